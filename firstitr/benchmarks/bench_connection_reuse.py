@@ -0,0 +1,102 @@
+"""
+Benchmark: pooled keep-alive sessions vs. one connection per request
+
+Replays the request pattern of loading one run (1 run-details call, 1 link
+listing, 4 stats files per iteration) against a local keep-alive server and
+compares module-level requests.get with UpstreamHTTPClient.
+
+Usage (from firstitr/):
+    python benchmarks/bench_connection_reuse.py [--iterations 10] [--runs 20] [--handshake-ms 2]
+
+--handshake-ms adds a delay to every new connection to model the TCP/TLS
+setup cost of reaching grover/perfweb from the dashboard hosts.
+"""
+import argparse
+import os
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests  # noqa: E402
+from myapp.services.http_client import UpstreamHTTPClient  # noqa: E402
+
+STATS_BODY = ('write_data:1048576b/s\nops:50000/s\nlatency:2.5us\n' * 50).encode()
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes; avoid Nagle/delayed-ACK stalls
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def handle(self):
+        with self.server.lock:
+            self.server.connections += 1
+        time.sleep(self.server.handshake_delay)
+        super().handle()
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(STATS_BODY)))
+        self.end_headers()
+        self.wfile.write(STATS_BODY)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run_pattern(get, base_url, iterations):
+    """Issue the requests made while loading one run"""
+    get(f'{base_url}/KO/rest/api/Runs/250729hhm', timeout=10)
+    get(f'{base_url}/cgi-bin/perfcloud/testdirview.cgi', timeout=10)
+    for iteration in range(iterations):
+        for stats_file in ('stats_workload.txt', 'stats_system.txt', 'stats_wafl_flexlog.txt',
+                           'system_node_virtual_machine_instance_show.txt'):
+            get(f'{base_url}/cgi-bin/perfcloud/view.cgi?p={iteration}/{stats_file}', timeout=10)
+
+
+def measure(label, get, server, base_url, args):
+    server.connections = 0
+    start = time.perf_counter()
+    for _ in range(args.runs):
+        run_pattern(get, base_url, args.iterations)
+    elapsed = time.perf_counter() - start
+    total_requests = args.runs * (2 + 4 * args.iterations)
+    print(f'{label:<24} {elapsed:8.3f}s  {total_requests / elapsed:9.1f} req/s  '
+          f'{server.connections:6d} connections')
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--handshake-ms', type=float, default=2.0)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.connections = 0
+    server.handshake_delay = args.handshake_ms / 1000.0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_address[1]}'
+
+    print(f'{args.runs} runs x {2 + 4 * args.iterations} requests, handshake {args.handshake_ms}ms')
+    baseline = measure('requests.get', requests.get, server, base_url, args)
+    client = UpstreamHTTPClient({})
+    pooled = measure('UpstreamHTTPClient', client.get, server, base_url, args)
+    print(f'speedup: {baseline / pooled:.2f}x')
+
+    client.close()
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
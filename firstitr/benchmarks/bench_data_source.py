@@ -0,0 +1,152 @@
+"""
+Benchmark: stats crawl from a local RESULTS mount vs. perfweb CGI over HTTP
+
+Builds a synthetic RESULTS tree, serves it through a local testdirview/view.cgi
+stand-in (with a fixed per-request CGI overhead) and times
+StatsProcessingService.fetch_comprehensive_stats against the HTTP and the
+filesystem data sources, with a cold artifact cache on every run.
+
+Usage (from firstitr/):
+    python benchmarks/bench_data_source.py [--iterations 12] [--runs 5] [--cgi-ms 20] [--file-kb 256]
+
+Against a real NFS mount the filesystem numbers also include NFS latency; use
+--root to point the filesystem source at an existing tree instead.
+"""
+import argparse
+import os
+import re
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+settings.configure(RESULTS_SOURCE={'BACKEND': 'http'})
+django.setup()
+
+from myapp.services.api_service import ExternalAPIService  # noqa: E402
+from myapp.services.artifact_cache import artifact_cache  # noqa: E402
+from myapp.services.stats_service import StatsProcessingService  # noqa: E402
+
+RUN_ID = '250729hhm'
+FILES = {
+    'stats_workload.txt': 'write_data:{n}048576b/s\nread_io_type.cache:75%\nread_io_type.ext_cache:5%\n'
+                          'read_io_type.disk:20%\nread_io_type.bamboo_ssd:0%\n',
+    'stats_system.txt': 'cpu_busy:{n}.5%\n',
+    'stats_wafl_flexlog.txt': 'rdma_actual_latency.WAFL_SPINNP_WRITE:1{n}.0us\n'
+                              'ldma_actual_latency.WAFL_SPINNP_WRITE:2{n}.0us\n',
+    'system_node_virtual_machine_instance_show.txt': 'Instance Type: m5.4xlarge\n',
+}
+
+
+def build_tree(root, iterations, file_kb):
+    """Write a run with `iterations` iteration directories of padded stats files"""
+    padding = 'counter.padding:0\n' * (file_kb * 1024 // 18)
+    output = os.path.join(root, RUN_ID[:4], RUN_ID, 'ontap_command_output')
+    for n in range(1, iterations + 1):
+        directory = os.path.join(output, f'{n:02d}_iter')
+        os.makedirs(directory)
+        for name, head in FILES.items():
+            with open(os.path.join(directory, name), 'w') as stats_file:
+                stats_file.write(head.format(n=n) + padding)
+
+
+class CGIHandler(BaseHTTPRequestHandler):
+    """Serves the tree the way testdirview.cgi and view.cgi expose it"""
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_GET(self):
+        time.sleep(self.server.cgi_seconds)
+        match = re.search(r'\?p=/x/eng/perfcloud/RESULTS/(.*)$', unquote(self.path))
+        path = os.path.join(self.server.root, match.group(1)) if match else ''
+        if 'testdirview.cgi' in self.path and os.path.isdir(path):
+            relative = match.group(1)
+            body = ''.join(
+                f'<a href="testdirview.cgi?p=/x/eng/perfcloud/RESULTS/{relative}/{name}">{name}</a>\n'
+                for name in sorted(os.listdir(path))
+            ).encode()
+        elif os.path.isfile(path):
+            with open(path, 'rb') as stats_file:
+                body = stats_file.read()
+        else:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Streaming scans close connections mid-body on purpose
+        pass
+
+
+def time_crawls(label, runs):
+    timings = []
+    for _ in range(runs):
+        artifact_cache.clear()
+        start = time.perf_counter()
+        stats = StatsProcessingService.fetch_comprehensive_stats(RUN_ID)
+        timings.append(time.perf_counter() - start)
+    print(f'{label:<12} median {statistics.median(timings) * 1000:8.1f}ms  '
+          f'min {min(timings) * 1000:8.1f}ms  ({len(stats)} metrics)')
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=12)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--cgi-ms', type=float, default=20.0, help='Per-request CGI overhead of the stand-in')
+    parser.add_argument('--file-kb', type=int, default=256)
+    parser.add_argument('--root', help='Existing RESULTS tree containing run 250729hhm')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        root = args.root or scratch
+        if not args.root:
+            build_tree(root, args.iterations, args.file_kb)
+
+        server = StandInServer(('127.0.0.1', 0), CGIHandler)
+        server.root = root
+        server.cgi_seconds = args.cgi_ms / 1000
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        ExternalAPIService.PERFWEB_BASE_URL = f'http://127.0.0.1:{server.server_address[1]}/cgi-bin/perfcloud'
+
+        print(f'{args.iterations} iterations x {len(FILES) - 1} stats files of ~{args.file_kb}KB, '
+              f'CGI overhead {args.cgi_ms:.0f}ms')
+        for streaming in (False, True):
+            settings.STREAMING_FETCH = {'ENABLED': streaming}
+            print(f'-- {"streaming scan" if streaming else "full-body fetch"}')
+            settings.RESULTS_SOURCE = {'BACKEND': 'http'}
+            http_time = time_crawls('http', args.runs)
+            settings.RESULTS_SOURCE = {'BACKEND': 'filesystem', 'ROOT': root}
+            local_time = time_crawls('filesystem', args.runs)
+            print(f'{"speedup":<12} {http_time / local_time:8.1f}x')
+
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
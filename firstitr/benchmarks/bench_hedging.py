@@ -0,0 +1,144 @@
+"""
+Benchmark: tail latency of stats-file fetches with and without hedging
+
+Replays stats-file GETs through ExternalAPIService.fetch_stats_file against a
+local stand-in whose per-request service time is drawn from a latency
+distribution (a heavy-tailed synthetic one by default, or a replayed trace).
+Reports p50/p95/p99/max of the fetch latency and the extra upstream load
+caused by hedges.
+
+Usage (from firstitr/):
+    python benchmarks/bench_hedging.py [--requests 600] [--concurrency 4] [--trace latencies_ms.txt]
+
+--trace takes one service time in milliseconds per line (e.g. exported from
+perfweb access logs); service times are sampled from it with a fixed seed.
+"""
+import argparse
+import os
+import random
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from myapp.services.api_service import ExternalAPIService  # noqa: E402
+from myapp.services.artifact_cache import artifact_cache  # noqa: E402
+from myapp.services.hedging import hedging  # noqa: E402
+
+STATS_BODY = ('write_data:1048576b/s\nops:50000/s\nlatency:2.5us\n' * 50).encode()
+
+
+def synthetic_latencies(count, seed):
+    """Mostly fast responses with a slow 5% and a very slow 1% tail (seconds)"""
+    rng = random.Random(seed)
+    latencies = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.01:
+            latencies.append(rng.uniform(0.3, 0.6))
+        elif roll < 0.06:
+            latencies.append(rng.uniform(0.06, 0.15))
+        else:
+            latencies.append(rng.uniform(0.004, 0.012))
+    return latencies
+
+
+def trace_latencies(path, count, seed):
+    with open(path) as trace:
+        samples = [float(line) / 1000.0 for line in trace if line.strip()]
+    rng = random.Random(seed)
+    return [rng.choice(samples) for _ in range(count)]
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests += 1
+            delay = self.server.latencies[self.server.next_latency % len(self.server.latencies)]
+            self.server.next_latency += 1
+        time.sleep(delay)
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(STATS_BODY)))
+        self.end_headers()
+        self.wfile.write(STATS_BODY)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def percentile(samples, percent):
+    ordered = sorted(samples)
+    return ordered[max(0, min(len(ordered) - 1, int(round(percent / 100 * len(ordered))) - 1))]
+
+
+def replay(label, server, args, offset):
+    """Fetch args.requests distinct stats files and report latency percentiles"""
+    artifact_cache.clear()
+    server.requests = 0
+    server.next_latency = 0
+
+    def fetch(index):
+        link = f'testdirview.cgi?p=/x/eng/perfcloud/RESULTS/2507/250729hhm/ontap_command_output/{offset + index:05d}_iter'
+        start = time.perf_counter()
+        ExternalAPIService.fetch_stats_file('2507', '250729hhm', link, 'stats_workload.txt')
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        latencies = list(pool.map(fetch, range(args.requests)))
+
+    extra = server.requests - args.requests
+    print(f'{label:<12} p50 {percentile(latencies, 50) * 1000:7.1f}ms  p95 {percentile(latencies, 95) * 1000:7.1f}ms  '
+          f'p99 {percentile(latencies, 99) * 1000:7.1f}ms  max {max(latencies) * 1000:7.1f}ms  '
+          f'extra load {extra / args.requests * 100:5.1f}%')
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=600)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--trace', help='File with one service time in milliseconds per line')
+    parser.add_argument('--hedge-ratio', type=float, default=0.05)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    count = args.requests * 2
+    latencies = trace_latencies(args.trace, count, args.seed) if args.trace else synthetic_latencies(count, args.seed)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.latencies = latencies
+    server.requests = 0
+    server.next_latency = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    ExternalAPIService.PERFWEB_BASE_URL = f'http://127.0.0.1:{server.server_address[1]}/cgi-bin/perfcloud'
+
+    print(f'{args.requests} stats-file fetches, concurrency {args.concurrency}, '
+          f'{"trace " + args.trace if args.trace else "synthetic heavy-tailed latencies"}')
+
+    # Same service-time sequence for both phases; the first also warms the latency windows
+    hedging._config = {'ENABLED': False}
+    replay('no hedging', server, args, 0)
+    hedging._config = {'ENABLED': True, 'MAX_HEDGE_RATIO': args.hedge_ratio}
+    hedging.reset()
+    replay('hedged', server, args, args.requests)
+    status = hedging.get_status()
+    print(f'hedges sent {status["hedges"]} ({status["hedge_ratio"] * 100:.1f}% of requests), '
+          f'won {status["hedge_wins"]}, denied by budget {status["budget_denied"]}')
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
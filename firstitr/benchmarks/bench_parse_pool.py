@@ -0,0 +1,95 @@
+"""
+Benchmark: stats file parsing on request threads vs. the PARSE_POOL process pool
+
+Simulates concurrent requests (threads) that each parse a batch of large
+synthetic stats_workload.txt bodies, once inline under the GIL and once
+through ParsePool with 1, 2, 4 ... worker processes up to the CPU count, and
+prints parsed MB/s for each. Inline throughput stays flat however many
+requests run at once; pooled throughput scales with the workers until the
+cores (or pickling of the bodies) run out.
+
+Usage (from firstitr/):
+    python benchmarks/bench_parse_pool.py [--file-kb 2048] [--files 8] [--requests 4]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+settings.configure()
+django.setup()
+
+from myapp.services.parse_pool import ParsePool  # noqa: E402
+from myapp.services.stats_service import StatsProcessingService  # noqa: E402
+
+METRICS = [
+    'write_data:2097152b/s', 'ops:50000/s', 'latency:2.5us', 'read_io_type.cache:75%',
+    'read_io_type.ext_cache:5%', 'read_io_type.disk:20%', 'read_io_type.bamboo_ssd:0%',
+]
+
+
+def build_body(file_kb, seed):
+    """Counter lines of roughly file_kb KB with the metric lines near the end"""
+    rng = random.Random(seed)
+    lines = []
+    size = 0
+    while size < file_kb * 1024:
+        line = f'volume.vol{rng.randint(0, 999)}.counter_{rng.randint(0, 96)}:{rng.randint(0, 10 ** 6)}'
+        lines.append(line)
+        size += len(line) + 1
+    at = int(len(lines) * 0.9)
+    lines[at:at] = METRICS
+    return '\n'.join(lines) + '\n'
+
+
+def throughput(pool, bodies, requests):
+    """Parsed MB/s with `requests` threads each scanning every body as one batch"""
+    patterns = StatsProcessingService.scan_patterns('stats_workload.txt')
+    jobs = [(body, patterns) for body in bodies]
+    pool.scan_many(jobs)  # Warm up workers and scanner caches
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=requests) as threads:
+        results = list(threads.map(lambda _: pool.scan_many(jobs), range(requests)))
+    elapsed = time.perf_counter() - start
+
+    assert all(result == results[0] for result in results)
+    return sum(len(body) for body in bodies) * requests / elapsed / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--file-kb', type=int, default=2048)
+    parser.add_argument('--files', type=int, default=8, help='Bodies parsed per request')
+    parser.add_argument('--requests', type=int, default=4, help='Concurrent requests')
+    args = parser.parse_args()
+
+    bodies = [build_body(args.file_kb, seed) for seed in range(args.files)]
+    cpus = os.cpu_count() or 1
+    print(f'{args.requests} concurrent requests x {args.files} bodies of ~{args.file_kb}KB, {cpus} CPUs')
+
+    inline = throughput(ParsePool({'ENABLED': False}), bodies, args.requests)
+    print(f'{"inline":<12} {inline:8.1f} MB/s')
+
+    workers = 1
+    while True:
+        pool = ParsePool({'ENABLED': True, 'WORKERS': workers, 'MIN_BYTES': 0})
+        try:
+            pooled = throughput(pool, bodies, args.requests)
+        finally:
+            pool.shutdown()
+        print(f'{f"{workers} workers":<12} {pooled:8.1f} MB/s  {pooled / inline:5.2f}x inline')
+        if workers >= cpus:
+            break
+        workers = min(workers * 2, cpus)
+
+
+if __name__ == '__main__':
+    main()
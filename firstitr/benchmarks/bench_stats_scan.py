@@ -0,0 +1,124 @@
+"""
+Benchmark: single-pass multi-metric extraction vs. one regex search per metric
+
+Builds large synthetic stats_workload.txt bodies and times the workload stats
+and graph point extraction done for every iteration: once with one
+re.search per pattern over the whole body (five stats and three graph
+patterns), once through the precompiled MultiPatternScanner, and once in
+series mode (STATS_SERIES), which collects every sample of each metric.
+
+Usage (from firstitr/):
+    python benchmarks/bench_stats_scan.py [--file-kb 1024] [--runs 20]
+
+Layouts: metrics near the start of the file, near the end, and near the end
+with one metric absent (every separate search of the absent metric reads the
+whole body).
+"""
+import argparse
+import os
+import random
+import re
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+settings.configure()
+django.setup()
+
+from myapp.services.api_service import DataTransformService  # noqa: E402
+from myapp.services.sample_series import parse_samples, summarize  # noqa: E402
+from myapp.services.stats_service import StatsProcessingService, GraphDataService  # noqa: E402
+from myapp.services.stream_scan import scan_text_all  # noqa: E402
+
+METRICS = [
+    'write_data:2097152b/s', 'ops:50000/s', 'latency:2.5us', 'read_io_type.cache:75%',
+    'read_io_type.ext_cache:5%', 'read_io_type.disk:20%', 'read_io_type.bamboo_ssd:0%',
+]
+
+
+def build_body(file_kb, position, drop_bamboo):
+    """Counter lines of roughly file_kb KB with the metric lines at a relative position"""
+    rng = random.Random(1)
+    lines = []
+    size = 0
+    while size < file_kb * 1024:
+        line = f'volume.vol{rng.randint(0, 999)}.counter_{rng.randint(0, 96)}:{rng.randint(0, 10 ** 6)}'
+        lines.append(line)
+        size += len(line) + 1
+    metrics = [line for line in METRICS if not (drop_bamboo and 'bamboo' in line)]
+    at = int(len(lines) * position)
+    lines[at:at] = metrics
+    return '\n'.join(lines) + '\n'
+
+
+def separate_searches(text):
+    """The per-metric extraction: one re.search over the body for every pattern"""
+    collectors = StatsProcessingService._new_collectors()
+    StatsProcessingService._collect_file_stats(
+        'stats_workload.txt',
+        lambda name, value_type: DataTransformService.extract_numeric_value(
+            text, StatsProcessingService.STATS_PATTERNS[name], value_type
+        ),
+        collectors
+    )
+    point = GraphDataService._graph_point(
+        lambda name, value_type: DataTransformService.extract_numeric_value(
+            text, GraphDataService.GRAPH_PATTERNS[name], value_type
+        )
+    )
+    return collectors, point
+
+
+def single_pass(text):
+    collectors = StatsProcessingService._new_collectors()
+    StatsProcessingService._extract_workload_stats(text, collectors)
+    return collectors, GraphDataService._extract_graph_point(text)
+
+
+def series_pass(text):
+    """Series-mode extraction: every sample of the workload metrics, summarized"""
+    matches = scan_text_all(text, StatsProcessingService.scan_patterns('stats_workload.txt'))
+    return {
+        name: summarize(parse_samples(values, StatsProcessingService.SERIES_METRICS[name][1]))
+        for name, values in matches.items() if name in StatsProcessingService.SERIES_METRICS
+    }
+
+
+def median_ms(function, text, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function(text)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--file-kb', type=int, default=1024)
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    re.purge()
+    print(f'stats_workload.txt of ~{args.file_kb}KB, median of {args.runs} runs')
+    for label, position, drop_bamboo in (
+        ('metrics early', 0.02, False),
+        ('metrics late', 0.9, False),
+        ('one absent', 0.9, True),
+    ):
+        text = build_body(args.file_kb, position, drop_bamboo)
+        assert single_pass(text) == separate_searches(text)
+        before = median_ms(separate_searches, text, args.runs)
+        after = median_ms(single_pass, text, args.runs)
+        series = median_ms(series_pass, text, args.runs)
+        print(f'{label:<14} separate {before:8.2f}ms  single pass {after:8.2f}ms  speedup {before / after:5.1f}x  '
+              f'series {series:8.2f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'firstitr.settings')
+# Route upstream-bound endpoints to the async views (see ASYNC_VIEWS_ENABLED)
+os.environ.setdefault('FIRSTITR_ASYNC_VIEWS', '1')
 
 application = get_asgi_application()
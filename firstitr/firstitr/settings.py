@@ -13,6 +13,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -186,3 +187,146 @@ LOGGING = {
     },
 }
 
+# Cache memory introspection (opt-in)
+# Enables /api/cache-memory/; tracemalloc adds allocation snapshots at a runtime cost
+CACHE_INTROSPECTION_ENABLED = False
+CACHE_INTROSPECTION_TRACEMALLOC = False
+
+# Upstream HTTP connection pooling (grover / perfweb)
+# Shared keep-alive sessions per host with retry and exponential backoff on idempotent GETs
+UPSTREAM_HTTP = {
+    'POOL_CONNECTIONS': 4,
+    'POOL_MAXSIZE': 16,
+    'RETRIES': 2,
+    'BACKOFF_FACTOR': 0.3,
+    'BACKOFF_JITTER': 0.2,
+    'BACKOFF_MAX': 5.0,
+    'RETRY_STATUSES': (429, 500, 502, 503, 504),
+    'ASYNC_MAX_CONNECTIONS': 100,
+}
+
+# Async views are used when served through firstitr.asgi (which sets FIRSTITR_ASYNC_VIEWS=1);
+# WSGI deployments keep the sync views. httpx is used for upstream calls when installed.
+ASYNC_VIEWS_ENABLED = os.environ.get('FIRSTITR_ASYNC_VIEWS') == '1'
+
+# Concurrency for per-iteration stats file fetches
+# PER_PROCESS bounds worker threads shared by all requests; PER_RUN bounds one run's fan-out
+STATS_FETCH_CONCURRENCY = {
+    'PER_PROCESS': 16,
+    'PER_RUN': 6,
+}
+
+# Raw upstream artifact cache (run details, iteration listings and stats file bodies)
+# Shared by the details and graph extractors so each file is downloaded once per TTL
+ARTIFACT_CACHE = {
+    'MAX_BYTES': 64 * 1024 * 1024,
+    'TTL_SECONDS': 600,
+    'LISTING_TTL_SECONDS': 60,
+    'DETAILS_TTL_SECONDS': 60,
+    'MISSING_TTL_SECONDS': 60,
+}
+
+# Priority scheduling of upstream requests waiting for a host's concurrency slots.
+# Contended slots go to interactive, bulk (multi-run fetches) and background
+# requests in proportion to WEIGHTS; anything queued longer than
+# STARVATION_SECONDS is served first. Scheduling is per process: the web server
+# only issues interactive and bulk work, and warm_cache runs in its own process
+UPSTREAM_SCHEDULER = {
+    'WEIGHTS': {'interactive': 8, 'bulk': 2, 'background': 1},
+    'STARVATION_SECONDS': 2.0,
+}
+
+# Incremental refresh: remember the values of completed iterations so refreshing an
+# in-progress run only fetches and parses iterations that appeared since
+ITERATION_LEDGER = {
+    'ENABLED': True,
+    'MAX_RUNS': 256,
+}
+
+# Batched Runs API queries for fetch_run_details_many. When disabled, details for
+# several runs are fetched concurrently with one request per run
+RUN_DETAILS_BATCH = {
+    'ENABLED': False,
+    'MAX_IDS': 25,
+}
+
+# Per-host circuit breakers for grover and perfweb
+# While a breaker is open requests fail fast and stale artifacts are served instead
+CIRCUIT_BREAKER = {
+    'WINDOW_SIZE': 20,
+    'MIN_CALLS': 10,
+    'FAILURE_RATE_THRESHOLD': 0.5,
+    'SLOW_CALL_SECONDS': 5.0,
+    'SLOW_CALL_RATE_THRESHOLD': 0.8,
+    'OPEN_SECONDS': 30,
+    'HALF_OPEN_MAX_CALLS': 2,
+    'HALF_OPEN_SUCCESSES': 2,
+}
+
+# Adaptive per-host concurrency limits (AIMD) and latency-derived timeouts
+# Timeouts become TIMEOUT_P99_MULTIPLIER x the endpoint's p99, capped by the fixed timeouts
+UPSTREAM_LIMITS = {
+    'INITIAL_LIMIT': 8,
+    'MIN_LIMIT': 2,
+    'MAX_LIMIT': 32,
+    'BACKOFF_RATIO': 0.7,
+    'LATENCY_TOLERANCE': 2.0,
+    'WINDOW_SIZE': 200,
+    'MIN_SAMPLES': 20,
+    'TIMEOUT_P99_MULTIPLIER': 3.0,
+    'MIN_TIMEOUT': 1.0,
+}
+
+# Streaming fetch mode: scan listings and stats files line by line while they download
+# and close the connection once every requested metric has been found
+STREAMING_FETCH = {
+    'ENABLED': False,
+    'CHUNK_SIZE': 8192,
+}
+
+# Series mode: keep every sample of each stats metric (not only the first per file) and
+# add mean/p50/p95/p99/stddev/max per iteration and per run as 'Sample Statistics'
+# Needs whole file bodies, so it is skipped while STREAMING_FETCH is enabled
+STATS_SERIES = {
+    'ENABLED': False,
+}
+
+# Parse stats files of at least MIN_BYTES in WORKERS processes (None: one per CPU) instead of
+# on the request thread; smaller bodies are parsed inline (benchmarks/bench_parse_pool.py)
+PARSE_POOL = {
+    'ENABLED': False,
+    'WORKERS': None,
+    'MIN_BYTES': 256 * 1024,
+}
+
+# Hedged stats-file requests: duplicate a GET that outlives the endpoint's p95
+# Hedges are budgeted to MAX_HEDGE_RATIO of primary requests (benchmarks/bench_hedging.py)
+UPSTREAM_HEDGING = {
+    'ENABLED': False,
+    'PERCENTILE': 95,
+    'MIN_DELAY': 0.02,
+    'MAX_HEDGE_RATIO': 0.05,
+    'MAX_BURST': 5,
+    'MAX_WORKERS': 32,
+}
+
+# End-to-end request deadlines for the details and multi-run views (?deadline= seconds)
+# Every upstream timeout is clamped to the remaining budget; runs cut short are
+# returned with partial: true and missing_fields instead of failing the request
+REQUEST_DEADLINE = {
+    'DEFAULT_SECONDS': 25,
+    'MAX_SECONDS': 120,
+}
+
+# Where iteration listings and stats files are read from: 'http' (perfweb CGI) or
+# 'filesystem' (RESULTS tree mounted at ROOT, e.g. over NFS on the analytics hosts)
+RESULTS_SOURCE = {
+    'BACKEND': 'http',
+    'ROOT': '/x/eng/perfcloud/RESULTS',
+}
+
+# Upstream base URLs. Empty values use the production grover/perfweb hosts. Point
+# them at the stand-in server to benchmark offline (python manage.py upstream_standin):
+#   UPSTREAM_BASE_URLS = {'RUNS_API': 'http://127.0.0.1:8765/KO/rest/api/Runs',
+#                         'PERFWEB': 'http://127.0.0.1:8765/cgi-bin/perfcloud'}
+UPSTREAM_BASE_URLS = {}
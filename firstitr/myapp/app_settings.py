@@ -0,0 +1,32 @@
+"""
+Application settings access
+Reads optional tuning settings from Django with safe fallbacks
+"""
+from typing import Any
+
+try:
+    from django.conf import settings
+    DJANGO_AVAILABLE = True
+except ImportError:
+    DJANGO_AVAILABLE = False
+    settings = None
+
+
+def get_setting(name: str, default: Any = None) -> Any:
+    """
+    Read a setting from Django settings, falling back to a default
+
+    Args:
+        name: Setting name (e.g. 'CACHE_INTROSPECTION_ENABLED')
+        default: Value returned when Django is unavailable or the setting is unset
+
+    Returns:
+        The configured value or the default
+    """
+    try:
+        if DJANGO_AVAILABLE and settings and settings.configured:
+            return getattr(settings, name, default)
+    except Exception:
+        # Fallback for scripts and tests without a configured Django project
+        pass
+    return default
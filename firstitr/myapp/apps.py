@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class MyappConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'myapp'
+
+    def ready(self):
+        from .app_settings import get_setting
+        from .cache_introspection import start_allocation_tracing
+
+        if get_setting('CACHE_INTROSPECTION_ENABLED', False) and get_setting('CACHE_INTROSPECTION_TRACEMALLOC', False):
+            start_allocation_tracing()
@@ -0,0 +1,167 @@
+"""
+Cache memory introspection
+Reports approximate deep sizes of cache entries and tracemalloc allocations
+attributed to the cache and service modules
+"""
+import os
+import sys
+import tracemalloc
+from typing import Any, Dict, List, Optional, Tuple
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Modules whose allocations are attributed to the cache in snapshots
+TRACKED_PATHS = (
+    os.path.join(APP_DIR, 'cache_manager.py'),
+    os.path.join(APP_DIR, 'services', ''),
+)
+
+
+def deep_sizeof(obj: Any) -> int:
+    """
+    Approximate the deep memory footprint of an object
+
+    Follows dicts, lists, tuples, sets and objects with __dict__ / __slots__.
+    Shared objects are only counted once.
+
+    Args:
+        obj: Object to measure
+
+    Returns:
+        Approximate size in bytes
+    """
+    seen = set()
+    stack = [obj]
+    total = 0
+
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+
+        if isinstance(current, (str, bytes, bytearray, int, float, bool)) or current is None:
+            continue
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        else:
+            if hasattr(current, '__dict__'):
+                stack.append(vars(current))
+            for slot in getattr(type(current), '__slots__', ()):
+                if hasattr(current, slot):
+                    stack.append(getattr(current, slot))
+
+    return total
+
+
+def namespace_for_key(key: str) -> str:
+    """Return the namespace prefix of a cache key (e.g. 'details', 'graph')"""
+    return key.split('_', 1)[0] if '_' in key else 'default'
+
+
+def build_entry_report(items: List[Tuple[str, Any]], top_n: int = 10) -> Dict[str, Any]:
+    """
+    Build a per-entry and per-namespace size report
+
+    Args:
+        items: (key, value) pairs from the cache
+        top_n: Number of largest entries to list per namespace and overall
+
+    Returns:
+        Dictionary with entry sizes, namespace totals and largest entries
+    """
+    entries = [
+        {'key': key, 'namespace': namespace_for_key(key), 'bytes': deep_sizeof(value)}
+        for key, value in items
+    ]
+    entries.sort(key=lambda entry: entry['bytes'], reverse=True)
+
+    namespaces = {}
+    for entry in entries:
+        namespace = namespaces.setdefault(
+            entry['namespace'], {'count': 0, 'total_bytes': 0, 'largest': []}
+        )
+        namespace['count'] += 1
+        namespace['total_bytes'] += entry['bytes']
+        if len(namespace['largest']) < top_n:
+            namespace['largest'].append({'key': entry['key'], 'bytes': entry['bytes']})
+
+    return {
+        'entry_count': len(entries),
+        'total_bytes': sum(entry['bytes'] for entry in entries),
+        'entries': entries,
+        'largest': entries[:top_n],
+        'namespaces': namespaces
+    }
+
+
+def start_allocation_tracing(frames: int = 25) -> bool:
+    """
+    Start tracemalloc if it is not already running
+
+    Args:
+        frames: Number of stack frames stored per allocation
+
+    Returns:
+        True if tracing was started by this call
+    """
+    if tracemalloc.is_tracing():
+        return False
+    tracemalloc.start(frames)
+    return True
+
+
+def _tracked_frame(traceback: tracemalloc.Traceback) -> Optional[tracemalloc.Frame]:
+    """Return the innermost frame that belongs to a tracked module"""
+    for frame in reversed(traceback):
+        if frame.filename.startswith(TRACKED_PATHS):
+            return frame
+    return None
+
+
+def allocation_snapshot(limit: int = 10) -> Dict[str, Any]:
+    """
+    Summarise live allocations attributed to the cache and service modules
+
+    An allocation is attributed to the innermost tracked frame on its stack,
+    so objects built by json or re on behalf of the cache still count.
+
+    Args:
+        limit: Number of source lines to report
+
+    Returns:
+        Dictionary with tracing state, attributed totals and top source lines
+    """
+    if not tracemalloc.is_tracing():
+        return {'enabled': False}
+
+    snapshot = tracemalloc.take_snapshot()
+    by_line = {}
+    by_module = {}
+
+    for trace in snapshot.traces:
+        frame = _tracked_frame(trace.traceback)
+        if frame is None:
+            continue
+        location = f'{os.path.relpath(frame.filename, APP_DIR)}:{frame.lineno}'
+        line_stats = by_line.setdefault(location, {'location': location, 'bytes': 0, 'count': 0})
+        line_stats['bytes'] += trace.size
+        line_stats['count'] += 1
+        module = os.path.relpath(frame.filename, APP_DIR)
+        by_module[module] = by_module.get(module, 0) + trace.size
+
+    top_lines = sorted(by_line.values(), key=lambda stats: stats['bytes'], reverse=True)
+    current, peak = tracemalloc.get_traced_memory()
+
+    return {
+        'enabled': True,
+        'traced_current_bytes': current,
+        'traced_peak_bytes': peak,
+        'attributed_bytes': sum(by_module.values()),
+        'modules': dict(sorted(by_module.items(), key=lambda item: item[1], reverse=True)),
+        'top_lines': top_lines[:limit]
+    }
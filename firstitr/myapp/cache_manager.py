@@ -4,6 +4,8 @@ import threading
 import json
 import os
 from typing import Any, Optional, Dict
+from .cache_introspection import build_entry_report
+from .records import decode_record, encode_record
 
 try:
     from django.conf import settings
@@ -39,7 +41,7 @@ class LRUCache:
         if os.path.exists(self.cache_file):
             try:
                 with open(self.cache_file, 'r') as f:
-                    data = json.load(f)
+                    data = json.load(f, object_hook=decode_record)
                     
                 cache_items = data.get('cache', {})
                 access_times = data.get('access_times', {})
@@ -67,10 +69,15 @@ class LRUCache:
                 'access_times': self.access_times
             }
             with open(self.cache_file, 'w') as f:
-                json.dump(data, f, indent=2)
+                json.dump(data, f, indent=2, default=encode_record)
         except Exception as e:
             print(f"Error saving cache file: {e}")
     
+    def __contains__(self, key: str) -> bool:
+        """Whether a key is cached, without touching LRU order"""
+        with self.lock:
+            return key in self.cache
+    
     def get(self, key: str) -> Optional[Any]:
         """Get item from cache and mark as recently used"""
         with self.lock:
@@ -122,5 +129,14 @@ class LRUCache:
                 'access_order': list(self.cache.keys()),
                 'access_times': dict(self.access_times)
             }
+    
+    def get_memory_report(self, top_n: int = 10) -> Dict:
+        """Get approximate deep size of each cache entry, grouped by namespace"""
+        with self.lock:
+            items = list(self.cache.items())
+        
+        report = build_entry_report(items, top_n)
+        report['max_size'] = self.max_size
+        return report
 
 api_cache = LRUCache(max_size=20)
@@ -0,0 +1,54 @@
+"""
+Report approximate memory usage of the persisted API cache
+
+Usage:
+    python manage.py cache_memory [--top N] [--tracemalloc] [--json]
+"""
+import json
+from django.core.management.base import BaseCommand
+from myapp.cache_introspection import start_allocation_tracing, allocation_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Report per-entry deep size of cached runs and allocations attributed to the cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=10, help='Number of largest entries to list')
+        parser.add_argument(
+            '--tracemalloc',
+            action='store_true',
+            help='Trace allocations while loading the cache file and report them by source line'
+        )
+        parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+
+    def handle(self, *args, **options):
+        top_n = options['top']
+
+        if options['tracemalloc']:
+            start_allocation_tracing()
+
+        # Build a fresh cache from the persisted file so its allocations are traced
+        from myapp.cache_manager import LRUCache, api_cache
+        cache = LRUCache(max_size=api_cache.max_size)
+
+        report = cache.get_memory_report(top_n)
+        report['tracemalloc'] = allocation_snapshot(top_n)
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write(
+            f"{report['entry_count']} entries, {report['total_bytes']} bytes total "
+            f"(max_size={report['max_size']})"
+        )
+        for name, namespace in sorted(report['namespaces'].items()):
+            self.stdout.write(f"\n[{name}] {namespace['count']} entries, {namespace['total_bytes']} bytes")
+            for entry in namespace['largest']:
+                self.stdout.write(f"  {entry['bytes']:>10}  {entry['key']}")
+
+        tracing = report['tracemalloc']
+        if tracing['enabled']:
+            self.stdout.write(f"\nAllocations attributed to cache/services: {tracing['attributed_bytes']} bytes")
+            for line in tracing['top_lines']:
+                self.stdout.write(f"  {line['bytes']:>10}  {line['count']:>6}  {line['location']}")
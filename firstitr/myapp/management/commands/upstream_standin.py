@@ -0,0 +1,91 @@
+"""
+Run a local stand-in for the grover Runs API and perfweb CGI
+
+Usage:
+    python manage.py upstream_standin [--port 8765] [--fixtures DIR] [--synthetic]
+        [--latency SPEC] [--latency-runs SPEC] [--latency-listing SPEC] [--latency-file SPEC]
+        [--error-rate 0.01] [--error-status 503] [--drop-rate 0.0] [--bandwidth-kbps N]
+        [--record-runs URL] [--record-perfweb URL]
+
+Latency specs are in milliseconds: fixed:20, uniform:5,50, lognormal:20,0.8,
+pareto:10,1.5 or trace:FILE (one latency per line). Record mode fetches
+anything missing from --fixtures from the real hosts and stores it there; a
+recorded fixtures/results tree can also be used as RESULTS_SOURCE ROOT.
+"""
+import time
+from django.core.management.base import BaseCommand, CommandError
+from myapp.standin import FaultProfile, FixtureStore, LatencyDistribution, Recorder, SyntheticData, StandInServer
+
+
+class Command(BaseCommand):
+    help = 'Serve recorded or synthetic upstream responses with injected latency, errors and bandwidth limits'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1', help='Interface to bind')
+        parser.add_argument('--port', type=int, default=8765, help='Port to bind')
+        parser.add_argument('--fixtures', help='Fixture directory (runs/*.json and a results/ tree)')
+        parser.add_argument('--synthetic', action='store_true', help='Generate runs that are not in the fixtures')
+        parser.add_argument('--iterations', type=int, default=8, help='Iterations per synthetic run')
+        parser.add_argument('--file-kb', type=int, default=16, help='Padding per synthetic stats file in KB')
+        parser.add_argument('--latency', help='Latency spec for every endpoint')
+        for endpoint in ('runs', 'listing', 'file'):
+            parser.add_argument(f'--latency-{endpoint}', help=f'Latency spec for {endpoint} requests')
+        parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with --error-status')
+        parser.add_argument('--error-status', type=int, default=503)
+        parser.add_argument('--drop-rate', type=float, default=0.0, help='Fraction of connections closed without a response')
+        parser.add_argument('--bandwidth-kbps', type=float, help='Per-response bandwidth limit in KB/s')
+        parser.add_argument('--seed', type=int, help='Seed for latencies and faults')
+        parser.add_argument('--record-runs', help='Real Runs API base URL to record from')
+        parser.add_argument('--record-perfweb', help='Real perfweb CGI base URL to record from')
+
+    def handle(self, *args, **options):
+        if (options['record_runs'] or options['record_perfweb']) and not options['fixtures']:
+            raise CommandError('Record mode needs --fixtures to store responses in')
+        if not (options['fixtures'] or options['synthetic']):
+            raise CommandError('Nothing to serve: pass --fixtures and/or --synthetic')
+
+        try:
+            latency = {}
+            if options['latency']:
+                latency['*'] = LatencyDistribution(options['latency'], options['seed'])
+            for endpoint in ('runs', 'listing', 'file'):
+                spec = options[f'latency_{endpoint}']
+                if spec:
+                    latency[endpoint] = LatencyDistribution(spec, options['seed'])
+        except (ValueError, OSError) as e:
+            raise CommandError(str(e))
+
+        store = FixtureStore(options['fixtures']) if options['fixtures'] else None
+        recorder = None
+        if options['record_runs'] or options['record_perfweb']:
+            recorder = Recorder(store, options['record_runs'], options['record_perfweb'])
+        synthetic = SyntheticData(options['iterations'], options['file_kb']) if options['synthetic'] else None
+        bandwidth = options['bandwidth_kbps'] * 1024 if options['bandwidth_kbps'] else None
+        faults = FaultProfile(
+            latency=latency,
+            error_rate=options['error_rate'],
+            error_status=options['error_status'],
+            drop_rate=options['drop_rate'],
+            bandwidth=bandwidth,
+            seed=options['seed']
+        )
+
+        server = StandInServer((options['host'], options['port']), store, recorder, synthetic, faults)
+        urls = server.base_urls()
+        self.stdout.write(f'Upstream stand-in listening on {server.base_url}')
+        self.stdout.write('Point the app at it with:')
+        self.stdout.write(f"    UPSTREAM_BASE_URLS = {{'RUNS_API': '{urls['RUNS_API']}', 'PERFWEB': '{urls['PERFWEB']}'}}")
+
+        start = time.monotonic()
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            status = server.get_status()
+            self.stdout.write(
+                f"\n{status['requests']} requests in {time.monotonic() - start:.0f}s "
+                f"({status['endpoints']}), {status['errors']} injected errors, {status['dropped']} dropped, "
+                f"{status['not_modified']} not modified, {status['bytes_sent']} bytes sent"
+            )
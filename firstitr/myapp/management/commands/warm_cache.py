@@ -0,0 +1,43 @@
+"""
+Warm the API cache for a list of runs in the background priority class
+
+Usage:
+    python manage.py warm_cache RUN_ID [RUN_ID ...] [--no-graph]
+
+Upstream requests made here are tagged background, but the command runs in its
+own process with its own scheduler and concurrency limits: it does not yield to
+requests served by the web server, whose processes never issue background work.
+Run it off-peak, or with lower UPSTREAM_LIMITS, to spare interactive users.
+"""
+import time
+from django.core.management.base import BaseCommand
+from myapp.services.run_service import RunDataService, GraphDataManagerService
+from myapp.services.scheduler import BACKGROUND, priority_scope
+
+
+class Command(BaseCommand):
+    help = 'Fetch run details and graph data into the cache at background priority'
+
+    def add_arguments(self, parser):
+        parser.add_argument('run_ids', nargs='+', help='Run IDs to warm')
+        parser.add_argument('--no-graph', action='store_true', help='Only warm run details')
+
+    def handle(self, *args, **options):
+        warmed = 0
+        start = time.monotonic()
+
+        with priority_scope(BACKGROUND):
+            for run_id in dict.fromkeys(options['run_ids']):
+                try:
+                    details = RunDataService.fetch_single_run_data(run_id)
+                    if not options['no_graph']:
+                        GraphDataManagerService.fetch_single_graph_data(run_id)
+                except Exception as e:
+                    self.stderr.write(f'{run_id}: {e}')
+                    continue
+                if details:
+                    warmed += 1
+                else:
+                    self.stderr.write(f'{run_id}: no data available')
+
+        self.stdout.write(f'Warmed {warmed} of {len(set(options["run_ids"]))} runs in {time.monotonic() - start:.1f}s')
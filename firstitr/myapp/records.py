@@ -0,0 +1,264 @@
+"""
+Compact cached representations of run details and graph data
+Cached runs are held as slotted records with their numbers packed into
+double arrays, and graph data as typed columns; the public JSON shapes are
+rebuilt only where a response is built and where the cache is persisted
+"""
+import threading
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Kinds of packed values
+INT = 'i'      # Stored as a double, restored with int()
+FLOAT = 'f'    # Stored as a double
+OBJECT = 'o'   # Kept as the Python object (strings, None, ...)
+
+# Largest integer a double holds exactly
+_MAX_EXACT_INT = 2 ** 53
+
+# Schemas are interned and records refer to them by index, so a cached
+# record holds its values but not its field names
+_schemas = []
+_schema_ids = {}
+_schema_lock = threading.Lock()
+
+
+def _schema_id(schema: Tuple) -> int:
+    with _schema_lock:
+        if schema not in _schema_ids:
+            _schema_ids[schema] = len(_schemas)
+            _schemas.append(schema)
+        return _schema_ids[schema]
+
+
+def _kind(value: Any) -> str:
+    if isinstance(value, bool):
+        return OBJECT
+    if isinstance(value, int):
+        return INT if -_MAX_EXACT_INT <= value <= _MAX_EXACT_INT else OBJECT
+    return FLOAT if isinstance(value, float) else OBJECT
+
+
+def lttb_indices(xs: Sequence[float], ys: Sequence[float], threshold: int) -> List[int]:
+    """
+    Largest-Triangle-Three-Buckets downsampling of a curve
+
+    The first and last points are kept. The points in between are split
+    into threshold - 2 buckets in curve order, and each bucket keeps the
+    point forming the largest triangle with the previously kept point and
+    the average of the next bucket, which preserves peaks and bends.
+
+    Args:
+        xs: X values in curve order
+        ys: Y values in curve order
+        threshold: Number of points to keep (at least 3)
+
+    Returns:
+        Indices of the kept points in ascending order (all of them when
+        the curve has no more than threshold points)
+    """
+    count = len(xs)
+    if threshold >= count or threshold < 3:
+        return list(range(count))
+
+    every = (count - 2) / (threshold - 2)
+    kept = [0]
+    for bucket in range(threshold - 2):
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+        next_end = min(int((bucket + 2) * every) + 1, count)
+        avg_x = sum(xs[end:next_end]) / (next_end - end)
+        avg_y = sum(ys[end:next_end]) / (next_end - end)
+
+        ax, ay = xs[kept[-1]], ys[kept[-1]]
+        kept.append(max(
+            range(start, end),
+            key=lambda index: abs((ax - avg_x) * (ys[index] - ay) - (ax - xs[index]) * (avg_y - ay))
+        ))
+    kept.append(count - 1)
+    return kept
+
+
+class IterationStats:
+    """
+    Fields of a run aggregated over its iterations (or any flat field set)
+
+    Numbers are packed into one array('d'); other values stay in a tuple.
+    """
+
+    __slots__ = ('schema', 'numbers', 'objects')
+
+    def __init__(self, data: Dict[str, Any]):
+        schema = tuple((field, _kind(value)) for field, value in data.items())
+        self.schema = _schema_id(schema)
+        self.numbers = array('d', (value for value, (_, kind) in zip(data.values(), schema) if kind != OBJECT))
+        self.objects = tuple(value for value, (_, kind) in zip(data.values(), schema) if kind == OBJECT) or None
+
+    @property
+    def fields(self) -> List[str]:
+        return [field for field, _ in _schemas[self.schema]]
+
+    def to_dict(self) -> Dict[str, Any]:
+        numbers = iter(self.numbers)
+        objects = iter(self.objects or ())
+        data = {}
+        for field, kind in _schemas[self.schema]:
+            if kind == OBJECT:
+                data[field] = next(objects)
+            else:
+                data[field] = int(next(numbers)) if kind == INT else next(numbers)
+        return data
+
+
+class RunRecord:
+    """
+    Details of one run
+
+    Header fields and stats are held as IterationStats; nested values
+    (Sample Statistics, missing_fields) are kept as they are in `extra`.
+    """
+
+    __slots__ = ('header', 'stats', 'extra')
+
+    def __init__(
+        self,
+        header: IterationStats,
+        stats: Optional[IterationStats] = None,
+        extra: Optional[Dict[str, Any]] = None
+    ):
+        self.header = header
+        self.stats = stats
+        self.extra = extra or None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], stats_fields: Iterable[str] = ()) -> 'RunRecord':
+        """
+        Build a record from the public details shape
+
+        Args:
+            data: Run details as returned by the API
+            stats_fields: Fields that belong to the run's stats
+        """
+        stats_fields = set(stats_fields)
+        header, stats, extra = {}, {}, {}
+        for field, value in data.items():
+            if field in stats_fields:
+                stats[field] = value
+            elif isinstance(value, (dict, list)):
+                extra[field] = value
+            else:
+                header[field] = value
+        return cls(IterationStats(header), IterationStats(stats) if stats else None, extra)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The public details shape (a new dict on every call)"""
+        data = self.header.to_dict()
+        if self.stats is not None:
+            data.update(self.stats.to_dict())
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            '__record__': 'RunRecord',
+            'header': self.header.to_dict(),
+            'stats': None if self.stats is None else self.stats.to_dict(),
+            'extra': self.extra
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> 'RunRecord':
+        stats = data['stats']
+        return cls(IterationStats(data['header']), None if stats is None else IterationStats(stats), data['extra'])
+
+
+class GraphSeries:
+    """
+    Graph data points as one typed array per metric (struct of arrays)
+
+    Integer metrics are stored in array('q') and the others in array('d'),
+    so points convert back to the same Python values.
+    """
+
+    __slots__ = ('schema', 'columns')
+
+    def __init__(self, columns: Dict[str, array]):
+        self.schema = _schema_id(tuple(columns))
+        self.columns = tuple(columns.values())
+
+    @classmethod
+    def from_points(cls, points: Iterable[Dict[str, Any]], types: Dict[str, type]) -> 'GraphSeries':
+        """
+        Build a series from graph data points
+
+        Args:
+            points: Points with a value for every metric in types
+            types: Value type of each metric, in point order
+        """
+        columns = {name: array('q' if value_type is int else 'd') for name, value_type in types.items()}
+        for point in points:
+            for name, column in columns.items():
+                column.append(point[name])
+        return cls(columns)
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        return _schemas[self.schema]
+
+    def __len__(self) -> int:
+        return len(self.columns[0]) if self.columns else 0
+
+    def column(self, name: str) -> array:
+        return self.columns[self.names.index(name)]
+
+    def take(self, indices: Sequence[int]) -> 'GraphSeries':
+        """A copy holding the points at the given indices, in that order"""
+        return GraphSeries({
+            name: array(column.typecode, (column[index] for index in indices))
+            for name, column in zip(self.names, self.columns)
+        })
+
+    def sorted_by(self, name: str) -> 'GraphSeries':
+        """A copy with the points ordered by one metric"""
+        key = self.column(name)
+        return self.take(sorted(range(len(key)), key=key.__getitem__))
+
+    def downsampled(self, x: str, y: str, max_points: int) -> 'GraphSeries':
+        """A copy keeping at most max_points points of the x/y curve (see lttb_indices)"""
+        return self.take(lttb_indices(self.column(x), self.column(y), max_points))
+
+    def to_columns(self) -> Dict[str, List[Any]]:
+        """The columnar shape: one value list per metric"""
+        return {name: column.tolist() for name, column in zip(self.names, self.columns)}
+
+    def to_points(self) -> List[Dict[str, Any]]:
+        """The public point-list shape"""
+        names = self.names
+        return [dict(zip(names, values)) for values in zip(*self.columns)]
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            '__record__': 'GraphSeries',
+            'columns': {name: [column.typecode, column.tolist()] for name, column in zip(self.names, self.columns)}
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> 'GraphSeries':
+        return cls({name: array(typecode, values) for name, (typecode, values) in data['columns'].items()})
+
+
+RECORD_TYPES = {record_type.__name__: record_type for record_type in (RunRecord, GraphSeries)}
+
+
+def encode_record(obj: Any) -> Dict[str, Any]:
+    """json.dump default hook for cache persistence"""
+    if isinstance(obj, tuple(RECORD_TYPES.values())):
+        return obj.to_json()
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+def decode_record(data: Dict[str, Any]) -> Any:
+    """json.load object hook restoring records written by encode_record"""
+    record_type = RECORD_TYPES.get(data.get('__record__'))
+    return record_type.from_json(data) if record_type else data
@@ -3,16 +3,69 @@ Services module initialization
 Exports all service classes for easy importing
 """
 
-from .api_service import ExternalAPIService, DataTransformService, CompatibilityService
-from .stats_service import StatsProcessingService, GraphDataService
-from .run_service import RunDataService, GraphDataManagerService
+from .api_service import ExternalAPIService, AsyncExternalAPIService, DataTransformService, CompatibilityService
+from .stats_service import StatsProcessingService, GraphDataService, AsyncStatsProcessingService, AsyncGraphDataService
+from .run_service import RunDataService, GraphDataManagerService, AsyncRunDataService, AsyncGraphDataManagerService
+from .http_client import UpstreamHTTPClient, AsyncUpstreamHTTPClient, upstream_http, async_upstream_http
+from .concurrency import BoundedFetchExecutor, stats_fetch_executor
+from .artifact_cache import ArtifactCache, artifact_cache
+from .adaptive_limiter import AdaptiveLimiter, AdaptiveLimiterRegistry, UpstreamBusyError, upstream_limiters
+from .hedging import HedgingPolicy, hedging
+from .circuit_breaker import CircuitBreaker, CircuitBreakerRegistry, CircuitOpenError, circuit_breakers
+from .deadline import Deadline, DeadlineExceeded, deadline_scope, current_deadline
+from .iteration_ledger import IterationLedger, RunLedger, iteration_ledger
+from .scheduler import WorkScheduler, current_priority, priority_scope, upstream_scheduler
+from .metric_registry import Metric, MetricRegistry, metric_registry
+from .parse_pool import ParsePool, parse_pool
+from .ingestion import RunIngestionService, AsyncRunIngestionService
 
 __all__ = [
     'ExternalAPIService',
+    'AsyncExternalAPIService',
     'DataTransformService', 
     'CompatibilityService',
     'StatsProcessingService',
     'GraphDataService',
+    'AsyncStatsProcessingService',
+    'AsyncGraphDataService',
     'RunDataService',
-    'GraphDataManagerService'
+    'GraphDataManagerService',
+    'AsyncRunDataService',
+    'AsyncGraphDataManagerService',
+    'UpstreamHTTPClient',
+    'AsyncUpstreamHTTPClient',
+    'upstream_http',
+    'async_upstream_http',
+    'BoundedFetchExecutor',
+    'stats_fetch_executor',
+    'ArtifactCache',
+    'artifact_cache',
+    'CircuitBreaker',
+    'CircuitBreakerRegistry',
+    'CircuitOpenError',
+    'circuit_breakers',
+    'AdaptiveLimiter',
+    'AdaptiveLimiterRegistry',
+    'UpstreamBusyError',
+    'upstream_limiters',
+    'HedgingPolicy',
+    'hedging',
+    'Deadline',
+    'DeadlineExceeded',
+    'deadline_scope',
+    'current_deadline',
+    'IterationLedger',
+    'RunLedger',
+    'iteration_ledger',
+    'WorkScheduler',
+    'current_priority',
+    'priority_scope',
+    'upstream_scheduler',
+    'Metric',
+    'MetricRegistry',
+    'metric_registry',
+    'ParsePool',
+    'parse_pool',
+    'RunIngestionService',
+    'AsyncRunIngestionService'
 ]
@@ -0,0 +1,276 @@
+"""
+Adaptive concurrency limits and latency-based timeouts for upstream hosts
+Each host gets an AIMD bulkhead; each endpoint keeps a latency window from
+which request timeouts are derived
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from ..app_settings import get_setting
+
+
+class UpstreamBusyError(requests.exceptions.RequestException):
+    """Raised when no concurrency slot for a host frees up in time"""
+
+
+class LatencyWindow:
+    """Sliding window of recent request latencies with percentile lookups"""
+
+    def __init__(self, size: int):
+        self.samples = deque(maxlen=size)
+        self.lock = threading.Lock()
+
+    def add(self, latency: float) -> None:
+        with self.lock:
+            self.samples.append(latency)
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """Nearest-rank percentile of the window, or None when empty"""
+        with self.lock:
+            ordered = sorted(self.samples)
+        if not ordered:
+            return None
+        rank = max(0, min(len(ordered) - 1, int(round(percent / 100 * len(ordered))) - 1))
+        return ordered[rank]
+
+    def summary(self) -> Dict[str, Any]:
+        """Sample count and p50/p95/p99 in milliseconds"""
+        summary = {'samples': len(self)}
+        for percent in (50, 95, 99):
+            value = self.percentile(percent)
+            summary[f'p{percent}_ms'] = round(value * 1000, 1) if value is not None else None
+        return summary
+
+
+class AdaptiveLimiter:
+    """
+    Additive-increase/multiplicative-decrease concurrency limit for one host
+
+    Every on-time success raises the limit by 1/limit (about +1 per window of
+    requests); a failure, or a latency above LATENCY_TOLERANCE x the endpoint's
+    p50, multiplies it by BACKOFF_RATIO, at most once per observed latency.
+    """
+
+    DEFAULT_CONFIG = {
+        'INITIAL_LIMIT': 8,            # Concurrent requests allowed per host at start
+        'MIN_LIMIT': 2,                # Never throttle below this
+        'MAX_LIMIT': 32,               # Never open up beyond this
+        'BACKOFF_RATIO': 0.7,          # Multiplicative decrease on congestion
+        'LATENCY_TOLERANCE': 2.0,      # Latency above tolerance x p50 signals congestion
+        'WINDOW_SIZE': 200,            # Latency samples kept per endpoint
+        'MIN_SAMPLES': 20,             # Samples needed before latency drives limits and timeouts
+        'TIMEOUT_P99_MULTIPLIER': 3.0, # Timeout = multiplier x p99, capped by the fixed timeout
+        'MIN_TIMEOUT': 1.0,            # Floor for derived timeouts in seconds
+    }
+
+    def __init__(self, name: str, config: Dict[str, Any] = None, scheduler=None):
+        if scheduler is None:
+            # Imported here: the scheduler module builds on LatencyWindow above
+            from .scheduler import upstream_scheduler as scheduler
+        self.name = name
+        self.config = {**self.DEFAULT_CONFIG, **(config or {})}
+        self.scheduler = scheduler
+        self.queue = scheduler.queue()
+        self.limit = float(self.config['INITIAL_LIMIT'])
+        self.in_flight = 0
+        self.rejected = 0
+        self.last_decrease = 0.0
+        self.windows = {}
+        self.condition = threading.Condition()
+
+    @staticmethod
+    def endpoint_key(url: str) -> str:
+        """Group URLs by endpoint: CGI script on perfweb, collection path on grover"""
+        parts = urlsplit(url)
+        path = parts.path
+        if not path.endswith('.cgi'):
+            path = path.rsplit('/', 1)[0]
+        return f'{parts.scheme}://{parts.netloc}{path}'
+
+    def window_for(self, endpoint: str) -> LatencyWindow:
+        with self.condition:
+            window = self.windows.get(endpoint)
+            if window is None:
+                window = LatencyWindow(self.config['WINDOW_SIZE'])
+                self.windows[endpoint] = window
+            return window
+
+    def timeout_for(self, url: str, default: float) -> float:
+        """
+        Derive a request timeout from the endpoint's observed latency
+
+        Args:
+            url: URL about to be fetched
+            default: Fixed timeout for this kind of request (upper bound)
+
+        Returns:
+            TIMEOUT_P99_MULTIPLIER x p99, within [MIN_TIMEOUT, default]; the
+            default until MIN_SAMPLES latencies have been observed
+        """
+        window = self.window_for(self.endpoint_key(url))
+        if len(window) < self.config['MIN_SAMPLES']:
+            return default
+        derived = window.percentile(99) * self.config['TIMEOUT_P99_MULTIPLIER']
+        return min(default, max(self.config['MIN_TIMEOUT'], derived))
+
+    def _enqueue(self, priority: Optional[str]):
+        """Take a free slot right away (returns None) or queue for one in the request's priority class"""
+        priority = priority or self.scheduler.current_priority()
+        with self.condition:
+            if self.in_flight < int(self.limit) and not len(self.queue):
+                self.in_flight += 1
+                self.scheduler.admitted(priority)
+                return None
+            return self.queue.push(priority)
+
+    def _dispatch(self) -> None:
+        """Grant free slots to queued waiters in fair-queue order (caller holds the lock)"""
+        granted = False
+        while self.in_flight < int(self.limit) and self.queue.pop() is not None:
+            self.in_flight += 1
+            granted = True
+        if granted:
+            self.condition.notify_all()
+
+    def _give_up(self, waiter, wait: float) -> None:
+        """Leave the queue after waiting too long, or return a slot granted meanwhile (caller holds the lock)"""
+        if waiter.granted:
+            self.in_flight = max(0, self.in_flight - 1)
+            self._dispatch()
+        else:
+            self.queue.remove(waiter)
+        self.rejected += 1
+        raise UpstreamBusyError(f'No free upstream slot for {self.name} after {wait:.1f}s')
+
+    def acquire(self, wait: float, priority: Optional[str] = None) -> None:
+        """
+        Block until a concurrency slot is granted
+
+        Waiters are served by the scheduler's weighted fair queue across
+        priority classes rather than first come, first served.
+
+        Args:
+            wait: Seconds to wait before giving up with UpstreamBusyError
+            priority: Priority class (defaults to the current priority scope)
+        """
+        waiter = self._enqueue(priority)
+        if waiter is None:
+            return
+        deadline = time.monotonic() + wait
+        with self.condition:
+            while not waiter.granted:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._give_up(waiter, wait)
+                self.condition.wait(remaining)
+
+    async def acquire_async(self, wait: float, priority: Optional[str] = None) -> None:
+        """Event-loop friendly acquire, polling for its grant with short sleeps"""
+        waiter = self._enqueue(priority)
+        if waiter is None:
+            return
+        deadline = time.monotonic() + wait
+        delay = 0.005
+        try:
+            while not waiter.granted:
+                if time.monotonic() >= deadline:
+                    with self.condition:
+                        if not waiter.granted:
+                            self._give_up(waiter, wait)
+                    break
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 0.05)
+        except asyncio.CancelledError:
+            with self.condition:
+                if waiter.granted:
+                    self.in_flight = max(0, self.in_flight - 1)
+                    self._dispatch()
+                else:
+                    self.queue.remove(waiter)
+            raise
+
+    def release(self, url: str, latency: Optional[float], failed: bool = False) -> None:
+        """
+        Return a slot and adapt the limit to the request's outcome
+
+        Args:
+            url: URL that was fetched
+            latency: Request duration in seconds (None when it ended without an outcome)
+            failed: Whether the request failed (network error, timeout or 5xx)
+        """
+        window = self.window_for(self.endpoint_key(url))
+        congested = failed
+        if latency is not None and not failed:
+            if len(window) >= self.config['MIN_SAMPLES']:
+                congested = latency > window.percentile(50) * self.config['LATENCY_TOLERANCE']
+            window.add(latency)
+
+        with self.condition:
+            self.in_flight = max(0, self.in_flight - 1)
+            now = time.monotonic()
+            if congested:
+                # Decrease at most once per round trip so one burst of slow calls counts once
+                if now - self.last_decrease >= (latency or 0):
+                    self.limit = max(self.config['MIN_LIMIT'], self.limit * self.config['BACKOFF_RATIO'])
+                    self.last_decrease = now
+            elif latency is not None:
+                self.limit = min(self.config['MAX_LIMIT'], self.limit + 1 / self.limit)
+            self._dispatch()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the limiter state for status reporting"""
+        with self.condition:
+            windows = dict(self.windows)
+            snapshot = {
+                'limit': int(self.limit),
+                'in_flight': self.in_flight,
+                'queued': len(self.queue),
+                'rejected': self.rejected
+            }
+        snapshot['endpoints'] = {endpoint: window.summary() for endpoint, window in windows.items()}
+        return snapshot
+
+
+class AdaptiveLimiterRegistry:
+    """One adaptive limiter per upstream host, shared by the sync and async clients"""
+
+    def __init__(self, config: Dict[str, Any] = None):
+        self._config = config
+        self.limiters = {}
+        self.lock = threading.Lock()
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        return self._config if self._config is not None else get_setting('UPSTREAM_LIMITS', {})
+
+    def limiter_for(self, host: str) -> AdaptiveLimiter:
+        """Get (or create) the limiter for a host key such as http://perfweb..."""
+        with self.lock:
+            limiter = self.limiters.get(host)
+            if limiter is None:
+                limiter = AdaptiveLimiter(host, self.config)
+                self.limiters[host] = limiter
+            return limiter
+
+    def get_status(self) -> Dict[str, Dict[str, Any]]:
+        """Get the state of every known limiter"""
+        with self.lock:
+            limiters = dict(self.limiters)
+        return {host: limiter.snapshot() for host, limiter in limiters.items()}
+
+    def reset(self) -> None:
+        """Forget all limiters and latency history"""
+        with self.lock:
+            self.limiters.clear()
+
+
+upstream_limiters = AdaptiveLimiterRegistry()
@@ -2,9 +2,17 @@
 API service for external data fetching
 Handles communication with external NetApp performance systems
 """
+import asyncio
 import requests
 import re
-from typing import Dict, Any, Optional, List, Union, Type
+from typing import Dict, Any, Optional, List, Pattern, Union, Type
+from ..app_settings import get_setting
+from .http_client import upstream_http, async_upstream_http
+from .artifact_cache import ArtifactEntry, artifact_cache, MISSING
+from .concurrency import stats_fetch_executor
+from .data_source import results_source
+from .hedging import hedging
+from .stream_scan import ScanMatches, scan_lines, scan_lines_async, scan_text, find_all_lines, find_all_lines_async
 
 
 class ExternalAPIService:
@@ -15,6 +23,91 @@ class ExternalAPIService:
     
     DEFAULT_FIELDS = 'workload,peak_iter,ontap_ver,peak_ops,peak_lat,model'
     
+    RUN_DETAILS_BATCH_DEFAULTS = {
+        'ENABLED': False,    # Whether the Runs API accepts several IDs in one query
+        'MAX_IDS': 25,       # Run IDs per batched query
+        'ID_PARAM': 'id',    # Query parameter taking comma-separated run IDs
+        'ID_FIELD': 'id',    # Field identifying each record of a batched response
+    }
+    
+    # Upper bounds; upstream_http shortens them once endpoint latencies are known
+    RUN_DETAILS_TIMEOUT = 30
+    LINKS_TIMEOUT = 15
+    STATS_FILE_TIMEOUT = 10
+    
+    LINK_PATTERN = re.compile(
+        r'href="(testdirview.cgi\?p=/x/eng/perfcloud/RESULTS/[^"]+/ontap_command_output/\d+_[^"]+)"'
+    )
+    
+    STREAM_CHUNK_SIZE = 8192
+    
+    @classmethod
+    def streaming_enabled(cls) -> bool:
+        """Whether listings and stats files are scanned while streaming (STREAMING_FETCH setting)"""
+        return get_setting('STREAMING_FETCH', {}).get('ENABLED', False)
+    
+    @classmethod
+    def _response_lines(cls, response):
+        """Iterate a streamed requests response line by line"""
+        chunk_size = get_setting('STREAMING_FETCH', {}).get('CHUNK_SIZE', cls.STREAM_CHUNK_SIZE)
+        return response.iter_lines(chunk_size=chunk_size, decode_unicode=True)
+    
+    @classmethod
+    def runs_api_base(cls) -> str:
+        """Runs API base URL; UPSTREAM_BASE_URLS['RUNS_API'] overrides it (e.g. for the stand-in server)"""
+        return get_setting('UPSTREAM_BASE_URLS', {}).get('RUNS_API') or cls.BASE_API_URL
+    
+    @classmethod
+    def perfweb_base(cls) -> str:
+        """perfweb CGI base URL; UPSTREAM_BASE_URLS['PERFWEB'] overrides it"""
+        return get_setting('UPSTREAM_BASE_URLS', {}).get('PERFWEB') or cls.PERFWEB_BASE_URL
+    
+    @classmethod
+    def run_details_url(cls, run_id: str, fields: Optional[str] = None) -> str:
+        """Build the Runs API URL for a run ID"""
+        fields = fields or cls.DEFAULT_FIELDS
+        return f'{cls.runs_api_base()}/{run_id}?req_fields={fields}'
+    
+    @classmethod
+    def run_details_batch_config(cls) -> Dict[str, Any]:
+        """Batched Runs API query settings (RUN_DETAILS_BATCH setting)"""
+        return {**cls.RUN_DETAILS_BATCH_DEFAULTS, **get_setting('RUN_DETAILS_BATCH', {})}
+    
+    @classmethod
+    def run_details_batch_url(cls, run_ids: List[str], fields: str, config: Dict[str, Any]) -> str:
+        """Build a Runs API query for several run IDs, asking for the ID field as well"""
+        return f"{cls.runs_api_base()}?{config['ID_PARAM']}={','.join(run_ids)}&req_fields={fields},{config['ID_FIELD']}"
+    
+    @classmethod
+    def perfweb_links_url(cls, run_id: str) -> str:
+        """Build the testdirview URL listing a run's iteration directories"""
+        year_month = run_id[:4]
+        return f'{cls.perfweb_base()}/testdirview.cgi?p=/x/eng/perfcloud/RESULTS/{year_month}/{run_id}/ontap_command_output'
+    
+    @classmethod
+    def stats_file_url(cls, year_month: str, run_id: str, link: str, stats_type: str) -> str:
+        """Build the view.cgi URL of a stats file inside an iteration directory"""
+        return f'{cls.perfweb_base()}/view.cgi?p=/x/eng/perfcloud/RESULTS/{year_month}/{run_id}/ontap_command_output/{link.split("/")[-1]}/{stats_type}'
+    
+    @classmethod
+    def parse_run_details(cls, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return run details, or None when the API reports an invalid ID"""
+        # Check if workload is 0 (indicates invalid ID)
+        if data.get('workload') == 0:
+            return None
+        return data
+    
+    @classmethod
+    def parse_run_details_batch(cls, data: Any, config: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Index the records of a batched Runs API response by run ID"""
+        records = data.get('results', []) if isinstance(data, dict) else data
+        return {str(record.get(config['ID_FIELD'])): record for record in records}
+    
+    @classmethod
+    def parse_perfweb_links(cls, text: str) -> List[str]:
+        """Extract iteration directory links from a testdirview listing"""
+        return cls.LINK_PATTERN.findall(text)
+    
     @classmethod
     def fetch_run_details(cls, run_id: str, fields: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
@@ -27,27 +120,122 @@ class ExternalAPIService:
         Returns:
             Dictionary containing run data or None if not found
         """
-        fields = fields or cls.DEFAULT_FIELDS
-        api_url = f'{cls.BASE_API_URL}/{run_id}?req_fields={fields}'
+        cache_key = artifact_cache.details_key(run_id, fields or cls.DEFAULT_FIELDS)
+        cached = artifact_cache.get(cache_key)
+        if cached is not None:
+            return cls._cached_run_details(cached)
+        
+        api_url = cls.run_details_url(run_id, fields)
         
         try:
-            response = requests.get(api_url, timeout=30)
+            response = upstream_http.get(api_url, timeout=cls.RUN_DETAILS_TIMEOUT)
             response.raise_for_status()
-            data = response.json()
-            
-            # Check if workload is 0 (indicates invalid ID)
-            if data.get('workload') == 0:
-                return None
-                
-            return data
+            return cls._store_run_details(cache_key, cls.parse_run_details(response.json()))
             
         except requests.exceptions.RequestException as e:
             raise Exception(f"Network error fetching data for {run_id}: {str(e)}")
     
+    @classmethod
+    def fetch_run_details_many(cls, run_ids: List[str], fields: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Fetch basic run details for several runs
+        
+        Duplicate IDs are fetched once and cached details are served without an
+        upstream call. The rest are fetched with one query per MAX_IDS runs when
+        RUN_DETAILS_BATCH is enabled, otherwise concurrently one request per run.
+        
+        Args:
+            run_ids: The run IDs to fetch
+            fields: Comma-separated list of fields to fetch
+            
+        Returns:
+            Dictionary mapping each run ID to its details, None if not found, or
+            the Exception raised while fetching it
+        """
+        fields = fields or cls.DEFAULT_FIELDS
+        results, pending = cls._split_cached_details(run_ids, fields)
+        if not pending:
+            return results
+        
+        config = cls.run_details_batch_config()
+        if config['ENABLED'] and len(pending) > 1:
+            size = max(1, config['MAX_IDS'])
+            chunks = [pending[i:i + size] for i in range(0, len(pending), size)]
+            for batch in stats_fetch_executor.map_ordered(lambda chunk: cls._fetch_run_details_batch(chunk, fields, config), chunks):
+                results.update(batch)
+        else:
+            outcomes = stats_fetch_executor.map_ordered(lambda run_id: cls._run_details_outcome(run_id, fields), pending)
+            results.update(zip(pending, outcomes))
+        
+        return {run_id: results[run_id] for run_id in dict.fromkeys(run_ids)}
+    
+    @classmethod
+    def _split_cached_details(cls, run_ids: List[str], fields: str):
+        """Deduplicate run IDs into cached details and the IDs still to fetch"""
+        results = {}
+        pending = []
+        for run_id in dict.fromkeys(run_ids):
+            cached = artifact_cache.get(artifact_cache.details_key(run_id, fields))
+            if cached is not None:
+                results[run_id] = cls._cached_run_details(cached)
+            else:
+                pending.append(run_id)
+        return results, pending
+    
+    @classmethod
+    def _run_details_outcome(cls, run_id: str, fields: str) -> Any:
+        """Fetch one run's details, returning the exception instead of raising it"""
+        try:
+            return cls.fetch_run_details(run_id, fields)
+        except Exception as e:
+            return e
+    
+    @classmethod
+    def _fetch_run_details_batch(cls, run_ids: List[str], fields: str, config: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch several runs' details in one Runs API query; runs absent from the response are not found"""
+        api_url = cls.run_details_batch_url(run_ids, fields, config)
+        
+        try:
+            response = upstream_http.get(api_url, timeout=cls.RUN_DETAILS_TIMEOUT)
+            response.raise_for_status()
+            records = cls.parse_run_details_batch(response.json(), config)
+        except (requests.exceptions.RequestException, ValueError, AttributeError) as e:
+            return cls._batch_error(run_ids, e)
+        
+        return cls._store_run_details_batch(run_ids, fields, records)
+    
+    @classmethod
+    def _batch_error(cls, run_ids: List[str], error: Exception) -> Dict[str, Exception]:
+        """Report a failed batched query against every run it covered"""
+        error = Exception(f"Network error fetching data for {', '.join(run_ids)}: {str(error)}")
+        return {run_id: error for run_id in run_ids}
+    
+    @classmethod
+    def _store_run_details_batch(cls, run_ids: List[str], fields: str, records: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Parse and cache each run of a batched response"""
+        return {
+            run_id: cls._store_run_details(
+                artifact_cache.details_key(run_id, fields),
+                cls.parse_run_details(records.get(run_id, {'workload': 0}))
+            )
+            for run_id in run_ids
+        }
+    
+    @classmethod
+    def _cached_run_details(cls, cached: Any) -> Optional[Dict[str, Any]]:
+        """Copy cached details so callers cannot modify the cache (MISSING means not found)"""
+        return None if cached is MISSING else dict(cached)
+    
+    @classmethod
+    def _store_run_details(cls, cache_key, details: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Cache parsed run details, remembering invalid IDs as MISSING"""
+        artifact_cache.put(cache_key, MISSING if details is None else details)
+        return cls._cached_run_details(details) if details is not None else None
+    
     @classmethod
     def fetch_perfweb_links(cls, run_id: str) -> List[str]:
         """
-        Fetch perfweb links for a run ID
+        Fetch perfweb links for a run ID from the configured data source (RESULTS_SOURCE)
         
         Args:
             run_id: The run ID to fetch links for
@@ -55,22 +243,34 @@ class ExternalAPIService:
         Returns:
             List of perfweb links
         """
-        year_month = run_id[:4]
-        base_url = f'{cls.PERFWEB_BASE_URL}/testdirview.cgi?p=/x/eng/perfcloud/RESULTS/{year_month}/{run_id}/ontap_command_output'
+        return results_source().list_iterations(run_id)
+    
+    @classmethod
+    def _fetch_perfweb_links_http(cls, run_id: str) -> List[str]:
+        """Fetch a run's iteration listing from perfweb's testdirview CGI"""
+        cache_key = artifact_cache.listing_key(run_id)
+        cached_links = artifact_cache.get(cache_key)
+        if cached_links is not None:
+            return list(cached_links)
+        
+        base_url = cls.perfweb_links_url(run_id)
         
         try:
-            response = requests.get(base_url, timeout=15)
+            if cls.streaming_enabled():
+                return cls._stream_links(cache_key, base_url)
+            
+            response, refreshed = cls._conditional_get(
+                base_url, cls.LINKS_TIMEOUT, cache_key, cls._revalidatable(cache_key, list)
+            )
+            if refreshed is not None:
+                return list(refreshed.value)
             if response.ok:
-                text = response.text
-                links = re.findall(
-                    r'href="(testdirview.cgi\?p=/x/eng/perfcloud/RESULTS/[^"]+/ontap_command_output/\d+_[^"]+)"', 
-                    text
-                )
-                return links
-            return []
+                return cls._store_links(cache_key, cls.parse_perfweb_links(response.text), cls._validators(response))
+            return cls._stale_links(cache_key)
             
         except requests.exceptions.RequestException:
-            return []
+            # Includes CircuitOpenError: serve the last known listing while perfweb is degraded
+            return cls._stale_links(cache_key)
     
     @classmethod
     def fetch_stats_file(cls, year_month: str, run_id: str, link: str, stats_type: str) -> Optional[str]:
@@ -86,16 +286,498 @@ class ExternalAPIService:
         Returns:
             File content as string or None if not available
         """
-        stats_url = f'{cls.PERFWEB_BASE_URL}/view.cgi?p=/x/eng/perfcloud/RESULTS/{year_month}/{run_id}/ontap_command_output/{link.split("/")[-1]}/{stats_type}'
+        return results_source().read_stats_file(year_month, run_id, link, stats_type)
+    
+    @classmethod
+    def _fetch_stats_file_http(cls, year_month: str, run_id: str, link: str, stats_type: str) -> Optional[str]:
+        """Fetch a stats file through perfweb's view.cgi"""
+        cache_key = artifact_cache.file_key(run_id, link, stats_type)
+        cached_text = artifact_cache.get(cache_key)
+        # Scan matches (dict) cannot stand in for the full body
+        if cached_text is not None and not isinstance(cached_text, dict):
+            return None if cached_text is MISSING else cached_text
+        
+        stats_url = cls.stats_file_url(year_month, run_id, link, stats_type)
         
         try:
-            response = requests.get(stats_url, timeout=10)
-            if response.ok:
-                return response.text
+            # Hedged: a slow GET is duplicated after the endpoint's p95 (UPSTREAM_HEDGING)
+            revalidatable = cls._revalidatable(cache_key, str)
+            response, refreshed = hedging.call(
+                stats_url,
+                lambda: cls._conditional_get(stats_url, cls.STATS_FILE_TIMEOUT, cache_key, revalidatable)
+            )
+            if refreshed is not None:
+                return refreshed.value
+            return cls._store_stats_file(
+                cache_key, response.status_code, response.text if response.ok else None, cls._validators(response)
+            )
+            
+        except requests.exceptions.RequestException:
+            return cls._stale_stats_file(cache_key)
+    
+    @classmethod
+    def scan_stats_file(
+        cls,
+        year_month: str,
+        run_id: str,
+        link: str,
+        stats_type: str,
+        patterns: Dict[str, Pattern]
+    ) -> Optional[ScanMatches]:
+        """
+        Scan a stats file and return the first match of each pattern
+        
+        Over HTTP, reading stops and the connection is closed as soon as every
+        pattern has matched. Only the matches are cached (keyed by regex), so
+        a later scan for other patterns streams the file again for just those.
+        The filesystem source searches a memory map of the file instead.
+        
+        Args:
+            year_month: Year-month prefix
+            run_id: Run ID
+            link: Link path
+            stats_type: Type of stats file
+            patterns: Compiled single-group, single-line patterns by metric name
+            
+        Returns:
+            First captured group per metric name (None when absent), or None if the file is not available
+        """
+        return results_source().scan_stats_file(year_month, run_id, link, stats_type, patterns)
+    
+    @classmethod
+    def _scan_stats_file_http(
+        cls,
+        year_month: str,
+        run_id: str,
+        link: str,
+        stats_type: str,
+        patterns: Dict[str, Pattern]
+    ) -> Optional[ScanMatches]:
+        """Stream a stats file from perfweb's view.cgi, stopping once every pattern matched"""
+        cache_key = artifact_cache.file_key(run_id, link, stats_type)
+        cached = artifact_cache.get(cache_key)
+        if cached is MISSING:
             return None
+        known = cls._known_matches(cached, patterns)
+        wanted = {name: pattern for name, pattern in patterns.items() if pattern.pattern not in known}
+        if not wanted:
+            return cls._select_matches(known, patterns)
+        
+        stats_url = cls.stats_file_url(year_month, run_id, link, stats_type)
+        
+        revalidatable = cls._revalidatable_scan(cache_key, cached, patterns)
+        
+        def attempt():
+            response, refreshed = cls._conditional_get(
+                stats_url, cls.STATS_FILE_TIMEOUT, cache_key, revalidatable, stream=True
+            )
+            if refreshed is not None:
+                return response, refreshed, None
+            try:
+                found = scan_lines(cls._response_lines(response), wanted) if response.ok else None
+            finally:
+                response.close()
+            return response, None, found
+        
+        try:
+            response, refreshed, found = hedging.call(stats_url, attempt)
+            if refreshed is not None:
+                return cls._select_matches(cls._known_matches(refreshed.value, patterns), patterns)
+            return cls._store_scan(
+                cache_key, response.status_code, known, wanted, found, patterns, cls._validators(response)
+            )
             
         except requests.exceptions.RequestException:
+            return cls._stale_matches(cache_key, patterns)
+    
+    @classmethod
+    def _stream_links(cls, cache_key, base_url: str) -> List[str]:
+        """Fetch a listing, matching links line by line instead of on the whole page"""
+        response, refreshed = cls._conditional_get(
+            base_url, cls.LINKS_TIMEOUT, cache_key, cls._revalidatable(cache_key, list), stream=True
+        )
+        if refreshed is not None:
+            return list(refreshed.value)
+        try:
+            if not response.ok:
+                return cls._stale_links(cache_key)
+            links = find_all_lines(cls._response_lines(response), cls.LINK_PATTERN)
+            return cls._store_links(cache_key, links, cls._validators(response))
+        finally:
+            response.close()
+    
+    @classmethod
+    def _conditional_get(cls, url: str, timeout: float, cache_key, entry: Optional[ArtifactEntry], **kwargs):
+        """
+        GET that revalidates an expired cached artifact with its validators
+        
+        Args:
+            url: URL to fetch
+            timeout: Request timeout in seconds
+            cache_key: Artifact key of the entry
+            entry: Expired cache entry to revalidate, or None for a plain GET
+            
+        Returns:
+            (response, entry): entry is the refreshed cache entry on 304 Not Modified, else None
+        """
+        headers = cls._validator_headers(entry)
+        if not headers:
+            return upstream_http.get(url, timeout=timeout, **kwargs), None
+        
+        response = upstream_http.get(url, timeout=timeout, headers=headers, **kwargs)
+        if response.status_code != 304:
+            return response, None
+        response.close()
+        
+        refreshed = artifact_cache.revalidate(cache_key)
+        if refreshed is None:
+            # Evicted while revalidating: fetch the full artifact
+            return upstream_http.get(url, timeout=timeout, **kwargs), None
+        return response, refreshed
+    
+    @classmethod
+    def _revalidatable(cls, cache_key, value_type: type) -> Optional[ArtifactEntry]:
+        """The cached entry for a key if it holds a value of the given type (fresh entries were already served)"""
+        entry = artifact_cache.peek(cache_key)
+        return entry if entry is not None and isinstance(entry.value, value_type) else None
+    
+    @classmethod
+    def _revalidatable_scan(cls, cache_key, cached: Any, patterns: Dict[str, Pattern]) -> Optional[ArtifactEntry]:
+        """An expired body or scan entry that covers every requested pattern"""
+        if cached is not None:
+            return None
+        entry = artifact_cache.peek(cache_key)
+        if entry is None or not isinstance(entry.value, (str, dict)):
             return None
+        known = cls._known_matches(entry.value, patterns)
+        return entry if all(pattern.pattern in known for pattern in patterns.values()) else None
+    
+    @staticmethod
+    def _validator_headers(entry: Optional[ArtifactEntry]) -> Dict[str, str]:
+        """Conditional request headers for a cached entry's validators"""
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        return headers
+    
+    @staticmethod
+    def _validators(response) -> Dict[str, Optional[str]]:
+        """ETag and Last-Modified of a response, for storing with the artifact"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        return {
+            'etag': etag if isinstance(etag, str) else None,
+            'last_modified': last_modified if isinstance(last_modified, str) else None
+        }
+    
+    @classmethod
+    def _store_links(cls, cache_key, links: List[str], validators: Optional[Dict[str, Optional[str]]] = None) -> List[str]:
+        """Cache a non-empty iteration listing (with its validators) and return it"""
+        if links:
+            artifact_cache.put(cache_key, list(links), **(validators or {}))
+        return links
+    
+    @classmethod
+    def _store_stats_file(
+        cls,
+        cache_key,
+        status_code: int,
+        text: Optional[str],
+        validators: Optional[Dict[str, Optional[str]]] = None
+    ) -> Optional[str]:
+        """Cache a stats file body (or a 404) and return the body, or a stale copy on 5xx"""
+        if text is not None:
+            artifact_cache.put(cache_key, text, **(validators or {}))
+        elif status_code == 404:
+            artifact_cache.put(cache_key, MISSING)
+        elif status_code >= 500:
+            return cls._stale_stats_file(cache_key)
+        return text
+    
+    @classmethod
+    def _stale_links(cls, cache_key) -> List[str]:
+        """Return an expired cached listing when the upstream is unavailable"""
+        stale_links = artifact_cache.get(cache_key, allow_stale=True)
+        return list(stale_links) if stale_links is not None else []
+    
+    @classmethod
+    def _stale_stats_file(cls, cache_key) -> Optional[str]:
+        """Return an expired cached stats file when the upstream is unavailable"""
+        stale_text = artifact_cache.get(cache_key, allow_stale=True)
+        return stale_text if isinstance(stale_text, str) else None
+    
+    @classmethod
+    def _known_matches(cls, cached: Any, patterns: Dict[str, Pattern]) -> Dict[str, Optional[str]]:
+        """Matches already known for a file, keyed by regex source"""
+        if isinstance(cached, str):
+            matches = scan_text(cached, patterns)
+            return {patterns[name].pattern: value for name, value in matches.items()}
+        if isinstance(cached, dict):
+            return cached
+        return {}
+    
+    @classmethod
+    def _select_matches(cls, known: Dict[str, Optional[str]], patterns: Dict[str, Pattern]) -> ScanMatches:
+        """Map regex-keyed matches back to the caller's metric names"""
+        return {name: known.get(pattern.pattern) for name, pattern in patterns.items()}
+    
+    @classmethod
+    def _store_scan(
+        cls,
+        cache_key,
+        status_code: int,
+        known: Dict[str, Optional[str]],
+        wanted: Dict[str, Pattern],
+        found: Optional[ScanMatches],
+        patterns: Dict[str, Pattern],
+        validators: Optional[Dict[str, Optional[str]]] = None
+    ) -> Optional[ScanMatches]:
+        """Cache scan matches (or a 404) and return the requested matches, or stale ones on 5xx"""
+        if found is not None:
+            known = {**known, **{wanted[name].pattern: value for name, value in found.items()}}
+            artifact_cache.put(cache_key, known, **(validators or {}))
+            return cls._select_matches(known, patterns)
+        if status_code == 404:
+            artifact_cache.put(cache_key, MISSING)
+        elif status_code >= 500:
+            return cls._stale_matches(cache_key, patterns)
+        return None
+    
+    @classmethod
+    def _stale_matches(cls, cache_key, patterns: Dict[str, Pattern]) -> Optional[ScanMatches]:
+        """Return matches from an expired cached body or scan when the upstream is unavailable"""
+        stale = artifact_cache.get(cache_key, allow_stale=True)
+        if stale is None or stale is MISSING:
+            return None
+        return cls._select_matches(cls._known_matches(stale, patterns), patterns)
+
+
+class AsyncExternalAPIService:
+    """
+    Asyncio variant of ExternalAPIService for ASGI views
+    
+    Uses httpx when installed so hundreds of upstream fetches can be in flight
+    on one event loop; otherwise runs the sync service in worker threads.
+    """
+    
+    @classmethod
+    async def fetch_run_details(cls, run_id: str, fields: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Async version of ExternalAPIService.fetch_run_details"""
+        if not async_upstream_http.available:
+            return await asyncio.to_thread(ExternalAPIService.fetch_run_details, run_id, fields)
+        
+        cache_key = artifact_cache.details_key(run_id, fields or ExternalAPIService.DEFAULT_FIELDS)
+        cached = artifact_cache.get(cache_key)
+        if cached is not None:
+            return ExternalAPIService._cached_run_details(cached)
+        
+        api_url = ExternalAPIService.run_details_url(run_id, fields)
+        
+        try:
+            response = await async_upstream_http.get(api_url, timeout=ExternalAPIService.RUN_DETAILS_TIMEOUT)
+            response.raise_for_status()
+            return ExternalAPIService._store_run_details(cache_key, ExternalAPIService.parse_run_details(response.json()))
+            
+        except async_upstream_http.errors as e:
+            raise Exception(f"Network error fetching data for {run_id}: {str(e)}")
+    
+    @classmethod
+    async def fetch_run_details_many(cls, run_ids: List[str], fields: Optional[str] = None) -> Dict[str, Any]:
+        """Async version of ExternalAPIService.fetch_run_details_many"""
+        if not async_upstream_http.available:
+            return await asyncio.to_thread(ExternalAPIService.fetch_run_details_many, run_ids, fields)
+        
+        fields = fields or ExternalAPIService.DEFAULT_FIELDS
+        results, pending = ExternalAPIService._split_cached_details(run_ids, fields)
+        if not pending:
+            return results
+        
+        config = ExternalAPIService.run_details_batch_config()
+        if config['ENABLED'] and len(pending) > 1:
+            size = max(1, config['MAX_IDS'])
+            batches = await asyncio.gather(*(
+                cls._fetch_run_details_batch(pending[i:i + size], fields, config) for i in range(0, len(pending), size)
+            ))
+            for batch in batches:
+                results.update(batch)
+        else:
+            outcomes = await asyncio.gather(*(cls._run_details_outcome(run_id, fields) for run_id in pending))
+            results.update(zip(pending, outcomes))
+        
+        return {run_id: results[run_id] for run_id in dict.fromkeys(run_ids)}
+    
+    @classmethod
+    async def _run_details_outcome(cls, run_id: str, fields: str) -> Any:
+        """Fetch one run's details, returning the exception instead of raising it"""
+        try:
+            return await cls.fetch_run_details(run_id, fields)
+        except Exception as e:
+            return e
+    
+    @classmethod
+    async def _fetch_run_details_batch(cls, run_ids: List[str], fields: str, config: Dict[str, Any]) -> Dict[str, Any]:
+        """Async version of ExternalAPIService._fetch_run_details_batch"""
+        api_url = ExternalAPIService.run_details_batch_url(run_ids, fields, config)
+        
+        try:
+            response = await async_upstream_http.get(api_url, timeout=ExternalAPIService.RUN_DETAILS_TIMEOUT)
+            response.raise_for_status()
+            records = ExternalAPIService.parse_run_details_batch(response.json(), config)
+        except (*async_upstream_http.errors, ValueError, AttributeError) as e:
+            return ExternalAPIService._batch_error(run_ids, e)
+        
+        return ExternalAPIService._store_run_details_batch(run_ids, fields, records)
+    
+    @classmethod
+    async def fetch_perfweb_links(cls, run_id: str) -> List[str]:
+        """Async version of ExternalAPIService.fetch_perfweb_links"""
+        if not async_upstream_http.available or not results_source().remote:
+            return await asyncio.to_thread(ExternalAPIService.fetch_perfweb_links, run_id)
+        
+        cache_key = artifact_cache.listing_key(run_id)
+        cached_links = artifact_cache.get(cache_key)
+        if cached_links is not None:
+            return list(cached_links)
+        
+        base_url = ExternalAPIService.perfweb_links_url(run_id)
+        
+        try:
+            if ExternalAPIService.streaming_enabled():
+                return await cls._stream_links(cache_key, base_url)
+            
+            response, refreshed = await cls._conditional_get(
+                base_url, ExternalAPIService.LINKS_TIMEOUT, cache_key, ExternalAPIService._revalidatable(cache_key, list)
+            )
+            if refreshed is not None:
+                return list(refreshed.value)
+            if response.is_success:
+                return ExternalAPIService._store_links(
+                    cache_key, ExternalAPIService.parse_perfweb_links(response.text), ExternalAPIService._validators(response)
+                )
+            return ExternalAPIService._stale_links(cache_key)
+            
+        except async_upstream_http.errors:
+            return ExternalAPIService._stale_links(cache_key)
+    
+    @classmethod
+    async def fetch_stats_file(cls, year_month: str, run_id: str, link: str, stats_type: str) -> Optional[str]:
+        """Async version of ExternalAPIService.fetch_stats_file"""
+        if not async_upstream_http.available or not results_source().remote:
+            return await asyncio.to_thread(ExternalAPIService.fetch_stats_file, year_month, run_id, link, stats_type)
+        
+        cache_key = artifact_cache.file_key(run_id, link, stats_type)
+        cached_text = artifact_cache.get(cache_key)
+        if cached_text is not None and not isinstance(cached_text, dict):
+            return None if cached_text is MISSING else cached_text
+        
+        stats_url = ExternalAPIService.stats_file_url(year_month, run_id, link, stats_type)
+        
+        try:
+            revalidatable = ExternalAPIService._revalidatable(cache_key, str)
+            response, refreshed = await hedging.call_async(
+                stats_url,
+                lambda: cls._conditional_get(stats_url, ExternalAPIService.STATS_FILE_TIMEOUT, cache_key, revalidatable)
+            )
+            if refreshed is not None:
+                return refreshed.value
+            return ExternalAPIService._store_stats_file(
+                cache_key,
+                response.status_code,
+                response.text if response.is_success else None,
+                ExternalAPIService._validators(response)
+            )
+            
+        except async_upstream_http.errors:
+            return ExternalAPIService._stale_stats_file(cache_key)
+    
+    @classmethod
+    async def scan_stats_file(
+        cls,
+        year_month: str,
+        run_id: str,
+        link: str,
+        stats_type: str,
+        patterns: Dict[str, Pattern]
+    ) -> Optional[ScanMatches]:
+        """Async version of ExternalAPIService.scan_stats_file"""
+        if not async_upstream_http.available or not results_source().remote:
+            return await asyncio.to_thread(ExternalAPIService.scan_stats_file, year_month, run_id, link, stats_type, patterns)
+        
+        cache_key = artifact_cache.file_key(run_id, link, stats_type)
+        cached = artifact_cache.get(cache_key)
+        if cached is MISSING:
+            return None
+        known = ExternalAPIService._known_matches(cached, patterns)
+        wanted = {name: pattern for name, pattern in patterns.items() if pattern.pattern not in known}
+        if not wanted:
+            return ExternalAPIService._select_matches(known, patterns)
+        
+        stats_url = ExternalAPIService.stats_file_url(year_month, run_id, link, stats_type)
+        
+        revalidatable = ExternalAPIService._revalidatable_scan(cache_key, cached, patterns)
+        
+        async def attempt():
+            response, refreshed = await cls._conditional_get(
+                stats_url, ExternalAPIService.STATS_FILE_TIMEOUT, cache_key, revalidatable, stream=True
+            )
+            if refreshed is not None:
+                return response, refreshed, None
+            try:
+                found = await scan_lines_async(response.aiter_lines(), wanted) if response.is_success else None
+            finally:
+                await response.aclose()
+            return response, None, found
+        
+        try:
+            response, refreshed, found = await hedging.call_async(stats_url, attempt)
+            if refreshed is not None:
+                return ExternalAPIService._select_matches(ExternalAPIService._known_matches(refreshed.value, patterns), patterns)
+            return ExternalAPIService._store_scan(
+                cache_key, response.status_code, known, wanted, found, patterns, ExternalAPIService._validators(response)
+            )
+            
+        except async_upstream_http.errors:
+            return ExternalAPIService._stale_matches(cache_key, patterns)
+    
+    @classmethod
+    async def _stream_links(cls, cache_key, base_url: str) -> List[str]:
+        """Async version of ExternalAPIService._stream_links"""
+        response, refreshed = await cls._conditional_get(
+            base_url,
+            ExternalAPIService.LINKS_TIMEOUT,
+            cache_key,
+            ExternalAPIService._revalidatable(cache_key, list),
+            stream=True
+        )
+        if refreshed is not None:
+            return list(refreshed.value)
+        try:
+            if not response.is_success:
+                return ExternalAPIService._stale_links(cache_key)
+            links = await find_all_lines_async(response.aiter_lines(), ExternalAPIService.LINK_PATTERN)
+            return ExternalAPIService._store_links(cache_key, links, ExternalAPIService._validators(response))
+        finally:
+            await response.aclose()
+    
+    @classmethod
+    async def _conditional_get(cls, url: str, timeout: float, cache_key, entry: Optional[ArtifactEntry], **kwargs):
+        """Async version of ExternalAPIService._conditional_get"""
+        headers = ExternalAPIService._validator_headers(entry)
+        if not headers:
+            return await async_upstream_http.get(url, timeout=timeout, **kwargs), None
+        
+        response = await async_upstream_http.get(url, timeout=timeout, headers=headers, **kwargs)
+        if response.status_code != 304:
+            return response, None
+        await response.aclose()
+        
+        refreshed = artifact_cache.revalidate(cache_key)
+        if refreshed is None:
+            return await async_upstream_http.get(url, timeout=timeout, **kwargs), None
+        return response, refreshed
 
 
 class DataTransformService:
@@ -0,0 +1,229 @@
+"""
+Raw artifact cache for upstream perfweb data
+Stores run details, iteration listings and stats file bodies by (run_id, iteration, filename)
+with its own byte budget and TTL, beneath ExternalAPIService
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from ..app_settings import get_setting
+from ..cache_introspection import deep_sizeof
+
+ArtifactKey = Tuple[str, Optional[str], str]
+
+# Stored for files the upstream reported as missing (HTTP 404)
+MISSING = object()
+
+
+class ArtifactEntry:
+    """
+    One cached artifact with its size, freshness and upstream validators
+
+    Files stored while their iteration was the newest of the run's cached
+    listing are provisional: the run may still be writing them, so they
+    stop being served once a later iteration is listed.
+    """
+
+    __slots__ = ('value', 'size', 'stored_at', 'expires_at', 'etag', 'last_modified', 'provisional')
+
+    def __init__(self, value: Any, size: int, ttl: float, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        self.value = value
+        self.size = size
+        self.stored_at = time.time()
+        self.expires_at = self.stored_at + ttl
+        self.etag = etag
+        self.last_modified = last_modified
+        self.provisional = False
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+
+class ArtifactCache:
+    """Thread-safe LRU cache of raw artifacts bounded by total bytes"""
+
+    DEFAULT_CONFIG = {
+        'MAX_BYTES': 64 * 1024 * 1024,   # Byte budget for all cached artifacts
+        'TTL_SECONDS': 600,              # Freshness of stats file bodies
+        'LISTING_TTL_SECONDS': 60,       # Freshness of iteration listings (runs may still be adding iterations)
+        'DETAILS_TTL_SECONDS': 60,       # Freshness of Runs API details (peak values move while a run is active)
+        'MISSING_TTL_SECONDS': 60,       # Freshness of 404s (files of a running iteration appear later)
+    }
+
+    LISTING = '__listing__'
+    DETAILS = '__details__:'
+
+    def __init__(self, config: Dict[str, Any] = None):
+        self._config = config
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.revalidations = 0
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Effective configuration, read lazily so Django settings can apply"""
+        overrides = self._config if self._config is not None else get_setting('ARTIFACT_CACHE', {})
+        return {**self.DEFAULT_CONFIG, **overrides}
+
+    @classmethod
+    def listing_key(cls, run_id: str) -> ArtifactKey:
+        """Key for a run's iteration listing"""
+        return (run_id, None, cls.LISTING)
+
+    @classmethod
+    def details_key(cls, run_id: str, fields: str) -> ArtifactKey:
+        """Key for a run's Runs API details with the requested fields"""
+        return (run_id, None, cls.DETAILS + fields)
+
+    @staticmethod
+    def file_key(run_id: str, link: str, filename: str) -> ArtifactKey:
+        """Key for a stats file inside an iteration directory"""
+        return (run_id, link.split('/')[-1], filename)
+
+    def get_entry(self, key: ArtifactKey, allow_stale: bool = False) -> Optional[ArtifactEntry]:
+        """
+        Look up an artifact entry and mark it recently used
+
+        Args:
+            key: Artifact key
+            allow_stale: Return expired entries instead of treating them as misses
+
+        Returns:
+            The entry, or None on a miss
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or not (allow_stale or entry.is_fresh) or self._superseded(key, entry):
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def peek(self, key: ArtifactKey) -> Optional[ArtifactEntry]:
+        """Look up an entry, fresh or not, without counting a hit or touching LRU order"""
+        with self.lock:
+            return self.entries.get(key)
+
+    def get(self, key: ArtifactKey, allow_stale: bool = False) -> Optional[Any]:
+        """Return a cached artifact value (MISSING for known-absent files) or None"""
+        entry = self.get_entry(key, allow_stale)
+        return entry.value if entry is not None else None
+
+    def put(
+        self,
+        key: ArtifactKey,
+        value: Any,
+        ttl: Optional[float] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> ArtifactEntry:
+        """
+        Store an artifact, evicting least recently used entries over the byte budget
+
+        Args:
+            key: Artifact key
+            value: Run details (dict), listing (list of links), file body (str),
+                scan matches keyed by regex (dict) or MISSING
+            ttl: Freshness in seconds (defaults by artifact type; MISSING has its own)
+            etag: Upstream ETag for conditional revalidation
+            last_modified: Upstream Last-Modified for conditional revalidation
+
+        Returns:
+            The stored entry
+        """
+        if ttl is None:
+            ttl = self.config['MISSING_TTL_SECONDS'] if value is MISSING else self._default_ttl(key)
+        entry = ArtifactEntry(value, 0 if value is MISSING else deep_sizeof(value), ttl, etag, last_modified)
+        config = self.config
+
+        with self.lock:
+            entry.provisional = self._is_newest(key)
+            self._remove(key)
+            if entry.size > config['MAX_BYTES']:
+                return entry
+            self.entries[key] = entry
+            self.total_bytes += entry.size
+            while self.total_bytes > config['MAX_BYTES']:
+                oldest = next(iter(self.entries))
+                self._remove(oldest)
+                self.evictions += 1
+        return entry
+
+    def revalidate(self, key: ArtifactKey, ttl: Optional[float] = None) -> Optional[ArtifactEntry]:
+        """
+        Mark an entry fresh again after the upstream answered 304 Not Modified
+
+        Args:
+            key: Artifact key
+            ttl: New freshness in seconds (defaults by artifact type)
+
+        Returns:
+            The refreshed entry, or None if it was evicted meanwhile
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            entry.expires_at = time.time() + (self._default_ttl(key) if ttl is None else ttl)
+            entry.provisional = self._is_newest(key)
+            self.entries.move_to_end(key)
+            self.revalidations += 1
+            return entry
+
+    def _is_newest(self, key: ArtifactKey) -> bool:
+        """Whether a file key belongs to the newest iteration of its run's cached listing (or no listing is cached)"""
+        if key[1] is None:
+            return False
+        listing = self.entries.get(self.listing_key(key[0]))
+        if listing is None or not listing.value:
+            return True
+        return listing.value[-1].split('/')[-1] == key[1]
+
+    def _superseded(self, key: ArtifactKey, entry: ArtifactEntry) -> bool:
+        """Whether a provisional file's iteration is no longer the newest, so its body may be incomplete"""
+        return entry.provisional and not self._is_newest(key)
+
+    def _default_ttl(self, key: ArtifactKey) -> float:
+        config = self.config
+        if key[2] == self.LISTING:
+            return config['LISTING_TTL_SECONDS']
+        if key[2].startswith(self.DETAILS):
+            return config['DETAILS_TTL_SECONDS']
+        return config['TTL_SECONDS']
+
+    def _remove(self, key: ArtifactKey) -> None:
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry.size
+
+    def clear(self) -> None:
+        """Drop all artifacts and reset counters"""
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+            self.hits = self.misses = self.evictions = self.revalidations = 0
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get artifact cache status information"""
+        with self.lock:
+            return {
+                'entries': len(self.entries),
+                'bytes': self.total_bytes,
+                'max_bytes': self.config['MAX_BYTES'],
+                'runs': len({key[0] for key in self.entries}),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'revalidations': self.revalidations
+            }
+
+
+artifact_cache = ArtifactCache()
@@ -0,0 +1,186 @@
+"""
+Circuit breakers for upstream hosts
+Fails fast when grover or perfweb is erroring or too slow, then probes for recovery
+"""
+import threading
+import time
+from collections import deque
+from typing import Any, Dict
+
+import requests
+
+from ..app_settings import get_setting
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised instead of sending a request while a host's breaker is open"""
+
+
+class CircuitBreaker:
+    """
+    Failure-rate and slow-call-rate circuit breaker for one upstream host
+
+    closed    -> requests flow; outcomes of the last WINDOW_SIZE calls are tracked
+    open      -> requests fail fast until OPEN_SECONDS have passed
+    half_open -> up to HALF_OPEN_MAX_CALLS probes; enough successes close the
+                 breaker, any failure re-opens it
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    DEFAULT_CONFIG = {
+        'WINDOW_SIZE': 20,                # Recent calls used to compute rates
+        'MIN_CALLS': 10,                  # Calls required before the breaker can trip
+        'FAILURE_RATE_THRESHOLD': 0.5,    # Trip when this share of calls failed
+        'SLOW_CALL_SECONDS': 5.0,         # Calls slower than this count as slow
+        'SLOW_CALL_RATE_THRESHOLD': 0.8,  # Trip when this share of calls was slow
+        'OPEN_SECONDS': 30,               # Time to fail fast before probing
+        'HALF_OPEN_MAX_CALLS': 2,         # Concurrent probe requests while half open
+        'HALF_OPEN_SUCCESSES': 2,         # Probe successes needed to close again
+    }
+
+    def __init__(self, name: str, config: Dict[str, Any] = None):
+        self.name = name
+        self.config = {**self.DEFAULT_CONFIG, **(config or {})}
+        self.lock = threading.Lock()
+        self.state = self.CLOSED
+        self.calls = deque(maxlen=self.config['WINDOW_SIZE'])
+        self.opened_at = None
+        self.probes_in_flight = 0
+        self.probe_successes = 0
+        self.rejected = 0
+        self.last_failure = None
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a request may be sent now
+
+        Returns:
+            True if the request may proceed (callers must then record its outcome)
+        """
+        with self.lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.config['OPEN_SECONDS']:
+                    self.rejected += 1
+                    return False
+                self.state = self.HALF_OPEN
+                self.probes_in_flight = 0
+                self.probe_successes = 0
+
+            if self.state == self.HALF_OPEN:
+                if self.probes_in_flight >= self.config['HALF_OPEN_MAX_CALLS']:
+                    self.rejected += 1
+                    return False
+                self.probes_in_flight += 1
+
+            return True
+
+    def record_success(self, latency: float) -> None:
+        """Record a completed call; slow calls count against the slow-call rate"""
+        self._record(failed=False, latency=latency)
+
+    def record_failure(self, latency: float, reason: str = None) -> None:
+        """Record a failed call (network error, timeout or 5xx)"""
+        self._record(failed=True, latency=latency, reason=reason)
+
+    def release(self) -> None:
+        """Give back a probe slot for a call that ended without an outcome (e.g. cancelled)"""
+        with self.lock:
+            if self.state == self.HALF_OPEN:
+                self.probes_in_flight = max(0, self.probes_in_flight - 1)
+
+    def _record(self, failed: bool, latency: float, reason: str = None) -> None:
+        slow = latency >= self.config['SLOW_CALL_SECONDS']
+        with self.lock:
+            if failed:
+                self.last_failure = {'reason': reason, 'at': time.time()}
+
+            if self.state == self.HALF_OPEN:
+                self.probes_in_flight = max(0, self.probes_in_flight - 1)
+                if failed or slow:
+                    self._open()
+                else:
+                    self.probe_successes += 1
+                    if self.probe_successes >= self.config['HALF_OPEN_SUCCESSES']:
+                        self.state = self.CLOSED
+                        self.calls.clear()
+                return
+
+            if self.state == self.OPEN:
+                return
+
+            self.calls.append((failed, slow))
+            if len(self.calls) < self.config['MIN_CALLS']:
+                return
+            failure_rate, slow_rate = self._rates()
+            if failure_rate >= self.config['FAILURE_RATE_THRESHOLD'] or slow_rate >= self.config['SLOW_CALL_RATE_THRESHOLD']:
+                self._open()
+
+    def _rates(self):
+        total = len(self.calls)
+        if not total:
+            return 0.0, 0.0
+        failures = sum(1 for failed, _ in self.calls if failed)
+        slow = sum(1 for _, slow in self.calls if slow)
+        return failures / total, slow / total
+
+    def _open(self) -> None:
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self.probes_in_flight = 0
+        self.probe_successes = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the breaker state for status reporting"""
+        with self.lock:
+            failure_rate, slow_rate = self._rates()
+            snapshot = {
+                'state': self.state,
+                'window_calls': len(self.calls),
+                'failure_rate': round(failure_rate, 3),
+                'slow_call_rate': round(slow_rate, 3),
+                'rejected': self.rejected,
+                'last_failure': self.last_failure
+            }
+            if self.state == self.OPEN:
+                remaining = self.config['OPEN_SECONDS'] - (time.monotonic() - self.opened_at)
+                snapshot['retry_in_seconds'] = round(max(0.0, remaining), 1)
+            return snapshot
+
+
+class CircuitBreakerRegistry:
+    """One breaker per upstream host, shared by the sync and async clients"""
+
+    def __init__(self, config: Dict[str, Any] = None):
+        self._config = config
+        self.breakers = {}
+        self.lock = threading.Lock()
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        return self._config if self._config is not None else get_setting('CIRCUIT_BREAKER', {})
+
+    def breaker_for(self, host: str) -> CircuitBreaker:
+        """Get (or create) the breaker for a host key such as http://perfweb..."""
+        with self.lock:
+            breaker = self.breakers.get(host)
+            if breaker is None:
+                breaker = CircuitBreaker(host, self.config)
+                self.breakers[host] = breaker
+            return breaker
+
+    def get_status(self) -> Dict[str, Dict[str, Any]]:
+        """Get the state of every known breaker"""
+        with self.lock:
+            breakers = dict(self.breakers)
+        return {host: breaker.snapshot() for host, breaker in breakers.items()}
+
+    def reset(self) -> None:
+        """Forget all breakers (they are recreated closed on next use)"""
+        with self.lock:
+            self.breakers.clear()
+
+
+circuit_breakers = CircuitBreakerRegistry()
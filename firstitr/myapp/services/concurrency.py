@@ -0,0 +1,114 @@
+"""
+Bounded concurrency for upstream fetches
+Fans independent fetches out over a shared thread pool with per-call limits
+"""
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from ..app_settings import get_setting
+
+
+class BoundedFetchExecutor:
+    """
+    Process-wide thread pool with a per-call concurrency window
+
+    The pool size caps concurrent fetches across all requests in the process;
+    the `limit` passed to map_ordered caps how many one caller (e.g. one run)
+    may have in flight. Context variables are copied into every task, so
+    fetches keep their request's priority class and the upstream scheduler
+    orders them once they wait for a host's slots.
+    """
+
+    DEFAULT_CONFIG = {
+        'PER_PROCESS': 16,   # Worker threads shared by all requests
+        'PER_RUN': 6,        # Concurrent fetches for a single run
+    }
+
+    def __init__(self, name: str, setting_name: str, config: Dict[str, Any] = None):
+        self.name = name
+        self.setting_name = setting_name
+        self._config = config
+        self._executor = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Effective configuration, read lazily so Django settings can apply"""
+        overrides = self._config if self._config is not None else get_setting(self.setting_name, {})
+        return {**self.DEFAULT_CONFIG, **overrides}
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """The shared pool, created on first use"""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.config['PER_PROCESS'],
+                        thread_name_prefix=self.name,
+                        initializer=self._mark_worker
+                    )
+        return self._executor
+
+    def _mark_worker(self) -> None:
+        self._local.is_worker = True
+
+    def _in_worker(self) -> bool:
+        return getattr(self._local, 'is_worker', False)
+
+    def map_ordered(self, fn: Callable[[Any], Any], items: Iterable[Any], limit: Optional[int] = None) -> List[Any]:
+        """
+        Apply fn to every item concurrently and return results in input order
+
+        Args:
+            fn: Function called with one item
+            items: Items to process
+            limit: Maximum tasks in flight for this call (defaults to PER_RUN)
+
+        Returns:
+            List of results in the same order as items; the first exception
+            (in input order) is re-raised after all tasks finish
+        """
+        items = list(items)
+        limit = max(1, limit or self.config['PER_RUN'])
+
+        # Calls from inside our own workers run inline so nested fan-out cannot deadlock
+        if limit == 1 or len(items) <= 1 or self._in_worker():
+            return [fn(item) for item in items]
+
+        results = [None] * len(items)
+        errors = {}
+        pending = {}
+        next_index = 0
+
+        while next_index < len(items) or pending:
+            while next_index < len(items) and len(pending) < limit:
+                context = contextvars.copy_context()
+                future = self.executor.submit(context.run, fn, items[next_index])
+                pending[future] = next_index
+                next_index += 1
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    errors[index] = e
+
+        if errors:
+            raise errors[min(errors)]
+        return results
+
+    def shutdown(self) -> None:
+        """Stop the pool; a new one is created on next use"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+stats_fetch_executor = BoundedFetchExecutor('stats-fetch', 'STATS_FETCH_CONCURRENCY')
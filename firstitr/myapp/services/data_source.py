@@ -0,0 +1,197 @@
+"""
+Data sources for perfweb RESULTS artifacts
+Iteration listings and stats files come either from perfweb's CGI over HTTP or
+straight from an NFS mount of the RESULTS tree, chosen per deployment
+"""
+import importlib
+import mmap
+import os
+import re
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Pattern, Union
+
+from ..app_settings import get_setting
+from .stream_scan import ScanMatches
+
+
+class ResultsSource:
+    """
+    Interface of a RESULTS data source
+
+    Links have the same form as the testdirview listing
+    (`testdirview.cgi?p=/x/eng/perfcloud/RESULTS/<yymm>/<run_id>/ontap_command_output/<iteration>`)
+    whichever source produced them, so cached and new links are interchangeable.
+    """
+
+    # Remote sources go through the upstream HTTP client, local ones are read in worker threads
+    remote = False
+
+    def __init__(self, config: Dict[str, Any] = None):
+        self.config = config or {}
+
+    def list_iterations(self, run_id: str) -> List[str]:
+        """Iteration directory links of a run (empty when the run has none)"""
+        raise NotImplementedError
+
+    def read_stats_file(self, year_month: str, run_id: str, link: str, stats_type: str) -> Optional[str]:
+        """Full content of a stats file, or None if it does not exist"""
+        raise NotImplementedError
+
+    def scan_stats_file(
+        self,
+        year_month: str,
+        run_id: str,
+        link: str,
+        stats_type: str,
+        patterns: Dict[str, Pattern]
+    ) -> Optional[ScanMatches]:
+        """First captured group per pattern name, or None if the file does not exist"""
+        raise NotImplementedError
+
+
+class HTTPResultsSource(ResultsSource):
+    """perfweb CGI over HTTP, with artifact caching, hedging and revalidation"""
+
+    remote = True
+
+    def list_iterations(self, run_id: str) -> List[str]:
+        from .api_service import ExternalAPIService
+        return ExternalAPIService._fetch_perfweb_links_http(run_id)
+
+    def read_stats_file(self, year_month: str, run_id: str, link: str, stats_type: str) -> Optional[str]:
+        from .api_service import ExternalAPIService
+        return ExternalAPIService._fetch_stats_file_http(year_month, run_id, link, stats_type)
+
+    def scan_stats_file(self, year_month, run_id, link, stats_type, patterns):
+        from .api_service import ExternalAPIService
+        return ExternalAPIService._scan_stats_file_http(year_month, run_id, link, stats_type, patterns)
+
+
+@lru_cache(maxsize=256)
+def _bytes_pattern(source: str, flags: int) -> Pattern:
+    """Bytes version of a str pattern, so it can search a memory map directly"""
+    return re.compile(source.encode('utf-8'), flags & ~re.UNICODE)
+
+
+class LocalResultsSource(ResultsSource):
+    """
+    RESULTS tree on a local or NFS mount
+
+    Listings use os.scandir; stats files are memory-mapped and patterns are
+    searched in the mapping itself, so scans never copy or decode the file.
+    Nothing is cached here: the kernel page cache already holds hot files.
+    """
+
+    URL_ROOT = '/x/eng/perfcloud/RESULTS'
+    ITERATION_PATTERN = re.compile(r'\d+_')
+
+    @property
+    def root(self) -> str:
+        return self.config.get('ROOT', self.URL_ROOT)
+
+    @staticmethod
+    def _is_safe_component(part: str) -> bool:
+        """Reject empty names and anything that could leave the RESULTS tree"""
+        return bool(part) and part not in ('.', '..') and '/' not in part and '\\' not in part
+
+    def _output_dir(self, year_month: str, run_id: str) -> Optional[str]:
+        if not (self._is_safe_component(year_month) and self._is_safe_component(run_id)):
+            return None
+        return os.path.join(self.root, year_month, run_id, 'ontap_command_output')
+
+    def _stats_path(self, year_month: str, run_id: str, link: str, stats_type: str) -> Optional[str]:
+        output_dir = self._output_dir(year_month, run_id)
+        iteration = link.split('/')[-1]
+        if output_dir is None or not (self._is_safe_component(iteration) and self._is_safe_component(stats_type)):
+            return None
+        return os.path.join(output_dir, iteration, stats_type)
+
+    def list_iterations(self, run_id: str) -> List[str]:
+        year_month = run_id[:4]
+        output_dir = self._output_dir(year_month, run_id)
+        if output_dir is None:
+            return []
+        try:
+            with os.scandir(output_dir) as entries:
+                names = sorted(
+                    entry.name for entry in entries
+                    if self.ITERATION_PATTERN.match(entry.name) and entry.is_dir()
+                )
+        except (FileNotFoundError, NotADirectoryError):
+            return []
+        prefix = f'testdirview.cgi?p={self.URL_ROOT}/{year_month}/{run_id}/ontap_command_output'
+        return [f'{prefix}/{name}' for name in names]
+
+    @contextmanager
+    def _mapped(self, path: Optional[str]) -> Iterator[Optional[Union[mmap.mmap, bytes]]]:
+        """Map a file read-only; yields None when missing and b'' when empty (empty files cannot be mapped)"""
+        try:
+            file = open(path, 'rb') if path is not None else None
+        except (FileNotFoundError, NotADirectoryError, IsADirectoryError):
+            file = None
+        if file is None:
+            yield None
+            return
+        with file:
+            if os.fstat(file.fileno()).st_size == 0:
+                yield b''
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield mapped
+
+    def read_stats_file(self, year_month: str, run_id: str, link: str, stats_type: str) -> Optional[str]:
+        with self._mapped(self._stats_path(year_month, run_id, link, stats_type)) as data:
+            if data is None:
+                return None
+            return data[:].decode('utf-8', errors='replace')
+
+    def scan_stats_file(self, year_month, run_id, link, stats_type, patterns):
+        with self._mapped(self._stats_path(year_month, run_id, link, stats_type)) as data:
+            if data is None:
+                return None
+            results = {}
+            for name, pattern in patterns.items():
+                match = _bytes_pattern(pattern.pattern, pattern.flags).search(data)
+                results[name] = match.group(1).decode('utf-8', errors='replace') if match else None
+            return results
+
+
+SOURCE_BACKENDS = {
+    'http': HTTPResultsSource,
+    'filesystem': LocalResultsSource,
+}
+
+DEFAULT_CONFIG = {
+    'BACKEND': 'http',                      # 'http', 'filesystem' or a dotted path to a ResultsSource subclass
+    'ROOT': '/x/eng/perfcloud/RESULTS',     # Mount point of the RESULTS tree for the filesystem backend
+}
+
+_sources = {}
+_sources_lock = threading.Lock()
+
+
+def _import_backend(path: str) -> type:
+    module_name, _, class_name = path.rpartition('.')
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def results_source() -> ResultsSource:
+    """
+    The data source configured by the RESULTS_SOURCE setting
+
+    Returns:
+        A shared source instance per (backend, root) configuration
+    """
+    config = {**DEFAULT_CONFIG, **get_setting('RESULTS_SOURCE', {})}
+    key = (config['BACKEND'], config['ROOT'])
+    source = _sources.get(key)
+    if source is None:
+        with _sources_lock:
+            source = _sources.get(key)
+            if source is None:
+                backend = SOURCE_BACKENDS.get(config['BACKEND']) or _import_backend(config['BACKEND'])
+                source = backend(config)
+                _sources[key] = source
+    return source
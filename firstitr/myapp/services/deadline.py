@@ -0,0 +1,144 @@
+"""
+Per-request deadlines
+A request's time budget travels in a context variable from the view down to
+every upstream call, which clamps its timeout to whatever is left
+"""
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+import requests
+
+from ..app_settings import get_setting
+
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    """Raised when an upstream call is refused or cut short by the request deadline"""
+
+
+class Deadline:
+    """
+    Absolute expiry time for one request (or one part of it)
+
+    Child deadlines share their parent's expiry but record on their own
+    whether the budget cut anything short, so e.g. each run of a multi-run
+    request can tell whether its own data is complete.
+    """
+
+    def __init__(self, seconds: float, parent: Optional['Deadline'] = None):
+        self.seconds = seconds
+        self.expires_at = parent.expires_at if parent is not None else time.monotonic() + seconds
+        self.parent = parent
+        self.exceeded = False
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline (never negative)"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def child(self) -> 'Deadline':
+        return Deadline(self.seconds, parent=self)
+
+    def exceeded_error(self) -> DeadlineExceeded:
+        """Record that the budget cut a call short and build the error to raise"""
+        deadline = self
+        while deadline is not None:
+            deadline.exceeded = True
+            deadline = deadline.parent
+        return DeadlineExceeded(f'Request deadline of {self.seconds:.1f}s exceeded')
+
+    def clamp(self, timeout: float) -> float:
+        """
+        Limit a timeout to the remaining budget
+
+        Args:
+            timeout: Timeout the call would otherwise use
+
+        Returns:
+            The smaller of timeout and the remaining budget (raises
+            DeadlineExceeded when nothing is left)
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise self.exceeded_error()
+        return min(timeout, remaining)
+
+
+_current_deadline = contextvars.ContextVar('request_deadline', default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """The deadline of the request being served, or None outside a deadline scope"""
+    return _current_deadline.get()
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[Optional[Deadline]]:
+    """
+    Run a block under a deadline
+
+    Args:
+        seconds: Time budget for the block, or None for no deadline
+
+    Yields:
+        The new Deadline (None when seconds is None)
+    """
+    if seconds is None:
+        yield None
+        return
+    deadline = Deadline(seconds)
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+@contextmanager
+def child_scope() -> Iterator[Optional[Deadline]]:
+    """Track deadline hits of one part of the current request separately"""
+    parent = current_deadline()
+    if parent is None:
+        yield None
+        return
+    deadline = parent.child()
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+DEFAULT_CONFIG = {
+    'DEFAULT_SECONDS': 25,    # Budget when the request does not ask for one (None: no deadline)
+    'MAX_SECONDS': 120,       # Upper bound for a requested ?deadline=
+}
+
+
+def deadline_config() -> Dict[str, Any]:
+    """Effective REQUEST_DEADLINE configuration"""
+    return {**DEFAULT_CONFIG, **get_setting('REQUEST_DEADLINE', {})}
+
+
+def request_seconds(requested: Optional[str]) -> Optional[float]:
+    """
+    Resolve the budget for a request from its ?deadline= parameter
+
+    Args:
+        requested: Raw parameter value in seconds, or None
+
+    Returns:
+        The budget in seconds, capped at MAX_SECONDS (raises ValueError for a
+        non-numeric or non-positive value)
+    """
+    config = deadline_config()
+    if requested is None or requested == '':
+        return config['DEFAULT_SECONDS']
+    seconds = float(requested)
+    if not seconds > 0:
+        raise ValueError('deadline must be a positive number of seconds')
+    return min(seconds, config['MAX_SECONDS'])
@@ -0,0 +1,178 @@
+"""
+Hedged upstream requests
+Sends a duplicate of a slow request once it has outlived the endpoint's
+observed p95 and takes whichever copy answers first, within a hedge budget
+"""
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from ..app_settings import get_setting
+from .adaptive_limiter import AdaptiveLimiter, upstream_limiters
+from .http_client import UpstreamHTTPClient
+
+
+class HedgingPolicy:
+    """
+    Decides when to hedge and runs hedged calls
+
+    Every primary request earns MAX_HEDGE_RATIO budget tokens (up to
+    MAX_BURST) and every hedge spends one, so hedges add at most about
+    MAX_HEDGE_RATIO to upstream load. The hedge delay is the endpoint's
+    PERCENTILE latency from the per-host latency windows.
+    """
+
+    DEFAULT_CONFIG = {
+        'ENABLED': False,         # Hedging is opt-in
+        'PERCENTILE': 95,         # Hedge requests slower than this endpoint percentile
+        'MIN_DELAY': 0.02,        # Never hedge sooner than this many seconds
+        'MAX_HEDGE_RATIO': 0.05,  # Budget earned per primary request
+        'MAX_BURST': 5,           # Budget tokens that can be saved up
+        'MAX_WORKERS': 32,        # Threads running hedged sync requests
+    }
+
+    def __init__(self, config: Dict[str, Any] = None, limiters=None):
+        self._config = config
+        self.limiters = limiters or upstream_limiters
+        self.lock = threading.Lock()
+        self.tokens = 0.0
+        self.primaries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.budget_denied = 0
+        self._executor = None
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Effective configuration, read lazily so Django settings can apply"""
+        overrides = self._config if self._config is not None else get_setting('UPSTREAM_HEDGING', {})
+        return {**self.DEFAULT_CONFIG, **overrides}
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self.lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.config['MAX_WORKERS'], thread_name_prefix='upstream-hedge'
+                    )
+        return self._executor
+
+    def hedge_delay(self, url: str) -> Optional[float]:
+        """
+        Seconds to wait before hedging a request to this URL
+
+        Returns:
+            The endpoint's PERCENTILE latency, or None when hedging is disabled
+            or too few latencies have been observed
+        """
+        config = self.config
+        if not config['ENABLED']:
+            return None
+        limiter = self.limiters.limiter_for(UpstreamHTTPClient.host_key(url))
+        window = limiter.window_for(AdaptiveLimiter.endpoint_key(url))
+        if len(window) < limiter.config['MIN_SAMPLES']:
+            return None
+        return max(config['MIN_DELAY'], window.percentile(config['PERCENTILE']))
+
+    def _earn(self) -> None:
+        config = self.config
+        with self.lock:
+            self.primaries += 1
+            self.tokens = min(config['MAX_BURST'], self.tokens + config['MAX_HEDGE_RATIO'])
+
+    def _spend(self) -> bool:
+        with self.lock:
+            if self.tokens < 1:
+                self.budget_denied += 1
+                return False
+            self.tokens -= 1
+            self.hedges += 1
+            return True
+
+    def _record_win(self) -> None:
+        with self.lock:
+            self.hedge_wins += 1
+
+    def call(self, url: str, attempt: Callable[[], Any]) -> Any:
+        """
+        Run attempt(), hedging it with a second attempt() if it is slow
+
+        Args:
+            url: URL the attempt fetches (selects the latency window)
+            attempt: Function performing one complete request
+
+        Returns:
+            The result of whichever attempt succeeds first; if both fail the
+            primary's exception is raised
+        """
+        delay = self.hedge_delay(url)
+        if delay is None:
+            return attempt()
+        self._earn()
+
+        primary = self.executor.submit(contextvars.copy_context().run, attempt)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._spend():
+            return primary.result()
+
+        hedge = self.executor.submit(contextvars.copy_context().run, attempt)
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        self._record_win()
+                    return future.result()
+        return primary.result()
+
+    async def call_async(self, url: str, attempt: Callable[[], Awaitable[Any]]) -> Any:
+        """Async version of call; the losing attempt is cancelled"""
+        delay = self.hedge_delay(url)
+        if delay is None:
+            return await attempt()
+        self._earn()
+
+        primary = asyncio.ensure_future(attempt())
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done or not self._spend():
+            return await primary
+
+        hedge = asyncio.ensure_future(attempt())
+        pending = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self._record_win()
+                        return task.result()
+            return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get hedging counters for status reporting"""
+        with self.lock:
+            return {
+                'enabled': self.config['ENABLED'],
+                'primaries': self.primaries,
+                'hedges': self.hedges,
+                'hedge_wins': self.hedge_wins,
+                'budget_denied': self.budget_denied,
+                'hedge_ratio': round(self.hedges / self.primaries, 4) if self.primaries else 0.0
+            }
+
+    def reset(self) -> None:
+        """Reset the budget and counters"""
+        with self.lock:
+            self.tokens = 0.0
+            self.primaries = self.hedges = self.hedge_wins = self.budget_denied = 0
+
+
+hedging = HedgingPolicy()
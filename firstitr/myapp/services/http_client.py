@@ -0,0 +1,388 @@
+"""
+HTTP client for upstream NetApp hosts
+Keeps one pooled keep-alive session per host with retry and exponential backoff
+"""
+import asyncio
+import random
+import threading
+import time
+import weakref
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from ..app_settings import get_setting
+from .adaptive_limiter import UpstreamBusyError, upstream_limiters
+from .circuit_breaker import CircuitOpenError, circuit_breakers
+from .deadline import DeadlineExceeded, current_deadline
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+    httpx = None
+
+
+class UpstreamHTTPClient:
+    """Pooled HTTP sessions keyed by upstream host (grover, perfweb)"""
+
+    DEFAULT_CONFIG = {
+        'POOL_CONNECTIONS': 4,       # Connection pools kept per session
+        'POOL_MAXSIZE': 16,          # Keep-alive connections kept per host
+        'RETRIES': 2,                # Retries for idempotent GETs
+        'BACKOFF_FACTOR': 0.3,       # Sleep backoff_factor * 2 ** (retry - 1) between retries
+        'BACKOFF_JITTER': 0.2,       # Random extra sleep added to each backoff
+        'BACKOFF_MAX': 5.0,          # Upper bound for a single backoff sleep
+        'RETRY_STATUSES': (429, 500, 502, 503, 504),
+        'ASYNC_MAX_CONNECTIONS': 100,  # In-flight requests per host on the async client
+    }
+
+    def __init__(self, config: Dict[str, Any] = None, breakers=None, limiters=None):
+        self._config = config
+        self.breakers = breakers or circuit_breakers
+        self.limiters = limiters or upstream_limiters
+        self.sessions = {}
+        self.deadline_sessions = {}
+        self.lock = threading.Lock()
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Effective configuration, read lazily so Django settings can apply"""
+        if self._config is None:
+            return {**self.DEFAULT_CONFIG, **get_setting('UPSTREAM_HTTP', {})}
+        return {**self.DEFAULT_CONFIG, **self._config}
+
+    @staticmethod
+    def host_key(url: str) -> str:
+        """Return the scheme://host[:port] part of a URL"""
+        parts = urlsplit(url)
+        return f'{parts.scheme}://{parts.netloc}'
+
+    def _build_retry(self, config: Dict[str, Any]) -> Retry:
+        """Build the retry policy for idempotent GETs"""
+        options = {
+            'total': config['RETRIES'],
+            'connect': config['RETRIES'],
+            'read': config['RETRIES'],
+            'status': config['RETRIES'],
+            'backoff_factor': config['BACKOFF_FACTOR'],
+            'status_forcelist': tuple(config['RETRY_STATUSES']),
+            'allowed_methods': frozenset(['GET', 'HEAD']),
+            'raise_on_status': False,
+            'respect_retry_after_header': True,
+        }
+        try:
+            return Retry(backoff_jitter=config['BACKOFF_JITTER'], backoff_max=config['BACKOFF_MAX'], **options)
+        except TypeError:
+            # urllib3 < 2 has no jitter or max backoff options
+            return Retry(**options)
+
+    def _build_session(self, retries: bool = True) -> requests.Session:
+        """Create a session with a sized connection pool and retry policy (or single attempts)"""
+        config = self.config
+        adapter = HTTPAdapter(
+            pool_connections=config['POOL_CONNECTIONS'],
+            pool_maxsize=config['POOL_MAXSIZE'],
+            max_retries=self._build_retry(config) if retries else 0
+        )
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def session_for(self, url: str, retries: bool = True) -> requests.Session:
+        """
+        Get the shared session for the host of a URL
+
+        Args:
+            url: Any URL on the upstream host
+            retries: Whether the session's adapter retries on its own (calls
+                under a deadline retry in get() instead, within the budget)
+
+        Returns:
+            The pooled session for that host
+        """
+        key = self.host_key(url)
+        sessions = self.sessions if retries else self.deadline_sessions
+        session = sessions.get(key)
+        if session is None:
+            with self.lock:
+                session = sessions.get(key)
+                if session is None:
+                    session = self._build_session(retries)
+                    sessions[key] = session
+        return session
+
+    def get(self, url: str, timeout: float, **kwargs) -> requests.Response:
+        """
+        Issue a GET on the pooled session for the URL's host
+
+        Network errors and 5xx responses count against the host's circuit
+        breaker; while it is open the request fails fast with CircuitOpenError.
+        The host's adaptive limiter bounds concurrent requests (waiting up to
+        `timeout` for a slot, which the request then only gets what is left of)
+        and may shorten the timeout to a multiple of the endpoint's observed
+        p99 latency. Under a request deadline both the
+        wait and each attempt's timeout are clamped to the remaining budget,
+        and retries are only made while their backoff fits in it; calls cut
+        short by it raise DeadlineExceeded and do not count against the host.
+
+        Args:
+            url: URL to fetch
+            timeout: Request timeout in seconds (upper bound)
+
+        Returns:
+            The response (raises requests exceptions on network failure)
+        """
+        host = self.host_key(url)
+        breaker = self.breakers.breaker_for(host)
+        limiter = self.limiters.limiter_for(host)
+        deadline = current_deadline()
+        if deadline is not None and deadline.expired:
+            raise deadline.exceeded_error()
+        if not breaker.allow_request():
+            raise CircuitOpenError(f'Circuit open for {host}')
+        queued_at = time.perf_counter()
+        try:
+            limiter.acquire(wait=deadline.clamp(timeout) if deadline is not None else timeout)
+        except UpstreamBusyError as e:
+            breaker.release()
+            if deadline is not None and deadline.expired:
+                raise deadline.exceeded_error() from e
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+
+        request_timeout = limiter.timeout_for(url, self.left_after_wait(breaker, limiter, url, timeout, queued_at))
+        start = time.perf_counter()
+        try:
+            if deadline is not None:
+                response = self._get_within(deadline, url, request_timeout, **kwargs)
+            else:
+                response = self.session_for(url).get(url, timeout=request_timeout, **kwargs)
+        except requests.exceptions.RequestException as e:
+            if deadline is not None and deadline.expired:
+                # Cut short by the request's own budget: no verdict on the host
+                breaker.release()
+                limiter.release(url, None)
+                raise deadline.exceeded_error() from e
+            self.record_outcome(breaker, limiter, url, time.perf_counter() - start, type(e).__name__)
+            raise
+        except BaseException:
+            breaker.release()
+            limiter.release(url, None)
+            raise
+        self.record_outcome(breaker, limiter, url, time.perf_counter() - start, self.failure_reason(response.status_code))
+        return response
+
+    def _get_within(self, deadline, url: str, timeout: float, **kwargs) -> requests.Response:
+        """
+        GET retrying transport errors and retryable statuses by hand, so the
+        attempts and backoff sleeps together never outlast the request deadline
+        (the adapter's own retries know nothing of it)
+        """
+        config = self.config
+        session = self.session_for(url, retries=False)
+        attempt = 0
+        while True:
+            delay = self.backoff_delay(attempt + 1)
+            attempt_timeout = deadline.clamp(timeout)
+            try:
+                response = session.get(url, timeout=attempt_timeout, **kwargs)
+                if response.status_code not in config['RETRY_STATUSES'] or not self._can_retry(attempt, delay, deadline):
+                    return response
+                response.close()
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if not self._can_retry(attempt, delay, deadline):
+                    raise
+            attempt += 1
+            time.sleep(delay)
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with jitter before retry number `attempt` (1-based)"""
+        config = self.config
+        delay = config['BACKOFF_FACTOR'] * (2 ** (attempt - 1))
+        delay += random.uniform(0, config['BACKOFF_JITTER'])
+        return min(delay, config['BACKOFF_MAX'])
+
+    def _can_retry(self, attempt: int, delay: float, deadline) -> bool:
+        """Retry while retries remain and the backoff still fits in the request deadline"""
+        if attempt >= self.config['RETRIES']:
+            return False
+        return deadline is None or delay < deadline.remaining()
+
+    @staticmethod
+    def left_after_wait(breaker, limiter, url: str, timeout: float, queued_at: float) -> float:
+        """
+        What is left of a call's timeout after waiting for its concurrency slot
+
+        Raises UpstreamBusyError (returning the slot) when the wait used it all,
+        so waiting and fetching together never take longer than `timeout`.
+        """
+        left = timeout - (time.perf_counter() - queued_at)
+        if left <= 0:
+            breaker.release()
+            limiter.release(url, None)
+            raise UpstreamBusyError(f'No time left for {url} after waiting {timeout:.1f}s for a slot')
+        return left
+
+    @staticmethod
+    def failure_reason(status_code: int) -> Optional[str]:
+        """Describe 5xx responses as failures; anything else is a success"""
+        return f'HTTP {status_code}' if status_code >= 500 else None
+
+    @staticmethod
+    def record_outcome(breaker, limiter, url: str, elapsed: float, failure: Optional[str]) -> None:
+        """Feed a finished request into the host's circuit breaker and limiter"""
+        if failure is None:
+            breaker.record_success(elapsed)
+        else:
+            breaker.record_failure(elapsed, failure)
+        limiter.release(url, elapsed, failed=failure is not None)
+
+    def close(self) -> None:
+        """Close all pooled sessions and their connections"""
+        with self.lock:
+            for session in [*self.sessions.values(), *self.deadline_sessions.values()]:
+                session.close()
+            self.sessions.clear()
+            self.deadline_sessions.clear()
+
+
+class AsyncUpstreamHTTPClient:
+    """
+    httpx-based async client used by the ASGI views
+    
+    Keeps one AsyncClient per (event loop, host) and applies the same retry
+    and backoff settings as UpstreamHTTPClient.
+    """
+
+    DEFAULT_CONFIG = UpstreamHTTPClient.DEFAULT_CONFIG
+
+    def __init__(self, config: Dict[str, Any] = None, breakers=None, limiters=None):
+        self._config = config
+        self.breakers = breakers or circuit_breakers
+        self.limiters = limiters or upstream_limiters
+        self.clients = weakref.WeakKeyDictionary()
+
+    config = UpstreamHTTPClient.config
+    backoff_delay = UpstreamHTTPClient.backoff_delay
+    _can_retry = UpstreamHTTPClient._can_retry
+
+    @property
+    def available(self) -> bool:
+        """Whether the optional httpx dependency is installed"""
+        return HTTPX_AVAILABLE
+
+    @property
+    def errors(self) -> tuple:
+        """Exception types raised for network, HTTP status, open-circuit, busy-host and deadline failures"""
+        upstream_errors = (CircuitOpenError, UpstreamBusyError, DeadlineExceeded)
+        return (httpx.HTTPError,) + upstream_errors if HTTPX_AVAILABLE else upstream_errors
+
+    def client_for(self, url: str) -> 'httpx.AsyncClient':
+        """Get the AsyncClient for the URL's host on the running event loop"""
+        loop = asyncio.get_running_loop()
+        loop_clients = self.clients.setdefault(loop, {})
+        key = UpstreamHTTPClient.host_key(url)
+        client = loop_clients.get(key)
+        if client is None:
+            max_connections = self.config['ASYNC_MAX_CONNECTIONS']
+            client = httpx.AsyncClient(limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            ))
+            loop_clients[key] = client
+        return client
+
+    async def get(self, url: str, timeout: float, stream: bool = False, **kwargs) -> 'httpx.Response':
+        """
+        Issue an async GET, retrying transport errors and retryable statuses
+
+        Args:
+            url: URL to fetch
+            timeout: Request timeout in seconds (upper bound)
+            stream: Return once headers arrive; the caller reads the body and
+                must `await response.aclose()`
+
+        Returns:
+            The final response (raises httpx errors once retries are exhausted,
+            CircuitOpenError while the host's breaker is open, UpstreamBusyError
+            when no concurrency slot frees up in time, DeadlineExceeded when
+            the request deadline runs out)
+        """
+        host = UpstreamHTTPClient.host_key(url)
+        breaker = self.breakers.breaker_for(host)
+        limiter = self.limiters.limiter_for(host)
+        deadline = current_deadline()
+        if deadline is not None and deadline.expired:
+            raise deadline.exceeded_error()
+        if not breaker.allow_request():
+            raise CircuitOpenError(f'Circuit open for {host}')
+        queued_at = time.perf_counter()
+        try:
+            await limiter.acquire_async(wait=deadline.clamp(timeout) if deadline is not None else timeout)
+        except UpstreamBusyError as e:
+            breaker.release()
+            if deadline is not None and deadline.expired:
+                raise deadline.exceeded_error() from e
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+
+        left = UpstreamHTTPClient.left_after_wait(breaker, limiter, url, timeout, queued_at)
+        start = time.perf_counter()
+        try:
+            response = await self._get_with_retries(url, limiter.timeout_for(url, left), stream, **kwargs)
+        except (httpx.TransportError, DeadlineExceeded) as e:
+            if deadline is not None and deadline.expired:
+                breaker.release()
+                limiter.release(url, None)
+                raise deadline.exceeded_error() from e
+            UpstreamHTTPClient.record_outcome(breaker, limiter, url, time.perf_counter() - start, type(e).__name__)
+            raise
+        except BaseException:
+            breaker.release()
+            limiter.release(url, None)
+            raise
+        UpstreamHTTPClient.record_outcome(
+            breaker, limiter, url, time.perf_counter() - start, UpstreamHTTPClient.failure_reason(response.status_code)
+        )
+        return response
+
+    async def _get_with_retries(self, url: str, timeout: float, stream: bool = False, **kwargs) -> 'httpx.Response':
+        config = self.config
+        client = self.client_for(url)
+        deadline = current_deadline()
+        attempt = 0
+        while True:
+            delay = self.backoff_delay(attempt + 1)
+            try:
+                attempt_timeout = deadline.clamp(timeout) if deadline is not None else timeout
+                request = client.build_request('GET', url, timeout=attempt_timeout, **kwargs)
+                response = await client.send(request, stream=stream)
+                if response.status_code not in config['RETRY_STATUSES'] or not self._can_retry(attempt, delay, deadline):
+                    return response
+                if stream:
+                    await response.aclose()
+            except httpx.TransportError:
+                if not self._can_retry(attempt, delay, deadline):
+                    raise
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def aclose(self) -> None:
+        """Close the clients created on the running event loop"""
+        loop_clients = self.clients.pop(asyncio.get_running_loop(), {})
+        for client in loop_clients.values():
+            await client.aclose()
+
+
+upstream_http = UpstreamHTTPClient()
+async_upstream_http = AsyncUpstreamHTTPClient()
@@ -0,0 +1,214 @@
+"""
+Unified run ingestion
+Builds a run's details stats and graph data from one crawl of its perfweb
+iterations: the listing is fetched once, each needed file once, and every
+workload file is scanned once for both its details metrics and its graph point
+"""
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+from .api_service import ExternalAPIService, AsyncExternalAPIService
+from .concurrency import stats_fetch_executor
+from .iteration_ledger import RunLedger, UNSETTLED, iteration_ledger
+from .metric_registry import FetchPlan, metric_registry
+from .parse_pool import ParseJob, parse_pool
+from .stats_service import StatsProcessingService, GraphDataService, AsyncStatsProcessingService
+from .stream_scan import ScanMatches
+
+
+class RunIngestionService:
+    """
+    One crawl per run producing both what fetch_comprehensive_stats and
+    fetch_graph_data return
+
+    The ledger's settled iterations are reused for each side separately.
+    Workload files of iterations pending for stats also give their graph
+    points; workload files are fetched on their own only for iterations
+    whose stats are settled but whose graph point is not.
+    """
+
+    @classmethod
+    def ingest(cls, run_id: str) -> Dict[str, Any]:
+        """
+        Fetch a run's stats and graph data in one pass
+
+        Args:
+            run_id: The run ID to ingest
+
+        Returns:
+            {'stats': details stats as fetch_comprehensive_stats returns them,
+             'graph_data': graph points as fetch_graph_data returns them (None if there are none)}
+        """
+        year_month = run_id[:4]
+        links = ExternalAPIService.fetch_perfweb_links(run_id)
+        if not links:
+            return {'stats': {}, 'graph_data': None}
+
+        plan = metric_registry.details_plan()
+        ledger = iteration_ledger.for_run(run_id, links)
+        pending, stats_tasks, graph_tasks = cls._tasks(ledger, links, plan)
+        streaming = ExternalAPIService.streaming_enabled()
+        series = StatsProcessingService.series_enabled()
+
+        if streaming:
+            files = stats_fetch_executor.map_ordered(
+                lambda task: ExternalAPIService.scan_stats_file(
+                    year_month, run_id, *task, StatsProcessingService.scan_patterns(task[1])
+                ),
+                stats_tasks + graph_tasks
+            )
+            parsed = files
+        else:
+            files = stats_fetch_executor.map_ordered(
+                lambda task: ExternalAPIService.fetch_stats_file(year_month, run_id, *task),
+                stats_tasks + graph_tasks
+            )
+            parsed = parse_pool.scan_many(cls._parse_jobs(files, stats_tasks + graph_tasks), all_matches=series)
+
+        stats_files = files[:len(stats_tasks)]
+        if streaming:
+            collectors = StatsProcessingService._merge_iteration_scans(ledger, links, pending, stats_files, plan)
+        else:
+            collectors = StatsProcessingService._merge_parsed(ledger, links, pending, parsed, plan, series)
+        instance_type = StatsProcessingService._find_instance_type(
+            year_month, run_id, links, ledger, plan, stats_files[-1] if stats_files else None, streaming
+        )
+        stats = StatsProcessingService._calculate_final_stats(
+            collectors, instance_type, StatsProcessingService._sample_statistics(ledger, links, plan)
+        )
+
+        return {
+            'stats': stats,
+            'graph_data': cls._graph_data(ledger, links, stats_tasks + graph_tasks, files, parsed, series)
+        }
+
+    @classmethod
+    def _tasks(cls, ledger: RunLedger, links: List[str], plan: FetchPlan) -> Tuple[List[str], List, List]:
+        """
+        Pending stats iterations, their (link, file) fetches, and the workload
+        fetches of iterations that are only pending for their graph point
+        """
+        pending = StatsProcessingService._pending_iterations(ledger, links, plan)
+        stats_tasks = StatsProcessingService._stats_tasks(ledger, links, pending, plan)
+
+        workload_file = StatsProcessingService.STATS_FILE_TYPES['workload']
+        scanned = set(pending) if workload_file in plan.iteration_files else set()
+        graph_links = [
+            link for link in links
+            if link not in scanned and ledger.graph_point(link) is UNSETTLED
+        ]
+        iteration_ledger.record(reused=0, parsed=len(graph_links))
+        return pending, stats_tasks, [(link, workload_file) for link in graph_links]
+
+    @classmethod
+    def _parse_jobs(cls, files: List[Optional[str]], tasks: List) -> List[ParseJob]:
+        """
+        (body, patterns) scans of every fetched file, in fetch order
+
+        The VM instance file is parsed on its own (see _find_instance_type),
+        so its job has no body.
+        """
+        vm_file = StatsProcessingService.STATS_FILE_TYPES['vm_instance']
+        return [
+            (None if stats_type == vm_file else text, StatsProcessingService.scan_patterns(stats_type))
+            for text, (_, stats_type) in zip(files, tasks)
+        ]
+
+    @classmethod
+    def _graph_data(
+        cls,
+        ledger: RunLedger,
+        links: List[str],
+        tasks: List,
+        files: List[Any],
+        parsed: List[Any],
+        series: bool
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Graph points of every iteration, settling new ones in the ledger as fetch_graph_data does"""
+        workload_file = StatsProcessingService.STATS_FILE_TYPES['workload']
+        fetched = {link: index for index, (link, stats_type) in enumerate(tasks) if stats_type == workload_file}
+
+        graph_data = []
+        for link in links:
+            point = ledger.graph_point(link)
+            if point is UNSETTLED:
+                if link not in fetched:
+                    continue
+                workload = files[fetched[link]]
+                matches = cls._first_matches(parsed[fetched[link]], series)
+                point = GraphDataService._graph_point_from_scan(matches) if workload and matches else None
+                ledger.settle_graph(link, links, workload, point)
+            if point:
+                graph_data.append(point)
+        return graph_data if graph_data else None
+
+    @staticmethod
+    def _first_matches(matches: Any, series: bool) -> Optional[ScanMatches]:
+        """First-match view of a scan (series-mode scans hold every match)"""
+        if matches is None or not series:
+            return matches
+        return {name: values[0] if values else None for name, values in matches.items()}
+
+
+class AsyncRunIngestionService:
+    """Asyncio variant of RunIngestionService"""
+
+    @classmethod
+    async def ingest(cls, run_id: str) -> Dict[str, Any]:
+        """
+        Fetch a run's stats and graph data in one pass without blocking the event loop
+
+        Args:
+            run_id: The run ID to ingest
+
+        Returns:
+            {'stats': ..., 'graph_data': ...} as RunIngestionService.ingest returns them
+        """
+        year_month = run_id[:4]
+        links = await AsyncExternalAPIService.fetch_perfweb_links(run_id)
+        if not links:
+            return {'stats': {}, 'graph_data': None}
+
+        plan = metric_registry.details_plan()
+        ledger = iteration_ledger.for_run(run_id, links)
+        pending, stats_tasks, graph_tasks = RunIngestionService._tasks(ledger, links, plan)
+        streaming = ExternalAPIService.streaming_enabled()
+        series = StatsProcessingService.series_enabled()
+
+        # Fetch every file of the crawl, capped per run
+        per_run = asyncio.Semaphore(stats_fetch_executor.config['PER_RUN'])
+
+        async def fetch(link: str, stats_type: str) -> Any:
+            async with per_run:
+                if streaming:
+                    return await AsyncExternalAPIService.scan_stats_file(
+                        year_month, run_id, link, stats_type, StatsProcessingService.scan_patterns(stats_type)
+                    )
+                return await AsyncExternalAPIService.fetch_stats_file(year_month, run_id, link, stats_type)
+
+        files = await asyncio.gather(*(fetch(*task) for task in stats_tasks + graph_tasks))
+        if streaming:
+            parsed = files
+        else:
+            parsed = await parse_pool.scan_many_async(
+                RunIngestionService._parse_jobs(files, stats_tasks + graph_tasks), all_matches=series
+            )
+
+        stats_files = files[:len(stats_tasks)]
+        if streaming:
+            collectors = StatsProcessingService._merge_iteration_scans(ledger, links, pending, stats_files, plan)
+        else:
+            collectors = StatsProcessingService._merge_parsed(ledger, links, pending, parsed, plan, series)
+        instance_type = await AsyncStatsProcessingService._find_instance_type(
+            year_month, run_id, links, ledger, plan, stats_files[-1] if stats_files else None, streaming
+        )
+        stats = StatsProcessingService._calculate_final_stats(
+            collectors, instance_type, StatsProcessingService._sample_statistics(ledger, links, plan)
+        )
+
+        return {
+            'stats': stats,
+            'graph_data': RunIngestionService._graph_data(
+                ledger, links, stats_tasks + graph_tasks, files, parsed, series
+            )
+        }
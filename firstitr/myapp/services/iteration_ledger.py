@@ -0,0 +1,214 @@
+"""
+Ledger of processed iterations for incremental refreshes
+Remembers which iteration directories of a run have been parsed and the values
+they produced, so refreshing an in-progress run only fetches new iterations
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from ..app_settings import get_setting
+
+# Returned for iterations whose graph point has not been settled yet
+UNSETTLED = object()
+
+
+class RunLedger:
+    """
+    Settled iterations of one run and the values they produced
+
+    An iteration settles once a later iteration directory exists (so its files
+    are complete) and every file it needed was read. Settled iterations are
+    folded into running stats maxima and kept as graph points; the newest
+    iteration and any with unreadable files are fetched again on the next refresh.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.settled = {}
+        self.maxima = {}
+        self.graph_points = {}
+        self.samples = {}
+        self.instance_type = None
+
+    @property
+    def links(self) -> set:
+        """Every iteration link settled for stats or graph data"""
+        with self.lock:
+            return set(self.settled) | set(self.graph_points)
+
+    @staticmethod
+    def can_settle(link: str, links: Sequence[str], files: Sequence[Any]) -> bool:
+        """Whether an iteration is final: not the newest one and none of its files missing"""
+        return link != links[-1] and all(file is not None for file in files)
+
+    def pending_stats(
+        self,
+        links: Sequence[str],
+        collectors: Optional[Iterable[str]] = None,
+        samples: Iterable[str] = ()
+    ) -> List[str]:
+        """
+        Iteration links whose stats still have to be fetched, in listing order
+
+        Args:
+            links: Current iteration listing
+            collectors: Collectors the caller needs settled (any settled collector will do when None)
+            samples: Metrics whose per-sample series must have been kept as well
+        """
+        needed = set(collectors) if collectors is not None else set()
+        series = set(samples)
+        with self.lock:
+            return [
+                link for link in links
+                if link not in self.settled
+                or not needed <= self.settled[link]
+                or not series <= self.samples.get(link, {}).keys()
+            ]
+
+    def collectors(self, collectors: Dict[str, List]) -> Dict[str, List]:
+        """Seed empty per-metric collectors with the settled maxima of the collectors asked for"""
+        with self.lock:
+            for name, value in self.maxima.items():
+                if name in collectors:
+                    collectors[name].append(value)
+        return collectors
+
+    def settle_stats(self, link: str, links: Sequence[str], files: Sequence[Any], iteration: Dict[str, List]) -> bool:
+        """
+        Fold one iteration's collected values into the settled maxima if it is final
+
+        Args:
+            link: Iteration link
+            links: Current iteration listing
+            files: The iteration's file texts or scan matches (None when unreadable)
+            iteration: Per-metric values collected from this iteration alone (only the
+                collectors that were extracted; others stay pending)
+
+        Returns:
+            True if the iteration was settled
+        """
+        if not self.can_settle(link, links, files):
+            return False
+        with self.lock:
+            settled = self.settled.setdefault(link, set())
+            for name, values in iteration.items():
+                if name in settled:
+                    continue
+                settled.add(name)
+                if values:
+                    self.maxima[name] = max(self.maxima.get(name, values[0]), *values)
+        return True
+
+    def keep_samples(self, link: str, samples: Dict[str, Any]) -> None:
+        """Keep an iteration's per-sample series; unsettled iterations are replaced on their next fetch"""
+        with self.lock:
+            self.samples.setdefault(link, {}).update(samples)
+
+    def samples_of(self, link: str) -> Dict[str, Any]:
+        """Per-sample series kept for an iteration (empty if none)"""
+        with self.lock:
+            return self.samples.get(link, {})
+
+    def graph_point(self, link: str) -> Any:
+        """The settled graph point of an iteration (None if it had none), or UNSETTLED"""
+        with self.lock:
+            return self.graph_points.get(link, UNSETTLED)
+
+    def settle_graph(self, link: str, links: Sequence[str], file: Any, point: Optional[Dict[str, Any]]) -> bool:
+        """Keep an iteration's graph point if the iteration is final"""
+        if not self.can_settle(link, links, (file,)):
+            return False
+        with self.lock:
+            self.graph_points.setdefault(link, point)
+        return True
+
+    def remember_instance_type(self, instance_type: Optional[str]) -> None:
+        """Keep the run's instance type once found; it never changes during a run"""
+        if instance_type:
+            with self.lock:
+                self.instance_type = instance_type
+
+
+class IterationLedger:
+    """
+    Process-wide ledgers of settled iterations, least recently used runs evicted first
+
+    Ledgers are dropped when a settled iteration disappears from the listing
+    (e.g. a run was restarted), so stale values are never merged.
+    """
+
+    DEFAULT_CONFIG = {
+        'ENABLED': True,     # Reuse settled iterations across refreshes
+        'MAX_RUNS': 256,     # Runs whose ledgers are kept
+    }
+
+    def __init__(self, config: Dict[str, Any] = None):
+        self._config = config
+        self.runs = OrderedDict()
+        self.lock = threading.Lock()
+        self.reused = 0
+        self.parsed = 0
+        self.discarded = 0
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Effective configuration, read lazily so Django settings can apply"""
+        overrides = self._config if self._config is not None else get_setting('ITERATION_LEDGER', {})
+        return {**self.DEFAULT_CONFIG, **overrides}
+
+    def for_run(self, run_id: str, links: Sequence[str]) -> RunLedger:
+        """
+        Get the ledger of a run for its current iteration listing
+
+        Args:
+            run_id: Run ID
+            links: Current iteration listing
+
+        Returns:
+            The run's ledger, or a throwaway empty one when the ledger is disabled
+        """
+        config = self.config
+        if not config['ENABLED']:
+            return RunLedger()
+
+        with self.lock:
+            ledger = self.runs.get(run_id)
+            if ledger is not None and not ledger.links <= set(links):
+                ledger = None
+                self.discarded += 1
+            if ledger is None:
+                ledger = RunLedger()
+            self.runs[run_id] = ledger
+            self.runs.move_to_end(run_id)
+            while len(self.runs) > config['MAX_RUNS']:
+                self.runs.popitem(last=False)
+            return ledger
+
+    def record(self, reused: int, parsed: int) -> None:
+        """Count iterations served from ledgers and iterations fetched and parsed"""
+        with self.lock:
+            self.reused += reused
+            self.parsed += parsed
+
+    def reset(self) -> None:
+        """Drop all ledgers and counters"""
+        with self.lock:
+            self.runs.clear()
+            self.reused = self.parsed = self.discarded = 0
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get iteration ledger status information"""
+        with self.lock:
+            runs = list(self.runs.values())
+            return {
+                'enabled': self.config['ENABLED'],
+                'runs': len(runs),
+                'settled_iterations': sum(len(ledger.links) for ledger in runs),
+                'reused': self.reused,
+                'parsed': self.parsed,
+                'discarded': self.discarded
+            }
+
+
+iteration_ledger = IterationLedger()
@@ -0,0 +1,233 @@
+"""
+Declarative registry of run metrics
+Each metric declares the stats file it comes from, its pattern, value type,
+unit conversion and aggregation; the planner derives from the registry which
+files a set of metrics needs, so a new metric never adds an upstream fetch
+unless it lives in a file nobody reads yet
+"""
+import re
+from typing import Dict, Iterable, List, Optional, Pattern, Sequence
+
+WORKLOAD_FILE = 'stats_workload.txt'
+SYSTEM_FILE = 'stats_system.txt'
+WAFL_FILE = 'stats_wafl_flexlog.txt'
+VM_INSTANCE_FILE = 'system_node_virtual_machine_instance_show.txt'
+
+# Aggregations across iterations
+MAX = 'max'        # Largest value of any iteration, reported as 'Maximum <label>'
+FIRST = 'first'    # First iteration that has a value, reported as '<label>'
+
+
+class Metric:
+    """
+    One value extracted from a stats file
+
+    Args:
+        name: Metric name (scan match and series key)
+        source: Stats file the metric is read from
+        pattern: Regex whose first group captures the value
+        value_type: Type the captured text is converted to
+        label: Details field label; None for graph-only metrics
+        scale: Unit conversion applied to the aggregated value and to series samples
+        aggregation: MAX or FIRST across iterations
+        collector: Per-iteration collector name for MAX metrics
+        keep_zero: Whether a zero reading counts as a sample for the maximum
+        graph: Whether the metric is part of a graph data point
+    """
+
+    __slots__ = (
+        'name', 'source', 'pattern', 'value_type', 'label', 'scale',
+        'aggregation', 'collector', 'keep_zero', 'graph'
+    )
+
+    def __init__(
+        self,
+        name: str,
+        source: str,
+        pattern: str,
+        value_type: type = float,
+        label: Optional[str] = None,
+        scale: float = 1.0,
+        aggregation: str = MAX,
+        collector: Optional[str] = None,
+        keep_zero: bool = True,
+        graph: bool = False
+    ):
+        self.name = name
+        self.source = source
+        self.pattern = pattern
+        self.value_type = value_type
+        self.label = label
+        self.scale = scale
+        self.aggregation = aggregation
+        self.collector = collector or name
+        self.keep_zero = keep_zero
+        self.graph = graph
+
+    @property
+    def field(self) -> Optional[str]:
+        """Response field the metric is reported under, None for graph-only metrics"""
+        if self.label is None:
+            return None
+        return f'Maximum {self.label}' if self.aggregation == MAX else self.label
+
+    @property
+    def per_iteration(self) -> bool:
+        """Whether every iteration's file is read (FIRST metrics are read from one iteration)"""
+        return self.aggregation == MAX
+
+    def convert(self, value):
+        """Apply the unit conversion (values without one keep their type)"""
+        return value * self.scale if self.scale != 1 else value
+
+    def accepts(self, value) -> bool:
+        """Whether an extracted value counts towards the aggregation"""
+        return value is not None and (self.keep_zero or bool(value))
+
+
+class FetchPlan:
+    """
+    What a details crawl for a set of metrics has to fetch and collect
+
+    Args:
+        metrics: Details metrics to extract
+        iteration_files: Files fetched for every iteration
+    """
+
+    def __init__(self, metrics: List[Metric], iteration_files: List[str]):
+        self.metrics = metrics
+        self.iteration_files = iteration_files
+        self.names = [metric.name for metric in metrics]
+
+    def includes(self, name: str) -> bool:
+        return name in self.names
+
+    def new_collectors(self) -> Dict[str, List]:
+        """Empty collectors of the per-iteration metrics"""
+        return {metric.collector: [] for metric in self.metrics if metric.per_iteration}
+
+    def series_names(self) -> List[str]:
+        """Metrics whose samples are kept in series mode"""
+        return [metric.name for metric in self.metrics if metric.per_iteration]
+
+
+class MetricRegistry:
+    """Registered metrics in response order, with the fetch planner over them"""
+
+    def __init__(self, metrics: Iterable[Metric] = ()):
+        self.metrics = {}
+        self._compiled = {}
+        for metric in metrics:
+            self.register(metric)
+
+    def register(self, metric: Metric) -> Metric:
+        """Add a metric (replacing one with the same name)"""
+        self.metrics[metric.name] = metric
+        self._compiled.clear()
+        return metric
+
+    def unregister(self, name: str) -> None:
+        """Remove a metric"""
+        self.metrics.pop(name, None)
+        self._compiled.clear()
+
+    def get(self, name: str) -> Metric:
+        try:
+            return self.metrics[name]
+        except KeyError:
+            raise ValueError(f'Unknown metric: {name}')
+
+    def details_metrics(self, names: Optional[Iterable[str]] = None) -> List[Metric]:
+        """Metrics reported in run details (all of them when names is None), in registry order"""
+        wanted = None if names is None else {self.get(name).name for name in names}
+        return [
+            metric for metric in self.metrics.values()
+            if metric.label is not None and (wanted is None or metric.name in wanted)
+        ]
+
+    def graph_metrics(self) -> List[Metric]:
+        """Metrics that make up a graph data point"""
+        return [metric for metric in self.metrics.values() if metric.graph]
+
+    def fields(self) -> List[str]:
+        """Details fields the registry can produce, in response order"""
+        return [metric.field for metric in self.details_metrics()]
+
+    def plan(self, metrics: Sequence[Metric]) -> Dict[str, List[Metric]]:
+        """
+        Minimal set of files to download for a set of metrics
+
+        Args:
+            metrics: Metrics to extract
+
+        Returns:
+            Files to fetch in first-use order, each with the metrics read from it
+        """
+        files = {}
+        for metric in metrics:
+            files.setdefault(metric.source, []).append(metric)
+        return files
+
+    def iteration_files(self, metrics: Sequence[Metric]) -> List[str]:
+        """Files fetched for every iteration to extract the per-iteration metrics"""
+        return list(self.plan([metric for metric in metrics if metric.per_iteration]))
+
+    def details_plan(self, names: Optional[Iterable[str]] = None) -> FetchPlan:
+        """
+        Plan a details crawl
+
+        Args:
+            names: Metric names to extract (all details metrics when None)
+
+        Returns:
+            The metrics with the per-iteration files they need
+        """
+        metrics = self.details_metrics(names)
+        return FetchPlan(metrics, self.iteration_files(metrics))
+
+    def metric_for_field(self, field: str) -> Optional[Metric]:
+        """The details metric reported under a response field"""
+        for metric in self.details_metrics():
+            if metric.field == field:
+                return metric
+        return None
+
+    def source_metrics(self, source: str) -> List[Metric]:
+        """Every metric read from a file, details and graph alike"""
+        return [metric for metric in self.metrics.values() if metric.source == source]
+
+    def patterns(self, source: str) -> Dict[str, Pattern]:
+        """
+        Compiled patterns of every metric read from a file
+
+        One scan with these fills all of the file's metrics, whichever view
+        asked for the file.
+        """
+        if source not in self._compiled:
+            self._compiled[source] = {
+                metric.name: re.compile(metric.pattern) for metric in self.source_metrics(source)
+            }
+        return dict(self._compiled[source])
+
+
+metric_registry = MetricRegistry([
+    Metric('throughput', WORKLOAD_FILE, r'write_data:(\d+)b/s', int, label='Throughput',
+           scale=1 / (1024 * 1024), collector='throughputs', keep_zero=False, graph=True),
+    Metric('cache', WORKLOAD_FILE, r'read_io_type\.cache:(\d+)%', int, label='Cache Percentage',
+           collector='cache_percentages'),
+    Metric('ext_cache', WORKLOAD_FILE, r'read_io_type\.ext_cache:(\d+)%', int, label='External Cache Percentage',
+           collector='ext_cache_percentages'),
+    Metric('disk', WORKLOAD_FILE, r'read_io_type\.disk:(\d+)%', int, label='Disk Percentage',
+           collector='disk_percentages'),
+    Metric('bamboo_ssd', WORKLOAD_FILE, r'read_io_type\.bamboo_ssd:(\d+)%', int, label='Bamboo SSD Percentage',
+           collector='bamboo_ssd_percentages'),
+    Metric('cpu_busy', SYSTEM_FILE, r'cpu_busy:(\d+(?:\.\d+)?)%', label='System CPU Busy'),
+    Metric('rdma_latency', WAFL_FILE, r'rdma_actual_latency\.WAFL_SPINNP_WRITE:(\d+(?:\.\d+)?)us',
+           label='WAFL RDMA Write Latency', collector='rdma_stats'),
+    Metric('ldma_latency', WAFL_FILE, r'ldma_actual_latency\.WAFL_SPINNP_WRITE:(\d+(?:\.\d+)?)us',
+           label='WAFL LDMA Write Latency', collector='ldma_stats'),
+    Metric('instance_type', VM_INSTANCE_FILE, r'Instance Type:\s*([^\n\r]+)', str, label='Instance Type',
+           aggregation=FIRST),
+    Metric('latency', WORKLOAD_FILE, r'latency:(\d+\.\d+)us', graph=True),
+    Metric('ops', WORKLOAD_FILE, r'ops:(\d+)/s', int, graph=True),
+])
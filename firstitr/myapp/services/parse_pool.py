@@ -0,0 +1,148 @@
+"""
+Process-pool offload of stats file parsing
+Scans large stats file bodies in worker processes so regex work for one
+request does not hold the GIL against every other request in the process
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Pattern, Sequence, Tuple
+
+from ..app_settings import get_setting
+from .stream_scan import scan_text, scan_text_all
+
+ParseJob = Tuple[Optional[str], Dict[str, Pattern]]
+
+
+def scan_job(text: Optional[str], patterns: Dict[str, Pattern], all_matches: bool = False) -> Any:
+    """
+    Scan one downloaded body (runs inline or in a worker process)
+
+    Args:
+        text: File body, None when the file was not available
+        patterns: Named patterns to scan for
+        all_matches: Collect every match (series mode) instead of the first
+
+    Returns:
+        scan_text or scan_text_all results, None for a missing body
+    """
+    if text is None:
+        return None
+    return scan_text_all(text, patterns) if all_matches else scan_text(text, patterns)
+
+
+class ParsePool:
+    """
+    Optional process pool for stats file scans
+
+    Bodies of at least MIN_BYTES are sent to the pool; smaller ones are
+    scanned inline, where pickling them to a worker would cost more than
+    the scan itself. Inline scans of a batch run while the pool works on
+    its large bodies. Workers are started on first use.
+    """
+
+    DEFAULT_CONFIG = {
+        'ENABLED': False,          # Offload is opt-in
+        'WORKERS': None,           # Worker processes (None: one per CPU)
+        'MIN_BYTES': 256 * 1024,   # Bodies smaller than this are parsed inline
+    }
+
+    def __init__(self, config: Dict[str, Any] = None):
+        self._config = config
+        self.lock = threading.Lock()
+        self.offloaded = 0
+        self.inline = 0
+        self._executor = None
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Effective configuration, read lazily so Django settings can apply"""
+        overrides = self._config if self._config is not None else get_setting('PARSE_POOL', {})
+        return {**self.DEFAULT_CONFIG, **overrides}
+
+    @property
+    def workers(self) -> int:
+        return self.config['WORKERS'] or os.cpu_count() or 1
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            with self.lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def offloads(self, text: Optional[str]) -> bool:
+        """Whether a body is parsed in the pool"""
+        config = self.config
+        return config['ENABLED'] and text is not None and len(text) >= config['MIN_BYTES']
+
+    def _submit(self, jobs: Sequence[ParseJob], all_matches: bool) -> Dict[int, Any]:
+        """Send the large bodies of a batch to the pool, keyed by job index"""
+        futures = {
+            index: self.executor.submit(scan_job, text, patterns, all_matches)
+            for index, (text, patterns) in enumerate(jobs) if self.offloads(text)
+        }
+        with self.lock:
+            self.offloaded += len(futures)
+            self.inline += sum(1 for text, _ in jobs if text is not None) - len(futures)
+        return futures
+
+    def scan_many(self, jobs: Sequence[ParseJob], all_matches: bool = False) -> List[Any]:
+        """
+        Scan a batch of bodies
+
+        Args:
+            jobs: (body, patterns) pairs
+            all_matches: Collect every match (series mode) instead of the first
+
+        Returns:
+            Scan results in job order (None for missing bodies)
+        """
+        futures = self._submit(jobs, all_matches)
+        inline = [
+            None if index in futures else scan_job(text, patterns, all_matches)
+            for index, (text, patterns) in enumerate(jobs)
+        ]
+        return [futures[index].result() if index in futures else result for index, result in enumerate(inline)]
+
+    async def scan_many_async(self, jobs: Sequence[ParseJob], all_matches: bool = False) -> List[Any]:
+        """Variant of scan_many that awaits pooled scans instead of blocking the event loop"""
+        futures = {index: asyncio.wrap_future(future) for index, future in self._submit(jobs, all_matches).items()}
+        inline = [
+            None if index in futures else scan_job(text, patterns, all_matches)
+            for index, (text, patterns) in enumerate(jobs)
+        ]
+        pooled = dict(zip(futures, await asyncio.gather(*futures.values())))
+        return [pooled[index] if index in pooled else result for index, result in enumerate(inline)]
+
+    def scan(self, text: Optional[str], patterns: Dict[str, Pattern], all_matches: bool = False) -> Any:
+        """Scan one body, in the pool when it is large enough"""
+        return self.scan_many([(text, patterns)], all_matches)[0]
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get offload counters for status reporting"""
+        with self.lock:
+            return {
+                'enabled': self.config['ENABLED'],
+                'workers': self.workers,
+                'min_bytes': self.config['MIN_BYTES'],
+                'offloaded': self.offloaded,
+                'inline': self.inline
+            }
+
+    def reset(self) -> None:
+        """Reset the counters"""
+        with self.lock:
+            self.offloaded = self.inline = 0
+
+    def shutdown(self) -> None:
+        """Stop the worker processes; a new pool is started on next use"""
+        with self.lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+parse_pool = ParsePool()
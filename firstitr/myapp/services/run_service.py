@@ -2,63 +2,277 @@
 Run data service
 Handles fetching and processing of run data with caching
 """
-from typing import Dict, Any, Optional
+import asyncio
+from typing import Dict, Any, List, Optional, Tuple
 from ..cache_manager import api_cache
-from .api_service import ExternalAPIService, DataTransformService, CompatibilityService
-from .stats_service import StatsProcessingService, GraphDataService
+from ..records import GraphSeries, RunRecord
+from .api_service import ExternalAPIService, AsyncExternalAPIService, DataTransformService, CompatibilityService
+from .deadline import Deadline, child_scope
+from .ingestion import RunIngestionService, AsyncRunIngestionService
+from .metric_registry import metric_registry
+from .scheduler import BULK, priority_scope
+from .stats_service import StatsProcessingService, GraphDataService, AsyncStatsProcessingService, AsyncGraphDataService
 
 
 class RunDataService:
     """Service for managing run data operations"""
     
     @classmethod
-    def fetch_single_run_data(cls, run_id: str, include_stats: bool = True) -> Optional[Dict[str, Any]]:
+    def fetch_single_run_data(
+        cls,
+        run_id: str,
+        include_stats: bool = True,
+        projection: Optional[Dict[str, List[str]]] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Fetch comprehensive data for a single run
         
+        Results of projected requests are cached under their own key with the
+        metrics they cover; a later request fetches only the metrics that are
+        still missing and merges them in. A full stats crawl also yields the
+        run's graph data (see RunIngestionService), which is cached with it.
+        
         Args:
             run_id: The run ID to fetch
             include_stats: Whether to include detailed statistics
+            projection: Fields and metrics to return (see resolve_projection);
+                only the stats files those metrics need are fetched
             
         Returns:
-            Complete run data or None if not found
+            Complete (or projected) run data or None if not found
         """
         # Check cache first
         cache_key = f"details_{run_id}"
         cached_data = api_cache.get(cache_key)
         if cached_data:
             print(f"Found details data in memory cache for {run_id}")
-            return cached_data
+            return cls.project(cls.from_cache(cached_data), projection)
+        
+        entry = api_cache.get(cls._projected_key(run_id)) if include_stats else None
+        missing = cls._missing_metrics(entry, projection, include_stats)
+        if entry and not missing:
+            print(f"Found projected details data in memory cache for {run_id}")
+            return cls.project(cls.from_cache(entry['data']), projection)
         
         # Fetch from external API
         print(f"Fetching details data from external API for {run_id}")
         
-        try:
-            # Get basic run details
-            raw_data = ExternalAPIService.fetch_run_details(run_id)
-            if not raw_data:
-                return None
-            
-            # Transform to user-friendly format
-            run_data = DataTransformService.transform_run_data(raw_data)
-            
-            # Add detailed statistics if requested
-            if include_stats:
-                try:
-                    stats_data = StatsProcessingService.fetch_comprehensive_stats(run_id)
-                    run_data.update(stats_data)
-                except Exception as e:
-                    print(f"Error fetching stats data for {run_id}: {e}")
-                    run_data['stats_error'] = f"Could not fetch stats data: {str(e)}"
+        graph_data = None
+        with child_scope() as deadline:
+            try:
+                if entry:
+                    run_data = dict(cls.from_cache(entry['data']))
+                else:
+                    # Get basic run details
+                    raw_data = ExternalAPIService.fetch_run_details(run_id)
+                    if not raw_data:
+                        return None
+                    
+                    # Transform to user-friendly format
+                    run_data = DataTransformService.transform_run_data(raw_data)
+                
+                # Add detailed statistics if requested
+                if missing:
+                    try:
+                        stats_data, graph_data = cls._fetch_stats(run_id, missing)
+                        cls._merge_stats(run_data, stats_data)
+                    except Exception as e:
+                        print(f"Error fetching stats data for {run_id}: {e}")
+                        run_data['stats_error'] = f"Could not fetch stats data: {str(e)}"
+                
+            except Exception as e:
+                if cls._cut_short(deadline):
+                    return cls.project(cls._mark_partial({}, include_stats), projection)
+                raise Exception(f"Error fetching data for {run_id}: {str(e)}")
             
-            # Cache the result
-            api_cache.put(cache_key, run_data)
+            if cls._cut_short(deadline):
+                # Partial results are returned but never cached
+                return cls.project(cls._mark_partial(run_data, include_stats), projection)
+        
+        # Cache the result
+        for key, value in cls._cache_entries(run_id, run_data, entry, missing, projection, graph_data):
+            api_cache.put(key, value)
+        
+        print(f"Fetched data for {run_id}: {run_data}")
+        return cls.project(run_data, projection)
+    
+    @classmethod
+    def resolve_projection(
+        cls,
+        fields: Optional[List[str]] = None,
+        metrics: Optional[List[str]] = None
+    ) -> Optional[Dict[str, List[str]]]:
+        """
+        Resolve requested response fields and metric names into a projection
+        
+        Args:
+            fields: Response fields (run detail fields or stats fields such as 'Maximum Throughput')
+            metrics: Registry metric names (e.g. 'cpu_busy')
             
-            print(f"Fetched data for {run_id}: {run_data}")
+        Returns:
+            {'fields': fields to return, 'metrics': metrics to extract}, or None
+            when neither is given; raises ValueError on unknown names
+        """
+        if fields is None and metrics is None:
+            return None
+        
+        header_fields = list(DataTransformService.FIELD_MAPPINGS.values())
+        requested_header = set()
+        names = set()
+        for field in fields or []:
+            if field in header_fields:
+                requested_header.add(field)
+                continue
+            metric = metric_registry.metric_for_field(field)
+            if metric is None:
+                raise ValueError(f'Unknown field: {field}')
+            names.add(metric.name)
+        for name in metrics or []:
+            if metric_registry.get(name).label is None:
+                raise ValueError(f'Unknown metric: {name}')
+            names.add(name)
+        
+        details_metrics = metric_registry.details_metrics(names)
+        return {
+            'fields': [field for field in header_fields if field in requested_header]
+                      + [metric.field for metric in details_metrics],
+            'metrics': [metric.name for metric in details_metrics]
+        }
+    
+    @classmethod
+    def projection_kwargs(cls, projection: Optional[Dict[str, List[str]]]) -> Dict[str, Any]:
+        """Keyword arguments passing a projection on, none at all without one"""
+        return {} if projection is None else {'projection': projection}
+    
+    @classmethod
+    def project(cls, run_data: Dict[str, Any], projection: Optional[Dict[str, List[str]]]) -> Dict[str, Any]:
+        """Restrict run data to a projection's fields, keeping the partial/error markers"""
+        if projection is None:
             return run_data
-            
-        except Exception as e:
-            raise Exception(f"Error fetching data for {run_id}: {str(e)}")
+        
+        fields = projection['fields']
+        projected = {field: run_data[field] for field in fields if field in run_data}
+        for key in ('partial', 'stats_error'):
+            if key in run_data:
+                projected[key] = run_data[key]
+        if 'missing_fields' in run_data:
+            projected['missing_fields'] = [field for field in run_data['missing_fields'] if field in fields]
+        if run_data.get('Sample Statistics'):
+            labels = {metric_registry.get(name).label for name in projection['metrics']}
+            statistics = {label: summary for label, summary in run_data['Sample Statistics'].items() if label in labels}
+            if statistics:
+                projected['Sample Statistics'] = statistics
+        return projected
+    
+    @classmethod
+    def to_cache(cls, run_data: Dict[str, Any]) -> RunRecord:
+        """Compact cached form of run details"""
+        return RunRecord.from_dict(run_data, StatsProcessingService.STATS_FIELDS)
+    
+    @classmethod
+    def from_cache(cls, cached: Any) -> Dict[str, Any]:
+        """Public details shape of a cached entry (entries persisted before RunRecord are plain dicts)"""
+        return cached.to_dict() if isinstance(cached, RunRecord) else cached
+    
+    @classmethod
+    def _projected_key(cls, run_id: str) -> str:
+        return f"details_{run_id}:projected"
+    
+    @classmethod
+    def _details_metric_names(cls) -> List[str]:
+        return [metric.name for metric in metric_registry.details_metrics()]
+    
+    @classmethod
+    def _missing_metrics(
+        cls,
+        entry: Optional[Dict[str, Any]],
+        projection: Optional[Dict[str, List[str]]],
+        include_stats: bool
+    ) -> List[str]:
+        """Requested metrics a cached projected entry does not cover yet"""
+        if not include_stats:
+            return []
+        wanted = cls._details_metric_names() if projection is None else projection['metrics']
+        covered = entry['metrics'] if entry else ()
+        return [name for name in wanted if name not in covered]
+    
+    @classmethod
+    def _stats_args(cls, missing: List[str]) -> Tuple:
+        """fetch_comprehensive_stats arguments after the run ID (none for a full crawl)"""
+        return () if missing == cls._details_metric_names() else (missing,)
+    
+    @classmethod
+    def _fetch_stats(cls, run_id: str, missing: List[str]) -> Tuple[Dict[str, Any], Optional[List[Dict[str, Any]]]]:
+        """
+        Stats for the missing metrics, with the run's graph data when they are all of them
+        
+        A full crawl ingests stats and graph data together; projected crawls
+        only fetch the files their metrics need and yield no graph data.
+        """
+        args = cls._stats_args(missing)
+        if args:
+            return StatsProcessingService.fetch_comprehensive_stats(run_id, *args), None
+        ingested = RunIngestionService.ingest(run_id)
+        return ingested['stats'], ingested['graph_data']
+    
+    @classmethod
+    def _merge_stats(cls, run_data: Dict[str, Any], stats_data: Dict[str, Any]) -> None:
+        """Add stats to run data, merging per-metric sample statistics with those already there"""
+        statistics = stats_data.pop('Sample Statistics', None)
+        run_data.update(stats_data)
+        if statistics:
+            run_data['Sample Statistics'] = {**run_data.get('Sample Statistics', {}), **statistics}
+    
+    @classmethod
+    def _cache_entries(
+        cls,
+        run_id: str,
+        run_data: Dict[str, Any],
+        entry: Optional[Dict[str, Any]],
+        missing: List[str],
+        projection: Optional[Dict[str, List[str]]],
+        graph_data: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Tuple[str, Any]]:
+        """
+        Cache writes for freshly fetched run data
+        
+        Unprojected results go under details_<id> as before. Projected results
+        without stats errors go under details_<id>:projected with the metrics
+        they cover, and are promoted to details_<id> once they cover them all.
+        Graph data ingested with the stats goes under graph_<id>.
+        """
+        entries = [(f"graph_{run_id}", GraphDataManagerService.to_cache(graph_data))] if graph_data else []
+        cache_key = f"details_{run_id}"
+        if projection is None:
+            return [(cache_key, cls.to_cache(run_data))] + entries
+        if 'stats_error' in run_data:
+            return entries
+        
+        covered = set(entry['metrics'] if entry else ()) | set(missing)
+        metrics = [name for name in cls._details_metric_names() if name in covered]
+        if len(metrics) == len(cls._details_metric_names()):
+            return [(cache_key, cls.to_cache(run_data))] + entries
+        return [(cls._projected_key(run_id), {'data': cls.to_cache(run_data), 'metrics': metrics})] + entries
+    
+    @classmethod
+    def _cut_short(cls, deadline: Optional[Deadline]) -> bool:
+        """Whether the request deadline stopped any upstream call for this run"""
+        return deadline is not None and deadline.exceeded
+    
+    @classmethod
+    def expected_fields(cls, include_stats: bool = True) -> List[str]:
+        """Fields a complete single-run response can contain"""
+        fields = list(DataTransformService.FIELD_MAPPINGS.values())
+        if include_stats:
+            fields.extend(StatsProcessingService.STATS_FIELDS)
+        return fields
+    
+    @classmethod
+    def _mark_partial(cls, run_data: Dict[str, Any], include_stats: bool) -> Dict[str, Any]:
+        """Flag run data gathered before the deadline ran out and list what is missing"""
+        run_data['partial'] = True
+        run_data['missing_fields'] = [field for field in cls.expected_fields(include_stats) if field not in run_data]
+        return run_data
     
     @classmethod
     def fetch_comparison_data(cls, id1: str, id2: str) -> Dict[str, Any]:
@@ -73,26 +287,44 @@ class RunDataService:
             Dictionary containing both runs' data and compatibility info
         """
         result = {}
+        cls._prefetch_details([id1, id2])
         
         # Fetch data for both runs
-        try:
-            data1 = cls.fetch_single_run_data(id1)
-            if data1:
-                result['id1'] = data1
-            else:
-                result['error_id1'] = f'ID 1: {id1} is incorrect.'
-        except Exception as e:
-            result['error_id1'] = f'Error fetching ID 1: {str(e)}'
-        
-        try:
-            data2 = cls.fetch_single_run_data(id2)
-            if data2:
-                result['id2'] = data2
-            else:
-                result['error_id2'] = f'ID 2: {id2} is incorrect.'
-        except Exception as e:
-            result['error_id2'] = f'Error fetching ID 2: {str(e)}'
+        for index, run_id in ((1, id1), (2, id2)):
+            try:
+                cls._add_comparison_run(result, index, run_id, cls.fetch_single_run_data(run_id))
+            except Exception as e:
+                cls._add_comparison_run(result, index, run_id, error=e)
         
+        return cls._apply_compatibility(cls._flag_partial(result, (result.get('id1'), result.get('id2'))))
+    
+    @classmethod
+    def _add_comparison_run(
+        cls,
+        result: Dict[str, Any],
+        index: int,
+        run_id: str,
+        data: Optional[Dict[str, Any]] = None,
+        error: Optional[Exception] = None
+    ) -> None:
+        """Record one run of a comparison, or the reason it is missing"""
+        if error is not None:
+            result[f'error_id{index}'] = f'Error fetching ID {index}: {str(error)}'
+        elif data:
+            result[f'id{index}'] = data
+        else:
+            result[f'error_id{index}'] = f'ID {index}: {run_id} is incorrect.'
+    
+    @classmethod
+    def _flag_partial(cls, result: Dict[str, Any], runs) -> Dict[str, Any]:
+        """Mark a multi-run response partial when any run was cut short by the deadline"""
+        if any(run and run.get('partial') for run in runs):
+            result['partial'] = True
+        return result
+    
+    @classmethod
+    def _apply_compatibility(cls, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Add comparison compatibility info to a two-run result"""
         # Check compatibility if both runs were fetched successfully
         if 'id1' in result and 'id2' in result:
             compatibility = CompatibilityService.check_workload_compatibility(
@@ -122,72 +354,139 @@ class RunDataService:
         return result
     
     @classmethod
-    def fetch_multiple_runs_data(cls, run_ids: list, max_runs: int = 5) -> Dict[str, Any]:
+    def fetch_multiple_runs_data(
+        cls,
+        run_ids: list,
+        max_runs: int = 5,
+        projection: Optional[Dict[str, List[str]]] = None
+    ) -> Dict[str, Any]:
         """
         Fetch data for multiple run IDs
         
+        Upstream requests are scheduled in the bulk priority class, behind
+        interactive single-run and comparison requests.
+        
         Args:
             run_ids: List of run IDs to fetch
             max_runs: Maximum number of runs to process
+            projection: Fields and metrics to return for every run (see resolve_projection)
             
         Returns:
             Dictionary containing results and errors
         """
+        cls._validate_run_ids(run_ids, max_runs)
+        
+        results = {}
+        errors = {}
+        
+        with priority_scope(BULK):
+            cls._prefetch_details(run_ids)
+            
+            for run_id in dict.fromkeys(run_ids):
+                try:
+                    data = cls.fetch_single_run_data(run_id, **cls.projection_kwargs(projection))
+                    if data:
+                        data['Test harness Log'] = cls._harness_log_link(run_id)
+                        results[run_id] = data
+                    else:
+                        errors[run_id] = "No data available for this ID"
+                except Exception as e:
+                    errors[run_id] = str(e)
+        
+        return cls._multiple_runs_response(run_ids, results, errors)
+    
+    @classmethod
+    def _uncached_run_ids(cls, run_ids: list) -> List[str]:
+        """Distinct run IDs whose details response is not cached yet"""
+        return [run_id for run_id in dict.fromkeys(run_ids) if f"details_{run_id}" not in api_cache]
+    
+    @classmethod
+    def _prefetch_details(cls, run_ids: list) -> None:
+        """
+        Fetch Runs API details for several runs in one go before they are processed one by one
+        
+        Details land in the artifact cache, where fetch_single_run_data picks them
+        up; per-run errors surface again when that run is processed.
+        """
+        uncached = cls._uncached_run_ids(run_ids)
+        if len(uncached) > 1:
+            ExternalAPIService.fetch_run_details_many(uncached)
+    
+    @classmethod
+    def _validate_run_ids(cls, run_ids: list, max_runs: int) -> None:
+        """Validate a multi-run request, raising ValueError on bad input"""
         if len(run_ids) > max_runs:
             raise ValueError(f'Maximum {max_runs} IDs allowed per request')
         
-        # Validate IDs
         invalid_ids = [id for id in run_ids if len(id) != 9]
         if invalid_ids:
             raise ValueError(f'All IDs must be exactly 9 characters long. Invalid IDs: {invalid_ids}')
-        
-        results = {}
-        errors = {}
-        
-        for run_id in run_ids:
-            try:
-                data = cls.fetch_single_run_data(run_id)
-                if data:
-                    # Add harness log link
-                    year_month = run_id[:4]
-                    data['Test harness Log'] = f'http://perfweb.gdl.englab.netapp.com/cgi-bin/perfcloud/view.cgi?p=/x/eng/perfcloud/RESULTS/{year_month}/{run_id}/cloud_test_harness.log'
-                    results[run_id] = data
-                else:
-                    errors[run_id] = "No data available for this ID"
-            except Exception as e:
-                errors[run_id] = str(e)
-        
-        return {
+    
+    @classmethod
+    def _harness_log_link(cls, run_id: str) -> str:
+        """Build the perfweb link to a run's test harness log"""
+        year_month = run_id[:4]
+        return f'http://perfweb.gdl.englab.netapp.com/cgi-bin/perfcloud/view.cgi?p=/x/eng/perfcloud/RESULTS/{year_month}/{run_id}/cloud_test_harness.log'
+    
+    @classmethod
+    def _multiple_runs_response(cls, run_ids: list, results: Dict[str, Any], errors: Dict[str, str]) -> Dict[str, Any]:
+        """Build the multi-run response body"""
+        return cls._flag_partial({
             'success_count': len(results),
             'error_count': len(errors),
             'total_requested': len(run_ids),
             'results': results,
             'errors': errors if errors else None
-        }
+        }, results.values())
 
 
 class GraphDataManagerService:
     """Service for managing graph data operations"""
     
+    # Response formats: a list of {latency, ops, throughput} points per run, or
+    # one value list per metric with the points sorted by SORT_METRIC
+    POINTS = 'points'
+    COLUMNAR = 'columnar'
+    FORMATS = (POINTS, COLUMNAR)
+    SORT_METRIC = 'ops'
+    
+    # Downsampling keeps the shape of the plotted latency vs throughput curve
+    X_METRIC = 'throughput'
+    Y_METRIC = 'latency'
+    MIN_POINTS = 3
+    
     @classmethod
-    def fetch_single_graph_data(cls, run_id: str) -> Optional[Dict[str, Any]]:
+    def fetch_single_graph_data(
+        cls,
+        run_id: str,
+        graph_format: str = POINTS,
+        max_points: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Fetch graph data for a single run with caching
         
         Args:
             run_id: The run ID to fetch graph data for
+            graph_format: POINTS or COLUMNAR
+            max_points: Downsample runs with more points than this (None: all points)
             
         Returns:
             Graph data or None if not available
         """
         cache_key = f"graph_{run_id}"
         
+        if max_points:
+            variant = api_cache.get(cls._downsampled_key(run_id, max_points))
+            if variant:
+                print(f"Found {max_points}-point graph data in memory cache for {run_id}")
+                return cls._graph_response(run_id, variant, graph_format)
+        
         # Check cache first
         cached_data = api_cache.get(cache_key)
         if cached_data:
             print(f"Found graph data in memory cache for {run_id}")
             # Return in consistent format with data_points wrapper
-            return {'data_points': {run_id: cached_data}}
+            return cls._graph_response(run_id, cls._downsample(run_id, cached_data, max_points), graph_format)
         
         # Fetch from external sources
         print(f"Fetching graph data from external API for {run_id}")
@@ -196,11 +495,13 @@ class GraphDataManagerService:
             graph_data = GraphDataService.fetch_graph_data(run_id)
             if graph_data:
                 # Cache the result
-                api_cache.put(cache_key, graph_data)
+                entry = cls.to_cache(graph_data)
+                api_cache.put(cache_key, entry)
                 # Return in consistent format with data_points wrapper
-                return {'data_points': {run_id: graph_data}}
+                if graph_format == cls.POINTS and not max_points:
+                    return {'data_points': {run_id: graph_data}}
+                return cls._graph_response(run_id, cls._downsample(run_id, entry, max_points), graph_format)
             else:
-                return None
                 print(f"No graph data found for {run_id}")
                 return None
                 
@@ -209,34 +510,149 @@ class GraphDataManagerService:
             return None
     
     @classmethod
-    def fetch_comparison_graph_data(cls, run_id1: str, run_id2: Optional[str] = None) -> Dict[str, Any]:
+    def to_cache(cls, graph_data: List[Dict[str, Any]]) -> Any:
+        """Compact cached form of graph data points (anything but complete points is cached as is)"""
+        types = GraphDataService.graph_types()
+        if not all(isinstance(point, dict) and point.keys() == types.keys() for point in graph_data):
+            return graph_data
+        return GraphSeries.from_points(graph_data, types)
+    
+    @classmethod
+    def from_cache(cls, cached: Any) -> List[Dict[str, Any]]:
+        """Public point list of a cached entry (entries persisted before GraphSeries are plain lists)"""
+        return cached.to_points() if isinstance(cached, GraphSeries) else cached
+    
+    @classmethod
+    def format_kwargs(cls, graph_format: str, max_points: Optional[int] = None) -> Dict[str, Any]:
+        """Keyword arguments passing a graph format and resolution on, none at all for the defaults"""
+        kwargs = {} if graph_format == cls.POINTS else {'graph_format': graph_format}
+        if max_points:
+            kwargs['max_points'] = max_points
+        return kwargs
+    
+    @classmethod
+    def resolve_max_points(cls, value: Optional[str]) -> Optional[int]:
+        """
+        Parse a requested maximum number of points per run
+        
+        Args:
+            value: Raw max_points value, None or empty for no limit
+            
+        Returns:
+            The limit, or None for all points
+            
+        Raises:
+            ValueError: If the value is not an integer of at least MIN_POINTS
+        """
+        if not value:
+            return None
+        try:
+            max_points = int(value)
+        except (TypeError, ValueError):
+            max_points = 0
+        if max_points < cls.MIN_POINTS:
+            raise ValueError(f"max_points must be an integer of at least {cls.MIN_POINTS}")
+        return max_points
+    
+    @classmethod
+    def _downsampled_key(cls, run_id: str, max_points: int) -> str:
+        return f"graph_{run_id}:lttb{max_points}"
+    
+    @classmethod
+    def _downsample(cls, run_id: str, entry: Any, max_points: Optional[int]) -> Any:
+        """
+        Downsample a cached graph entry, caching the variant for its resolution
+        
+        Entries with no more than max_points points, and plain entries cached
+        before GraphSeries, are returned unchanged.
+        """
+        if not max_points or not isinstance(entry, GraphSeries) or len(entry) <= max_points:
+            return entry
+        variant = entry.downsampled(cls.X_METRIC, cls.Y_METRIC, max_points)
+        api_cache.put(cls._downsampled_key(run_id, max_points), variant)
+        return variant
+    
+    @classmethod
+    def _graph_response(cls, run_id: str, entry: Any, graph_format: str) -> Dict[str, Any]:
+        """Single-run response for a cached graph entry in the requested format"""
+        if graph_format != cls.COLUMNAR:
+            return {'data_points': {run_id: cls.from_cache(entry)}}
+        
+        series = entry if isinstance(entry, GraphSeries) else cls.to_cache(entry)
+        columns = series.sorted_by(cls.SORT_METRIC).to_columns() if isinstance(series, GraphSeries) else entry
+        return cls._apply_format({'data_points': {run_id: columns}}, graph_format)
+    
+    @classmethod
+    def _apply_format(cls, response_data: Dict[str, Any], graph_format: str) -> Dict[str, Any]:
+        """Mark a columnar response and add axis bounds over every run in it"""
+        if graph_format != cls.COLUMNAR:
+            return response_data
+        
+        bounds = {}
+        for columns in response_data['data_points'].values():
+            if not isinstance(columns, dict):
+                continue
+            for name, values in columns.items():
+                if values:
+                    low, high = min(values), max(values)
+                    if name in bounds:
+                        low, high = min(low, bounds[name]['min']), max(high, bounds[name]['max'])
+                    bounds[name] = {'min': low, 'max': high}
+        response_data['format'] = cls.COLUMNAR
+        response_data['bounds'] = bounds
+        return response_data
+    
+    @classmethod
+    def fetch_comparison_graph_data(
+        cls,
+        run_id1: str,
+        run_id2: Optional[str] = None,
+        graph_format: str = POINTS,
+        max_points: Optional[int] = None
+    ) -> Dict[str, Any]:
         """
         Fetch graph data for one or two runs
         
         Args:
             run_id1: First run ID (required)
             run_id2: Second run ID (optional)
+            graph_format: POINTS or COLUMNAR
+            max_points: Downsample runs with more points than this (None: all points)
             
         Returns:
             Dictionary containing graph data and metadata
         """
+        format_kwargs = cls.format_kwargs(graph_format, max_points)
+        graph_data1 = cls.fetch_single_graph_data(run_id1, **format_kwargs)
+        graph_data2 = cls.fetch_single_graph_data(run_id2, **format_kwargs) if run_id2 else None
+        
+        response_data = cls._merge_graph_results(run_id1, graph_data1, run_id2, graph_data2)
+        
+        # Check compatibility if both runs have data
+        if run_id1 and run_id2 and run_id1 in response_data['data_points'] and run_id2 in response_data['data_points']:
+            cls._add_compatibility_warning(response_data, cls._check_graph_compatibility(run_id1, run_id2))
+        
+        return cls._apply_format(response_data, graph_format)
+    
+    @classmethod
+    def _merge_graph_results(
+        cls,
+        run_id1: str,
+        graph_data1: Optional[Dict[str, Any]],
+        run_id2: Optional[str],
+        graph_data2: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Merge one or two single-run graph results into a comparison response"""
         data_points = {}
         missing_data_messages = []
         
-        # Fetch data for first run
-        graph_data1 = cls.fetch_single_graph_data(run_id1)
-        if graph_data1 and 'data_points' in graph_data1:
-            data_points.update(graph_data1['data_points'])
-        else:
-            missing_data_messages.append(f"No graph data available for run ID: {run_id1}")
-        
-        # Fetch data for second run if provided
-        if run_id2:
-            graph_data2 = cls.fetch_single_graph_data(run_id2)
-            if graph_data2 and 'data_points' in graph_data2:
-                data_points.update(graph_data2['data_points'])
+        for run_id, graph_data in ((run_id1, graph_data1), (run_id2, graph_data2)):
+            if not run_id:
+                continue
+            if graph_data and 'data_points' in graph_data:
+                data_points.update(graph_data['data_points'])
             else:
-                missing_data_messages.append(f"No graph data available for run ID: {run_id2}")
+                missing_data_messages.append(f"No graph data available for run ID: {run_id}")
         
         # Prepare response
         response_data = {'data_points': data_points}
@@ -244,66 +660,81 @@ class GraphDataManagerService:
         if missing_data_messages:
             response_data['missing_data'] = missing_data_messages
         
-        # Check compatibility if both runs have data
-        if run_id1 and run_id2 and run_id1 in data_points and run_id2 in data_points:
-            compatibility = cls._check_graph_compatibility(run_id1, run_id2)
-            if not compatibility['compatible']:
-                # Return data with compatibility warning instead of error
-                response_data['compatibility_warning'] = {
-                    'message': f"Cannot generate meaningful comparison for runs with different {compatibility['error_type']} types",
-                    'error_type': compatibility['error_type'],
-                    **compatibility
-                }
-        
         return response_data
     
+    @classmethod
+    def _add_compatibility_warning(cls, response_data: Dict[str, Any], compatibility: Dict[str, Any]) -> None:
+        """Attach a compatibility warning when the two runs should not be compared"""
+        if not compatibility['compatible']:
+            # Return data with compatibility warning instead of error
+            response_data['compatibility_warning'] = {
+                'message': f"Cannot generate meaningful comparison for runs with different {compatibility['error_type']} types",
+                'error_type': compatibility['error_type'],
+                **compatibility
+            }
+    
     @classmethod
     def _check_graph_compatibility(cls, run_id1: str, run_id2: str) -> Dict[str, Any]:
         """Check compatibility between two runs for graph comparison"""
         
         try:
             # Get basic run details for compatibility check
-            data1 = ExternalAPIService.fetch_run_details(run_id1, 'workload,model')
-            data2 = ExternalAPIService.fetch_run_details(run_id2, 'workload,model')
+            details = ExternalAPIService.fetch_run_details_many([run_id1, run_id2], 'workload,model')
+            return cls._compare_run_details(*cls._raise_first_error(details, run_id1, run_id2))
             
-            if data1 and data2:
-                workload1 = data1.get('workload')
-                workload2 = data2.get('workload')
-                model1 = data1.get('model')
-                model2 = data2.get('model')
-                
-                # Check workload compatibility
-                if workload1 != workload2:
-                    return {
-                        'compatible': False,
-                        'workload_id1': workload1,
-                        'workload_id2': workload2,
-                        'model_id1': model1,
-                        'model_id2': model2,
-                        'error_type': 'workload'
-                    }
-                
-                # Check model compatibility
-                if model1 != model2:
-                    return {
-                        'compatible': False,
-                        'workload_id1': workload1,
-                        'workload_id2': workload2,
-                        'model_id1': model1,
-                        'model_id2': model2,
-                        'error_type': 'model'
-                    }
-                
+        except Exception as e:
+            print(f"Error checking compatibility: {e}")
+        
+        return cls._compare_run_details(None, None)
+    
+    @classmethod
+    def _raise_first_error(cls, details: Dict[str, Any], *run_ids: str) -> List[Optional[Dict[str, Any]]]:
+        """Pick runs out of a fetch_run_details_many result, raising the first per-run error"""
+        picked = [details[run_id] for run_id in run_ids]
+        for outcome in picked:
+            if isinstance(outcome, Exception):
+                raise outcome
+        return picked
+    
+    @classmethod
+    def _compare_run_details(cls, data1: Optional[Dict[str, Any]], data2: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Compare raw workload/model details of two runs"""
+        
+        if data1 and data2:
+            workload1 = data1.get('workload')
+            workload2 = data2.get('workload')
+            model1 = data1.get('model')
+            model2 = data2.get('model')
+            
+            # Check workload compatibility
+            if workload1 != workload2:
                 return {
-                    'compatible': True,
+                    'compatible': False,
                     'workload_id1': workload1,
                     'workload_id2': workload2,
                     'model_id1': model1,
-                    'model_id2': model2
+                    'model_id2': model2,
+                    'error_type': 'workload'
                 }
             
-        except Exception as e:
-            print(f"Error checking compatibility: {e}")
+            # Check model compatibility
+            if model1 != model2:
+                return {
+                    'compatible': False,
+                    'workload_id1': workload1,
+                    'workload_id2': workload2,
+                    'model_id1': model1,
+                    'model_id2': model2,
+                    'error_type': 'model'
+                }
+            
+            return {
+                'compatible': True,
+                'workload_id1': workload1,
+                'workload_id2': workload2,
+                'model_id1': model1,
+                'model_id2': model2
+            }
         
         # If error occurs or data unavailable, allow comparison
         return {
@@ -313,3 +744,310 @@ class GraphDataManagerService:
             'model_id1': 'Unknown',
             'model_id2': 'Unknown'
         }
+
+
+class AsyncRunDataService:
+    """Asyncio variant of RunDataService used by the ASGI views"""
+    
+    @classmethod
+    async def fetch_single_run_data(
+        cls,
+        run_id: str,
+        include_stats: bool = True,
+        projection: Optional[Dict[str, List[str]]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Fetch comprehensive data for a single run without blocking the event loop
+        
+        Args:
+            run_id: The run ID to fetch
+            include_stats: Whether to include detailed statistics
+            projection: Fields and metrics to return (see RunDataService.resolve_projection)
+            
+        Returns:
+            Complete (or projected) run data or None if not found
+        """
+        cache_key = f"details_{run_id}"
+        cached_data = await asyncio.to_thread(api_cache.get, cache_key)
+        if cached_data:
+            print(f"Found details data in memory cache for {run_id}")
+            return RunDataService.project(RunDataService.from_cache(cached_data), projection)
+        
+        entry = None
+        if include_stats:
+            entry = await asyncio.to_thread(api_cache.get, RunDataService._projected_key(run_id))
+        missing = RunDataService._missing_metrics(entry, projection, include_stats)
+        if entry and not missing:
+            print(f"Found projected details data in memory cache for {run_id}")
+            return RunDataService.project(RunDataService.from_cache(entry['data']), projection)
+        
+        print(f"Fetching details data from external API for {run_id}")
+        
+        graph_data = None
+        with child_scope() as deadline:
+            try:
+                if entry:
+                    raw_data = None
+                    stats_data = await cls._fetch_stats(run_id, missing)
+                elif missing:
+                    # Run details and the stats crawl are independent
+                    raw_data, stats_data = await asyncio.gather(
+                        AsyncExternalAPIService.fetch_run_details(run_id),
+                        cls._fetch_stats(run_id, missing),
+                        return_exceptions=True
+                    )
+                    if isinstance(raw_data, Exception):
+                        raise raw_data
+                else:
+                    raw_data = await AsyncExternalAPIService.fetch_run_details(run_id)
+                
+                if entry:
+                    run_data = dict(RunDataService.from_cache(entry['data']))
+                elif not raw_data:
+                    return None
+                else:
+                    run_data = DataTransformService.transform_run_data(raw_data)
+                
+                if missing:
+                    if isinstance(stats_data, Exception):
+                        print(f"Error fetching stats data for {run_id}: {stats_data}")
+                        run_data['stats_error'] = f"Could not fetch stats data: {str(stats_data)}"
+                    else:
+                        stats_data, graph_data = stats_data
+                        RunDataService._merge_stats(run_data, stats_data)
+                
+            except Exception as e:
+                if RunDataService._cut_short(deadline):
+                    return RunDataService.project(RunDataService._mark_partial({}, include_stats), projection)
+                raise Exception(f"Error fetching data for {run_id}: {str(e)}")
+            
+            if RunDataService._cut_short(deadline):
+                return RunDataService.project(RunDataService._mark_partial(run_data, include_stats), projection)
+        
+        for key, value in RunDataService._cache_entries(run_id, run_data, entry, missing, projection, graph_data):
+            await asyncio.to_thread(api_cache.put, key, value)
+        
+        print(f"Fetched data for {run_id}: {run_data}")
+        return RunDataService.project(run_data, projection)
+    
+    @classmethod
+    async def _fetch_stats(cls, run_id: str, missing: List[str]):
+        """
+        Stats crawl for the missing metrics (see RunDataService._fetch_stats),
+        returning its exception instead of raising it
+        """
+        try:
+            args = RunDataService._stats_args(missing)
+            if args:
+                return await AsyncStatsProcessingService.fetch_comprehensive_stats(run_id, *args), None
+            ingested = await AsyncRunIngestionService.ingest(run_id)
+            return ingested['stats'], ingested['graph_data']
+        except Exception as e:
+            return e
+    
+    @classmethod
+    async def fetch_comparison_data(cls, id1: str, id2: str) -> Dict[str, Any]:
+        """
+        Fetch data for two runs concurrently and check compatibility
+        
+        Args:
+            id1: First run ID
+            id2: Second run ID
+            
+        Returns:
+            Dictionary containing both runs' data and compatibility info
+        """
+        result = {}
+        await cls._prefetch_details([id1, id2])
+        outcomes = await asyncio.gather(
+            cls.fetch_single_run_data(id1),
+            cls.fetch_single_run_data(id2),
+            return_exceptions=True
+        )
+        
+        for index, run_id, outcome in ((1, id1, outcomes[0]), (2, id2, outcomes[1])):
+            if isinstance(outcome, Exception):
+                RunDataService._add_comparison_run(result, index, run_id, error=outcome)
+            else:
+                RunDataService._add_comparison_run(result, index, run_id, outcome)
+        
+        return RunDataService._apply_compatibility(
+            RunDataService._flag_partial(result, (result.get('id1'), result.get('id2')))
+        )
+    
+    @classmethod
+    async def fetch_multiple_runs_data(
+        cls,
+        run_ids: list,
+        max_runs: int = 5,
+        projection: Optional[Dict[str, List[str]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Fetch data for multiple run IDs concurrently, in the bulk priority class
+        
+        Args:
+            run_ids: List of run IDs to fetch
+            max_runs: Maximum number of runs to process
+            projection: Fields and metrics to return for every run (see RunDataService.resolve_projection)
+            
+        Returns:
+            Dictionary containing results and errors
+        """
+        RunDataService._validate_run_ids(run_ids, max_runs)
+        distinct_ids = list(dict.fromkeys(run_ids))
+        
+        with priority_scope(BULK):
+            await cls._prefetch_details(distinct_ids)
+            
+            outcomes = await asyncio.gather(
+                *(
+                    cls.fetch_single_run_data(run_id, **RunDataService.projection_kwargs(projection))
+                    for run_id in distinct_ids
+                ),
+                return_exceptions=True
+            )
+        
+        results = {}
+        errors = {}
+        for run_id, outcome in zip(distinct_ids, outcomes):
+            if isinstance(outcome, Exception):
+                errors[run_id] = str(outcome)
+            elif outcome:
+                outcome['Test harness Log'] = RunDataService._harness_log_link(run_id)
+                results[run_id] = outcome
+            else:
+                errors[run_id] = "No data available for this ID"
+        
+        return RunDataService._multiple_runs_response(run_ids, results, errors)
+    
+    @classmethod
+    async def _prefetch_details(cls, run_ids: list) -> None:
+        """
+        Fetch details for several runs with batched Runs API queries
+        
+        Runs are already fetched concurrently here, and each run's details
+        request overlaps its stats crawl, so this only pays off when
+        RUN_DETAILS_BATCH lets one query replace several requests.
+        """
+        if not ExternalAPIService.run_details_batch_config()['ENABLED']:
+            return
+        uncached = await asyncio.to_thread(RunDataService._uncached_run_ids, run_ids)
+        if len(uncached) > 1:
+            await AsyncExternalAPIService.fetch_run_details_many(uncached)
+
+
+class AsyncGraphDataManagerService:
+    """Asyncio variant of GraphDataManagerService used by the ASGI views"""
+    
+    @classmethod
+    async def fetch_single_graph_data(
+        cls,
+        run_id: str,
+        graph_format: str = GraphDataManagerService.POINTS,
+        max_points: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Fetch graph data for a single run with caching
+        
+        Args:
+            run_id: The run ID to fetch graph data for
+            graph_format: GraphDataManagerService.POINTS or COLUMNAR
+            max_points: Downsample runs with more points than this (None: all points)
+            
+        Returns:
+            Graph data or None if not available
+        """
+        cache_key = f"graph_{run_id}"
+        
+        if max_points:
+            variant = await asyncio.to_thread(
+                api_cache.get, GraphDataManagerService._downsampled_key(run_id, max_points)
+            )
+            if variant:
+                print(f"Found {max_points}-point graph data in memory cache for {run_id}")
+                return GraphDataManagerService._graph_response(run_id, variant, graph_format)
+        
+        cached_data = await asyncio.to_thread(api_cache.get, cache_key)
+        if cached_data:
+            print(f"Found graph data in memory cache for {run_id}")
+            return GraphDataManagerService._graph_response(
+                run_id,
+                await asyncio.to_thread(GraphDataManagerService._downsample, run_id, cached_data, max_points),
+                graph_format
+            )
+        
+        print(f"Fetching graph data from external API for {run_id}")
+        
+        try:
+            graph_data = await AsyncGraphDataService.fetch_graph_data(run_id)
+            if graph_data:
+                entry = GraphDataManagerService.to_cache(graph_data)
+                await asyncio.to_thread(api_cache.put, cache_key, entry)
+                if graph_format == GraphDataManagerService.POINTS and not max_points:
+                    return {'data_points': {run_id: graph_data}}
+                return GraphDataManagerService._graph_response(
+                    run_id,
+                    await asyncio.to_thread(GraphDataManagerService._downsample, run_id, entry, max_points),
+                    graph_format
+                )
+            
+            print(f"No graph data found for {run_id}")
+            return None
+            
+        except Exception as e:
+            print(f"Error fetching graph data for {run_id}: {e}")
+            return None
+    
+    @classmethod
+    async def fetch_comparison_graph_data(
+        cls,
+        run_id1: str,
+        run_id2: Optional[str] = None,
+        graph_format: str = GraphDataManagerService.POINTS,
+        max_points: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Fetch graph data for one or two runs concurrently
+        
+        Args:
+            run_id1: First run ID (required)
+            run_id2: Second run ID (optional)
+            graph_format: GraphDataManagerService.POINTS or COLUMNAR
+            max_points: Downsample runs with more points than this (None: all points)
+            
+        Returns:
+            Dictionary containing graph data and metadata
+        """
+        format_kwargs = GraphDataManagerService.format_kwargs(graph_format, max_points)
+        if not run_id2:
+            graph_data1 = await cls.fetch_single_graph_data(run_id1, **format_kwargs)
+            return GraphDataManagerService._apply_format(
+                GraphDataManagerService._merge_graph_results(run_id1, graph_data1, None, None), graph_format
+            )
+        
+        graph_data1, graph_data2 = await asyncio.gather(
+            cls.fetch_single_graph_data(run_id1, **format_kwargs),
+            cls.fetch_single_graph_data(run_id2, **format_kwargs)
+        )
+        response_data = GraphDataManagerService._merge_graph_results(run_id1, graph_data1, run_id2, graph_data2)
+        
+        if run_id1 in response_data['data_points'] and run_id2 in response_data['data_points']:
+            GraphDataManagerService._add_compatibility_warning(
+                response_data, await cls._check_graph_compatibility(run_id1, run_id2)
+            )
+        
+        return GraphDataManagerService._apply_format(response_data, graph_format)
+    
+    @classmethod
+    async def _check_graph_compatibility(cls, run_id1: str, run_id2: str) -> Dict[str, Any]:
+        """Check compatibility between two runs, fetching both details concurrently"""
+        try:
+            details = await AsyncExternalAPIService.fetch_run_details_many([run_id1, run_id2], 'workload,model')
+            return GraphDataManagerService._compare_run_details(
+                *GraphDataManagerService._raise_first_error(details, run_id1, run_id2)
+            )
+            
+        except Exception as e:
+            print(f"Error checking compatibility: {e}")
+        
+        return GraphDataManagerService._compare_run_details(None, None)
@@ -0,0 +1,86 @@
+"""
+Per-sample metric series and their summaries
+Stats files repeat their counters many times per iteration; series mode keeps
+every sample in compact double arrays and summarizes them with NumPy when it
+is installed (the standard library otherwise)
+"""
+import math
+from array import array
+from typing import Dict, Iterable, Optional
+
+try:
+    import numpy
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    numpy = None
+
+PERCENTILES = (50, 95, 99)
+
+
+def parse_samples(raw_values: Iterable[str], scale: float = 1.0) -> array:
+    """
+    Parse captured values into a double array
+
+    Args:
+        raw_values: Captured groups in file order
+        scale: Unit conversion applied to every sample
+
+    Returns:
+        Samples that parse as numbers
+    """
+    samples = array('d')
+    for raw in raw_values:
+        try:
+            samples.append(float(raw) * scale)
+        except ValueError:
+            continue
+    return samples
+
+
+def concat(parts: Iterable[array]) -> array:
+    """Join series in order into one array"""
+    joined = array('d')
+    for part in parts:
+        joined.extend(part)
+    return joined
+
+
+def _percentile(ordered: array, percentile: float) -> float:
+    """Linear interpolation between closest ranks (NumPy's default method)"""
+    rank = percentile / 100 * (len(ordered) - 1)
+    low = math.floor(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(samples: array) -> Optional[Dict[str, float]]:
+    """
+    Summarize a series
+
+    Args:
+        samples: Series to summarize
+
+    Returns:
+        count, mean, p50, p95, p99, stddev (population) and max, or None for an empty series
+    """
+    if not samples:
+        return None
+
+    if NUMPY_AVAILABLE:
+        values = numpy.frombuffer(samples, dtype=numpy.float64)
+        percentiles = numpy.percentile(values, PERCENTILES)
+        mean, stddev, maximum = values.mean(), values.std(), values.max()
+    else:
+        ordered = array('d', sorted(samples))
+        percentiles = [_percentile(ordered, percentile) for percentile in PERCENTILES]
+        mean = math.fsum(ordered) / len(ordered)
+        stddev = math.sqrt(math.fsum((value - mean) ** 2 for value in ordered) / len(ordered))
+        maximum = ordered[-1]
+
+    summary = {'count': len(samples), 'mean': float(mean)}
+    for percentile, value in zip(PERCENTILES, percentiles):
+        summary[f'p{percentile}'] = float(value)
+    summary['stddev'] = float(stddev)
+    summary['max'] = float(maximum)
+    return summary
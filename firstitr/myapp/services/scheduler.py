@@ -0,0 +1,229 @@
+"""
+Priority scheduling of upstream work
+Requests waiting for an upstream host's concurrency slots are served by weighted
+fair queuing across priority classes (interactive, bulk, background), with
+starvation protection and per-class queue metrics
+"""
+import contextvars
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from ..app_settings import get_setting
+from .adaptive_limiter import LatencyWindow
+
+INTERACTIVE = 'interactive'
+BULK = 'bulk'
+BACKGROUND = 'background'
+
+# Highest priority first
+PRIORITY_CLASSES = (INTERACTIVE, BULK, BACKGROUND)
+
+_current_priority = contextvars.ContextVar('upstream_priority', default=INTERACTIVE)
+
+
+def current_priority() -> str:
+    """The priority class of the work being done (interactive unless scoped otherwise)"""
+    return _current_priority.get()
+
+
+@contextmanager
+def priority_scope(priority: str) -> Iterator[str]:
+    """
+    Run a block's upstream requests in a priority class
+
+    Scopes only ever lower the priority: bulk work started from a background
+    job stays background.
+
+    Args:
+        priority: One of PRIORITY_CLASSES
+
+    Yields:
+        The effective priority class
+    """
+    if priority not in PRIORITY_CLASSES:
+        raise ValueError(f'Unknown priority class: {priority}')
+    effective = max(priority, current_priority(), key=PRIORITY_CLASSES.index)
+    token = _current_priority.set(effective)
+    try:
+        yield effective
+    finally:
+        _current_priority.reset(token)
+
+
+class Waiter:
+    """One request queued for a concurrency slot"""
+
+    __slots__ = ('priority', 'enqueued_at', 'granted')
+
+    def __init__(self, priority: str):
+        self.priority = priority
+        self.enqueued_at = time.monotonic()
+        self.granted = False
+
+
+class FairQueue:
+    """
+    Weighted fair queue of waiters for one host
+
+    Each class's head waiter carries a virtual start tag; the smallest tag is
+    served next and advances its class by 1 / WEIGHT, so backlogged classes
+    get slots in proportion to their weights. A head waiter older than
+    STARVATION_SECONDS is served first whatever its class. Not thread-safe on
+    its own: callers hold the limiter's lock.
+    """
+
+    def __init__(self, scheduler: 'WorkScheduler'):
+        self.scheduler = scheduler
+        self.queues = {priority: deque() for priority in PRIORITY_CLASSES}
+        self.tags = {priority: 0.0 for priority in PRIORITY_CLASSES}
+        self.clock = 0.0
+
+    def __len__(self) -> int:
+        return sum(len(queue) for queue in self.queues.values())
+
+    def push(self, priority: str) -> Waiter:
+        """Queue a waiter at the back of its class"""
+        queue = self.queues[priority]
+        if not queue:
+            # A class that was idle starts at the current virtual time rather than catching up
+            self.tags[priority] = max(self.tags[priority], self.clock)
+        waiter = Waiter(priority)
+        queue.append(waiter)
+        self.scheduler.queued(priority)
+        return waiter
+
+    def remove(self, waiter: Waiter) -> None:
+        """Drop a waiter that gave up before it was granted a slot"""
+        self.queues[waiter.priority].remove(waiter)
+        self.scheduler.gave_up(waiter)
+
+    def pop(self) -> Optional[Waiter]:
+        """Take the next waiter to grant a slot to, or None when nobody waits"""
+        heads = [queue[0] for queue in self.queues.values() if queue]
+        if not heads:
+            return None
+
+        fair = min(heads, key=lambda waiter: self.tags[waiter.priority])
+        oldest = min(heads, key=lambda waiter: waiter.enqueued_at)
+        starving = time.monotonic() - oldest.enqueued_at > self.scheduler.config['STARVATION_SECONDS']
+        waiter = oldest if starving else fair
+
+        self.queues[waiter.priority].popleft()
+        self.clock = max(self.clock, self.tags[waiter.priority])
+        self.tags[waiter.priority] += 1 / self.scheduler.weight(waiter.priority)
+        waiter.granted = True
+        self.scheduler.granted(waiter, promoted=waiter is not fair)
+        return waiter
+
+
+class ClassMetrics:
+    """Queue depth and wait times of one priority class"""
+
+    def __init__(self, window_size: int):
+        self.depth = 0
+        self.immediate = 0
+        self.granted = 0
+        self.rejected = 0
+        self.promoted = 0
+        self.max_wait = 0.0
+        self.waits = LatencyWindow(window_size)
+
+    def snapshot(self) -> Dict[str, Any]:
+        waits = self.waits.summary()
+        return {
+            'queue_depth': self.depth,
+            'immediate': self.immediate,
+            'queued_grants': self.granted,
+            'rejected': self.rejected,
+            'starvation_promotions': self.promoted,
+            'wait_p50_ms': waits['p50_ms'],
+            'wait_p95_ms': waits['p95_ms'],
+            'wait_p99_ms': waits['p99_ms'],
+            'max_wait_ms': round(self.max_wait * 1000, 1)
+        }
+
+
+class WorkScheduler:
+    """Process-wide scheduling policy and per-class metrics for all hosts' fair queues"""
+
+    DEFAULT_CONFIG = {
+        'WEIGHTS': {INTERACTIVE: 8, BULK: 2, BACKGROUND: 1},  # Share of contended slots per class
+        'STARVATION_SECONDS': 2.0,                            # Serve any waiter queued longer than this first
+    }
+
+    WAIT_WINDOW = 500  # Wait samples kept per class
+
+    def __init__(self, config: Dict[str, Any] = None):
+        self._config = config
+        self.lock = threading.Lock()
+        self.metrics = self._new_metrics()
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Effective configuration, read lazily so Django settings can apply"""
+        overrides = self._config if self._config is not None else get_setting('UPSTREAM_SCHEDULER', {})
+        return {**self.DEFAULT_CONFIG, **overrides}
+
+    def _new_metrics(self) -> Dict[str, ClassMetrics]:
+        return {priority: ClassMetrics(self.WAIT_WINDOW) for priority in PRIORITY_CLASSES}
+
+    @staticmethod
+    def current_priority() -> str:
+        """Priority class of the calling context"""
+        return current_priority()
+
+    def weight(self, priority: str) -> float:
+        """Positive weight of a class (missing classes get weight 1)"""
+        return max(float(self.config['WEIGHTS'].get(priority, 1)), 1e-6)
+
+    def queue(self) -> FairQueue:
+        """A new fair queue for one host"""
+        return FairQueue(self)
+
+    def admitted(self, priority: str) -> None:
+        """Count a request that got a slot without queueing"""
+        with self.lock:
+            self.metrics[priority].immediate += 1
+
+    def queued(self, priority: str) -> None:
+        with self.lock:
+            self.metrics[priority].depth += 1
+
+    def granted(self, waiter: Waiter, promoted: bool = False) -> None:
+        waited = time.monotonic() - waiter.enqueued_at
+        with self.lock:
+            metrics = self.metrics[waiter.priority]
+            metrics.depth -= 1
+            metrics.granted += 1
+            metrics.promoted += int(promoted)
+            metrics.max_wait = max(metrics.max_wait, waited)
+        metrics.waits.add(waited)
+
+    def gave_up(self, waiter: Waiter) -> None:
+        with self.lock:
+            metrics = self.metrics[waiter.priority]
+            metrics.depth -= 1
+            metrics.rejected += 1
+
+    def reset(self) -> None:
+        """Forget all metrics except the current queue depths"""
+        with self.lock:
+            metrics = self._new_metrics()
+            for priority, old in self.metrics.items():
+                metrics[priority].depth = old.depth
+            self.metrics = metrics
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get per-class scheduling metrics"""
+        with self.lock:
+            metrics = dict(self.metrics)
+        return {
+            'weights': {priority: self.weight(priority) for priority in PRIORITY_CLASSES},
+            'classes': {priority: metrics[priority].snapshot() for priority in PRIORITY_CLASSES}
+        }
+
+
+upstream_scheduler = WorkScheduler()
@@ -2,25 +2,27 @@
 Statistics processing service
 Handles extraction and processing of performance statistics from external sources
 """
+import asyncio
 import re
-from typing import Dict, Any, List, Optional
-from .api_service import ExternalAPIService, DataTransformService
+from typing import Callable, Dict, Any, List, Optional, Pattern
+from ..app_settings import get_setting
+from .api_service import ExternalAPIService, AsyncExternalAPIService
+from .concurrency import stats_fetch_executor
+from .iteration_ledger import RunLedger, UNSETTLED, iteration_ledger
+from .metric_registry import FetchPlan, metric_registry
+from .parse_pool import ParseJob, parse_pool
+from .sample_series import concat, parse_samples, summarize
+from .stream_scan import ScanMatches, scan_text
+
+# Reads one metric as (pattern name, value type) -> value, from file text or scan matches
+ValueGetter = Callable[[str, type], Any]
 
 
 class StatsProcessingService:
     """Service for processing performance statistics"""
     
-    STATS_PATTERNS = {
-        'throughput': r'write_data:(\d+)b/s',
-        'cache': r'read_io_type\.cache:(\d+)%',
-        'ext_cache': r'read_io_type\.ext_cache:(\d+)%',
-        'disk': r'read_io_type\.disk:(\d+)%',
-        'bamboo_ssd': r'read_io_type\.bamboo_ssd:(\d+)%',
-        'cpu_busy': r'cpu_busy:(\d+(?:\.\d+)?)%',
-        'rdma_latency': r'rdma_actual_latency\.WAFL_SPINNP_WRITE:(\d+(?:\.\d+)?)us',
-        'ldma_latency': r'ldma_actual_latency\.WAFL_SPINNP_WRITE:(\d+(?:\.\d+)?)us',
-        'instance_type': r'Instance Type:\s*([^\n\r]+)'
-    }
+    # Metric patterns, fields and file layout all derive from metric_registry
+    STATS_PATTERNS = {metric.name: metric.pattern for metric in metric_registry.details_metrics()}
     
     STATS_FILE_TYPES = {
         'workload': 'stats_workload.txt',
@@ -29,127 +31,339 @@ class StatsProcessingService:
         'wafl_flexlog': 'stats_wafl_flexlog.txt'
     }
     
+    # Fields _calculate_final_stats can produce, in response order
+    STATS_FIELDS = tuple(metric_registry.fields())
+    
+    # Metrics summarized per sample in series mode: metric name -> (label, unit scale)
+    SERIES_METRICS = {
+        metric.name: (metric.label, metric.scale)
+        for metric in metric_registry.details_metrics() if metric.per_iteration
+    }
+    
     @classmethod
-    def fetch_comprehensive_stats(cls, run_id: str) -> Dict[str, Any]:
+    def fetch_comprehensive_stats(cls, run_id: str, metrics: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Fetch comprehensive statistics for a run ID
         
+        Iterations settled by an earlier call (see iteration_ledger) are not
+        fetched again; only new iterations are parsed and merged into their maxima.
+        
         Args:
             run_id: The run ID to fetch stats for
+            metrics: Registry metric names to extract (all details metrics when None);
+                only the files they need are fetched
             
         Returns:
             Dictionary containing processed statistics
         """
         year_month = run_id[:4]
+        plan = metric_registry.details_plan(metrics)
+        if not plan.metrics:
+            return {}
         links = ExternalAPIService.fetch_perfweb_links(run_id)
         
         if not links:
             return {}
         
-        # Initialize collectors
-        collectors = {
-            'throughputs': [],
-            'cache_percentages': [],
-            'ext_cache_percentages': [],
-            'disk_percentages': [],
-            'bamboo_ssd_percentages': [],
-            'rdma_stats': [],
-            'ldma_stats': [],
-            'cpu_busy': []
-        }
-        
-        instance_type = None
-        
-        # Process each iteration link
-        for link in links:
-            cls._process_iteration_stats(
-                year_month, run_id, link, collectors
-            )
-            
-            # Get instance type (only need one)
-            if instance_type is None:
-                instance_type = cls._extract_instance_type(year_month, run_id, link)
+        ledger = iteration_ledger.for_run(run_id, links)
+        pending = cls._pending_iterations(ledger, links, plan)
+        tasks = cls._stats_tasks(ledger, links, pending, plan)
+        
+        if ExternalAPIService.streaming_enabled():
+            return cls._fetch_comprehensive_stats_streaming(year_month, run_id, links, pending, tasks, ledger, plan)
+        
+        texts = stats_fetch_executor.map_ordered(
+            lambda task: ExternalAPIService.fetch_stats_file(year_month, run_id, *task),
+            tasks
+        )
+        
+        collectors = cls._merge_iteration_texts(ledger, links, pending, texts, plan)
+        instance_type = cls._find_instance_type(
+            year_month, run_id, links, ledger, plan, texts[-1] if texts else None, streaming=False
+        )
         
         # Calculate final statistics
-        return cls._calculate_final_stats(collectors, instance_type)
+        return cls._calculate_final_stats(collectors, instance_type, cls._sample_statistics(ledger, links, plan))
     
     @classmethod
-    def _process_iteration_stats(
-        cls, 
-        year_month: str, 
-        run_id: str, 
-        link: str, 
-        collectors: Dict[str, List]
-    ) -> None:
-        """Process statistics for a single iteration"""
-        
-        # Process workload stats
-        workload_text = ExternalAPIService.fetch_stats_file(
-            year_month, run_id, link, cls.STATS_FILE_TYPES['workload']
+    def _fetch_comprehensive_stats_streaming(
+        cls,
+        year_month: str,
+        run_id: str,
+        links: List[str],
+        pending: List[str],
+        tasks: List,
+        ledger: RunLedger,
+        plan: FetchPlan
+    ) -> Dict[str, Any]:
+        """Streaming-mode fetch: scan each file only until its metrics are found"""
+        scans = stats_fetch_executor.map_ordered(
+            lambda task: ExternalAPIService.scan_stats_file(year_month, run_id, *task, cls.scan_patterns(task[1])),
+            tasks
         )
-        if workload_text:
-            cls._extract_workload_stats(workload_text, collectors)
         
-        # Process system stats
-        system_text = ExternalAPIService.fetch_stats_file(
-            year_month, run_id, link, cls.STATS_FILE_TYPES['system']
+        collectors = cls._merge_iteration_scans(ledger, links, pending, scans, plan)
+        instance_type = cls._find_instance_type(
+            year_month, run_id, links, ledger, plan, scans[-1] if scans else None, streaming=True
         )
-        if system_text:
-            cls._extract_system_stats(system_text, collectors)
         
-        # Process WAFL stats
-        wafl_text = ExternalAPIService.fetch_stats_file(
-            year_month, run_id, link, cls.STATS_FILE_TYPES['wafl_flexlog']
-        )
-        if wafl_text:
-            cls._extract_wafl_stats(wafl_text, collectors)
+        return cls._calculate_final_stats(collectors, instance_type)
     
     @classmethod
-    def _extract_workload_stats(cls, text: str, collectors: Dict[str, List]) -> None:
-        """Extract statistics from workload stats file"""
+    def _pending_iterations(cls, ledger: RunLedger, links: List[str], plan: FetchPlan) -> List[str]:
+        """Iterations whose planned metrics (and series, in series mode) are not settled yet"""
+        samples = plan.series_names() if cls.series_enabled() else ()
+        return ledger.pending_stats(links, collectors=plan.new_collectors(), samples=samples)
+    
+    @classmethod
+    def _stats_tasks(cls, ledger: RunLedger, links: List[str], pending: List[str], plan: Optional[FetchPlan] = None) -> List:
+        """(link, file) fetches for the pending iterations, plus the first VM instance file while the instance type is unknown"""
+        plan = plan or metric_registry.details_plan()
+        tasks = [(link, stats_type) for link in pending for stats_type in plan.iteration_files]
+        if ledger.instance_type is None and plan.includes('instance_type'):
+            tasks.append((links[0], cls.STATS_FILE_TYPES['vm_instance']))
+        iteration_ledger.record(reused=len(links) - len(pending), parsed=len(pending))
+        return tasks
+    
+    @classmethod
+    def scan_patterns(cls, stats_type: str) -> Dict[str, Pattern]:
+        """
+        Compiled patterns of every registered metric in a stats file
         
-        # Throughput
-        throughput = DataTransformService.extract_numeric_value(
-            text, cls.STATS_PATTERNS['throughput'], int
-        )
-        if throughput:
-            collectors['throughputs'].append(throughput)
+        The workload file also carries the graph metrics, so one pass over it
+        serves both the details and graph views.
+        """
+        return metric_registry.patterns(stats_type)
+    
+    @classmethod
+    def series_enabled(cls) -> bool:
+        """
+        Whether every sample of each metric is kept and summarized (STATS_SERIES setting)
+        
+        Series need whole file bodies, so they are skipped in streaming fetch mode.
+        """
+        return get_setting('STATS_SERIES', {}).get('ENABLED', False) and not ExternalAPIService.streaming_enabled()
+    
+    @classmethod
+    def _text_values(cls, text: str, stats_type: str) -> ValueGetter:
+        """Read metrics from a downloaded file body, scanned once for all of the file's patterns"""
+        return cls._scan_values(scan_text(text, cls.scan_patterns(stats_type)))
+    
+    @staticmethod
+    def _scan_values(matches: ScanMatches) -> ValueGetter:
+        """Read metrics from streamed scan matches"""
+        def value(name: str, value_type: type) -> Any:
+            raw = matches.get(name)
+            try:
+                return value_type(raw) if raw is not None else None
+            except ValueError:
+                return None
+        return value
+    
+    @classmethod
+    def _new_collectors(cls) -> Dict[str, List]:
+        """Create empty per-metric collectors"""
+        return {metric.collector: [] for metric in metric_registry.details_metrics() if metric.per_iteration}
+    
+    @classmethod
+    def _apply_iteration_scans(cls, scans: List[Optional[ScanMatches]], file_types: List[str], collectors: Dict[str, List]) -> None:
+        """Extract statistics from one iteration's scan matches into the collectors"""
+        for matches, stats_type in zip(scans, file_types):
+            if matches:
+                cls._collect_file_stats(stats_type, cls._scan_values(matches), collectors)
+    
+    @classmethod
+    def _merge_iteration_texts(
+        cls,
+        ledger: RunLedger,
+        links: List[str],
+        pending: List[str],
+        texts: List[Optional[str]],
+        plan: Optional[FetchPlan] = None
+    ) -> Dict[str, List]:
+        """
+        Merge fetched file contents of the pending iterations with the ledger's settled maxima
         
-        # Cache percentages
-        for cache_type in ['cache', 'ext_cache', 'disk', 'bamboo_ssd']:
-            percentage = DataTransformService.extract_numeric_value(
-                text, cls.STATS_PATTERNS[cache_type], int
-            )
-            if percentage is not None:
-                collectors[f'{cache_type}_percentages'].append(percentage)
+        Large bodies are scanned in the parse pool when PARSE_POOL is enabled.
+        """
+        plan = plan or metric_registry.details_plan()
+        series = cls.series_enabled()
+        parsed = parse_pool.scan_many(cls._parse_jobs(pending, texts, plan), all_matches=series)
+        return cls._merge_parsed(ledger, links, pending, parsed, plan, series)
+    
+    @classmethod
+    def _parse_jobs(cls, pending: List[str], texts: List[Optional[str]], plan: FetchPlan) -> List[ParseJob]:
+        """(body, patterns) scans of the pending iterations' files, in fetch order"""
+        file_types = plan.iteration_files
+        return [
+            (text, cls.scan_patterns(file_types[index % len(file_types)]))
+            for index, text in enumerate(texts[:len(pending) * len(file_types)])
+        ]
+    
+    @classmethod
+    def _merge_parsed(
+        cls,
+        ledger: RunLedger,
+        links: List[str],
+        pending: List[str],
+        parsed: List[Any],
+        plan: FetchPlan,
+        series: bool
+    ) -> Dict[str, List]:
+        """Merge scanned files: first matches, or every match in series mode"""
+        if series:
+            return cls._merge_iteration_series(ledger, links, pending, parsed, plan)
+        return cls._merge_pending(ledger, links, pending, parsed, cls._apply_iteration_scans, plan)
+    
+    @classmethod
+    def _merge_iteration_series(
+        cls,
+        ledger: RunLedger,
+        links: List[str],
+        pending: List[str],
+        parsed: List[Optional[Dict[str, List[str]]]],
+        plan: FetchPlan
+    ) -> Dict[str, List]:
+        """
+        Series-mode merge: each file was scanned once for every sample of its metrics
+        
+        The samples of each pending iteration are kept in the ledger; their first
+        values feed the same collectors as a first-match scan would.
+        """
+        file_types = plan.iteration_files
+        scans = []
+        for index, link in enumerate(pending):
+            samples = {}
+            for matches in parsed[index * len(file_types):(index + 1) * len(file_types)]:
+                if matches is None:
+                    scans.append(None)
+                    continue
+                scans.append({name: values[0] if values else None for name, values in matches.items()})
+                for name, values in matches.items():
+                    if name in cls.SERIES_METRICS:
+                        samples[name] = parse_samples(values, cls.SERIES_METRICS[name][1])
+            ledger.keep_samples(link, samples)
+        return cls._merge_pending(ledger, links, pending, scans, cls._apply_iteration_scans, plan)
+    
+    @classmethod
+    def _sample_statistics(cls, ledger: RunLedger, links: List[str], plan: Optional[FetchPlan] = None) -> Optional[Dict[str, Any]]:
+        """Per-run and per-iteration summaries of every kept sample, or None outside series mode"""
+        if not cls.series_enabled():
+            return None
+        
+        plan = plan or metric_registry.details_plan()
+        iterations = [ledger.samples_of(link) for link in links]
+        statistics = {}
+        for name in plan.series_names():
+            label = cls.SERIES_METRICS[name][0]
+            series = [iteration.get(name) for iteration in iterations]
+            if not any(series):
+                continue
+            statistics[label] = {
+                'run': summarize(concat(samples for samples in series if samples)),
+                'iterations': [summarize(samples) if samples else None for samples in series]
+            }
+        return statistics
+    
+    @classmethod
+    def _merge_iteration_scans(
+        cls,
+        ledger: RunLedger,
+        links: List[str],
+        pending: List[str],
+        scans: List[Optional[ScanMatches]],
+        plan: Optional[FetchPlan] = None
+    ) -> Dict[str, List]:
+        """Merge scan matches of the pending iterations with the ledger's settled maxima"""
+        plan = plan or metric_registry.details_plan()
+        return cls._merge_pending(ledger, links, pending, scans, cls._apply_iteration_scans, plan)
+    
+    @classmethod
+    def _merge_pending(
+        cls,
+        ledger: RunLedger,
+        links: List[str],
+        pending: List[str],
+        files: List,
+        apply: Callable,
+        plan: FetchPlan
+    ) -> Dict[str, List]:
+        """Collect each pending iteration on its own, settle it in the ledger when final, and merge it"""
+        collectors = ledger.collectors(plan.new_collectors())
+        per_link = len(plan.iteration_files)
+        for index, link in enumerate(pending):
+            iteration_files = files[index * per_link:(index + 1) * per_link]
+            iteration = plan.new_collectors()
+            apply(iteration_files, plan.iteration_files, iteration)
+            ledger.settle_stats(link, links, iteration_files, iteration)
+            for name, values in iteration.items():
+                collectors[name].extend(values)
+        return collectors
+    
+    @classmethod
+    def _extract_workload_stats(cls, text: str, collectors: Dict[str, List]) -> None:
+        """Extract statistics from workload stats file"""
+        workload_file = cls.STATS_FILE_TYPES['workload']
+        cls._collect_file_stats(workload_file, cls._text_values(text, workload_file), collectors)
     
     @classmethod
     def _extract_system_stats(cls, text: str, collectors: Dict[str, List]) -> None:
         """Extract statistics from system stats file"""
-        
-        cpu_busy = DataTransformService.extract_numeric_value(
-            text, cls.STATS_PATTERNS['cpu_busy'], float
-        )
-        if cpu_busy is not None:
-            collectors['cpu_busy'].append(cpu_busy)
+        system_file = cls.STATS_FILE_TYPES['system']
+        cls._collect_file_stats(system_file, cls._text_values(text, system_file), collectors)
     
     @classmethod
     def _extract_wafl_stats(cls, text: str, collectors: Dict[str, List]) -> None:
         """Extract statistics from WAFL stats file"""
+        wafl_file = cls.STATS_FILE_TYPES['wafl_flexlog']
+        cls._collect_file_stats(wafl_file, cls._text_values(text, wafl_file), collectors)
+    
+    @classmethod
+    def _collect_file_stats(cls, stats_type: str, value: ValueGetter, collectors: Dict[str, List]) -> None:
+        """Collect the per-iteration details metrics of one stats file"""
+        for metric in metric_registry.source_metrics(stats_type):
+            if metric.collector not in collectors or metric.label is None or not metric.per_iteration:
+                continue
+            reading = value(metric.name, metric.value_type)
+            if metric.accepts(reading):
+                collectors[metric.collector].append(reading)
+    
+    @classmethod
+    def _find_instance_type(
+        cls,
+        year_month: str,
+        run_id: str,
+        links: List[str],
+        ledger: RunLedger,
+        plan: FetchPlan,
+        first_vm_file: Any,
+        streaming: bool
+    ) -> Optional[str]:
+        """
+        The run's instance type, when the plan asks for it
         
-        # RDMA latency
-        rdma_latency = DataTransformService.extract_numeric_value(
-            text, cls.STATS_PATTERNS['rdma_latency'], float
-        )
-        if rdma_latency is not None:
-            collectors['rdma_stats'].append(rdma_latency)
+        Taken from the ledger once known, otherwise from the first iteration's
+        VM instance file (fetched with the stats tasks), trying later
+        iterations only if needed.
         
-        # LDMA latency
-        ldma_latency = DataTransformService.extract_numeric_value(
-            text, cls.STATS_PATTERNS['ldma_latency'], float
-        )
-        if ldma_latency is not None:
-            collectors['ldma_stats'].append(ldma_latency)
+        Args:
+            first_vm_file: First iteration's VM instance file text, or its scan matches when streaming
+        """
+        instance_type = ledger.instance_type
+        if instance_type is None and plan.includes('instance_type'):
+            vm_file = cls.STATS_FILE_TYPES['vm_instance']
+            instance_type = cls._instance_type_from_scan(first_vm_file) if streaming else cls._parse_instance_type(first_vm_file)
+            for link in links[1:]:
+                if instance_type is not None:
+                    break
+                if streaming:
+                    instance_type = cls._instance_type_from_scan(
+                        ExternalAPIService.scan_stats_file(year_month, run_id, link, vm_file, cls.scan_patterns(vm_file))
+                    )
+                else:
+                    instance_type = cls._extract_instance_type(year_month, run_id, link)
+            ledger.remember_instance_type(instance_type)
+        return instance_type
     
     @classmethod
     def _extract_instance_type(cls, year_month: str, run_id: str, link: str) -> Optional[str]:
@@ -158,7 +372,11 @@ class StatsProcessingService:
         vm_text = ExternalAPIService.fetch_stats_file(
             year_month, run_id, link, cls.STATS_FILE_TYPES['vm_instance']
         )
-        
+        return cls._parse_instance_type(vm_text)
+    
+    @classmethod
+    def _parse_instance_type(cls, vm_text: Optional[str]) -> Optional[str]:
+        """Parse the instance type from VM instance file content"""
         if vm_text:
             match = re.search(cls.STATS_PATTERNS['instance_type'], vm_text)
             if match:
@@ -167,56 +385,50 @@ class StatsProcessingService:
         return None
     
     @classmethod
-    def _calculate_final_stats(cls, collectors: Dict[str, List], instance_type: Optional[str]) -> Dict[str, Any]:
+    def _instance_type_from_scan(cls, matches: Optional[ScanMatches]) -> Optional[str]:
+        """Parse the instance type from VM instance file scan matches"""
+        if matches and matches.get('instance_type'):
+            return matches['instance_type'].strip()
+        return None
+    
+    @classmethod
+    def _calculate_final_stats(
+        cls,
+        collectors: Dict[str, List],
+        instance_type: Optional[str],
+        sample_statistics: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """Calculate final statistics from collected data"""
         
         stats_data = {}
         
         # Calculate maximums
-        if collectors['throughputs']:
-            stats_data['Maximum Throughput'] = max(collectors['throughputs']) / (1024 * 1024)
-        
-        if collectors['cache_percentages']:
-            stats_data['Maximum Cache Percentage'] = max(collectors['cache_percentages'])
-        
-        if collectors['ext_cache_percentages']:
-            stats_data['Maximum External Cache Percentage'] = max(collectors['ext_cache_percentages'])
-        
-        if collectors['disk_percentages']:
-            stats_data['Maximum Disk Percentage'] = max(collectors['disk_percentages'])
-        
-        if collectors['bamboo_ssd_percentages']:
-            stats_data['Maximum Bamboo SSD Percentage'] = max(collectors['bamboo_ssd_percentages'])
-        
-        if collectors['cpu_busy']:
-            stats_data['Maximum System CPU Busy'] = max(collectors['cpu_busy'])
-        
-        if collectors['rdma_stats']:
-            stats_data['Maximum WAFL RDMA Write Latency'] = max(collectors['rdma_stats'])
-        
-        if collectors['ldma_stats']:
-            stats_data['Maximum WAFL LDMA Write Latency'] = max(collectors['ldma_stats'])
+        for metric in metric_registry.details_metrics():
+            if metric.per_iteration and collectors.get(metric.collector):
+                stats_data[metric.field] = metric.convert(max(collectors[metric.collector]))
         
         if instance_type:
             stats_data['Instance Type'] = instance_type
         
+        if sample_statistics:
+            stats_data['Sample Statistics'] = sample_statistics
+        
         return stats_data
 
 
 class GraphDataService:
     """Service for processing graph data"""
     
-    GRAPH_PATTERNS = {
-        'latency': r'latency:(\d+\.\d+)us',
-        'ops': r'ops:(\d+)/s',
-        'throughput': r'write_data:(\d+)b/s'
-    }
+    GRAPH_PATTERNS = {metric.name: metric.pattern for metric in metric_registry.graph_metrics()}
     
     @classmethod
     def fetch_graph_data(cls, run_id: str) -> Optional[List[Dict[str, Any]]]:
         """
         Fetch graph data for a run ID
         
+        Points of iterations settled by an earlier call are reused; only new
+        iterations' workload files are fetched.
+        
         Args:
             run_id: The run ID to fetch graph data for
             
@@ -229,39 +441,221 @@ class GraphDataService:
         if not links:
             return None
         
+        ledger = iteration_ledger.for_run(run_id, links)
         graph_data = []
+        parsed = 0
+        streaming = ExternalAPIService.streaming_enabled()
+        workload_file = StatsProcessingService.STATS_FILE_TYPES['workload']
         
         for link in links:
-            stats_text = ExternalAPIService.fetch_stats_file(
-                year_month, run_id, link, 'stats_workload.txt'
-            )
+            data_point = ledger.graph_point(link)
+            if data_point is UNSETTLED:
+                parsed += 1
+                if streaming:
+                    workload = ExternalAPIService.scan_stats_file(
+                        year_month, run_id, link, workload_file, StatsProcessingService.scan_patterns(workload_file)
+                    )
+                else:
+                    workload = ExternalAPIService.fetch_stats_file(
+                        year_month, run_id, link, 'stats_workload.txt'
+                    )
+                data_point = cls._graph_point_from_workload(workload, streaming)
+                ledger.settle_graph(link, links, workload, data_point)
             
-            if stats_text:
-                data_point = cls._extract_graph_point(stats_text)
-                if data_point:
-                    graph_data.append(data_point)
+            if data_point:
+                graph_data.append(data_point)
         
+        iteration_ledger.record(reused=len(links) - parsed, parsed=parsed)
         return graph_data if graph_data else None
     
+    @classmethod
+    def _graph_point_from_workload(cls, workload: Any, streaming: bool) -> Optional[Dict[str, Any]]:
+        """Build a graph data point from a workload file's text or scan matches"""
+        if not workload:
+            return None
+        return cls._graph_point_from_scan(workload) if streaming else cls._extract_graph_point(workload)
+    
     @classmethod
     def _extract_graph_point(cls, stats_text: str) -> Optional[Dict[str, Any]]:
-        """Extract a single graph data point from stats text"""
+        """Extract a single graph data point from stats text in one pass over it"""
+        workload_file = StatsProcessingService.STATS_FILE_TYPES['workload']
+        return cls._graph_point_from_scan(parse_pool.scan(stats_text, StatsProcessingService.scan_patterns(workload_file)))
+    
+    @classmethod
+    def _graph_point_from_scan(cls, matches: ScanMatches) -> Optional[Dict[str, Any]]:
+        """Build a graph data point from workload file scan matches"""
+        return cls._graph_point(StatsProcessingService._scan_values(matches))
+    
+    @classmethod
+    def graph_types(cls) -> Dict[str, type]:
+        """Value type of each graph metric, in point order"""
+        return {metric.name: metric.value_type for metric in metric_registry.graph_metrics()}
+    
+    @classmethod
+    def _graph_point(cls, value: ValueGetter) -> Optional[Dict[str, Any]]:
+        """Build a graph data point when every graph metric (latency, ops, throughput) is present"""
+        point = {metric.name: value(metric.name, metric.value_type) for metric in metric_registry.graph_metrics()}
+        return point if all(point.values()) else None
+
+
+class AsyncStatsProcessingService:
+    """Asyncio variant of StatsProcessingService that fetches iteration files concurrently"""
+    
+    @classmethod
+    async def fetch_comprehensive_stats(cls, run_id: str, metrics: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Fetch comprehensive statistics for a run ID without blocking the event loop
         
-        latency = DataTransformService.extract_numeric_value(
-            stats_text, cls.GRAPH_PATTERNS['latency'], float
+        Args:
+            run_id: The run ID to fetch stats for
+            metrics: Registry metric names to extract (all details metrics when None)
+            
+        Returns:
+            Dictionary containing processed statistics
+        """
+        year_month = run_id[:4]
+        plan = metric_registry.details_plan(metrics)
+        if not plan.metrics:
+            return {}
+        links = await AsyncExternalAPIService.fetch_perfweb_links(run_id)
+        
+        if not links:
+            return {}
+        
+        ledger = iteration_ledger.for_run(run_id, links)
+        pending = StatsProcessingService._pending_iterations(ledger, links, plan)
+        tasks = StatsProcessingService._stats_tasks(ledger, links, pending, plan)
+        
+        # Fetch the pending iterations' files plus the first VM instance file, capped per run
+        per_run = asyncio.Semaphore(stats_fetch_executor.config['PER_RUN'])
+        
+        async def fetch(link: str, stats_type: str) -> Optional[str]:
+            async with per_run:
+                return await AsyncExternalAPIService.fetch_stats_file(year_month, run_id, link, stats_type)
+        
+        if ExternalAPIService.streaming_enabled():
+            return await cls._fetch_comprehensive_stats_streaming(year_month, run_id, links, pending, tasks, ledger, plan, per_run)
+        
+        texts = await asyncio.gather(*(fetch(*task) for task in tasks))
+        
+        series = StatsProcessingService.series_enabled()
+        parsed = await parse_pool.scan_many_async(StatsProcessingService._parse_jobs(pending, texts, plan), all_matches=series)
+        collectors = StatsProcessingService._merge_parsed(ledger, links, pending, parsed, plan, series)
+        instance_type = await cls._find_instance_type(
+            year_month, run_id, links, ledger, plan, texts[-1] if texts else None, streaming=False
         )
-        ops = DataTransformService.extract_numeric_value(
-            stats_text, cls.GRAPH_PATTERNS['ops'], int
+        
+        return StatsProcessingService._calculate_final_stats(
+            collectors, instance_type, StatsProcessingService._sample_statistics(ledger, links, plan)
         )
-        throughput = DataTransformService.extract_numeric_value(
-            stats_text, cls.GRAPH_PATTERNS['throughput'], int
+    
+    @classmethod
+    async def _fetch_comprehensive_stats_streaming(
+        cls,
+        year_month: str,
+        run_id: str,
+        links: List[str],
+        pending: List[str],
+        tasks: List,
+        ledger: RunLedger,
+        plan: FetchPlan,
+        per_run: asyncio.Semaphore
+    ) -> Dict[str, Any]:
+        """Streaming-mode fetch: scan each file only until its metrics are found"""
+        
+        async def scan(link: str, stats_type: str) -> Optional[ScanMatches]:
+            async with per_run:
+                return await AsyncExternalAPIService.scan_stats_file(
+                    year_month, run_id, link, stats_type, StatsProcessingService.scan_patterns(stats_type)
+                )
+        
+        scans = await asyncio.gather(*(scan(*task) for task in tasks))
+        
+        collectors = StatsProcessingService._merge_iteration_scans(ledger, links, pending, scans, plan)
+        instance_type = await cls._find_instance_type(
+            year_month, run_id, links, ledger, plan, scans[-1] if scans else None, streaming=True
         )
         
-        if latency and ops and throughput:
-            return {
-                'latency': latency,
-                'ops': ops,
-                'throughput': throughput
-            }
+        return StatsProcessingService._calculate_final_stats(collectors, instance_type)
+    
+    @classmethod
+    async def _find_instance_type(
+        cls,
+        year_month: str,
+        run_id: str,
+        links: List[str],
+        ledger: RunLedger,
+        plan: FetchPlan,
+        first_vm_file: Any,
+        streaming: bool
+    ) -> Optional[str]:
+        """Async variant of StatsProcessingService._find_instance_type"""
+        instance_type = ledger.instance_type
+        if instance_type is None and plan.includes('instance_type'):
+            vm_file = StatsProcessingService.STATS_FILE_TYPES['vm_instance']
+            if streaming:
+                instance_type = StatsProcessingService._instance_type_from_scan(first_vm_file)
+            else:
+                instance_type = StatsProcessingService._parse_instance_type(first_vm_file)
+            for link in links[1:]:
+                if instance_type is not None:
+                    break
+                if streaming:
+                    instance_type = StatsProcessingService._instance_type_from_scan(
+                        await AsyncExternalAPIService.scan_stats_file(
+                            year_month, run_id, link, vm_file, StatsProcessingService.scan_patterns(vm_file)
+                        )
+                    )
+                else:
+                    vm_text = await AsyncExternalAPIService.fetch_stats_file(year_month, run_id, link, vm_file)
+                    instance_type = StatsProcessingService._parse_instance_type(vm_text)
+            ledger.remember_instance_type(instance_type)
+        return instance_type
+
+
+class AsyncGraphDataService:
+    """Asyncio variant of GraphDataService"""
+    
+    @classmethod
+    async def fetch_graph_data(cls, run_id: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Fetch graph data for a run ID, downloading iteration files concurrently
         
-        return None
+        Args:
+            run_id: The run ID to fetch graph data for
+            
+        Returns:
+            List of data points or None if no data available
+        """
+        year_month = run_id[:4]
+        links = await AsyncExternalAPIService.fetch_perfweb_links(run_id)
+        
+        if not links:
+            return None
+        
+        ledger = iteration_ledger.for_run(run_id, links)
+        streaming = ExternalAPIService.streaming_enabled()
+        workload_file = StatsProcessingService.STATS_FILE_TYPES['workload']
+        
+        async def fetch(link: str) -> Any:
+            if streaming:
+                return await AsyncExternalAPIService.scan_stats_file(
+                    year_month, run_id, link, workload_file, StatsProcessingService.scan_patterns(workload_file)
+                )
+            return await AsyncExternalAPIService.fetch_stats_file(year_month, run_id, link, 'stats_workload.txt')
+        
+        points = {link: ledger.graph_point(link) for link in links}
+        pending = [link for link in links if points[link] is UNSETTLED]
+        workloads = await asyncio.gather(*(fetch(link) for link in pending))
+        if streaming:
+            scans = workloads
+        else:
+            patterns = StatsProcessingService.scan_patterns(workload_file)
+            scans = await parse_pool.scan_many_async([(workload, patterns) for workload in workloads])
+        for link, workload, matches in zip(pending, workloads, scans):
+            points[link] = GraphDataService._graph_point_from_scan(matches) if workload else None
+            ledger.settle_graph(link, links, workload, points[link])
+        iteration_ledger.record(reused=len(links) - len(pending), parsed=len(pending))
+        
+        graph_data = [points[link] for link in links if points[link]]
+        return graph_data if graph_data else None
@@ -0,0 +1,246 @@
+"""
+Incremental pattern scanning of upstream responses
+Matches line-oriented patterns while a body streams in so the download can
+stop as soon as every requested metric has been found
+"""
+import re
+from functools import lru_cache
+from typing import AsyncIterable, Dict, Iterable, List, Optional, Pattern, Tuple, Union
+
+ScanMatches = Dict[str, Optional[str]]
+
+# Characters with a meaning in regex syntax outside character classes
+_REGEX_SYNTAX = frozenset('.^$*+?{}[]|()')
+
+
+class LineScanner:
+    """
+    First-match scanner for a set of named single-group patterns
+
+    Patterns are tried line by line and dropped once matched, so work per
+    line shrinks as metrics are found. Every pattern used with the scanner
+    must match within one line (all perfweb stats patterns do).
+    """
+
+    def __init__(self, patterns: Dict[str, Pattern]):
+        self.pending = dict(patterns)
+        self.found = {}
+
+    @property
+    def done(self) -> bool:
+        return not self.pending
+
+    def feed(self, line: str) -> bool:
+        """
+        Scan one line
+
+        Args:
+            line: Decoded line without its terminator
+
+        Returns:
+            True once every pattern has matched
+        """
+        for name, pattern in list(self.pending.items()):
+            match = pattern.search(line)
+            if match:
+                self.found[name] = match.group(1)
+                del self.pending[name]
+        return self.done
+
+    def results(self) -> ScanMatches:
+        """First captured group per pattern name (None for patterns that never matched)"""
+        return {**{name: None for name in self.pending}, **self.found}
+
+
+def _decode(line: Union[str, bytes]) -> str:
+    return line.decode('utf-8', errors='replace') if isinstance(line, bytes) else line
+
+
+def scan_lines(lines: Iterable[Union[str, bytes]], patterns: Dict[str, Pattern]) -> ScanMatches:
+    """Scan lines until every pattern has matched or the input ends"""
+    scanner = LineScanner(patterns)
+    for line in lines:
+        if scanner.feed(_decode(line)):
+            break
+    return scanner.results()
+
+
+async def scan_lines_async(lines: AsyncIterable[str], patterns: Dict[str, Pattern]) -> ScanMatches:
+    """Async variant of scan_lines for httpx response.aiter_lines()"""
+    scanner = LineScanner(patterns)
+    async for line in lines:
+        if scanner.feed(_decode(line)):
+            break
+    return scanner.results()
+
+
+def _literal(source: str) -> Optional[str]:
+    """The text a regex source matches if it is a plain literal, else None"""
+    chars = []
+    index = 0
+    while index < len(source):
+        char = source[index]
+        if char == '\\':
+            if index + 1 == len(source) or source[index + 1].isalnum():
+                return None
+            char = source[index + 1]
+            index += 1
+        elif char in _REGEX_SYNTAX:
+            return None
+        chars.append(char)
+        index += 1
+    return ''.join(chars) or None
+
+
+class MultiPatternScanner:
+    """
+    First-match extraction of many key:value patterns in one pass over a body
+
+    Patterns shaped like LITERAL_KEY:rest (all perfweb stats patterns) are
+    folded into one regex that only stops at the anchor ':' and checks which
+    key precedes it, so the text is walked once for every metric instead of
+    once per metric, and the walk ends as soon as every pattern has matched.
+    Patterns that cannot be folded without changing their first match (a key
+    that is a suffix of another key, non-literal keys, backreferences, flags)
+    fall back to their own search.
+    """
+
+    ANCHOR = ':'
+
+    def __init__(self, patterns: Dict[str, Pattern]):
+        self.patterns = dict(patterns)
+        # Patterns with the same source are searched once and fill every name
+        self.names_by_source = {}
+        for name, pattern in self.patterns.items():
+            self.names_by_source.setdefault(pattern, []).append(name)
+
+        keys = {}
+        self.residual = []
+        for pattern in self.names_by_source:
+            split = self._split(pattern)
+            if split is None:
+                self.residual.append(pattern)
+            else:
+                keys[pattern] = split
+
+        for pattern, (key, _) in list(keys.items()):
+            if any(other is not pattern and other_key.endswith(key) for other, (other_key, _) in keys.items()):
+                # Both could match at the same anchor, where only one branch is reported
+                del keys[pattern]
+                self.residual.append(pattern)
+
+        self.combined = None
+        self.branches = {}
+        if keys:
+            anchor = re.escape(self.ANCHOR)
+            last_chars = ''.join(sorted({re.escape(key[-1]) for key, _ in keys.values()}))
+            branches = []
+            group = 1
+            for pattern, (key, rest) in keys.items():
+                # Zero-width branches: a match never hides a later anchor from finditer
+                branches.append(f'(?<={re.escape(key)}{anchor})(?=({rest}))')
+                self.branches[group] = pattern
+                group += 1 + pattern.groups
+            self.combined = re.compile(f'{anchor}(?<=[{last_chars}]{anchor})(?:{"|".join(branches)})')
+
+    @classmethod
+    def _split(cls, pattern: Pattern) -> Optional[Tuple[str, str]]:
+        """(literal key, rest of the regex source) if the pattern can join the combined regex"""
+        source = pattern.pattern
+        if not isinstance(source, str) or pattern.flags & ~re.UNICODE or pattern.groups < 1:
+            return None
+        key_source, anchor, rest = source.partition(cls.ANCHOR)
+        key = _literal(key_source)
+        if not anchor or key is None or re.search(r'\\\d|\(\?P', rest):
+            return None
+        return key, rest
+
+    def scan(self, text: str) -> ScanMatches:
+        """
+        Find the first match of every pattern
+
+        Args:
+            text: Body to scan
+
+        Returns:
+            First captured group per pattern name (None for patterns that never matched)
+        """
+        found = {}
+        for pattern in self.residual:
+            match = pattern.search(text)
+            found[pattern] = match.group(1) if match else None
+
+        if self.combined is not None:
+            pending = len(self.branches)
+            for match in self.combined.finditer(text):
+                pattern = self.branches[match.lastindex]
+                if pattern not in found:
+                    found[pattern] = match.group(match.lastindex + 1)
+                    pending -= 1
+                    if not pending:
+                        break
+
+        return self._by_name(found)
+
+    def scan_all(self, text: str) -> Dict[str, List[str]]:
+        """
+        Find every match of every pattern, still in one pass
+
+        Args:
+            text: Body to scan
+
+        Returns:
+            Captured groups per pattern name, in file order
+        """
+        found = {pattern: [] for pattern in self.names_by_source}
+        for pattern in self.residual:
+            found[pattern] = [match.group(1) for match in pattern.finditer(text)]
+
+        if self.combined is not None:
+            for match in self.combined.finditer(text):
+                found[self.branches[match.lastindex]].append(match.group(match.lastindex + 1))
+
+        return self._by_name(found)
+
+    def _by_name(self, found: Dict[Pattern, object]) -> Dict[str, object]:
+        return {
+            name: found.get(pattern)
+            for pattern, names in self.names_by_source.items()
+            for name in names
+        }
+
+
+@lru_cache(maxsize=64)
+def _scanner(patterns: Tuple[Tuple[str, Pattern], ...]) -> MultiPatternScanner:
+    return MultiPatternScanner(dict(patterns))
+
+
+def multi_pattern_scanner(patterns: Dict[str, Pattern]) -> MultiPatternScanner:
+    """Shared precompiled scanner for a set of named patterns"""
+    return _scanner(tuple(patterns.items()))
+
+
+def scan_text(text: str, patterns: Dict[str, Pattern]) -> ScanMatches:
+    """Apply the same first-match semantics to an already downloaded body, in one pass"""
+    return multi_pattern_scanner(patterns).scan(text)
+
+
+def scan_text_all(text: str, patterns: Dict[str, Pattern]) -> Dict[str, List[str]]:
+    """Collect every match of each pattern from a downloaded body, in one pass"""
+    return multi_pattern_scanner(patterns).scan_all(text)
+
+
+def find_all_lines(lines: Iterable[Union[str, bytes]], pattern: Pattern) -> List[str]:
+    """Collect every match of a pattern line by line (e.g. directory listing links)"""
+    found = []
+    for line in lines:
+        found.extend(pattern.findall(_decode(line)))
+    return found
+
+
+async def find_all_lines_async(lines: AsyncIterable[str], pattern: Pattern) -> List[str]:
+    """Async variant of find_all_lines"""
+    found = []
+    async for line in lines:
+        found.extend(pattern.findall(_decode(line)))
+    return found
@@ -0,0 +1,496 @@
+"""
+Upstream stand-in server
+Serves grover Runs API JSON, perfweb testdirview listings and view.cgi stats
+files from recorded fixtures or synthetic data, with injected latency, errors
+and bandwidth limits, so upstream behavior can be benchmarked offline
+"""
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import requests
+
+RESULTS_PREFIX = '/x/eng/perfcloud/RESULTS/'
+RUNS_PATH = re.compile(r'^/KO/rest/api/Runs/([^/?]+)$')
+ENDPOINTS = ('runs', 'listing', 'file')
+
+
+class LatencyDistribution:
+    """
+    Per-request service time parsed from a spec string
+
+    Specs (times in milliseconds):
+        fixed:20            always 20ms
+        uniform:5,50        uniform between 5 and 50ms
+        lognormal:20,0.8    median 20ms, sigma 0.8 (heavy right tail)
+        pareto:10,1.5       scale 10ms, shape 1.5 (very heavy tail)
+        trace:latencies.txt one latency per line, sampled with replacement
+    """
+
+    def __init__(self, spec: str, seed: Optional[int] = None):
+        self.spec = spec
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        kind, _, args = spec.partition(':')
+        self.kind = kind
+        if kind == 'trace':
+            with open(args) as trace:
+                self.samples = [float(line) for line in trace if line.strip()]
+            if not self.samples:
+                raise ValueError(f'Latency trace {args} is empty')
+            return
+        try:
+            self.params = [float(value) for value in args.split(',')] if args else []
+        except ValueError:
+            raise ValueError(f'Invalid latency spec: {spec}')
+        expected = {'fixed': 1, 'uniform': 2, 'lognormal': 2, 'pareto': 2}.get(kind)
+        if expected is None or len(self.params) != expected:
+            raise ValueError(f'Invalid latency spec: {spec}')
+
+    def sample(self) -> float:
+        """Draw one service time in seconds"""
+        with self.lock:
+            if self.kind == 'fixed':
+                millis = self.params[0]
+            elif self.kind == 'uniform':
+                millis = self.random.uniform(*self.params)
+            elif self.kind == 'lognormal':
+                median, sigma = self.params
+                millis = self.random.lognormvariate(math.log(median), sigma)
+            elif self.kind == 'pareto':
+                scale, shape = self.params
+                millis = scale * self.random.paretovariate(shape)
+            else:
+                millis = self.random.choice(self.samples)
+        return max(0.0, millis) / 1000
+
+
+class FaultProfile:
+    """Latency, error, dropped-connection and bandwidth behavior of the stand-in"""
+
+    def __init__(
+        self,
+        latency: Optional[Dict[str, LatencyDistribution]] = None,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        drop_rate: float = 0.0,
+        bandwidth: Optional[float] = None,
+        seed: Optional[int] = None
+    ):
+        """
+        Args:
+            latency: Distribution per endpoint ('runs', 'listing', 'file'), '*' for the rest
+            error_rate: Fraction of requests answered with error_status
+            error_status: HTTP status of injected errors
+            drop_rate: Fraction of requests whose connection is closed without a response
+            bandwidth: Bytes per second per response (None for unlimited)
+            seed: Seed for fault decisions
+        """
+        self.latency = latency or {}
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.drop_rate = drop_rate
+        self.bandwidth = bandwidth
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def delay_for(self, endpoint: str) -> float:
+        distribution = self.latency.get(endpoint) or self.latency.get('*')
+        return distribution.sample() if distribution is not None else 0.0
+
+    def outcome(self) -> Optional[str]:
+        """'drop', 'error' or None for a normal response"""
+        with self.lock:
+            roll = self.random.random()
+        if roll < self.drop_rate:
+            return 'drop'
+        if roll < self.drop_rate + self.error_rate:
+            return 'error'
+        return None
+
+
+def _safe_relative(relative: str) -> Optional[str]:
+    """A RESULTS-relative path without empty, '.' or '..' components"""
+    parts = relative.strip('/').split('/')
+    if not parts or any(part in ('', '.', '..') or '\\' in part for part in parts):
+        return None
+    return '/'.join(parts)
+
+
+class FixtureStore:
+    """
+    Recorded responses on disk
+
+    Layout:
+        runs/<run_id>.json                    Runs API record (all recorded fields)
+        results/<yymm>/<run_id>/...           Mirror of the RESULTS tree; listings
+                                              are the directories, stats files the files
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _results_path(self, relative: str) -> Optional[str]:
+        relative = _safe_relative(relative)
+        return os.path.join(self.root, 'results', *relative.split('/')) if relative else None
+
+    def _run_path(self, run_id: str) -> Optional[str]:
+        return os.path.join(self.root, 'runs', f'{run_id}.json') if _safe_relative(run_id) == run_id else None
+
+    def run_details(self, run_id: str) -> Optional[Dict[str, Any]]:
+        path = self._run_path(run_id)
+        if path is None or not os.path.isfile(path):
+            return None
+        with open(path) as run_file:
+            return json.load(run_file)
+
+    def listing(self, relative: str) -> Optional[List[str]]:
+        path = self._results_path(relative)
+        if path is None or not os.path.isdir(path):
+            return None
+        with os.scandir(path) as entries:
+            return sorted(entry.name for entry in entries if entry.is_dir())
+
+    def stats_file(self, relative: str) -> Optional[bytes]:
+        path = self._results_path(relative)
+        if path is None or not os.path.isfile(path):
+            return None
+        with open(path, 'rb') as stats_file:
+            return stats_file.read()
+
+    def save_run(self, run_id: str, data: Dict[str, Any]) -> None:
+        """Merge a Runs API response into the run's fixture"""
+        path = self._run_path(run_id)
+        if path is None:
+            return
+        record = {**(self.run_details(run_id) or {}), **data}
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as run_file:
+            json.dump(record, run_file, indent=2, sort_keys=True)
+
+    def save_listing(self, relative: str, names: List[str]) -> None:
+        path = self._results_path(relative)
+        if path is None:
+            return
+        os.makedirs(path, exist_ok=True)
+        for name in names:
+            if _safe_relative(name) == name:
+                os.makedirs(os.path.join(path, name), exist_ok=True)
+
+    def save_file(self, relative: str, body: bytes) -> None:
+        path = self._results_path(relative)
+        if path is None:
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as stats_file:
+            stats_file.write(body)
+
+
+class SyntheticData:
+    """
+    Deterministic runs generated from the run ID
+
+    Every 9-character run ID exists, with `iterations` iteration directories;
+    stats files carry the metrics the dashboard extracts at the top, followed
+    by `file_kb` of counter padding.
+    """
+
+    STATS_FILES = (
+        'stats_workload.txt',
+        'stats_system.txt',
+        'stats_wafl_flexlog.txt',
+        'system_node_virtual_machine_instance_show.txt'
+    )
+
+    def __init__(self, iterations: int = 8, file_kb: int = 16):
+        self.iterations = iterations
+        self.file_kb = file_kb
+
+    @staticmethod
+    def _random(*parts: str) -> random.Random:
+        return random.Random(hashlib.sha1('/'.join(parts).encode()).hexdigest())
+
+    def run_details(self, run_id: str) -> Optional[Dict[str, Any]]:
+        if len(run_id) != 9:
+            return None
+        rng = self._random(run_id)
+        return {
+            'workload': rng.choice(['fio_seq_write', 'fio_rand_read', 'oltp_mix']),
+            'peak_iter': rng.randint(1, self.iterations),
+            'ontap_ver': rng.choice(['9.15.1', '9.16.1']),
+            'peak_ops': rng.randint(20000, 400000),
+            'peak_lat': round(rng.uniform(0.2, 3.0), 2),
+            'model': rng.choice(['A400', 'A90', 'C250'])
+        }
+
+    def listing(self, relative: str) -> Optional[List[str]]:
+        parts = relative.strip('/').split('/')
+        if len(parts) != 3 or parts[2] != 'ontap_command_output' or len(parts[1]) != 9:
+            return None
+        return [f'{index:02d}_iter' for index in range(1, self.iterations + 1)]
+
+    def stats_file(self, relative: str) -> Optional[bytes]:
+        parts = relative.strip('/').split('/')
+        if len(parts) != 5 or parts[4] not in self.STATS_FILES:
+            return None
+        _, run_id, _, iteration, name = parts
+        if iteration not in (self.listing('/'.join(parts[:3])) or []):
+            return None
+        rng = self._random(run_id, iteration)
+        load = int(iteration.split('_')[0]) / self.iterations
+        if name == 'stats_workload.txt':
+            head = (
+                f'write_data:{int(load * rng.uniform(800, 1200) * 1024 * 1024)}b/s\n'
+                f'ops:{int(load * rng.uniform(40000, 60000))}/s\n'
+                f'latency:{rng.uniform(0.2, 1.0) + load * 2:.3f}us\n'
+                f'read_io_type.cache:{rng.randint(40, 90)}%\n'
+                f'read_io_type.ext_cache:{rng.randint(0, 10)}%\n'
+                f'read_io_type.disk:{rng.randint(0, 40)}%\n'
+                f'read_io_type.bamboo_ssd:{rng.randint(0, 5)}%\n'
+            )
+        elif name == 'stats_system.txt':
+            head = f'cpu_busy:{min(99.0, load * rng.uniform(60, 100)):.1f}%\n'
+        elif name == 'stats_wafl_flexlog.txt':
+            head = (
+                f'rdma_actual_latency.WAFL_SPINNP_WRITE:{rng.uniform(5, 40):.1f}us\n'
+                f'ldma_actual_latency.WAFL_SPINNP_WRITE:{rng.uniform(2, 20):.1f}us\n'
+            )
+        else:
+            return b'Instance Type: m5.4xlarge\n'
+        padding = b'counter.padding:0\n' * (self.file_kb * 1024 // 18)
+        return head.encode() + padding
+
+
+class Recorder:
+    """Fetches responses missing from the fixtures from the real upstream and stores them"""
+
+    LINK_NAME = re.compile(r'href="testdirview\.cgi\?p=[^"]+/([^"/]+)"')
+
+    def __init__(self, store: FixtureStore, runs_url: Optional[str], perfweb_url: Optional[str], timeout: float = 30):
+        self.store = store
+        self.runs_url = runs_url.rstrip('/') if runs_url else None
+        self.perfweb_url = perfweb_url.rstrip('/') if perfweb_url else None
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def run_details(self, run_id: str, query: str) -> Optional[Dict[str, Any]]:
+        if not self.runs_url:
+            return None
+        response = self.session.get(f'{self.runs_url}/{run_id}?{query}', timeout=self.timeout)
+        if not response.ok:
+            return None
+        data = response.json()
+        self.store.save_run(run_id, data)
+        return data
+
+    def listing(self, relative: str) -> Optional[List[str]]:
+        if not self.perfweb_url:
+            return None
+        response = self.session.get(f'{self.perfweb_url}/testdirview.cgi?p={RESULTS_PREFIX}{relative}', timeout=self.timeout)
+        if not response.ok:
+            return None
+        names = sorted(set(self.LINK_NAME.findall(response.text)))
+        self.store.save_listing(relative, names)
+        return names
+
+    def stats_file(self, relative: str) -> Optional[bytes]:
+        if not self.perfweb_url:
+            return None
+        response = self.session.get(f'{self.perfweb_url}/view.cgi?p={RESULTS_PREFIX}{relative}', timeout=self.timeout)
+        if not response.ok:
+            return None
+        self.store.save_file(relative, response.content)
+        return response.content
+
+
+class StandInServer(ThreadingHTTPServer):
+    """
+    HTTP server standing in for grover and perfweb
+
+    Data is looked up in the fixture store first, then (in record mode)
+    fetched from the real upstream and recorded, then generated synthetically
+    when enabled; anything else is a 404.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address,
+        store: Optional[FixtureStore] = None,
+        recorder: Optional[Recorder] = None,
+        synthetic: Optional[SyntheticData] = None,
+        faults: Optional[FaultProfile] = None
+    ):
+        super().__init__(address, StandInHandler)
+        self.store = store
+        self.recorder = recorder
+        self.synthetic = synthetic
+        self.faults = faults or FaultProfile()
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'errors': 0, 'dropped': 0, 'not_modified': 0, 'bytes_sent': 0}
+        self.endpoint_requests = {endpoint: 0 for endpoint in ENDPOINTS}
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def base_urls(self) -> Dict[str, str]:
+        """UPSTREAM_BASE_URLS pointing at this server"""
+        return {'RUNS_API': f'{self.base_url}/KO/rest/api/Runs', 'PERFWEB': f'{self.base_url}/cgi-bin/perfcloud'}
+
+    def lookup(self, kind: str, key: str) -> Any:
+        """Find a listing ('listing') or stats file ('stats_file') by RESULTS-relative path"""
+        for provider in (self.store, self.recorder, self.synthetic):
+            found = getattr(provider, kind)(key) if provider is not None else None
+            if found is not None:
+                return found
+        return None
+
+    def run_details(self, run_id: str, fields: List[str], query: str) -> Optional[Dict[str, Any]]:
+        """Find a Runs API record; in record mode, fields missing from the fixture are fetched"""
+        record = self.store.run_details(run_id) if self.store is not None else None
+        if self.recorder is not None and (record is None or any(field not in record for field in fields)):
+            recorded = self.recorder.run_details(run_id, query)
+            if recorded is not None:
+                record = {**(record or {}), **recorded}
+        if record is None and self.synthetic is not None:
+            record = self.synthetic.run_details(run_id)
+        return record
+
+    def count(self, name: str, amount: int = 1) -> None:
+        with self.lock:
+            self.stats[name] += amount
+
+    def get_status(self) -> Dict[str, Any]:
+        with self.lock:
+            return {**self.stats, 'endpoints': dict(self.endpoint_requests)}
+
+    def handle_error(self, request, client_address):
+        # Clients close streamed or timed-out responses early on purpose
+        pass
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Routes Runs API, testdirview and view.cgi requests to the server's data"""
+
+    protocol_version = 'HTTP/1.1'
+    CHUNK_SIZE = 16 * 1024
+
+    def setup(self):
+        super().setup()
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        query = parse_qs(parts.query)
+        endpoint, body, content_type = self._route(parts, query)
+
+        server = self.server
+        server.count('requests')
+        with server.lock:
+            if endpoint in server.endpoint_requests:
+                server.endpoint_requests[endpoint] += 1
+
+        time.sleep(server.faults.delay_for(endpoint))
+        outcome = server.faults.outcome()
+        if outcome == 'drop':
+            server.count('dropped')
+            self.close_connection = True
+            return
+        if outcome == 'error':
+            server.count('errors')
+            self._send(server.faults.error_status, b'injected error', 'text/plain')
+            return
+        if body is None:
+            self._send(404, b'not found', 'text/plain')
+            return
+
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        if self.headers.get('If-None-Match') == etag:
+            server.count('not_modified')
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self._send(200, body, content_type, etag)
+
+    def _route(self, parts, query):
+        """Resolve a request to (endpoint, body or None, content type)"""
+        runs = RUNS_PATH.match(parts.path)
+        if runs:
+            fields = [name for name in query.get('req_fields', [''])[0].split(',') if name]
+            record = self.server.run_details(runs.group(1), fields, parts.query)
+            if record is None:
+                # The Runs API reports unknown IDs as workload 0
+                record = {'workload': 0}
+            elif fields:
+                record = {name: record[name] for name in fields if name in record}
+            return 'runs', json.dumps(record).encode(), 'application/json'
+
+        target = unquote(query.get('p', [''])[0])
+        relative = _safe_relative(target[len(RESULTS_PREFIX):]) if target.startswith(RESULTS_PREFIX) else None
+        if parts.path.endswith('/testdirview.cgi'):
+            names = self.server.lookup('listing', relative) if relative else None
+            if names is None:
+                return 'listing', None, 'text/html'
+            links = ''.join(
+                f'<a href="testdirview.cgi?p={RESULTS_PREFIX}{relative}/{name}">{name}</a><br>\n' for name in names
+            )
+            return 'listing', f'<html><body>\n{links}</body></html>\n'.encode(), 'text/html'
+        if parts.path.endswith('/view.cgi'):
+            body = self.server.lookup('stats_file', relative) if relative else None
+            return 'file', body, 'text/plain'
+        return 'other', None, 'text/plain'
+
+    def _send(self, status: int, body: bytes, content_type: str, etag: Optional[str] = None) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        bandwidth = self.server.faults.bandwidth
+        try:
+            if not bandwidth:
+                self.wfile.write(body)
+            else:
+                for offset in range(0, len(body), self.CHUNK_SIZE):
+                    chunk = body[offset:offset + self.CHUNK_SIZE]
+                    self.wfile.write(chunk)
+                    time.sleep(len(chunk) / bandwidth)
+        except OSError:
+            self.close_connection = True
+            return
+        self.server.count('bytes_sent', len(body))
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_standin(host: str = '127.0.0.1', port: int = 0, **options) -> StandInServer:
+    """
+    Start a stand-in server on a background thread
+
+    Args:
+        host: Interface to bind
+        port: Port to bind (0 picks a free one)
+        **options: StandInServer arguments (store, recorder, synthetic, faults)
+
+    Returns:
+        The running server; call shutdown() and server_close() when done
+    """
+    server = StandInServer((host, port), **options)
+    threading.Thread(target=server.serve_forever, daemon=True, name='upstream-standin').start()
+    return server
@@ -1,10 +1,23 @@
 from django.urls import path
-from .views import FetchDetailsView, FetchGraphDataView, CacheStatusView, CacheManagementView, FetchMultipleRunsView
+from .app_settings import get_setting
+from .views import (
+    FetchDetailsView, FetchGraphDataView, CacheStatusView, CacheMemoryView, CacheManagementView, FetchMultipleRunsView, UpstreamStatusView,
+    AsyncFetchDetailsView, AsyncFetchGraphDataView, AsyncFetchMultipleRunsView
+)
+
+# Under ASGI the upstream-bound endpoints use async views so one process can
+# hold many in-flight perfweb fetches; WSGI keeps the sync views.
+if get_setting('ASYNC_VIEWS_ENABLED', False):
+    details_view, graph_view, multiple_runs_view = AsyncFetchDetailsView, AsyncFetchGraphDataView, AsyncFetchMultipleRunsView
+else:
+    details_view, graph_view, multiple_runs_view = FetchDetailsView, FetchGraphDataView, FetchMultipleRunsView
 
 urlpatterns = [
-    path('fetch-details/', FetchDetailsView.as_view(), name='fetch-details'),
-    path('fetch-graph-data/', FetchGraphDataView.as_view(), name='fetch-graph-data'),
-    path('fetch-multiple-runs/', FetchMultipleRunsView.as_view(), name='fetch-multiple-runs'),
+    path('fetch-details/', details_view.as_view(), name='fetch-details'),
+    path('fetch-graph-data/', graph_view.as_view(), name='fetch-graph-data'),
+    path('fetch-multiple-runs/', multiple_runs_view.as_view(), name='fetch-multiple-runs'),
     path('cache-status/', CacheStatusView.as_view(), name='cache-status'),
+    path('cache-memory/', CacheMemoryView.as_view(), name='cache-memory'),
     path('cache-management/', CacheManagementView.as_view(), name='cache-management'),
+    path('upstream-status/', UpstreamStatusView.as_view(), name='upstream-status'),
 ]
@@ -8,9 +8,44 @@ from .services import (
     CompatibilityService,
     StatsProcessingService,
     RunDataService,
-    GraphDataManagerService
+    GraphDataManagerService,
+    AsyncRunDataService,
+    AsyncGraphDataManagerService
 )
+from .services.artifact_cache import artifact_cache
+from .services.circuit_breaker import circuit_breakers
+from .services.adaptive_limiter import upstream_limiters
+from .services.hedging import hedging
+from .services.iteration_ledger import iteration_ledger
+from .services.parse_pool import parse_pool
+from .services.scheduler import upstream_scheduler
+from .services.deadline import deadline_scope, request_seconds
 from .cache_manager import api_cache
+from .app_settings import get_setting
+from .cache_introspection import allocation_snapshot
+
+def request_deadline(request):
+    """Time budget from ?deadline= (seconds) or REQUEST_DEADLINE; raises ValueError when invalid"""
+    return request_seconds(request.GET.get('deadline'))
+
+
+def request_projection(request):
+    """Projection from ?fields= and ?metrics= (comma-separated); None without them, ValueError on unknown names"""
+    requested = {}
+    for param in ('fields', 'metrics'):
+        value = request.GET.get(param)
+        if value:
+            requested[param] = [name.strip() for name in value.split(',') if name.strip()]
+    return RunDataService.resolve_projection(**requested)
+
+
+def request_graph_format(request):
+    """Graph response format from ?format= ('points' or 'columnar'); raises ValueError when unknown"""
+    graph_format = request.GET.get('format') or GraphDataManagerService.POINTS
+    if graph_format not in GraphDataManagerService.FORMATS:
+        raise ValueError(f"format must be one of: {', '.join(GraphDataManagerService.FORMATS)}")
+    return graph_format
+
 
 class FetchDetailsView(View):
     
@@ -22,14 +57,26 @@ class FetchDetailsView(View):
             return JsonResponse({'error': 'id1 or id parameter is required'}, status=400)
         
         try:
-            if id2:
-                # Comparison mode
-                result = RunDataService.fetch_comparison_data(id1, id2)
-            else:
-                # Single mode
-                result = RunDataService.fetch_single_run_data(id1)
-                if not result:
-                    return JsonResponse({'error': f'ID {id1} is incorrect.'}, status=400)
+            seconds = request_deadline(request)
+        except ValueError:
+            return JsonResponse({'error': 'deadline must be a positive number of seconds'}, status=400)
+        
+        try:
+            projection = request_projection(request)
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        
+        try:
+            # Upstream calls share the deadline; runs cut short come back with partial: true
+            with deadline_scope(seconds):
+                if id2:
+                    # Comparison mode
+                    result = RunDataService.fetch_comparison_data(id1, id2)
+                else:
+                    # Single mode
+                    result = RunDataService.fetch_single_run_data(id1, **RunDataService.projection_kwargs(projection))
+            if not id2 and not result:
+                return JsonResponse({'error': f'ID {id1} is incorrect.'}, status=400)
             
             return JsonResponse(result, safe=False)
         except Exception as e:
@@ -46,13 +93,21 @@ class FetchGraphDataView(View):
         if not id1:
             return JsonResponse({'error': 'run_id1 is required'}, status=400)
         
+        try:
+            format_kwargs = GraphDataManagerService.format_kwargs(
+                request_graph_format(request),
+                GraphDataManagerService.resolve_max_points(request.GET.get('max_points'))
+            )
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        
         try:
             if id2:
                 # Comparison mode - fetch data for both runs
-                result = GraphDataManagerService.fetch_comparison_graph_data(id1, id2)
+                result = GraphDataManagerService.fetch_comparison_graph_data(id1, id2, **format_kwargs)
             else:
                 # Single mode - fetch data for one run
-                result = GraphDataManagerService.fetch_single_graph_data(id1)
+                result = GraphDataManagerService.fetch_single_graph_data(id1, **format_kwargs)
                 print(result)
                 if not result:
                     return JsonResponse({'error': f'No graph data found for run {id1}'}, status=404)
@@ -70,12 +125,46 @@ class CacheStatusView(View):
         return JsonResponse(cache_status, safe=False)
 
 
+class UpstreamStatusView(View):
+    """View reporting the state of the upstream data layer"""
+    
+    def get(self, request):
+        return JsonResponse({
+            'artifact_cache': artifact_cache.get_status(),
+            'circuit_breakers': circuit_breakers.get_status(),
+            'upstream_limits': upstream_limiters.get_status(),
+            'hedging': hedging.get_status(),
+            'iteration_ledger': iteration_ledger.get_status(),
+            'scheduler': upstream_scheduler.get_status(),
+            'parse_pool': parse_pool.get_status()
+        }, safe=False)
+
+
+class CacheMemoryView(View):
+    """Opt-in view reporting per-entry cache memory usage"""
+    
+    def get(self, request):
+        if not get_setting('CACHE_INTROSPECTION_ENABLED', False):
+            return JsonResponse({'error': 'Cache introspection is disabled'}, status=404)
+        
+        try:
+            top_n = int(request.GET.get('top', 10))
+        except ValueError:
+            return JsonResponse({'error': 'top must be an integer'}, status=400)
+        
+        report = api_cache.get_memory_report(top_n)
+        report['tracemalloc'] = allocation_snapshot(top_n)
+        return JsonResponse(report, safe=False)
+
+
 @method_decorator(csrf_exempt, name='dispatch')
 class CacheManagementView(View):
     """View for managing cache operations"""
     
     def delete(self, request):
         api_cache.clear()
+        artifact_cache.clear()
+        iteration_ledger.reset()
         return JsonResponse({'status': 'Cache cleared successfully'}, safe=False)
 
 
@@ -88,13 +177,121 @@ class FetchMultipleRunsView(View):
         if not run_ids:
             return JsonResponse({'error': 'run_ids parameter is required'}, status=400)
         
+        try:
+            seconds = request_deadline(request)
+        except ValueError:
+            return JsonResponse({'error': 'deadline must be a positive number of seconds'}, status=400)
+        
+        try:
+            projection = request_projection(request)
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        
+        try:
+            run_ids_list = [rid.strip() for rid in run_ids.split(',') if rid.strip()]
+            
+            if len(run_ids_list) > 5:
+                return JsonResponse({'error': 'Maximum 5 run IDs allowed'}, status=400)
+            
+            with deadline_scope(seconds):
+                result = RunDataService.fetch_multiple_runs_data(run_ids_list, **RunDataService.projection_kwargs(projection))
+            return JsonResponse(result, safe=False)
+        except Exception as e:
+            return JsonResponse({'error': str(e)}, status=500)
+
+
+class AsyncFetchDetailsView(View):
+    """Async variant of FetchDetailsView, routed when the app runs under ASGI"""
+    
+    async def get(self, request):
+        id1 = request.GET.get('id1') or request.GET.get('id')  # Support both id1 and id parameters
+        id2 = request.GET.get('id2')
+        
+        if not id1:
+            return JsonResponse({'error': 'id1 or id parameter is required'}, status=400)
+        
+        try:
+            seconds = request_deadline(request)
+        except ValueError:
+            return JsonResponse({'error': 'deadline must be a positive number of seconds'}, status=400)
+        
+        try:
+            projection = request_projection(request)
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        
+        try:
+            with deadline_scope(seconds):
+                if id2:
+                    result = await AsyncRunDataService.fetch_comparison_data(id1, id2)
+                else:
+                    result = await AsyncRunDataService.fetch_single_run_data(id1, **RunDataService.projection_kwargs(projection))
+            if not id2 and not result:
+                return JsonResponse({'error': f'ID {id1} is incorrect.'}, status=400)
+            
+            return JsonResponse(result, safe=False)
+        except Exception as e:
+            return JsonResponse({'error': str(e)}, status=500)
+
+
+class AsyncFetchGraphDataView(View):
+    """Async variant of FetchGraphDataView, routed when the app runs under ASGI"""
+    
+    async def get(self, request):
+        id1 = request.GET.get('run_id1')
+        id2 = request.GET.get('run_id2')
+        
+        if not id1:
+            return JsonResponse({'error': 'run_id1 is required'}, status=400)
+        
+        try:
+            format_kwargs = GraphDataManagerService.format_kwargs(
+                request_graph_format(request),
+                GraphDataManagerService.resolve_max_points(request.GET.get('max_points'))
+            )
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        
+        try:
+            if id2:
+                result = await AsyncGraphDataManagerService.fetch_comparison_graph_data(id1, id2, **format_kwargs)
+            else:
+                result = await AsyncGraphDataManagerService.fetch_single_graph_data(id1, **format_kwargs)
+                if not result:
+                    return JsonResponse({'error': f'No graph data found for run {id1}'}, status=404)
+            
+            return JsonResponse(result, safe=False)
+        except Exception as e:
+            return JsonResponse({'error': str(e)}, status=500)
+
+
+class AsyncFetchMultipleRunsView(View):
+    """Async variant of FetchMultipleRunsView, routed when the app runs under ASGI"""
+    
+    async def get(self, request):
+        run_ids = request.GET.get('run_ids', '')
+        
+        if not run_ids:
+            return JsonResponse({'error': 'run_ids parameter is required'}, status=400)
+        
+        try:
+            seconds = request_deadline(request)
+        except ValueError:
+            return JsonResponse({'error': 'deadline must be a positive number of seconds'}, status=400)
+        
+        try:
+            projection = request_projection(request)
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        
         try:
             run_ids_list = [rid.strip() for rid in run_ids.split(',') if rid.strip()]
             
             if len(run_ids_list) > 5:
                 return JsonResponse({'error': 'Maximum 5 run IDs allowed'}, status=400)
             
-            result = RunDataService.fetch_multiple_runs_data(run_ids_list)
+            with deadline_scope(seconds):
+                result = await AsyncRunDataService.fetch_multiple_runs_data(run_ids_list, **RunDataService.projection_kwargs(projection))
             return JsonResponse(result, safe=False)
         except Exception as e:
             return JsonResponse({'error': str(e)}, status=500)
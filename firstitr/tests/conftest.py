@@ -2,6 +2,7 @@
 Test configuration and fixtures for the myapp tests
 Provides shared fixtures and configuration for all tests
 """
+from contextlib import ExitStack
 import pytest
 from unittest.mock import patch
 
@@ -21,6 +22,122 @@ def mock_cache():
         }
         yield mock_cache_instance
 
+@pytest.fixture
+def isolated_api_cache(request, tmp_path):
+    """
+    Empty response cache persisted under tmp_path, patched in as the run services' api_cache
+
+    Indirect parametrization passes LRUCache keyword arguments (e.g. {'max_size': 3}).
+    """
+    from myapp.cache_manager import LRUCache
+    cache = LRUCache(**getattr(request, 'param', {}))
+    cache.cache_file = str(tmp_path / 'cache_data.json')
+    cache.clear()
+    with patch('myapp.services.run_service.api_cache', cache):
+        yield cache
+
+class FakeRun:
+    """
+    Runs API and perfweb stand-in for a run whose iterations appear one refresh at a time
+
+    Iteration n's stats files come from files_of(n), keyed by filename; every
+    details, listing and file request is recorded.
+    """
+
+    def __init__(self, iterations, files_of, raw_details=None):
+        self.iterations = iterations
+        self.files_of = files_of
+        self.raw_details = raw_details
+        self.details = []
+        self.listings = 0
+        self.fetched = []
+
+    @property
+    def links(self):
+        return [f'link/{n:02d}_iter' for n in range(1, self.iterations + 1)]
+
+    @property
+    def fetched_types(self):
+        """Filenames of every file fetched, in request order"""
+        return [stats_type for _, stats_type in self.fetched]
+
+    @property
+    def requests(self):
+        """Listing and file requests made so far"""
+        return self.listings + len(self.fetched)
+
+    def fetch_run_details(self, run_id, *args, **kwargs):
+        self.details.append(run_id)
+        return dict(self.raw_details) if self.raw_details is not None else None
+
+    def fetch_perfweb_links(self, run_id):
+        self.listings += 1
+        return self.links
+
+    def fetch_stats_file(self, year_month, run_id, link, stats_type):
+        self.fetched.append((link, stats_type))
+        return self.files_of(int(link[-7:-5]))[stats_type]
+
+    def scan_stats_file(self, year_month, run_id, link, stats_type, patterns):
+        from myapp.services.stream_scan import scan_text
+        return scan_text(self.fetch_stats_file(year_month, run_id, link, stats_type), patterns)
+
+    async def fetch_perfweb_links_async(self, run_id):
+        return self.fetch_perfweb_links(run_id)
+
+    async def fetch_stats_file_async(self, year_month, run_id, link, stats_type):
+        return self.fetch_stats_file(year_month, run_id, link, stats_type)
+
+@pytest.fixture
+def fake_run():
+    """
+    Factory patching a FakeRun in for ExternalAPIService and AsyncExternalAPIService
+
+    Call it with the number of iterations listed, the files_of(n) factory and
+    optionally the raw Runs API details.
+    """
+    api = 'myapp.services.api_service.ExternalAPIService'
+    async_api = 'myapp.services.api_service.AsyncExternalAPIService'
+    with ExitStack() as stack:
+        def make(iterations, files_of, raw_details=None):
+            fake = FakeRun(iterations, files_of, raw_details)
+            for target, side_effect in (
+                (f'{api}.fetch_run_details', fake.fetch_run_details),
+                (f'{api}.fetch_perfweb_links', fake.fetch_perfweb_links),
+                (f'{api}.fetch_stats_file', fake.fetch_stats_file),
+                (f'{api}.scan_stats_file', fake.scan_stats_file),
+                (f'{async_api}.fetch_perfweb_links', fake.fetch_perfweb_links_async),
+                (f'{async_api}.fetch_stats_file', fake.fetch_stats_file_async),
+            ):
+                stack.enter_context(patch(target, side_effect=side_effect))
+            return fake
+        yield make
+
+# Process-wide singletons reset around every test: (module, attribute, reset method)
+SINGLETONS = [
+    ('myapp.services.artifact_cache', 'artifact_cache', 'clear'),
+    ('myapp.services.circuit_breaker', 'circuit_breakers', 'reset'),
+    ('myapp.services.adaptive_limiter', 'upstream_limiters', 'reset'),
+    ('myapp.services.hedging', 'hedging', 'reset'),
+    ('myapp.services.iteration_ledger', 'iteration_ledger', 'reset'),
+    ('myapp.services.scheduler', 'upstream_scheduler', 'reset'),
+    ('myapp.services.parse_pool', 'parse_pool', 'reset'),
+]
+
+@pytest.fixture(autouse=True)
+def reset_singletons():
+    """Start and end every test with empty caches, closed breakers and zeroed counters"""
+    import importlib
+    resets = [
+        getattr(getattr(importlib.import_module(module), name), method)
+        for module, name, method in SINGLETONS
+    ]
+    for reset in resets:
+        reset()
+    yield
+    for reset in resets:
+        reset()
+
 # Pytest configuration
 def pytest_configure(config):
     """Configure pytest settings"""
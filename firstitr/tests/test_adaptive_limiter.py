@@ -0,0 +1,240 @@
+"""
+Unit tests for adaptive upstream concurrency limits
+Tests latency percentiles, AIMD adjustments, slot waits and derived timeouts
+"""
+import asyncio
+import threading
+import time
+from unittest.mock import Mock, patch
+import pytest
+from myapp.services.adaptive_limiter import AdaptiveLimiter, AdaptiveLimiterRegistry, LatencyWindow, UpstreamBusyError
+from myapp.services.circuit_breaker import CircuitBreakerRegistry
+from myapp.services.http_client import UpstreamHTTPClient
+
+STATS_URL = 'http://perfweb/cgi-bin/perfcloud/view.cgi?p=/x/eng/perfcloud/RESULTS/2507/250729hhm/ontap_command_output/01_iter/stats_workload.txt'
+LISTING_URL = 'http://perfweb/cgi-bin/perfcloud/testdirview.cgi?p=/x/eng/perfcloud/RESULTS/2507/250729hhm/ontap_command_output'
+
+CONFIG = {
+    'INITIAL_LIMIT': 4,
+    'MIN_LIMIT': 1,
+    'MAX_LIMIT': 8,
+    'BACKOFF_RATIO': 0.5,
+    'LATENCY_TOLERANCE': 2.0,
+    'WINDOW_SIZE': 100,
+    'MIN_SAMPLES': 10,
+    'TIMEOUT_P99_MULTIPLIER': 3.0,
+    'MIN_TIMEOUT': 0.5,
+}
+
+
+def _warm_up(limiter, url, latency, count=10):
+    for _ in range(count):
+        limiter.acquire(wait=1)
+        limiter.release(url, latency)
+
+
+class TestLatencyWindow:
+    """Test cases for LatencyWindow"""
+
+    def test_percentiles(self):
+        """Test nearest-rank percentiles over the window"""
+        window = LatencyWindow(100)
+        for latency in range(1, 101):
+            window.add(latency / 1000)
+
+        assert window.percentile(50) == 0.05
+        assert window.percentile(99) == 0.099
+        assert window.summary() == {'samples': 100, 'p50_ms': 50.0, 'p95_ms': 95.0, 'p99_ms': 99.0}
+
+    def test_empty_window(self):
+        """Test percentiles of an empty window are None"""
+        assert LatencyWindow(10).percentile(99) is None
+
+
+class TestAdaptiveLimiter:
+    """Test cases for AdaptiveLimiter"""
+
+    def test_endpoint_keys(self):
+        """Test perfweb scripts and grover collections are separate endpoints"""
+        assert AdaptiveLimiter.endpoint_key(STATS_URL) == 'http://perfweb/cgi-bin/perfcloud/view.cgi'
+        assert AdaptiveLimiter.endpoint_key(LISTING_URL) == 'http://perfweb/cgi-bin/perfcloud/testdirview.cgi'
+        assert AdaptiveLimiter.endpoint_key('http://grover/KO/rest/api/Runs/250729hhm?req_fields=model') == 'http://grover/KO/rest/api/Runs'
+
+    def test_successes_increase_limit(self):
+        """Test on-time successes grow the limit additively"""
+        limiter = AdaptiveLimiter('http://perfweb', CONFIG)
+
+        _warm_up(limiter, STATS_URL, 0.01, count=20)
+
+        assert 5 <= limiter.limit <= CONFIG['MAX_LIMIT']
+
+    def test_failure_decreases_limit(self):
+        """Test a failure multiplies the limit by BACKOFF_RATIO"""
+        limiter = AdaptiveLimiter('http://perfweb', CONFIG)
+
+        limiter.acquire(wait=1)
+        limiter.release(STATS_URL, 0.01, failed=True)
+
+        assert limiter.limit == 2
+
+    def test_slow_call_decreases_limit(self):
+        """Test latency above tolerance x p50 is treated as congestion"""
+        limiter = AdaptiveLimiter('http://perfweb', CONFIG)
+        _warm_up(limiter, STATS_URL, 0.01)
+        before = limiter.limit
+
+        limiter.acquire(wait=1)
+        limiter.release(STATS_URL, 0.05)
+
+        assert limiter.limit == pytest.approx(before * CONFIG['BACKOFF_RATIO'])
+
+    def test_limit_respects_bounds(self):
+        """Test the limit never leaves [MIN_LIMIT, MAX_LIMIT]"""
+        limiter = AdaptiveLimiter('http://perfweb', CONFIG)
+
+        for _ in range(10):
+            limiter.last_decrease = 0.0
+            limiter.acquire(wait=1)
+            limiter.release(STATS_URL, 0.0, failed=True)
+        assert limiter.limit == CONFIG['MIN_LIMIT']
+
+        _warm_up(limiter, STATS_URL, 0.0, count=500)
+        assert limiter.limit == CONFIG['MAX_LIMIT']
+
+    def test_acquire_waits_for_slot(self):
+        """Test a caller blocks until another request releases its slot"""
+        limiter = AdaptiveLimiter('http://perfweb', {**CONFIG, 'INITIAL_LIMIT': 1})
+        limiter.acquire(wait=1)
+
+        timer = threading.Timer(0.05, limiter.release, args=(STATS_URL, 0.05))
+        timer.start()
+        start = time.perf_counter()
+        limiter.acquire(wait=1)
+
+        assert time.perf_counter() - start >= 0.04
+        assert limiter.in_flight == 1
+
+    def test_acquire_gives_up(self):
+        """Test UpstreamBusyError is raised when no slot frees up in time"""
+        limiter = AdaptiveLimiter('http://perfweb', {**CONFIG, 'INITIAL_LIMIT': 1})
+        limiter.acquire(wait=1)
+
+        with pytest.raises(UpstreamBusyError):
+            limiter.acquire(wait=0.02)
+        assert limiter.snapshot()['rejected'] == 1
+
+    def test_async_acquire_gives_up(self):
+        """Test the event-loop acquire also honours the wait"""
+        limiter = AdaptiveLimiter('http://perfweb', {**CONFIG, 'INITIAL_LIMIT': 1})
+        limiter.acquire(wait=1)
+
+        with pytest.raises(UpstreamBusyError):
+            asyncio.run(limiter.acquire_async(wait=0.02))
+
+    def test_timeout_uses_default_until_warmed_up(self):
+        """Test the fixed timeout applies before MIN_SAMPLES latencies are known"""
+        limiter = AdaptiveLimiter('http://perfweb', CONFIG)
+        _warm_up(limiter, STATS_URL, 0.2, count=5)
+
+        assert limiter.timeout_for(STATS_URL, 10) == 10
+
+    def test_timeout_derived_from_p99(self):
+        """Test warmed-up endpoints get multiplier x p99, within the bounds"""
+        limiter = AdaptiveLimiter('http://perfweb', CONFIG)
+        _warm_up(limiter, STATS_URL, 0.2)
+        _warm_up(limiter, LISTING_URL, 0.01)
+
+        assert limiter.timeout_for(STATS_URL, 10) == pytest.approx(0.6)
+        assert limiter.timeout_for(STATS_URL, 0.3) == 0.3
+        assert limiter.timeout_for(LISTING_URL, 15) == CONFIG['MIN_TIMEOUT']
+
+
+class TestUpstreamClientLimits:
+    """Test cases for the limiter inside UpstreamHTTPClient"""
+
+    def _client(self, **overrides):
+        limiters = AdaptiveLimiterRegistry({**CONFIG, **overrides})
+        client = UpstreamHTTPClient({}, breakers=CircuitBreakerRegistry({}), limiters=limiters)
+        return client, limiters
+
+    def test_derived_timeout_is_sent(self):
+        """Test requests use the latency-derived timeout once warmed up"""
+        client, limiters = self._client()
+        _warm_up(limiters.limiter_for('http://perfweb'), STATS_URL, 0.2)
+        session = Mock()
+        session.get.return_value = Mock(status_code=200)
+
+        with patch.object(client, 'session_for', return_value=session):
+            client.get(STATS_URL, timeout=10)
+
+        assert session.get.call_args.kwargs['timeout'] == pytest.approx(0.6)
+
+    def test_slot_wait_comes_out_of_the_timeout(self):
+        """Test time spent waiting for a slot is taken off the request timeout"""
+        client, limiters = self._client(INITIAL_LIMIT=1)
+        limiter = limiters.limiter_for('http://perfweb')
+        limiter.acquire(wait=1)
+        timer = threading.Timer(0.3, limiter.release, args=(STATS_URL, None))
+        timer.start()
+        session = Mock()
+        session.get.return_value = Mock(status_code=200)
+
+        with patch.object(client, 'session_for', return_value=session):
+            client.get(STATS_URL, timeout=1)
+
+        assert session.get.call_args.kwargs['timeout'] <= 0.75
+
+    def test_slot_granted_too_late(self):
+        """Test a slot granted once the whole timeout was spent waiting is given back"""
+        client, limiters = self._client(INITIAL_LIMIT=1)
+        limiter = limiters.limiter_for('http://perfweb')
+        session = Mock()
+
+        with patch.object(client, 'session_for', return_value=session), \
+                patch('myapp.services.http_client.time.perf_counter', side_effect=[0.0, 2.0]):
+            with pytest.raises(UpstreamBusyError):
+                client.get(STATS_URL, timeout=1)
+
+        session.get.assert_not_called()
+        assert limiter.in_flight == 0
+
+    def test_slot_released_after_errors(self):
+        """Test failed requests give their slot back and shrink the limit"""
+        client, limiters = self._client()
+        session = Mock()
+        session.get.side_effect = UpstreamBusyError('boom')
+
+        with patch.object(client, 'session_for', return_value=session):
+            with pytest.raises(UpstreamBusyError):
+                client.get(STATS_URL, timeout=10)
+
+        status = limiters.get_status()['http://perfweb']
+        assert status['in_flight'] == 0
+        assert status['limit'] == 2
+
+    def test_concurrency_is_bounded(self):
+        """Test no more than the current limit of requests are in flight"""
+        client, limiters = self._client(MAX_LIMIT=4)
+        lock = threading.Lock()
+        state = {'active': 0, 'peak': 0}
+
+        def fake_get(url, timeout, **kwargs):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            time.sleep(0.02)
+            with lock:
+                state['active'] -= 1
+            return Mock(status_code=200)
+
+        session = Mock()
+        session.get.side_effect = fake_get
+        with patch.object(client, 'session_for', return_value=session):
+            threads = [threading.Thread(target=client.get, args=(STATS_URL, 5)) for _ in range(12)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert state['peak'] <= 4
+        assert limiters.get_status()['http://perfweb']['in_flight'] == 0
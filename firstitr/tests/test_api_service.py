@@ -12,7 +12,7 @@ from myapp.services.api_service import ExternalAPIService, DataTransformService,
 class TestExternalAPIService:
     """Test cases for ExternalAPIService"""
     
-    @patch('myapp.services.api_service.requests.get')
+    @patch('myapp.services.api_service.upstream_http.get')
     def test_fetch_run_details_success(self, mock_get):
         """Test successful API call for run details"""
         # Setup mock response
@@ -37,7 +37,7 @@ class TestExternalAPIService:
         assert result == sample_data
         mock_get.assert_called_once()
     
-    @patch('myapp.services.api_service.requests.get')
+    @patch('myapp.services.api_service.upstream_http.get')
     def test_fetch_run_details_invalid_workload(self, mock_get):
         """Test API response with workload=0 (invalid ID)"""
         mock_response = Mock()
@@ -49,7 +49,7 @@ class TestExternalAPIService:
         
         assert result is None
     
-    @patch('myapp.services.api_service.requests.get')
+    @patch('myapp.services.api_service.upstream_http.get')
     def test_fetch_run_details_network_error(self, mock_get):
         """Test API call with network error"""
         mock_get.side_effect = RequestException("Network error")
@@ -59,7 +59,7 @@ class TestExternalAPIService:
         
         assert "Network error fetching data for 123456789" in str(exc_info.value)
 
-    @patch('myapp.services.api_service.requests.get')
+    @patch('myapp.services.api_service.upstream_http.get')
     def test_fetch_run_details_with_real_data_structure(self, mock_get):
         """Test API call using real data structure from production cache"""
         # Real API response structure (before transformation)
@@ -90,7 +90,7 @@ class TestExternalAPIService:
         expected_url = f'{ExternalAPIService.BASE_API_URL}/250729hhm?req_fields={ExternalAPIService.DEFAULT_FIELDS}'
         mock_get.assert_called_once_with(expected_url, timeout=30)
 
-    @patch('myapp.services.api_service.requests.get')
+    @patch('myapp.services.api_service.upstream_http.get')
     def test_fetch_run_details_real_workload_validation(self, mock_get):
         """Test workload validation with real workload types"""
         # Test with valid workload (non-zero)
@@ -119,7 +119,7 @@ class TestExternalAPIService:
         result = ExternalAPIService.fetch_run_details('invalid123')
         assert result is None
 
-    @patch('myapp.services.api_service.requests.get')
+    @patch('myapp.services.api_service.upstream_http.get')
     def test_fetch_perfweb_links_real_format(self, mock_get):
         """Test perfweb links fetching with real URL patterns"""
         # Mock HTML response with real perfweb link patterns
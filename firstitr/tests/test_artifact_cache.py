@@ -0,0 +1,230 @@
+"""
+Unit tests for the raw artifact cache
+Tests TTL, byte budget eviction and read-through from ExternalAPIService
+"""
+import json
+from unittest.mock import Mock, patch
+from django.test import TestCase, RequestFactory
+from myapp.services.api_service import ExternalAPIService
+from myapp.services.artifact_cache import ArtifactCache, MISSING, artifact_cache
+from myapp.services.stats_service import StatsProcessingService, GraphDataService
+from myapp.views import UpstreamStatusView
+
+LINK = 'testdirview.cgi?p=/x/eng/perfcloud/RESULTS/2507/250729hhm/ontap_command_output/01_iter'
+
+
+def _response(text, status=200):
+    response = Mock()
+    response.ok = status < 400
+    response.status_code = status
+    response.text = text
+    return response
+
+
+class TestArtifactCache:
+    """Test cases for ArtifactCache"""
+
+    def test_keys(self):
+        """Test keys are built from run, iteration directory and filename"""
+        assert ArtifactCache.file_key('250729hhm', LINK, 'stats_workload.txt') == ('250729hhm', '01_iter', 'stats_workload.txt')
+        assert ArtifactCache.listing_key('250729hhm') == ('250729hhm', None, ArtifactCache.LISTING)
+
+    def test_put_and_get(self):
+        """Test stored artifacts are returned while fresh"""
+        cache = ArtifactCache({})
+        key = ArtifactCache.file_key('250729hhm', LINK, 'stats_workload.txt')
+
+        cache.put(key, 'ops:50000/s')
+
+        assert cache.get(key) == 'ops:50000/s'
+        assert cache.get_status()['hits'] == 1
+
+    def test_expired_entries_are_misses_unless_stale_allowed(self):
+        """Test TTL expiry and stale reads"""
+        cache = ArtifactCache({})
+        key = ArtifactCache.file_key('250729hhm', LINK, 'stats_workload.txt')
+
+        cache.put(key, 'ops:50000/s', ttl=-1)
+
+        assert cache.get(key) is None
+        assert cache.get(key, allow_stale=True) == 'ops:50000/s'
+
+    def test_listing_uses_listing_ttl(self):
+        """Test listings expire on their own, shorter TTL"""
+        cache = ArtifactCache({'TTL_SECONDS': 600, 'LISTING_TTL_SECONDS': 5})
+
+        entry = cache.put(ArtifactCache.listing_key('250729hhm'), [LINK])
+
+        assert 4 < entry.expires_at - entry.stored_at <= 5
+
+    def test_missing_uses_missing_ttl(self):
+        """Test 404s are remembered only briefly, whatever the artifact type"""
+        cache = ArtifactCache({'TTL_SECONDS': 600, 'MISSING_TTL_SECONDS': 5})
+
+        entry = cache.put(ArtifactCache.file_key('250729hhm', LINK, 'stats_workload.txt'), MISSING)
+
+        assert 4 < entry.expires_at - entry.stored_at <= 5
+
+    def test_byte_budget_evicts_least_recently_used(self):
+        """Test eviction keeps total size within MAX_BYTES"""
+        body = 'x' * 1000
+        cache = ArtifactCache({'MAX_BYTES': 2500})
+        keys = [ArtifactCache.file_key('250729hhm', f'{index:02d}_iter', 'stats_workload.txt') for index in range(3)]
+
+        cache.put(keys[0], body)
+        cache.put(keys[1], body)
+        cache.get(keys[0])
+        cache.put(keys[2], body)
+
+        assert cache.get(keys[0]) == body
+        assert cache.get(keys[1]) is None
+        assert cache.get_status()['bytes'] <= 2500
+        assert cache.get_status()['evictions'] == 1
+
+    def test_oversized_artifacts_are_not_cached(self):
+        """Test a single artifact larger than the budget is skipped"""
+        cache = ArtifactCache({'MAX_BYTES': 100})
+        key = ArtifactCache.file_key('250729hhm', LINK, 'stats_workload.txt')
+
+        cache.put(key, 'x' * 1000)
+
+        assert cache.get(key) is None
+
+    def test_peek_does_not_count(self):
+        """Test peek returns expired entries without touching hit counters"""
+        cache = ArtifactCache({})
+        key = ArtifactCache.file_key('250729hhm', LINK, 'stats_workload.txt')
+        cache.put(key, 'ops:50000/s', ttl=-1, etag='"v1"')
+
+        assert cache.peek(key).etag == '"v1"'
+        assert cache.get_status()['hits'] == cache.get_status()['misses'] == 0
+
+    def test_revalidate_refreshes_freshness(self):
+        """Test a revalidated entry becomes fresh without being replaced"""
+        cache = ArtifactCache({'TTL_SECONDS': 600})
+        key = ArtifactCache.file_key('250729hhm', LINK, 'stats_workload.txt')
+        stored = cache.put(key, 'ops:50000/s', ttl=-1, last_modified='Tue, 29 Jul 2025 10:00:00 GMT')
+
+        refreshed = cache.revalidate(key)
+
+        assert refreshed is stored
+        assert cache.get(key) == 'ops:50000/s'
+        assert cache.get_status()['revalidations'] == 1
+        assert cache.revalidate(ArtifactCache.listing_key('unknown')) is None
+
+    def test_newest_iteration_files_superseded_by_later_iterations(self):
+        """Test files stored while their iteration was the newest stop being served once a later one is listed"""
+        cache = ArtifactCache({})
+        later = LINK.replace('01_iter', '02_iter')
+        newest = ArtifactCache.file_key('250729hhm', LINK, 'stats_workload.txt')
+        cache.put(ArtifactCache.listing_key('250729hhm'), [LINK])
+        cache.put(newest, 'ops:100/s')
+
+        assert cache.get(newest) == 'ops:100/s'
+
+        cache.put(ArtifactCache.listing_key('250729hhm'), [LINK, later])
+
+        assert cache.get(newest) is None
+        assert cache.get(newest, allow_stale=True) is None
+        cache.put(newest, 'ops:50000/s')
+        assert cache.get(newest) == 'ops:50000/s'
+
+
+class TestArtifactReadThrough:
+    """Test cases for ExternalAPIService reading through the artifact cache"""
+
+    @patch('myapp.services.api_service.upstream_http.get')
+    def test_stats_file_downloaded_once(self, mock_get):
+        """Test a second read of the same file is served from the cache"""
+        mock_get.return_value = _response('ops:50000/s')
+
+        first = ExternalAPIService.fetch_stats_file('2507', '250729hhm', LINK, 'stats_workload.txt')
+        second = ExternalAPIService.fetch_stats_file('2507', '250729hhm', LINK, 'stats_workload.txt')
+
+        assert first == second == 'ops:50000/s'
+        mock_get.assert_called_once()
+
+    @patch('myapp.services.api_service.upstream_http.get')
+    def test_missing_files_are_remembered(self, mock_get):
+        """Test 404s are cached so absent files are not re-requested"""
+        mock_get.return_value = _response('not found', status=404)
+
+        assert ExternalAPIService.fetch_stats_file('2507', '250729hhm', LINK, 'stats_wafl_flexlog.txt') is None
+        assert ExternalAPIService.fetch_stats_file('2507', '250729hhm', LINK, 'stats_wafl_flexlog.txt') is None
+
+        mock_get.assert_called_once()
+        assert artifact_cache.get(ArtifactCache.file_key('250729hhm', LINK, 'stats_wafl_flexlog.txt')) is MISSING
+
+    @patch('myapp.services.api_service.upstream_http.get')
+    def test_server_errors_are_not_cached(self, mock_get):
+        """Test transient failures are retried on the next read"""
+        mock_get.return_value = _response('unavailable', status=503)
+
+        ExternalAPIService.fetch_stats_file('2507', '250729hhm', LINK, 'stats_workload.txt')
+        ExternalAPIService.fetch_stats_file('2507', '250729hhm', LINK, 'stats_workload.txt')
+
+        assert mock_get.call_count == 2
+
+    @patch('myapp.services.api_service.upstream_http.get')
+    def test_details_then_graph_share_downloads(self, mock_get):
+        """Test opening details then the graph for a run fetches each file once"""
+        listing = f'<a href="{LINK}">1</a>'
+        workload = 'write_data:1048576b/s\nops:50000/s\nlatency:2.5us\nread_io_type.cache:75%'
+
+        def fake_get(url, timeout, **kwargs):
+            if 'testdirview.cgi' in url:
+                return _response(listing)
+            if url.endswith('stats_workload.txt'):
+                return _response(workload)
+            return _response('not found', status=404)
+
+        mock_get.side_effect = fake_get
+
+        stats = StatsProcessingService.fetch_comprehensive_stats('250729hhm')
+        calls_after_details = mock_get.call_count
+        graph = GraphDataService.fetch_graph_data('250729hhm')
+
+        assert stats['Maximum Throughput'] == 1.0
+        assert graph == [{'latency': 2.5, 'ops': 50000, 'throughput': 1048576}]
+        assert mock_get.call_count == calls_after_details
+
+
+    @patch('myapp.services.api_service.upstream_http.get')
+    def test_newest_iteration_refetched_before_settling(self, mock_get):
+        """Test an iteration read while it was the newest is fetched again before it settles"""
+        iterations = ['01_iter', '02_iter']
+        workloads = {'01_iter': 'ops:1000/s\nlatency:1.0us\nwrite_data:1048576b/s', '02_iter': ''}
+
+        def fake_get(url, timeout, **kwargs):
+            if 'testdirview.cgi' in url:
+                return _response(''.join(f'<a href="{LINK.replace("01_iter", name)}">x</a>' for name in iterations))
+            if url.endswith('stats_workload.txt'):
+                return _response(workloads[url.split('/')[-2]])
+            return _response('not found', status=404)
+
+        mock_get.side_effect = fake_get
+        assert len(GraphDataService.fetch_graph_data('250729hhm')) == 1
+
+        # 02 is completed and 03 appears once the listing expires
+        workloads['02_iter'] = 'ops:2000/s\nlatency:2.0us\nwrite_data:2097152b/s'
+        workloads['03_iter'] = 'ops:3000/s\nlatency:3.0us\nwrite_data:3145728b/s'
+        iterations.append('03_iter')
+        artifact_cache.peek(ArtifactCache.listing_key('250729hhm')).expires_at = 0
+
+        assert [point['ops'] for point in GraphDataService.fetch_graph_data('250729hhm')] == [1000, 2000, 3000]
+        assert [point['ops'] for point in GraphDataService.fetch_graph_data('250729hhm')] == [1000, 2000, 3000]
+
+
+class TestUpstreamStatusView(TestCase):
+    """Test cases for UpstreamStatusView"""
+
+    def test_reports_artifact_cache(self):
+        """Test artifact cache status is exposed"""
+        request = RequestFactory().get('/upstream-status/')
+
+        response = UpstreamStatusView().get(request)
+
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertIn('bytes', data['artifact_cache'])
+        self.assertIn('max_bytes', data['artifact_cache'])
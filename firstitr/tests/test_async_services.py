@@ -0,0 +1,241 @@
+"""
+Unit tests for the asyncio service variants and ASGI views
+Tests AsyncExternalAPIService, async stats/graph fetching, async run services and views
+"""
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import AsyncMock, patch
+import pytest
+from django.test import RequestFactory
+from myapp.services.api_service import ExternalAPIService, AsyncExternalAPIService
+from myapp.services.stats_service import AsyncStatsProcessingService, AsyncGraphDataService
+from myapp.services.run_service import AsyncRunDataService, AsyncGraphDataManagerService
+from myapp.views import AsyncFetchDetailsView
+
+
+LISTING_HTML = (
+    '<a href="testdirview.cgi?p=/x/eng/perfcloud/RESULTS/2507/250729hhm/ontap_command_output/01_iter">1</a>'
+    '<a href="testdirview.cgi?p=/x/eng/perfcloud/RESULTS/2507/250729hhm/ontap_command_output/02_iter">2</a>'
+)
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if '/Runs/' in self.path:
+            run_id = self.path.split('/Runs/')[1].split('?')[0]
+            body = json.dumps({'workload': 0} if run_id == 'invalid12' else {'workload': 'rndwrite', 'model': 'A'})
+            status = 200
+        elif 'testdirview.cgi' in self.path:
+            body, status = LISTING_HTML, 200
+        elif 'missing' in self.path:
+            body, status = 'not found', 404
+        else:
+            body, status = 'latency:2.5us\nops:50000/s\nwrite_data:1048576b/s', 200
+
+        data = body.encode()
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stand_in_urls():
+    """Point ExternalAPIService at a local stand-in server"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _StandInHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f'http://127.0.0.1:{server.server_address[1]}'
+    with patch.object(ExternalAPIService, 'BASE_API_URL', f'{base}/KO/rest/api/Runs'), \
+            patch.object(ExternalAPIService, 'PERFWEB_BASE_URL', f'{base}/cgi-bin/perfcloud'):
+        yield base
+    server.shutdown()
+    server.server_close()
+
+
+class TestAsyncExternalAPIService:
+    """Test cases for AsyncExternalAPIService"""
+
+    def test_fetches_against_stand_in(self, stand_in_urls):
+        """Test run details, links and stats files over the async client"""
+        pytest.importorskip('httpx')
+
+        async def scenario():
+            details = await AsyncExternalAPIService.fetch_run_details('250729hhm')
+            invalid = await AsyncExternalAPIService.fetch_run_details('invalid12')
+            links = await AsyncExternalAPIService.fetch_perfweb_links('250729hhm')
+            texts = await asyncio.gather(*(
+                AsyncExternalAPIService.fetch_stats_file('2507', '250729hhm', link, 'stats_workload.txt')
+                for link in links
+            ))
+            missing = await AsyncExternalAPIService.fetch_stats_file('2507', '250729hhm', links[0], 'missing.txt')
+            return details, invalid, links, texts, missing
+
+        details, invalid, links, texts, missing = asyncio.run(scenario())
+
+        assert details['workload'] == 'rndwrite'
+        assert invalid is None
+        assert links == ExternalAPIService.parse_perfweb_links(LISTING_HTML)
+        assert all('ops:50000/s' in text for text in texts)
+        assert missing is None
+
+    @patch('myapp.services.http_client.HTTPX_AVAILABLE', False)
+    @patch('myapp.services.api_service.ExternalAPIService.fetch_stats_file')
+    def test_falls_back_to_threads_without_httpx(self, mock_fetch_file):
+        """Test the sync service runs in a worker thread when httpx is missing"""
+        mock_fetch_file.return_value = 'cpu_busy:85.2%'
+
+        result = asyncio.run(AsyncExternalAPIService.fetch_stats_file('2507', '250729hhm', 'link1', 'stats_system.txt'))
+
+        assert result == 'cpu_busy:85.2%'
+        mock_fetch_file.assert_called_once_with('2507', '250729hhm', 'link1', 'stats_system.txt')
+
+
+class TestAsyncStatsServices:
+    """Test cases for async stats and graph fetching"""
+
+    @patch('myapp.services.stats_service.AsyncExternalAPIService.fetch_stats_file', new_callable=AsyncMock)
+    @patch('myapp.services.stats_service.AsyncExternalAPIService.fetch_perfweb_links', new_callable=AsyncMock)
+    def test_fetch_comprehensive_stats(self, mock_links, mock_fetch_file):
+        """Test concurrent fetches are merged into the same statistics"""
+        mock_links.return_value = ['link1', 'link2']
+        files = {
+            ('link1', 'stats_workload.txt'): 'write_data:1048576b/s\nread_io_type.cache:75%',
+            ('link2', 'stats_workload.txt'): 'write_data:2097152b/s\nread_io_type.cache:80%',
+            ('link1', 'stats_system.txt'): 'cpu_busy:85.2%',
+            ('link2', 'stats_system.txt'): 'cpu_busy:90.1%',
+            ('link1', 'system_node_virtual_machine_instance_show.txt'): 'Instance Type: c5.xlarge',
+        }
+        mock_fetch_file.side_effect = lambda ym, run_id, link, stats_type: files.get((link, stats_type))
+
+        result = asyncio.run(AsyncStatsProcessingService.fetch_comprehensive_stats('250729hhm'))
+
+        assert result['Maximum Throughput'] == 2.0
+        assert result['Maximum Cache Percentage'] == 80
+        assert result['Maximum System CPU Busy'] == 90.1
+        assert result['Instance Type'] == 'c5.xlarge'
+
+    @patch('myapp.services.stats_service.AsyncExternalAPIService.fetch_perfweb_links', new_callable=AsyncMock)
+    def test_fetch_comprehensive_stats_no_links(self, mock_links):
+        """Test empty stats when no links are available"""
+        mock_links.return_value = []
+
+        assert asyncio.run(AsyncStatsProcessingService.fetch_comprehensive_stats('250729hhm')) == {}
+
+    @patch('myapp.services.stats_service.AsyncExternalAPIService.fetch_stats_file', new_callable=AsyncMock)
+    @patch('myapp.services.stats_service.AsyncExternalAPIService.fetch_perfweb_links', new_callable=AsyncMock)
+    def test_fetch_graph_data_keeps_link_order(self, mock_links, mock_fetch_file):
+        """Test graph points come back in iteration order"""
+        mock_links.return_value = ['link1', 'link2']
+        texts = {
+            'link1': 'latency:2.5us\nops:50000/s\nwrite_data:1048576b/s',
+            'link2': 'latency:2.3us\nops:55000/s\nwrite_data:1073741824b/s',
+        }
+        mock_fetch_file.side_effect = lambda ym, run_id, link, stats_type: texts[link]
+
+        result = asyncio.run(AsyncGraphDataService.fetch_graph_data('250729hhm'))
+
+        assert [point['ops'] for point in result] == [50000, 55000]
+
+
+class TestAsyncRunServices:
+    """Test cases for AsyncRunDataService and AsyncGraphDataManagerService"""
+
+    @patch('myapp.services.run_service.AsyncRunIngestionService.ingest', new_callable=AsyncMock)
+    @patch('myapp.services.run_service.AsyncExternalAPIService.fetch_run_details', new_callable=AsyncMock)
+    @patch('myapp.services.run_service.api_cache')
+    def test_fetch_single_run_data(self, mock_cache, mock_details, mock_stats):
+        """Test details and stats are merged and cached"""
+        mock_cache.get.return_value = None
+        mock_details.return_value = {'workload': 'rndwrite', 'model': 'A'}
+        mock_stats.return_value = {'stats': {'Maximum Throughput': 2.0}, 'graph_data': None}
+
+        result = asyncio.run(AsyncRunDataService.fetch_single_run_data('250729hhm'))
+
+        assert result == {'Workload Type': 'rndwrite', 'Model': 'A', 'Maximum Throughput': 2.0}
+        mock_cache.put.assert_called_once()
+        key, record = mock_cache.put.call_args[0]
+        assert key == 'details_250729hhm'
+        assert record.to_dict() == result
+
+    @patch('myapp.services.run_service.AsyncRunIngestionService.ingest', new_callable=AsyncMock)
+    @patch('myapp.services.run_service.AsyncExternalAPIService.fetch_run_details', new_callable=AsyncMock)
+    @patch('myapp.services.run_service.api_cache')
+    def test_fetch_single_run_data_stats_error(self, mock_cache, mock_details, mock_stats):
+        """Test stats failures are reported without failing the run"""
+        mock_cache.get.return_value = None
+        mock_details.return_value = {'workload': 'rndwrite'}
+        mock_stats.side_effect = Exception('Stats error')
+
+        result = asyncio.run(AsyncRunDataService.fetch_single_run_data('250729hhm'))
+
+        assert 'Could not fetch stats data: Stats error' in result['stats_error']
+
+    @patch('myapp.services.run_service.AsyncRunDataService.fetch_single_run_data', new_callable=AsyncMock)
+    def test_fetch_comparison_data(self, mock_fetch_single):
+        """Test comparison results keep the same shape as the sync service"""
+        mock_fetch_single.side_effect = lambda run_id: (
+            None if run_id == 'invalid12' else {'Workload Type': 'rndwrite', 'Model': 'A'}
+        )
+
+        result = asyncio.run(AsyncRunDataService.fetch_comparison_data('250729hhm', 'invalid12'))
+
+        assert result['id1'] == {'Workload Type': 'rndwrite', 'Model': 'A'}
+        assert result['error_id2'] == 'ID 2: invalid12 is incorrect.'
+
+    @patch('myapp.services.run_service.AsyncRunDataService.fetch_single_run_data', new_callable=AsyncMock)
+    def test_fetch_multiple_runs_data(self, mock_fetch_single):
+        """Test multiple runs are fetched and errors reported per ID"""
+        mock_fetch_single.side_effect = [{'Workload Type': 'a'}, None, Exception('API error')]
+
+        result = asyncio.run(AsyncRunDataService.fetch_multiple_runs_data(['123456789', '987654321', '555555555']))
+
+        assert result['success_count'] == 1
+        assert result['errors'] == {'987654321': 'No data available for this ID', '555555555': 'API error'}
+        assert 'Test harness Log' in result['results']['123456789']
+
+    @patch('myapp.services.run_service.AsyncGraphDataManagerService._check_graph_compatibility', new_callable=AsyncMock)
+    @patch('myapp.services.run_service.AsyncGraphDataService.fetch_graph_data', new_callable=AsyncMock)
+    @patch('myapp.services.run_service.api_cache')
+    def test_fetch_comparison_graph_data(self, mock_cache, mock_graph, mock_compat):
+        """Test comparison graphs include a warning for incompatible runs"""
+        mock_cache.get.return_value = None
+        mock_graph.side_effect = lambda run_id: [{'latency': 1.0, 'ops': 1, 'throughput': 1}]
+        mock_compat.return_value = {'compatible': False, 'error_type': 'model'}
+
+        result = asyncio.run(AsyncGraphDataManagerService.fetch_comparison_graph_data('123456789', '987654321'))
+
+        assert set(result['data_points']) == {'123456789', '987654321'}
+        assert result['compatibility_warning']['error_type'] == 'model'
+
+
+class TestAsyncViews:
+    """Test cases for the ASGI view variants"""
+
+    @patch('myapp.views.AsyncRunDataService.fetch_single_run_data', new_callable=AsyncMock)
+    def test_async_fetch_details(self, mock_fetch_single):
+        """Test the async details view returns run data"""
+        mock_fetch_single.return_value = {'Workload Type': 'rndwrite'}
+        request = RequestFactory().get('/fetch-details/', {'id': '250729hhm'})
+
+        response = asyncio.run(AsyncFetchDetailsView().get(request))
+
+        assert response.status_code == 200
+        assert json.loads(response.content) == {'Workload Type': 'rndwrite'}
+
+    @patch('myapp.views.AsyncRunDataService.fetch_single_run_data', new_callable=AsyncMock)
+    def test_async_fetch_details_not_found(self, mock_fetch_single):
+        """Test the async details view rejects unknown IDs"""
+        mock_fetch_single.return_value = None
+        request = RequestFactory().get('/fetch-details/', {'id': 'invalid12'})
+
+        response = asyncio.run(AsyncFetchDetailsView().get(request))
+
+        assert response.status_code == 400
@@ -0,0 +1,168 @@
+"""
+Unit tests for cache memory introspection
+Tests deep size reporting, the cache-memory view and the management command
+"""
+import io
+import json
+import os
+import tempfile
+import tracemalloc
+from unittest.mock import patch
+from django.core.management import call_command
+from django.test import TestCase, RequestFactory, override_settings
+from myapp.cache_introspection import deep_sizeof, namespace_for_key, build_entry_report, allocation_snapshot
+from myapp.cache_manager import LRUCache
+from myapp.views import CacheMemoryView
+
+
+class TestDeepSizeof:
+    """Test cases for deep size estimation"""
+
+    def test_nested_structures_are_larger(self):
+        """Test that nested content contributes to the size"""
+        small = {'data_points': []}
+        large = {'data_points': [{'latency': 1.5, 'ops': i, 'throughput': i * 10} for i in range(100)]}
+
+        assert deep_sizeof(large) > deep_sizeof(small)
+
+    def test_shared_objects_counted_once(self):
+        """Test that repeated references are not double counted"""
+        payload = 'x' * 10000
+
+        assert deep_sizeof([payload, payload]) < 2 * deep_sizeof(payload)
+
+    def test_slotted_objects(self):
+        """Test that __slots__ attributes are followed"""
+        class Slotted:
+            __slots__ = ('values',)
+
+            def __init__(self, values):
+                self.values = values
+
+        assert deep_sizeof(Slotted(list(range(1000)))) > deep_sizeof(list(range(1000)))
+
+    def test_namespace_for_key(self):
+        """Test namespace extraction from cache keys"""
+        assert namespace_for_key('details_250729hhm') == 'details'
+        assert namespace_for_key('graph_250729hhm') == 'graph'
+        assert namespace_for_key('plainkey') == 'default'
+
+
+class TestEntryReport:
+    """Test cases for per-entry memory reports"""
+
+    def test_report_groups_by_namespace(self):
+        """Test that entries are grouped and ordered by size"""
+        items = [
+            ('details_run000001', {'Model': 'FAS8300'}),
+            ('graph_run000001', [{'latency': 1.0, 'ops': i, 'throughput': i} for i in range(50)]),
+            ('graph_run000002', [{'latency': 1.0, 'ops': 1, 'throughput': 1}]),
+        ]
+
+        report = build_entry_report(items, top_n=1)
+
+        assert report['entry_count'] == 3
+        assert report['entries'][0]['key'] == 'graph_run000001'
+        assert report['namespaces']['graph']['count'] == 2
+        assert len(report['namespaces']['graph']['largest']) == 1
+        assert report['total_bytes'] == sum(entry['bytes'] for entry in report['entries'])
+
+    def test_lru_cache_memory_report(self):
+        """Test memory report from an LRUCache instance"""
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.json')
+        temp_file.close()
+        try:
+            cache = LRUCache(max_size=3)
+            cache.cache_file = temp_file.name
+            cache.clear()
+            cache.put('details_123456789', {'Model': 'FAS8300'})
+
+            report = cache.get_memory_report()
+
+            assert report['max_size'] == 3
+            assert report['entries'][0]['key'] == 'details_123456789'
+            assert report['entries'][0]['bytes'] > 0
+        finally:
+            os.unlink(temp_file.name)
+
+    def test_allocation_snapshot_disabled(self):
+        """Test snapshot reports disabled when tracemalloc is off"""
+        with patch('myapp.cache_introspection.tracemalloc.is_tracing', return_value=False):
+            assert allocation_snapshot() == {'enabled': False}
+
+    def test_allocation_snapshot_attributes_cache_allocations(self):
+        """Test that allocations made by the cache module are attributed to it"""
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start(25)
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.json', mode='w')
+        json.dump({'cache': {'graph_123456789': [{'ops': i} for i in range(2000)]}, 'access_times': {}}, temp_file)
+        temp_file.close()
+        try:
+            cache = LRUCache.__new__(LRUCache)
+            cache.max_size = 3
+            cache.cache_file = temp_file.name
+            cache._load_from_file()
+
+            snapshot = allocation_snapshot()
+
+            assert snapshot['enabled'] is True
+            assert snapshot['attributed_bytes'] > 0
+            assert any(line['location'].startswith('cache_manager.py') for line in snapshot['top_lines'])
+        finally:
+            os.unlink(temp_file.name)
+            if not was_tracing:
+                tracemalloc.stop()
+
+
+class TestCacheMemoryView(TestCase):
+    """Test cases for CacheMemoryView"""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.view = CacheMemoryView()
+
+    @override_settings(CACHE_INTROSPECTION_ENABLED=False)
+    def test_disabled_by_default(self):
+        """Test that the endpoint is opt-in"""
+        response = self.view.get(self.factory.get('/cache-memory/'))
+
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(CACHE_INTROSPECTION_ENABLED=True)
+    @patch('myapp.views.allocation_snapshot')
+    @patch('myapp.views.api_cache.get_memory_report')
+    def test_enabled_returns_report(self, mock_report, mock_snapshot):
+        """Test report is returned when enabled"""
+        mock_report.return_value = {'entry_count': 1, 'total_bytes': 100}
+        mock_snapshot.return_value = {'enabled': False}
+
+        response = self.view.get(self.factory.get('/cache-memory/', {'top': '5'}))
+
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual(data['total_bytes'], 100)
+        self.assertEqual(data['tracemalloc'], {'enabled': False})
+        mock_report.assert_called_once_with(5)
+
+    @override_settings(CACHE_INTROSPECTION_ENABLED=True)
+    def test_invalid_top_parameter(self):
+        """Test validation of the top parameter"""
+        response = self.view.get(self.factory.get('/cache-memory/', {'top': 'abc'}))
+
+        self.assertEqual(response.status_code, 400)
+
+
+class TestCacheMemoryCommand(TestCase):
+    """Test cases for the cache_memory management command"""
+
+    @patch('myapp.cache_manager.LRUCache._load_from_file')
+    def test_command_json_output(self, mock_load):
+        """Test that the command prints a JSON report"""
+        out = io.StringIO()
+
+        call_command('cache_memory', '--json', stdout=out)
+
+        data = json.loads(out.getvalue())
+        self.assertIn('namespaces', data)
+        self.assertIn('tracemalloc', data)
@@ -0,0 +1,203 @@
+"""
+Unit tests for the per-host circuit breakers
+Tests state transitions, fail-fast requests and stale artifact fallback
+"""
+import json
+import socket
+from unittest.mock import Mock, patch
+import pytest
+from django.test import TestCase, RequestFactory
+from myapp.services.api_service import ExternalAPIService
+from myapp.services.artifact_cache import artifact_cache
+from myapp.services.circuit_breaker import CircuitBreaker, CircuitBreakerRegistry, CircuitOpenError, circuit_breakers
+from myapp.services.http_client import UpstreamHTTPClient
+from myapp.views import UpstreamStatusView
+
+LINK = 'testdirview.cgi?p=/x/eng/perfcloud/RESULTS/2507/250729hhm/ontap_command_output/01_iter'
+
+CONFIG = {
+    'WINDOW_SIZE': 4,
+    'MIN_CALLS': 4,
+    'FAILURE_RATE_THRESHOLD': 0.5,
+    'SLOW_CALL_SECONDS': 1.0,
+    'SLOW_CALL_RATE_THRESHOLD': 0.75,
+    'OPEN_SECONDS': 30,
+    'HALF_OPEN_MAX_CALLS': 1,
+    'HALF_OPEN_SUCCESSES': 2,
+}
+
+
+@pytest.fixture
+def clock():
+    """Controllable monotonic clock for the breaker module"""
+    now = {'value': 1000.0}
+    with patch('myapp.services.circuit_breaker.time.monotonic', side_effect=lambda: now['value']):
+        yield now
+
+
+def _trip(breaker):
+    for _ in range(CONFIG['MIN_CALLS']):
+        assert breaker.allow_request()
+        breaker.record_failure(0.01, 'ConnectionError')
+
+
+class TestCircuitBreaker:
+    """Test cases for CircuitBreaker"""
+
+    def test_stays_closed_below_min_calls(self):
+        """Test a few failures do not trip the breaker"""
+        breaker = CircuitBreaker('http://perfweb', CONFIG)
+
+        for _ in range(CONFIG['MIN_CALLS'] - 1):
+            breaker.record_failure(0.01)
+
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_opens_on_failure_rate(self):
+        """Test the breaker opens and rejects once the failure rate is reached"""
+        breaker = CircuitBreaker('http://perfweb', CONFIG)
+
+        breaker.record_success(0.01)
+        breaker.record_success(0.01)
+        breaker.record_failure(0.01)
+        breaker.record_failure(0.01)
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.allow_request() is False
+        assert breaker.snapshot()['rejected'] == 1
+
+    def test_opens_on_slow_call_rate(self):
+        """Test successful but slow calls also trip the breaker"""
+        breaker = CircuitBreaker('http://perfweb', CONFIG)
+
+        breaker.record_success(0.01)
+        for _ in range(3):
+            breaker.record_success(2.0)
+
+        assert breaker.state == CircuitBreaker.OPEN
+
+    def test_half_open_probes_close_breaker(self, clock):
+        """Test enough successful probes after OPEN_SECONDS close the breaker"""
+        breaker = CircuitBreaker('http://perfweb', CONFIG)
+        _trip(breaker)
+        clock['value'] += CONFIG['OPEN_SECONDS']
+
+        assert breaker.allow_request() is True
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow_request() is False  # only one probe at a time
+        breaker.record_success(0.01)
+        assert breaker.allow_request() is True
+        breaker.record_success(0.01)
+
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.snapshot()['window_calls'] == 0
+
+    def test_failed_probe_reopens_breaker(self, clock):
+        """Test a failing probe re-opens the breaker for another OPEN_SECONDS"""
+        breaker = CircuitBreaker('http://perfweb', CONFIG)
+        _trip(breaker)
+        clock['value'] += CONFIG['OPEN_SECONDS']
+
+        assert breaker.allow_request() is True
+        breaker.record_failure(0.01, 'HTTP 503')
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.allow_request() is False
+        assert breaker.snapshot()['retry_in_seconds'] == CONFIG['OPEN_SECONDS']
+
+    def test_released_probe_frees_slot(self, clock):
+        """Test a probe ending without an outcome does not block later probes"""
+        breaker = CircuitBreaker('http://perfweb', CONFIG)
+        _trip(breaker)
+        clock['value'] += CONFIG['OPEN_SECONDS']
+
+        assert breaker.allow_request() is True
+        breaker.release()
+
+        assert breaker.allow_request() is True
+
+
+class TestUpstreamClientBreaker:
+    """Test cases for circuit breaking inside UpstreamHTTPClient"""
+
+    def test_unreachable_host_fails_fast_once_open(self):
+        """Test connection failures open the breaker and later calls skip the network"""
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            port = sock.getsockname()[1]
+        url = f'http://127.0.0.1:{port}/view.cgi'
+        registry = CircuitBreakerRegistry(CONFIG)
+        client = UpstreamHTTPClient({'RETRIES': 0}, breakers=registry)
+
+        for _ in range(CONFIG['MIN_CALLS']):
+            with pytest.raises(Exception) as error:
+                client.get(url, timeout=1)
+            assert not isinstance(error.value, CircuitOpenError)
+
+        with patch.object(client, 'session_for') as mock_session_for:
+            with pytest.raises(CircuitOpenError):
+                client.get(url, timeout=1)
+            mock_session_for.assert_not_called()
+
+        assert registry.get_status()[f'http://127.0.0.1:{port}']['state'] == CircuitBreaker.OPEN
+        client.close()
+
+    def test_server_errors_count_as_failures(self):
+        """Test 5xx responses are recorded as failures and 4xx as successes"""
+        registry = CircuitBreakerRegistry(CONFIG)
+        client = UpstreamHTTPClient({}, breakers=registry)
+        session = Mock()
+        session.get.side_effect = [Mock(status_code=503), Mock(status_code=404)]
+
+        with patch.object(client, 'session_for', return_value=session):
+            client.get('http://perfweb/a', timeout=1)
+            client.get('http://perfweb/b', timeout=1)
+
+        snapshot = registry.get_status()['http://perfweb']
+        assert snapshot['window_calls'] == 2
+        assert snapshot['failure_rate'] == 0.5
+        assert snapshot['last_failure']['reason'] == 'HTTP 503'
+
+
+class TestStaleFallback:
+    """Test cases for serving expired artifacts while the upstream is degraded"""
+
+    @patch('myapp.services.api_service.upstream_http.get')
+    def test_open_circuit_serves_stale_stats_file(self, mock_get):
+        """Test an expired stats file is returned instead of None"""
+        key = artifact_cache.file_key('250729hhm', LINK, 'stats_workload.txt')
+        artifact_cache.put(key, 'ops:50000/s', ttl=-1)
+        mock_get.side_effect = CircuitOpenError('Circuit open for http://perfweb')
+
+        assert ExternalAPIService.fetch_stats_file('2507', '250729hhm', LINK, 'stats_workload.txt') == 'ops:50000/s'
+
+    @patch('myapp.services.api_service.upstream_http.get')
+    def test_open_circuit_serves_stale_listing(self, mock_get):
+        """Test an expired iteration listing is returned instead of an empty list"""
+        artifact_cache.put(artifact_cache.listing_key('250729hhm'), [LINK], ttl=-1)
+        mock_get.side_effect = CircuitOpenError('Circuit open for http://perfweb')
+
+        assert ExternalAPIService.fetch_perfweb_links('250729hhm') == [LINK]
+
+    @patch('myapp.services.api_service.upstream_http.get')
+    def test_server_error_serves_stale_stats_file(self, mock_get):
+        """Test a 5xx response falls back to the expired copy"""
+        key = artifact_cache.file_key('250729hhm', LINK, 'stats_workload.txt')
+        artifact_cache.put(key, 'ops:50000/s', ttl=-1)
+        mock_get.return_value = Mock(ok=False, status_code=503, text='unavailable')
+
+        assert ExternalAPIService.fetch_stats_file('2507', '250729hhm', LINK, 'stats_workload.txt') == 'ops:50000/s'
+
+
+class TestBreakerStatus(TestCase):
+    """Test cases for breaker state in UpstreamStatusView"""
+
+    def test_reports_breakers(self):
+        """Test every known host's breaker state is exposed"""
+        circuit_breakers.breaker_for('http://perfweb.gdl.englab.netapp.com')
+        request = RequestFactory().get('/upstream-status/')
+
+        response = UpstreamStatusView().get(request)
+
+        data = json.loads(response.content)
+        self.assertEqual(data['circuit_breakers']['http://perfweb.gdl.englab.netapp.com']['state'], 'closed')
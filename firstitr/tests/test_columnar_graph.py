@@ -0,0 +1,112 @@
+"""
+Unit tests for the columnar graph payload
+Tests ops ordering, axis bounds, cached entries and the format query parameter
+"""
+import asyncio
+import json
+from unittest.mock import patch
+import pytest
+from django.test import RequestFactory
+from myapp.services.run_service import AsyncGraphDataManagerService, GraphDataManagerService
+from myapp.views import FetchGraphDataView
+
+COLUMNAR = GraphDataManagerService.COLUMNAR
+
+GRAPHS = {
+    '250729hhm': [
+        {'latency': 2.5, 'ops': 3000, 'throughput': 300},
+        {'latency': 0.5, 'ops': 1000, 'throughput': 100},
+        {'latency': 1.5, 'ops': 2000, 'throughput': 200},
+    ],
+    '250730abc': [
+        {'latency': 4.0, 'ops': 5000, 'throughput': 500},
+        {'latency': 0.25, 'ops': 500, 'throughput': 50},
+    ],
+}
+
+
+@pytest.fixture
+def cache(isolated_api_cache):
+    with patch('myapp.services.run_service.GraphDataService.fetch_graph_data',
+               side_effect=lambda run_id: [dict(point) for point in GRAPHS[run_id]]) as fetch, \
+            patch.object(GraphDataManagerService, '_check_graph_compatibility',
+                         return_value={'compatible': True, 'warnings': []}):
+        isolated_api_cache.fetch = fetch
+        yield isolated_api_cache
+
+
+class TestColumnarGraph:
+    """Test cases for columnar graph responses"""
+
+    def test_points_by_default(self, cache):
+        """Test the default response keeps the point list in upstream order"""
+        result = GraphDataManagerService.fetch_single_graph_data('250729hhm')
+
+        assert result == {'data_points': {'250729hhm': GRAPHS['250729hhm']}}
+
+    def test_columns_sorted_by_ops(self, cache):
+        """Test columnar runs are one list per metric with points ordered by ops"""
+        result = GraphDataManagerService.fetch_single_graph_data('250729hhm', graph_format=COLUMNAR)
+
+        assert result['format'] == COLUMNAR
+        assert result['data_points']['250729hhm'] == {
+            'latency': [0.5, 1.5, 2.5],
+            'ops': [1000, 2000, 3000],
+            'throughput': [100, 200, 300],
+        }
+        assert result['bounds']['latency'] == {'min': 0.5, 'max': 2.5}
+
+    def test_cached_series_served_as_columns(self, cache):
+        """Test a second request builds the columns from the cached series"""
+        GraphDataManagerService.fetch_single_graph_data('250729hhm')
+
+        result = GraphDataManagerService.fetch_single_graph_data('250729hhm', graph_format=COLUMNAR)
+
+        assert cache.fetch.call_count == 1
+        assert result['data_points']['250729hhm']['ops'] == [1000, 2000, 3000]
+
+    def test_bounds_span_both_runs(self, cache):
+        """Test comparison bounds cover every run so both share one set of axes"""
+        result = GraphDataManagerService.fetch_comparison_graph_data('250729hhm', '250730abc', graph_format=COLUMNAR)
+
+        assert set(result['data_points']) == {'250729hhm', '250730abc'}
+        assert result['bounds'] == {
+            'latency': {'min': 0.25, 'max': 4.0},
+            'ops': {'min': 500, 'max': 5000},
+            'throughput': {'min': 50, 'max': 500},
+        }
+
+    def test_async_comparison(self, cache):
+        """Test the async service returns the same columnar payload"""
+        with patch('myapp.services.run_service.AsyncGraphDataService.fetch_graph_data',
+                   side_effect=lambda run_id: [dict(point) for point in GRAPHS[run_id]]), \
+                patch.object(AsyncGraphDataManagerService, '_check_graph_compatibility',
+                             return_value={'compatible': True, 'warnings': []}):
+            result = asyncio.run(AsyncGraphDataManagerService.fetch_comparison_graph_data(
+                '250729hhm', '250730abc', graph_format=COLUMNAR
+            ))
+
+        assert result == GraphDataManagerService.fetch_comparison_graph_data(
+            '250729hhm', '250730abc', graph_format=COLUMNAR
+        )
+
+
+class TestGraphFormatParameter:
+    """Test cases for the format query parameter"""
+
+    def test_unknown_format(self):
+        """Test an unknown format is rejected with 400"""
+        request = RequestFactory().get('/fetch-graph-data/', {'run_id1': '250729hhm', 'format': 'csv'})
+
+        response = FetchGraphDataView.as_view()(request)
+
+        assert response.status_code == 400
+        assert 'format' in json.loads(response.content)['error']
+
+    def test_columnar_format(self, cache):
+        """Test ?format=columnar reaches the service"""
+        request = RequestFactory().get('/fetch-graph-data/', {'run_id1': '250729hhm', 'format': 'columnar'})
+
+        response = FetchGraphDataView.as_view()(request)
+
+        assert json.loads(response.content)['data_points']['250729hhm']['ops'] == [1000, 2000, 3000]
@@ -0,0 +1,79 @@
+"""
+Unit tests for bounded fetch concurrency
+Tests ordering, per-call limits, error propagation and nested fan-out
+"""
+import contextvars
+import random
+import threading
+import time
+import pytest
+from myapp.services.concurrency import BoundedFetchExecutor
+
+
+@pytest.fixture
+def executor():
+    """Executor with a small process-wide pool"""
+    pool = BoundedFetchExecutor('test-fetch', 'UNUSED_SETTING', {'PER_PROCESS': 8, 'PER_RUN': 3})
+    yield pool
+    pool.shutdown()
+
+
+class TestBoundedFetchExecutor:
+    """Test cases for BoundedFetchExecutor"""
+
+    def test_results_keep_input_order(self, executor):
+        """Test results are returned in input order despite completion order"""
+        def fetch(item):
+            time.sleep(random.uniform(0, 0.01))
+            return item * 2
+
+        assert executor.map_ordered(fetch, range(20)) == [item * 2 for item in range(20)]
+
+    def test_per_call_limit_is_respected(self, executor):
+        """Test no more than `limit` tasks run at once for one call"""
+        lock = threading.Lock()
+        state = {'active': 0, 'peak': 0}
+
+        def fetch(item):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            time.sleep(0.01)
+            with lock:
+                state['active'] -= 1
+            return item
+
+        executor.map_ordered(fetch, range(12), limit=3)
+
+        assert state['peak'] == 3
+
+    def test_runs_concurrently(self, executor):
+        """Test independent fetches overlap in time"""
+        start = time.perf_counter()
+        executor.map_ordered(lambda item: time.sleep(0.05), range(3), limit=3)
+
+        assert time.perf_counter() - start < 0.12
+
+    def test_first_error_is_raised(self, executor):
+        """Test the first failing item (in input order) is re-raised"""
+        def fetch(item):
+            if item in (2, 4):
+                raise ValueError(f'failed {item}')
+            return item
+
+        with pytest.raises(ValueError, match='failed 2'):
+            executor.map_ordered(fetch, range(6))
+
+    def test_nested_calls_run_inline(self, executor):
+        """Test fan-out from inside a worker does not deadlock the pool"""
+        def outer(item):
+            return sum(executor.map_ordered(lambda inner: inner + item, range(4)))
+
+        assert executor.map_ordered(outer, range(10), limit=8) == [6 + 4 * item for item in range(10)]
+
+    def test_context_variables_are_propagated(self, executor):
+        """Test context variables set by the caller are visible in workers"""
+        request_id = contextvars.ContextVar('request_id', default=None)
+        request_id.set('req-1')
+
+        assert executor.map_ordered(lambda item: request_id.get(), range(4)) == ['req-1'] * 4
@@ -0,0 +1,124 @@
+"""
+Unit tests for RESULTS data sources
+Tests the local filesystem source and data source selection in ExternalAPIService
+"""
+import asyncio
+from unittest.mock import patch
+import pytest
+from myapp.services.api_service import ExternalAPIService, AsyncExternalAPIService
+from myapp.services.data_source import HTTPResultsSource, LocalResultsSource, results_source
+from myapp.services.stats_service import StatsProcessingService
+
+RUN_ID = '250729hhm'
+WORKLOAD = (
+    'write_data:2097152b/s\nops:50000/s\nlatency:2.5us\n'
+    'read_io_type.cache:75%\nread_io_type.ext_cache:5%\nread_io_type.disk:20%\nread_io_type.bamboo_ssd:0%\n'
+)
+LINK_PREFIX = f'testdirview.cgi?p=/x/eng/perfcloud/RESULTS/2507/{RUN_ID}/ontap_command_output'
+
+
+@pytest.fixture
+def results_tree(tmp_path):
+    """A RESULTS tree with two iterations, a non-iteration directory and a stray file"""
+    output = tmp_path / '2507' / RUN_ID / 'ontap_command_output'
+    for iteration, cpu in (('02_iter', '61.5'), ('01_iter', '40.0')):
+        directory = output / iteration
+        directory.mkdir(parents=True)
+        (directory / 'stats_workload.txt').write_text(WORKLOAD)
+        (directory / 'stats_system.txt').write_text(f'cpu_busy:{cpu}%\n')
+        (directory / 'stats_wafl_flexlog.txt').write_text('')
+    (output / '01_iter' / 'system_node_virtual_machine_instance_show.txt').write_text('Instance Type: m5.4xlarge\n')
+    (output / 'logs').mkdir()
+    (output / '03_notadir').write_text('')
+    return tmp_path
+
+
+@pytest.fixture
+def filesystem(settings, results_tree):
+    settings.RESULTS_SOURCE = {'BACKEND': 'filesystem', 'ROOT': str(results_tree)}
+    return results_tree
+
+
+class TestLocalResultsSource:
+    """Test cases for LocalResultsSource"""
+
+    def test_lists_iteration_directories(self, results_tree):
+        """Test only iteration directories are listed, in name order, as perfweb links"""
+        source = LocalResultsSource({'ROOT': str(results_tree)})
+
+        assert source.list_iterations(RUN_ID) == [f'{LINK_PREFIX}/01_iter', f'{LINK_PREFIX}/02_iter']
+        assert source.list_iterations('250799xxx') == []
+
+    def test_reads_and_scans_files(self, results_tree):
+        """Test full reads and memory-mapped scans agree with the HTTP semantics"""
+        source = LocalResultsSource({'ROOT': str(results_tree)})
+        link = f'{LINK_PREFIX}/01_iter'
+        patterns = StatsProcessingService.scan_patterns('stats_workload.txt')
+
+        assert source.read_stats_file('2507', RUN_ID, link, 'stats_workload.txt') == WORKLOAD
+        assert source.read_stats_file('2507', RUN_ID, link, 'stats_wafl_flexlog.txt') == ''
+        assert source.read_stats_file('2507', RUN_ID, link, 'missing.txt') is None
+        matches = source.scan_stats_file('2507', RUN_ID, link, 'stats_workload.txt', patterns)
+        assert matches['throughput'] == '2097152'
+        assert matches['cache'] == '75'
+        assert source.scan_stats_file('2507', RUN_ID, link, 'stats_wafl_flexlog.txt', patterns)['throughput'] is None
+        assert source.scan_stats_file('2507', RUN_ID, link, 'missing.txt', patterns) is None
+
+    def test_rejects_paths_outside_tree(self, results_tree):
+        """Test run IDs and links cannot escape the RESULTS root"""
+        source = LocalResultsSource({'ROOT': str(results_tree / '2507')})
+
+        assert source.list_iterations('..') == []
+        assert source.read_stats_file('..', '2507', f'{LINK_PREFIX}/..', 'stats_workload.txt') is None
+        assert source.read_stats_file('2507', RUN_ID, f'{LINK_PREFIX}/01_iter', '../01_iter') is None
+
+
+class TestSourceSelection:
+    """Test cases for choosing the data source in settings"""
+
+    def test_http_is_default(self):
+        """Test perfweb over HTTP is used unless configured otherwise"""
+        assert isinstance(results_source(), HTTPResultsSource)
+
+    def test_dotted_path_backend(self, settings):
+        """Test a custom source class can be configured by dotted path"""
+        settings.RESULTS_SOURCE = {'BACKEND': 'myapp.services.data_source.LocalResultsSource', 'ROOT': '/nonexistent'}
+
+        source = results_source()
+
+        assert isinstance(source, LocalResultsSource)
+        assert source is results_source()
+
+    @patch('myapp.services.api_service.upstream_http.get')
+    def test_filesystem_bypasses_http(self, mock_get, filesystem):
+        """Test listings and stats files come from the mount without any upstream call"""
+        links = ExternalAPIService.fetch_perfweb_links(RUN_ID)
+        text = ExternalAPIService.fetch_stats_file('2507', RUN_ID, links[1], 'stats_system.txt')
+
+        assert len(links) == 2
+        assert text == 'cpu_busy:61.5%\n'
+        mock_get.assert_not_called()
+
+    @patch('myapp.services.api_service.upstream_http.get')
+    @pytest.mark.parametrize('streaming', [False, True])
+    def test_comprehensive_stats_from_filesystem(self, mock_get, streaming, filesystem, settings):
+        """Test the full stats crawl works from the mount in both fetch modes"""
+        settings.STREAMING_FETCH = {'ENABLED': streaming}
+
+        stats = StatsProcessingService.fetch_comprehensive_stats(RUN_ID)
+
+        assert stats['Maximum Throughput'] == 2.0
+        assert stats['Maximum System CPU Busy'] == 61.5
+        assert stats['Instance Type'] == 'm5.4xlarge'
+        mock_get.assert_not_called()
+
+    def test_async_service_reads_filesystem(self, filesystem):
+        """Test the async service reads the mount in worker threads"""
+        async def fetch():
+            links = await AsyncExternalAPIService.fetch_perfweb_links(RUN_ID)
+            return links, await AsyncExternalAPIService.fetch_stats_file('2507', RUN_ID, links[0], 'stats_system.txt')
+
+        links, text = asyncio.run(fetch())
+
+        assert links[0].endswith('/01_iter')
+        assert text == 'cpu_busy:40.0%\n'
@@ -0,0 +1,249 @@
+"""
+Unit tests for end-to-end request deadlines
+Tests budget clamping in the upstream clients and partial run results
+"""
+import asyncio
+import json
+import time
+from unittest.mock import Mock, patch
+import pytest
+import requests
+from django.test import RequestFactory
+from myapp.services.adaptive_limiter import AdaptiveLimiterRegistry
+from myapp.services.circuit_breaker import CircuitBreakerRegistry
+from myapp.services.deadline import Deadline, DeadlineExceeded, child_scope, current_deadline, deadline_scope, request_seconds
+from myapp.services.http_client import UpstreamHTTPClient
+from myapp.services.run_service import RunDataService, AsyncRunDataService
+from myapp.views import FetchDetailsView, FetchMultipleRunsView
+
+STATS_URL = 'http://perfweb/cgi-bin/perfcloud/view.cgi?p=/x/eng/perfcloud/RESULTS/2507/250729hhm/ontap_command_output/01_iter/stats_workload.txt'
+RAW_DETAILS = {'workload': 'fio', 'peak_iter': 3, 'ontap_ver': '9.16', 'peak_ops': 5000, 'peak_lat': 1.2, 'model': 'A90'}
+
+
+class TestDeadline:
+    """Test cases for Deadline and its scopes"""
+
+    def test_clamp_limits_timeout(self):
+        """Test timeouts are cut to the remaining budget"""
+        deadline = Deadline(0.5)
+
+        assert deadline.clamp(30) <= 0.5
+        assert deadline.clamp(0.1) == 0.1
+        assert not deadline.exceeded
+
+    def test_clamp_after_expiry(self):
+        """Test an expired deadline refuses further calls and records it"""
+        deadline = Deadline(0.01)
+        time.sleep(0.02)
+
+        with pytest.raises(DeadlineExceeded):
+            deadline.clamp(30)
+        assert deadline.exceeded
+
+    def test_child_reports_to_parent(self):
+        """Test a child shares the expiry and marks its parent when cut short"""
+        with deadline_scope(5) as parent:
+            with child_scope() as child:
+                assert current_deadline() is child
+                assert child.expires_at == parent.expires_at
+                child.exceeded_error()
+            assert current_deadline() is parent
+
+        assert parent.exceeded
+        assert current_deadline() is None
+
+    def test_no_deadline(self):
+        """Test scopes without a budget set nothing"""
+        with deadline_scope(None) as deadline:
+            with child_scope() as child:
+                assert deadline is None and child is None
+                assert current_deadline() is None
+
+    def test_request_seconds(self, settings):
+        """Test ?deadline= parsing, the default and the cap"""
+        settings.REQUEST_DEADLINE = {'DEFAULT_SECONDS': 25, 'MAX_SECONDS': 60}
+
+        assert request_seconds(None) == 25
+        assert request_seconds('2.5') == 2.5
+        assert request_seconds('600') == 60
+        for invalid in ('abc', '0', '-1', 'nan'):
+            with pytest.raises(ValueError):
+                request_seconds(invalid)
+
+
+class TestUpstreamClientDeadline:
+    """Test cases for deadline clamping inside UpstreamHTTPClient"""
+
+    def _client(self):
+        breakers = CircuitBreakerRegistry({})
+        client = UpstreamHTTPClient({}, breakers=breakers, limiters=AdaptiveLimiterRegistry({}))
+        return client, breakers
+
+    def test_timeout_clamped_to_budget(self):
+        """Test the request timeout never exceeds the remaining budget"""
+        client, _ = self._client()
+        session = Mock()
+        session.get.return_value = Mock(status_code=200)
+
+        with patch.object(client, 'session_for', return_value=session):
+            with deadline_scope(0.5):
+                client.get(STATS_URL, timeout=10)
+
+        assert session.get.call_args.kwargs['timeout'] <= 0.5
+
+    def test_expired_deadline_fails_fast(self):
+        """Test no request is sent once the budget is spent"""
+        client, _ = self._client()
+        session = Mock()
+
+        with patch.object(client, 'session_for', return_value=session):
+            with deadline_scope(0.01) as deadline:
+                time.sleep(0.02)
+                with pytest.raises(DeadlineExceeded):
+                    client.get(STATS_URL, timeout=10)
+
+        session.get.assert_not_called()
+        assert deadline.exceeded
+
+    def test_cut_short_call_does_not_count_against_host(self):
+        """Test a timeout caused by the deadline is not recorded as a host failure"""
+        client, breakers = self._client()
+
+        def slow_get(url, timeout, **kwargs):
+            time.sleep(timeout)
+            raise requests.exceptions.ReadTimeout('read timed out')
+
+        session = Mock()
+        session.get.side_effect = slow_get
+        with patch.object(client, 'session_for', return_value=session):
+            with deadline_scope(0.05):
+                with pytest.raises(DeadlineExceeded):
+                    client.get(STATS_URL, timeout=10)
+
+        assert breakers.get_status()['http://perfweb']['window_calls'] == 0
+
+
+def _cut_short_stats(run_id):
+    """Stats crawl that loses its last files to the deadline"""
+    current_deadline().exceeded_error()
+    return {'Maximum Throughput': 10.0}
+
+
+def _cut_short_ingestion(run_id):
+    """Run ingestion that loses its last files to the deadline"""
+    return {'stats': _cut_short_stats(run_id), 'graph_data': [{'latency': 1.0, 'ops': 1, 'throughput': 1}]}
+
+
+class TestPartialResults:
+    """Test cases for partial run data when the deadline runs out"""
+
+    @patch('myapp.services.run_service.api_cache')
+    @patch('myapp.services.run_service.RunIngestionService.ingest', side_effect=_cut_short_ingestion)
+    @patch('myapp.services.run_service.ExternalAPIService.fetch_run_details', return_value=RAW_DETAILS)
+    def test_partial_run_not_cached(self, mock_details, mock_stats, mock_cache):
+        """Test a run cut short is flagged, lists its missing fields and is not cached"""
+        mock_cache.get.return_value = None
+
+        with deadline_scope(5):
+            result = RunDataService.fetch_single_run_data('250729hhm')
+
+        assert result['partial'] is True
+        assert result['Maximum Throughput'] == 10.0
+        assert 'Maximum Throughput' not in result['missing_fields']
+        assert 'Maximum System CPU Busy' in result['missing_fields']
+        assert 'Workload Type' not in result['missing_fields']
+        mock_cache.put.assert_not_called()
+
+    @patch('myapp.services.run_service.api_cache')
+    @patch('myapp.services.run_service.ExternalAPIService.fetch_run_details')
+    def test_details_cut_short(self, mock_details, mock_cache):
+        """Test a run whose details never arrived is partial rather than an error"""
+        mock_cache.get.return_value = None
+
+        def expire(run_id):
+            current_deadline().exceeded_error()
+            raise Exception('Network error fetching data: deadline exceeded')
+        mock_details.side_effect = expire
+
+        with deadline_scope(5):
+            result = RunDataService.fetch_single_run_data('250729hhm', include_stats=False)
+
+        assert result == {'partial': True, 'missing_fields': RunDataService.expected_fields(False)}
+
+    @patch('myapp.services.run_service.api_cache')
+    @patch('myapp.services.run_service.RunIngestionService.ingest')
+    @patch('myapp.services.run_service.ExternalAPIService.fetch_run_details', return_value=RAW_DETAILS)
+    def test_only_the_cut_short_run_is_partial(self, mock_details, mock_stats, mock_cache):
+        """Test each run of a comparison tracks the deadline separately"""
+        mock_cache.get.return_value = None
+        mock_stats.side_effect = lambda run_id: (
+            _cut_short_ingestion(run_id) if run_id == '250729hhn'
+            else {'stats': {'Maximum Throughput': 1.0}, 'graph_data': None}
+        )
+
+        with deadline_scope(5):
+            result = RunDataService.fetch_comparison_data('250729hhm', '250729hhn')
+
+        assert result['partial'] is True
+        assert 'partial' not in result['id1']
+        assert result['id2']['partial'] is True
+        assert mock_cache.put.call_count == 1
+
+    @patch('myapp.services.run_service.api_cache')
+    @patch('myapp.services.run_service.AsyncRunIngestionService.ingest')
+    @patch('myapp.services.run_service.AsyncExternalAPIService.fetch_run_details')
+    def test_async_partial_run(self, mock_details, mock_stats, mock_cache):
+        """Test the async service flags partial runs the same way"""
+        mock_cache.get.return_value = None
+
+        async def details(run_id):
+            return RAW_DETAILS
+
+        async def stats(run_id):
+            return _cut_short_ingestion(run_id)
+
+        mock_details.side_effect = details
+        mock_stats.side_effect = stats
+
+        async def fetch():
+            with deadline_scope(5):
+                return await AsyncRunDataService.fetch_multiple_runs_data(['250729hhm'])
+
+        result = asyncio.run(fetch())
+
+        assert result['partial'] is True
+        assert result['results']['250729hhm']['partial'] is True
+        mock_cache.put.assert_not_called()
+
+
+class TestDeadlineViews:
+    """Test cases for the deadline parameter on the views"""
+
+    def setup_method(self):
+        self.factory = RequestFactory()
+
+    @patch('myapp.views.RunDataService.fetch_single_run_data')
+    def test_view_sets_deadline(self, mock_fetch):
+        """Test the view runs the service under the requested budget"""
+        seen = {}
+
+        def fetch(run_id):
+            seen['deadline'] = current_deadline()
+            return {'Workload Type': 'fio'}
+        mock_fetch.side_effect = fetch
+
+        response = FetchDetailsView().get(self.factory.get('/fetch-details/', {'id': '250729hhm', 'deadline': '3'}))
+
+        assert response.status_code == 200
+        assert seen['deadline'].seconds == 3.0
+        assert current_deadline() is None
+
+    def test_invalid_deadline(self):
+        """Test a malformed deadline is rejected with 400"""
+        for view, params in (
+            (FetchDetailsView(), {'id': '250729hhm', 'deadline': 'soon'}),
+            (FetchMultipleRunsView(), {'run_ids': '250729hhm', 'deadline': '-5'})
+        ):
+            response = view.get(self.factory.get('/', params))
+            assert response.status_code == 400
+            assert 'deadline' in json.loads(response.content)['error']
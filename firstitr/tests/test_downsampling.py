@@ -0,0 +1,125 @@
+"""
+Unit tests for LTTB downsampling of graph data
+Tests point selection, per-resolution cache variants and the max_points query parameter
+"""
+import asyncio
+import json
+from unittest.mock import patch
+import pytest
+from django.test import RequestFactory
+from myapp.records import GraphSeries, lttb_indices
+from myapp.services.run_service import AsyncGraphDataManagerService, GraphDataManagerService
+from myapp.services.stats_service import GraphDataService
+from myapp.views import FetchGraphDataView
+
+RUN_ID = '250729hhm'
+
+# A load curve with a latency spike at point 50
+POINTS = [
+    {'latency': 50.0 if index == 50 else 1.0 + index / 100, 'ops': 100 * index, 'throughput': 1048576 * index}
+    for index in range(100)
+]
+
+
+@pytest.fixture
+def cache(isolated_api_cache):
+    with patch('myapp.services.run_service.GraphDataService.fetch_graph_data',
+               side_effect=lambda run_id: [dict(point) for point in POINTS]) as fetch:
+        isolated_api_cache.fetch = fetch
+        yield isolated_api_cache
+
+
+class TestLttb:
+    """Test cases for Largest-Triangle-Three-Buckets selection"""
+
+    def test_keeps_endpoints_and_count(self):
+        """Test the first and last points are kept and exactly threshold points remain"""
+        indices = lttb_indices(list(range(100)), [index % 7 for index in range(100)], 10)
+
+        assert len(indices) == 10
+        assert indices[0] == 0 and indices[-1] == 99
+        assert indices == sorted(indices)
+
+    def test_keeps_spikes(self):
+        """Test a spike survives downsampling"""
+        series = GraphSeries.from_points(POINTS, GraphDataService.graph_types())
+
+        downsampled = series.downsampled('throughput', 'latency', 10)
+
+        assert 50.0 in downsampled.column('latency')
+
+    def test_short_curves_unchanged(self):
+        """Test curves with no more than threshold points keep every point"""
+        assert lttb_indices([1, 2, 3], [3, 2, 1], 5) == [0, 1, 2]
+
+
+class TestDownsampledGraphData:
+    """Test cases for max_points in the graph data services"""
+
+    def test_max_points(self, cache):
+        """Test each run is cut down to max_points points in curve order"""
+        result = GraphDataManagerService.fetch_single_graph_data(RUN_ID, max_points=10)
+
+        points = result['data_points'][RUN_ID]
+        assert len(points) == 10
+        assert points[0] == POINTS[0] and points[-1] == POINTS[-1]
+
+    def test_variant_cached_per_resolution(self, cache):
+        """Test a repeated resolution is served from its own cache entry"""
+        first = GraphDataManagerService.fetch_single_graph_data(RUN_ID, max_points=10)
+        with patch.object(GraphSeries, 'downsampled') as downsampled:
+            again = GraphDataManagerService.fetch_single_graph_data(RUN_ID, max_points=10)
+            other = GraphDataManagerService.fetch_single_graph_data(RUN_ID, max_points=20)
+
+        assert again == first
+        assert cache.fetch.call_count == 1
+        assert downsampled.call_count == 1
+        assert other is not None
+        assert f'graph_{RUN_ID}:lttb10' in cache.cache
+
+    def test_full_resolution_unaffected(self, cache):
+        """Test requests without max_points still get every point"""
+        GraphDataManagerService.fetch_single_graph_data(RUN_ID, max_points=10)
+
+        result = GraphDataManagerService.fetch_single_graph_data(RUN_ID)
+
+        assert result['data_points'][RUN_ID] == POINTS
+
+    def test_plain_entries_served_as_is(self, cache):
+        """Test entries cached before GraphSeries are not downsampled"""
+        cache.put(f'graph_{RUN_ID}', POINTS)
+
+        result = GraphDataManagerService.fetch_single_graph_data(RUN_ID, max_points=10)
+
+        assert result['data_points'][RUN_ID] == POINTS
+
+    def test_async_matches_sync(self, cache):
+        """Test the async service downsamples the same way"""
+        with patch('myapp.services.run_service.AsyncGraphDataService.fetch_graph_data',
+                   side_effect=lambda run_id: [dict(point) for point in POINTS]):
+            result = asyncio.run(AsyncGraphDataManagerService.fetch_single_graph_data(RUN_ID, max_points=10))
+        cache.clear()
+
+        assert result == GraphDataManagerService.fetch_single_graph_data(RUN_ID, max_points=10)
+
+
+class TestMaxPointsParameter:
+    """Test cases for the max_points query parameter"""
+
+    @pytest.mark.parametrize('value', ['2', 'ten', '-5'])
+    def test_invalid_values(self, value):
+        """Test values that are not integers of at least 3 are rejected with 400"""
+        request = RequestFactory().get('/fetch-graph-data/', {'run_id1': RUN_ID, 'max_points': value})
+
+        response = FetchGraphDataView.as_view()(request)
+
+        assert response.status_code == 400
+        assert 'max_points' in json.loads(response.content)['error']
+
+    def test_max_points(self, cache):
+        """Test ?max_points= reaches the service"""
+        request = RequestFactory().get('/fetch-graph-data/', {'run_id1': RUN_ID, 'max_points': '10'})
+
+        response = FetchGraphDataView.as_view()(request)
+
+        assert len(json.loads(response.content)['data_points'][RUN_ID]) == 10
@@ -0,0 +1,162 @@
+"""
+Unit tests for hedged upstream requests
+Tests hedge delays, the hedge budget, winner selection and ExternalAPIService integration
+"""
+import asyncio
+import threading
+import time
+from unittest.mock import Mock, patch
+import pytest
+from myapp.services.adaptive_limiter import AdaptiveLimiter, AdaptiveLimiterRegistry
+from myapp.services.api_service import ExternalAPIService
+from myapp.services.hedging import HedgingPolicy, hedging
+
+STATS_URL = 'http://perfweb/cgi-bin/perfcloud/view.cgi?p=/x/eng/perfcloud/RESULTS/2507/250729hhm/ontap_command_output/01_iter/stats_workload.txt'
+LINK = 'testdirview.cgi?p=/x/eng/perfcloud/RESULTS/2507/250729hhm/ontap_command_output/01_iter'
+
+
+def _policy(**overrides):
+    limiters = AdaptiveLimiterRegistry({'MIN_SAMPLES': 5})
+    window = limiters.limiter_for('http://perfweb').window_for(AdaptiveLimiter.endpoint_key(STATS_URL))
+    for _ in range(5):
+        window.add(0.01)
+    config = {'ENABLED': True, 'MIN_DELAY': 0.01, 'MAX_HEDGE_RATIO': 1.0, 'MAX_BURST': 5, **overrides}
+    return HedgingPolicy(config, limiters=limiters)
+
+
+def _attempts(*behaviours):
+    """Attempt function whose n-th call sleeps then returns or raises behaviours[n]"""
+    calls = {'count': 0}
+    lock = threading.Lock()
+
+    def attempt():
+        with lock:
+            index = calls['count']
+            calls['count'] += 1
+        delay, outcome = behaviours[index]
+        time.sleep(delay)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    attempt.calls = calls
+    return attempt
+
+
+class TestHedgingPolicy:
+    """Test cases for HedgingPolicy"""
+
+    def test_disabled_runs_inline(self):
+        """Test a disabled policy just calls the attempt"""
+        policy = _policy(ENABLED=False)
+        caller = threading.current_thread()
+
+        assert policy.call(STATS_URL, lambda: threading.current_thread()) is caller
+        assert policy.get_status()['primaries'] == 0
+
+    def test_no_hedge_without_latency_history(self):
+        """Test hedging waits for enough observed latencies"""
+        policy = HedgingPolicy({'ENABLED': True}, limiters=AdaptiveLimiterRegistry({'MIN_SAMPLES': 5}))
+
+        assert policy.hedge_delay(STATS_URL) is None
+
+    def test_hedge_delay_is_endpoint_percentile(self):
+        """Test the delay follows the endpoint's p95"""
+        assert _policy().hedge_delay(STATS_URL) == pytest.approx(0.01)
+
+    def test_slow_primary_is_hedged(self):
+        """Test the faster duplicate's result is returned"""
+        policy = _policy()
+        attempt = _attempts((0.5, 'slow'), (0.0, 'fast'))
+
+        start = time.perf_counter()
+        assert policy.call(STATS_URL, attempt) == 'fast'
+
+        assert time.perf_counter() - start < 0.3
+        assert policy.get_status()['hedges'] == 1
+        assert policy.get_status()['hedge_wins'] == 1
+
+    def test_fast_primary_is_not_hedged(self):
+        """Test requests answering before the delay send no duplicate"""
+        policy = _policy(MIN_DELAY=0.2)
+        attempt = _attempts((0.0, 'primary'))
+
+        assert policy.call(STATS_URL, attempt) == 'primary'
+        assert attempt.calls['count'] == 1
+
+    def test_budget_caps_hedges(self):
+        """Test hedges stop once the budget is spent"""
+        policy = _policy(MAX_HEDGE_RATIO=0.05)
+        attempt = _attempts((0.05, 'slow'))
+
+        assert policy.call(STATS_URL, attempt) == 'slow'
+        assert attempt.calls['count'] == 1
+        assert policy.get_status()['budget_denied'] == 1
+
+    def test_failed_primary_falls_back_to_hedge(self):
+        """Test a hedge that succeeds masks a failing slow primary"""
+        policy = _policy()
+        attempt = _attempts((0.1, ValueError('primary failed')), (0.15, 'hedge'))
+
+        assert policy.call(STATS_URL, attempt) == 'hedge'
+
+    def test_both_failing_raise_primary_error(self):
+        """Test the primary's exception is raised when both copies fail"""
+        policy = _policy()
+        attempt = _attempts((0.05, ValueError('primary failed')), (0.0, ValueError('hedge failed')))
+
+        with pytest.raises(ValueError, match='primary failed'):
+            policy.call(STATS_URL, attempt)
+
+    def test_async_loser_is_cancelled(self):
+        """Test the async variant returns the hedge and cancels the slow primary"""
+        policy = _policy()
+        state = {'calls': 0, 'cancelled': False}
+
+        async def attempt():
+            state['calls'] += 1
+            if state['calls'] == 1:
+                try:
+                    await asyncio.sleep(1)
+                except asyncio.CancelledError:
+                    state['cancelled'] = True
+                    raise
+                return 'slow'
+            return 'fast'
+
+        async def run():
+            result = await policy.call_async(STATS_URL, attempt)
+            await asyncio.sleep(0)
+            return result
+
+        assert asyncio.run(run()) == 'fast'
+        assert state['cancelled'] is True
+
+
+class TestHedgedStatsFiles:
+    """Test cases for hedging inside ExternalAPIService"""
+
+    @patch('myapp.services.api_service.upstream_http.get')
+    def test_slow_stats_file_is_hedged(self, mock_get, settings):
+        """Test a slow stats-file GET is answered by its duplicate"""
+        settings.UPSTREAM_HEDGING = {'ENABLED': True, 'MIN_DELAY': 0.01, 'MAX_HEDGE_RATIO': 1.0}
+        settings.UPSTREAM_LIMITS = {'MIN_SAMPLES': 5}
+        url = ExternalAPIService.stats_file_url('2507', '250729hhm', LINK, 'stats_workload.txt')
+        window = hedging.limiters.limiter_for('http://perfweb.gdl.englab.netapp.com').window_for(AdaptiveLimiter.endpoint_key(url))
+        for _ in range(5):
+            window.add(0.01)
+
+        responses = iter([(0.5, 'ops:1/s'), (0.0, 'ops:2/s')])
+        lock = threading.Lock()
+
+        def fake_get(url, timeout, **kwargs):
+            with lock:
+                delay, text = next(responses)
+            time.sleep(delay)
+            return Mock(ok=True, status_code=200, text=text, headers={})
+
+        mock_get.side_effect = fake_get
+
+        assert ExternalAPIService.fetch_stats_file('2507', '250729hhm', LINK, 'stats_workload.txt') == 'ops:2/s'
+        assert mock_get.call_count == 2
+        assert hedging.get_status()['hedge_wins'] == 1
@@ -0,0 +1,178 @@
+"""
+Unit tests for the pooled upstream HTTP client
+Tests per-host session reuse, pool sizing and retry/backoff behaviour
+"""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from requests.adapters import HTTPAdapter
+from myapp.services.deadline import DeadlineExceeded, deadline_scope
+from myapp.services.http_client import UpstreamHTTPClient
+
+
+class _CountingHandler(BaseHTTPRequestHandler):
+    """Keep-alive handler that counts connections and can fail first requests"""
+    protocol_version = 'HTTP/1.1'
+
+    def handle(self):
+        with self.server.lock:
+            self.server.connections += 1
+        super().handle()
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests += 1
+            failing = self.server.failures_left > 0
+            if failing:
+                self.server.failures_left -= 1
+        time.sleep(self.server.delay)
+
+        body = b'unavailable' if failing else b'write_data:1048576b/s'
+        self.send_response(503 if failing else 200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    """Local keep-alive server standing in for perfweb"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _CountingHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.connections = 0
+    server.requests = 0
+    server.failures_left = 0
+    server.delay = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestUpstreamHTTPClient:
+    """Test cases for UpstreamHTTPClient"""
+
+    def test_session_shared_per_host(self):
+        """Test that URLs on the same host share one session"""
+        client = UpstreamHTTPClient({})
+
+        session1 = client.session_for('http://perfweb.example.com/cgi-bin/view.cgi?p=a')
+        session2 = client.session_for('http://perfweb.example.com/cgi-bin/testdirview.cgi?p=b')
+        session3 = client.session_for('http://grover.example.com/KO/rest/api/Runs/1')
+
+        assert session1 is session2
+        assert session1 is not session3
+        assert set(client.sessions) == {'http://perfweb.example.com', 'http://grover.example.com'}
+
+    def test_adapter_uses_configured_pool_and_retries(self):
+        """Test that pool size and retry policy come from configuration"""
+        client = UpstreamHTTPClient({'POOL_MAXSIZE': 7, 'RETRIES': 4, 'BACKOFF_FACTOR': 0.1})
+
+        adapter = client.session_for('http://perfweb.example.com/').get_adapter('http://perfweb.example.com/')
+
+        assert isinstance(adapter, HTTPAdapter)
+        assert adapter._pool_maxsize == 7
+        assert adapter.max_retries.total == 4
+        assert adapter.max_retries.backoff_factor == 0.1
+        assert 'GET' in adapter.max_retries.allowed_methods
+        assert 'POST' not in adapter.max_retries.allowed_methods
+
+    def test_connections_are_reused(self, local_server):
+        """Test that sequential requests reuse one keep-alive connection"""
+        client = UpstreamHTTPClient({})
+        url = f'http://127.0.0.1:{local_server.server_address[1]}/view.cgi'
+
+        for _ in range(5):
+            response = client.get(url, timeout=5)
+            assert response.text == 'write_data:1048576b/s'
+
+        assert local_server.requests == 5
+        assert local_server.connections == 1
+        client.close()
+
+    def test_retries_transient_errors_with_backoff(self, local_server):
+        """Test that 503 responses are retried until success"""
+        local_server.failures_left = 2
+        client = UpstreamHTTPClient({'RETRIES': 2, 'BACKOFF_FACTOR': 0.01, 'BACKOFF_JITTER': 0.0})
+        url = f'http://127.0.0.1:{local_server.server_address[1]}/view.cgi'
+
+        response = client.get(url, timeout=5)
+
+        assert response.status_code == 200
+        assert local_server.requests == 3
+        client.close()
+
+    def test_exhausted_retries_return_last_response(self, local_server):
+        """Test that callers still see the error response after retries"""
+        local_server.failures_left = 5
+        client = UpstreamHTTPClient({'RETRIES': 1, 'BACKOFF_FACTOR': 0.0, 'BACKOFF_JITTER': 0.0})
+        url = f'http://127.0.0.1:{local_server.server_address[1]}/view.cgi'
+
+        response = client.get(url, timeout=5)
+
+        assert response.status_code == 503
+        assert not response.ok
+        assert local_server.requests == 2
+        client.close()
+
+    def test_close_clears_sessions(self):
+        """Test closing the client drops all sessions"""
+        client = UpstreamHTTPClient({})
+        client.session_for('http://perfweb.example.com/')
+
+        client.close()
+
+        assert client.sessions == {}
+
+
+class TestRetriesWithinDeadline:
+    """Test cases for retries made under a request deadline"""
+
+    def test_retries_only_while_backoff_fits(self, local_server):
+        """Test a retry is skipped once its backoff would outlast the deadline"""
+        local_server.failures_left = 5
+        client = UpstreamHTTPClient({'RETRIES': 2, 'BACKOFF_FACTOR': 0.3, 'BACKOFF_JITTER': 0.0})
+        url = f'http://127.0.0.1:{local_server.server_address[1]}/view.cgi'
+
+        start = time.monotonic()
+        with deadline_scope(0.5):
+            response = client.get(url, timeout=5)
+
+        assert response.status_code == 503
+        assert local_server.requests == 2
+        assert time.monotonic() - start < 0.5
+        client.close()
+
+    def test_slow_host_does_not_overshoot(self, local_server):
+        """Test timed-out attempts are not retried past the deadline"""
+        local_server.delay = 2.0
+        client = UpstreamHTTPClient({'RETRIES': 2, 'BACKOFF_FACTOR': 0.1, 'BACKOFF_JITTER': 0.0})
+        url = f'http://127.0.0.1:{local_server.server_address[1]}/view.cgi'
+
+        start = time.monotonic()
+        with deadline_scope(0.5):
+            with pytest.raises(DeadlineExceeded):
+                client.get(url, timeout=5)
+
+        assert time.monotonic() - start < 0.75
+        assert local_server.requests == 1
+        client.close()
+
+    def test_retries_within_budget_still_made(self, local_server):
+        """Test transient errors are still retried when the budget allows"""
+        local_server.failures_left = 2
+        client = UpstreamHTTPClient({'RETRIES': 2, 'BACKOFF_FACTOR': 0.01, 'BACKOFF_JITTER': 0.0})
+        url = f'http://127.0.0.1:{local_server.server_address[1]}/view.cgi'
+
+        with deadline_scope(5):
+            response = client.get(url, timeout=5)
+
+        assert response.status_code == 200
+        assert local_server.requests == 3
+        client.close()
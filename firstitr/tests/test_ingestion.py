@@ -0,0 +1,142 @@
+"""
+Unit tests for unified run ingestion
+Tests that one crawl yields the same stats and graph data as the separate crawls,
+fetches each file once and fills both the details and graph cache entries
+"""
+import asyncio
+import pytest
+from myapp.services.ingestion import AsyncRunIngestionService, RunIngestionService
+from myapp.services.iteration_ledger import iteration_ledger
+from myapp.services.run_service import GraphDataManagerService, RunDataService
+from myapp.services.stats_service import GraphDataService, StatsProcessingService
+
+RUN_ID = '250729hhm'
+LINKS = [f'link/{index:02d}_iter' for index in range(1, 6)]
+
+RAW_DETAILS = {'workload': 'seq_write', 'model': 'a400', 'peak_ops': 50000}
+
+
+def files_of(index):
+    return {
+        'stats_workload.txt': (
+            f'write_data:{1048576 * index}b/s\nread_io_type.cache:{70 + index}%\n'
+            f'latency:{1.0 + index / 10}us\nops:{1000 * index}/s\n'
+        ),
+        'stats_system.txt': f'cpu_busy:{40 + index}.5%\n',
+        'stats_wafl_flexlog.txt': f'rdma_actual_latency.WAFL_SPINNP_WRITE:{100 + index}.0us\n',
+        'system_node_virtual_machine_instance_show.txt': 'Instance Type: m5.4xlarge\n',
+    }
+
+
+@pytest.fixture
+def upstream(isolated_api_cache, fake_run):
+    fake = fake_run(len(LINKS), files_of, RAW_DETAILS)
+    fake.cache = isolated_api_cache
+    return fake
+
+
+def separate_crawls():
+    """Stats and graph data from the two independent crawls"""
+    return StatsProcessingService.fetch_comprehensive_stats(RUN_ID), GraphDataService.fetch_graph_data(RUN_ID)
+
+
+class TestRunIngestion:
+    """Test cases for RunIngestionService"""
+
+    def test_same_results_as_separate_crawls(self, upstream):
+        """Test one ingestion returns what the stats and graph crawls return"""
+        stats, graph_data = separate_crawls()
+        iteration_ledger.reset()
+
+        ingested = RunIngestionService.ingest(RUN_ID)
+
+        assert ingested == {'stats': stats, 'graph_data': graph_data}
+        assert len(graph_data) == len(LINKS)
+        assert stats['Instance Type'] == 'm5.4xlarge'
+
+    def test_each_file_fetched_once(self, upstream):
+        """Test the listing and every workload file are requested once"""
+        separate_crawls()
+        separate = upstream.requests
+        iteration_ledger.reset()
+        upstream.listings, upstream.fetched = 0, []
+
+        RunIngestionService.ingest(RUN_ID)
+
+        assert upstream.listings == 1
+        assert len(upstream.fetched) == len(set(upstream.fetched))
+        assert upstream.requests < separate
+        assert upstream.fetched.count((LINKS[0], 'stats_workload.txt')) == 1
+
+    def test_graph_only_pending_iterations(self, upstream):
+        """Test iterations with settled stats but no graph point only fetch their workload file"""
+        StatsProcessingService.fetch_comprehensive_stats(RUN_ID)
+        upstream.fetched = []
+
+        ingested = RunIngestionService.ingest(RUN_ID)
+
+        # Every iteration but the newest settled its stats; the newest is fetched again in full
+        workload_only = [link for link, stats_type in upstream.fetched if link != LINKS[-1]]
+        assert set(workload_only) == set(LINKS[:-1])
+        assert {stats_type for link, stats_type in upstream.fetched if link != LINKS[-1]} == {'stats_workload.txt'}
+        assert len(ingested['graph_data']) == len(LINKS)
+
+    def test_refresh_reuses_settled_iterations(self, upstream):
+        """Test a second ingestion only fetches the newest iteration"""
+        first = RunIngestionService.ingest(RUN_ID)
+        upstream.fetched = []
+
+        again = RunIngestionService.ingest(RUN_ID)
+
+        assert again == first
+        assert {link for link, _ in upstream.fetched} == {LINKS[-1]}
+
+    def test_series_mode(self, upstream, settings):
+        """Test series-mode scans still give first-match graph points"""
+        settings.STATS_SERIES = {'ENABLED': True}
+        stats, graph_data = separate_crawls()
+        iteration_ledger.reset()
+
+        ingested = RunIngestionService.ingest(RUN_ID)
+
+        assert ingested['graph_data'] == graph_data
+        assert ingested['stats']['Sample Statistics'] == stats['Sample Statistics']
+
+    def test_streaming_mode(self, upstream, settings):
+        """Test streamed scans serve both sides as well"""
+        stats, graph_data = separate_crawls()
+        iteration_ledger.reset()
+        settings.STREAMING_FETCH = {'ENABLED': True}
+
+        assert RunIngestionService.ingest(RUN_ID) == {'stats': stats, 'graph_data': graph_data}
+
+    def test_async_matches_sync(self, upstream):
+        """Test the async service ingests the same way"""
+        ingested = RunIngestionService.ingest(RUN_ID)
+        iteration_ledger.reset()
+
+        assert asyncio.run(AsyncRunIngestionService.ingest(RUN_ID)) == ingested
+
+
+class TestIngestedCacheEntries:
+    """Test cases for caching ingested graph data with the run details"""
+
+    def test_details_fill_graph_cache(self, upstream):
+        """Test a cold details load caches the graph so the graph request needs no upstream calls"""
+        details = RunDataService.fetch_single_run_data(RUN_ID)
+        requests = upstream.requests
+
+        graph = GraphDataManagerService.fetch_single_graph_data(RUN_ID)
+
+        assert details['Maximum Throughput'] == 5.0
+        assert upstream.requests == requests
+        assert graph['data_points'][RUN_ID] == GraphDataService.fetch_graph_data(RUN_ID)
+
+    def test_projected_details_leave_graph_alone(self, upstream):
+        """Test projected loads keep their narrow crawl and cache no graph data"""
+        projection = RunDataService.resolve_projection(metrics=['cpu_busy'])
+
+        RunDataService.fetch_single_run_data(RUN_ID, projection=projection)
+
+        assert upstream.cache.get(f'graph_{RUN_ID}') is None
+        assert {stats_type for _, stats_type in upstream.fetched} == {'stats_system.txt'}
@@ -0,0 +1,125 @@
+"""
+Unit tests for incremental refresh of in-progress runs
+Tests the iteration ledger and the stats and graph crawls that reuse it
+"""
+import asyncio
+import pytest
+from myapp.services.iteration_ledger import IterationLedger, UNSETTLED, iteration_ledger
+from myapp.services.stats_service import (
+    StatsProcessingService, GraphDataService, AsyncStatsProcessingService, AsyncGraphDataService
+)
+
+RUN_ID = '250729hhm'
+
+
+def iteration_files(n):
+    """Stats files of iteration n, with values growing by iteration"""
+    return {
+        'stats_workload.txt': f'write_data:{n}048576b/s\nops:{n}000/s\nlatency:{n}.5us\nread_io_type.cache:{60 + n}%\n',
+        'stats_system.txt': f'cpu_busy:{50 + n}.0%\n',
+        'stats_wafl_flexlog.txt': f'rdma_actual_latency.WAFL_SPINNP_WRITE:{100 - n}.0us\n',
+        'system_node_virtual_machine_instance_show.txt': 'Instance Type: m5.4xlarge\n',
+    }
+
+
+@pytest.fixture
+def run(fake_run):
+    return fake_run(3, iteration_files)
+
+
+class TestIterationLedger:
+    """Test cases for settling iterations"""
+
+    def test_newest_and_incomplete_iterations_stay_pending(self):
+        """Test only complete iterations with a successor settle"""
+        ledger = IterationLedger().for_run(RUN_ID, ['a', 'b', 'c'])
+
+        assert ledger.settle_stats('a', ['a', 'b', 'c'], ['x', '', 'y'], {'cpu_busy': [50.0]})
+        assert not ledger.settle_stats('b', ['a', 'b', 'c'], ['x', None, 'y'], {'cpu_busy': [70.0]})
+        assert not ledger.settle_graph('c', ['a', 'b', 'c'], 'x', {'ops': 1})
+
+        assert ledger.pending_stats(['a', 'b', 'c']) == ['b', 'c']
+        assert ledger.maxima == {'cpu_busy': 50.0}
+        assert ledger.graph_point('c') is UNSETTLED
+
+    def test_ledger_discarded_when_listing_loses_settled_iteration(self):
+        """Test a restarted run (settled iteration gone from the listing) starts over"""
+        ledgers = IterationLedger()
+        ledger = ledgers.for_run(RUN_ID, ['a', 'b'])
+        ledger.settle_graph('a', ['a', 'b'], 'x', None)
+
+        assert ledgers.for_run(RUN_ID, ['a', 'b', 'c']) is ledger
+        assert ledgers.for_run(RUN_ID, ['b', 'c']) is not ledger
+        assert ledgers.get_status()['discarded'] == 1
+
+    def test_max_runs_and_disabled(self):
+        """Test least recently used runs are evicted and a disabled ledger keeps nothing"""
+        ledgers = IterationLedger({'MAX_RUNS': 2})
+        for run_id in ('r1', 'r2', 'r3'):
+            ledgers.for_run(run_id, ['a'])
+        assert list(ledgers.runs) == ['r2', 'r3']
+
+        disabled = IterationLedger({'ENABLED': False})
+        assert disabled.for_run(RUN_ID, ['a']) is not disabled.for_run(RUN_ID, ['a'])
+        assert disabled.runs == {}
+
+
+class TestIncrementalRefresh:
+    """Test cases for stats and graph refreshes that fetch only new iterations"""
+
+    def test_stats_refresh_fetches_only_new_iterations(self, run):
+        """Test a refresh re-reads the previous newest iteration and the new ones, and merges maxima"""
+        first = StatsProcessingService.fetch_comprehensive_stats(RUN_ID)
+        run.fetched.clear()
+        run.iterations = 5
+
+        refreshed = StatsProcessingService.fetch_comprehensive_stats(RUN_ID)
+
+        assert {link for link, _ in run.fetched} == {'link/03_iter', 'link/04_iter', 'link/05_iter'}
+        assert first['Maximum System CPU Busy'] == 53.0
+        assert refreshed['Maximum System CPU Busy'] == 55.0
+        assert refreshed['Maximum WAFL RDMA Write Latency'] == 99.0
+        assert refreshed['Maximum Cache Percentage'] == 65
+        assert refreshed['Instance Type'] == 'm5.4xlarge'
+        assert iteration_ledger.get_status()['reused'] == 2
+
+    def test_refreshed_stats_match_full_crawl(self, run, settings):
+        """Test merged results equal a crawl without the ledger"""
+        StatsProcessingService.fetch_comprehensive_stats(RUN_ID)
+        run.iterations = 6
+        incremental = StatsProcessingService.fetch_comprehensive_stats(RUN_ID)
+
+        settings.ITERATION_LEDGER = {'ENABLED': False}
+
+        assert StatsProcessingService.fetch_comprehensive_stats(RUN_ID) == incremental
+
+    def test_graph_refresh_appends_new_points(self, run):
+        """Test graph series keep settled points in order and fetch only new workload files"""
+        GraphDataService.fetch_graph_data(RUN_ID)
+        run.fetched.clear()
+        run.iterations = 4
+
+        graph = GraphDataService.fetch_graph_data(RUN_ID)
+
+        assert [point['ops'] for point in graph] == [1000, 2000, 3000, 4000]
+        assert run.fetched == [('link/03_iter', 'stats_workload.txt'), ('link/04_iter', 'stats_workload.txt')]
+
+    def test_async_refresh(self, fake_run):
+        """Test the async crawls share the ledger and fetch only new iterations"""
+        fake = fake_run(2, iteration_files)
+
+        async def refresh():
+            await AsyncStatsProcessingService.fetch_comprehensive_stats(RUN_ID)
+            await AsyncGraphDataService.fetch_graph_data(RUN_ID)
+            fake.fetched.clear()
+            fake.iterations = 3
+            return (
+                await AsyncStatsProcessingService.fetch_comprehensive_stats(RUN_ID),
+                await AsyncGraphDataService.fetch_graph_data(RUN_ID)
+            )
+
+        stats, graph = asyncio.run(refresh())
+
+        assert stats['Maximum System CPU Busy'] == 53.0
+        assert len(graph) == 3
+        assert {link for link, _ in fake.fetched} == {'link/02_iter', 'link/03_iter'}
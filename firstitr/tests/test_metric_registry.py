@@ -0,0 +1,93 @@
+"""
+Unit tests for the metric registry and fetch planner
+Tests planning, registry-driven extraction and adding metrics without extra fetches
+"""
+from unittest.mock import patch
+import pytest
+from myapp.services.metric_registry import (
+    Metric, MetricRegistry, SYSTEM_FILE, VM_INSTANCE_FILE, WAFL_FILE, WORKLOAD_FILE, metric_registry
+)
+from myapp.services.stats_service import StatsProcessingService, GraphDataService
+
+RUN_ID = '250729hhm'
+FILES = {
+    WORKLOAD_FILE: 'write_data:1048576b/s\nops:1000/s\nlatency:1.5us\nread_io_type.cache:70%\n',
+    SYSTEM_FILE: 'cpu_busy:50.0%\n',
+    WAFL_FILE: 'rdma_actual_latency.WAFL_SPINNP_WRITE:100.0us\ncp_count:7\n',
+    VM_INSTANCE_FILE: 'Instance Type: m5.4xlarge\n',
+}
+
+
+@pytest.fixture
+def cp_count():
+    """Register an extra metric living in a file that is already fetched"""
+    metric = metric_registry.register(Metric('cp_count', WAFL_FILE, r'cp_count:(\d+)', int, label='WAFL CP Count'))
+    yield metric
+    metric_registry.unregister(metric.name)
+
+
+class TestPlanner:
+    """Test cases for planning fetches"""
+
+    def test_minimal_files_for_metrics(self):
+        """Test only the files holding the requested metrics are planned"""
+        plan = metric_registry.plan([metric_registry.get('cpu_busy'), metric_registry.get('throughput')])
+
+        assert list(plan) == [SYSTEM_FILE, WORKLOAD_FILE]
+        assert metric_registry.plan(metric_registry.graph_metrics()).keys() == {WORKLOAD_FILE}
+
+    def test_run_level_metrics_are_not_fetched_per_iteration(self):
+        """Test FIRST metrics (instance type) stay out of the per-iteration files"""
+        assert metric_registry.iteration_files(metric_registry.details_metrics()) == [
+            WORKLOAD_FILE, SYSTEM_FILE, WAFL_FILE
+        ]
+        assert metric_registry.iteration_files(metric_registry.details_metrics(['instance_type'])) == []
+
+    def test_unknown_metric(self):
+        """Test unknown names are rejected"""
+        with pytest.raises(ValueError):
+            MetricRegistry().get('cpu_busy')
+
+    def test_one_scan_covers_details_and_graph_metrics(self):
+        """Test the workload file's patterns include every metric read from it"""
+        patterns = metric_registry.patterns(WORKLOAD_FILE)
+
+        assert {'throughput', 'cache', 'latency', 'ops'} <= patterns.keys()
+        assert 'cpu_busy' not in patterns
+
+
+class TestRegistryDrivenExtraction:
+    """Test cases for extraction, aggregation and graph points from the registry"""
+
+    def test_new_metric_adds_no_fetches(self, cp_count):
+        """Test a metric in an already fetched file is reported without another upstream call"""
+        fetched = []
+
+        def fetch(year_month, run_id, link, stats_type):
+            fetched.append(stats_type)
+            return FILES[stats_type]
+
+        with patch('myapp.services.stats_service.ExternalAPIService.fetch_perfweb_links', return_value=['a', 'b']), \
+                patch('myapp.services.stats_service.ExternalAPIService.fetch_stats_file', side_effect=fetch):
+            stats = StatsProcessingService.fetch_comprehensive_stats(RUN_ID)
+
+        assert stats['Maximum WAFL CP Count'] == 7
+        assert stats['Maximum Throughput'] == 1.0
+        assert stats['Instance Type'] == 'm5.4xlarge'
+        assert len(fetched) == 2 * 3 + 1
+
+    def test_throughput_zero_readings_are_ignored(self):
+        """Test keep_zero=False metrics skip zero readings while percentages keep them"""
+        collectors = StatsProcessingService._new_collectors()
+
+        StatsProcessingService._extract_workload_stats('write_data:0b/s\nread_io_type.disk:0%\n', collectors)
+
+        assert collectors['throughputs'] == []
+        assert collectors['disk_percentages'] == [0]
+
+    def test_graph_point_needs_every_graph_metric(self):
+        """Test graph points come from the registry's graph metrics"""
+        assert GraphDataService._extract_graph_point(FILES[WORKLOAD_FILE]) == {
+            'latency': 1.5, 'ops': 1000, 'throughput': 1048576
+        }
+        assert GraphDataService._extract_graph_point('ops:1000/s\nlatency:1.5us\n') is None
@@ -0,0 +1,82 @@
+"""
+Unit tests for the stats parsing process pool
+Tests offload thresholds, result equivalence with inline scans and use in the stats crawl
+"""
+import asyncio
+from unittest.mock import patch
+import pytest
+from myapp.services.iteration_ledger import iteration_ledger
+from myapp.services.parse_pool import ParsePool, parse_pool
+from myapp.services.stats_service import StatsProcessingService
+from myapp.services.stream_scan import scan_text, scan_text_all
+
+WORKLOAD = 'stats_workload.txt'
+
+LARGE = 'volume.vol1.counter:1\n' * 20 + 'write_data:2097152b/s\nops:100/s\nlatency:1.5us\nops:300/s\n'
+SMALL = 'ops:7/s\n'
+
+
+@pytest.fixture
+def pool():
+    pool = ParsePool({'ENABLED': True, 'WORKERS': 2, 'MIN_BYTES': 100})
+    yield pool
+    pool.shutdown()
+
+
+class TestParsePool:
+    """Test cases for ParsePool"""
+
+    def test_disabled_by_default(self):
+        """Test nothing is offloaded unless PARSE_POOL is enabled"""
+        assert not ParsePool().offloads(LARGE * 100000)
+
+    def test_pooled_and_inline_scans_agree(self, pool):
+        """Test bodies above MIN_BYTES go to the pool and come back in job order"""
+        patterns = StatsProcessingService.scan_patterns(WORKLOAD)
+
+        results = pool.scan_many([(LARGE, patterns), (SMALL, patterns), (None, patterns)])
+
+        assert results == [scan_text(LARGE, patterns), scan_text(SMALL, patterns), None]
+        status = pool.get_status()
+        assert (status['offloaded'], status['inline'], status['workers']) == (1, 1, 2)
+
+    def test_all_matches(self, pool):
+        """Test series-mode scans run in the pool as well"""
+        patterns = StatsProcessingService.scan_patterns(WORKLOAD)
+
+        assert pool.scan(LARGE, patterns, all_matches=True) == scan_text_all(LARGE, patterns)
+
+    def test_async_scans(self, pool):
+        """Test the async variant awaits pooled scans"""
+        patterns = StatsProcessingService.scan_patterns(WORKLOAD)
+
+        results = asyncio.run(pool.scan_many_async([(SMALL, patterns), (LARGE, patterns)]))
+
+        assert results == [scan_text(SMALL, patterns), scan_text(LARGE, patterns)]
+
+
+class TestPooledStatsCrawl:
+    """Test cases for the stats crawl with the parse pool enabled"""
+
+    def test_same_stats_as_inline(self, settings):
+        """Test enabling the pool does not change the crawl's results"""
+        files = {
+            WORKLOAD: LARGE * 10,
+            'stats_system.txt': 'cpu_busy:42.0%\n',
+            'stats_wafl_flexlog.txt': '',
+            'system_node_virtual_machine_instance_show.txt': 'Instance Type: m5.4xlarge\n',
+        }
+        with patch('myapp.services.stats_service.ExternalAPIService.fetch_perfweb_links', return_value=['link/01_iter']), \
+                patch('myapp.services.stats_service.ExternalAPIService.fetch_stats_file',
+                      side_effect=lambda year_month, run_id, link, stats_type: files[stats_type]):
+            inline = StatsProcessingService.fetch_comprehensive_stats('250729hhm')
+            settings.PARSE_POOL = {'ENABLED': True, 'WORKERS': 1, 'MIN_BYTES': 100}
+            iteration_ledger.reset()
+            try:
+                pooled = StatsProcessingService.fetch_comprehensive_stats('250729hhm')
+            finally:
+                parse_pool.shutdown()
+
+        assert pooled == inline
+        assert pooled['Maximum Throughput'] == 2.0
+        assert parse_pool.get_status()['offloaded'] == 1
@@ -0,0 +1,146 @@
+"""
+Unit tests for fields/metrics projection of run details
+Tests projection resolution, planned stats fetches and reuse of cached partial results
+"""
+import json
+from unittest.mock import patch
+import pytest
+from django.test import RequestFactory
+from myapp.services.run_service import RunDataService
+from myapp.views import FetchDetailsView, FetchMultipleRunsView
+
+RUN_ID = '250729hhm'
+
+RAW_DETAILS = {'workload': 'seq_write', 'model': 'a400', 'peak_ops': 50000}
+
+FILES = {
+    'stats_workload.txt': 'write_data:2097152b/s\nread_io_type.cache:75%\n',
+    'stats_system.txt': 'cpu_busy:42.0%\n',
+    'stats_wafl_flexlog.txt': 'rdma_actual_latency.WAFL_SPINNP_WRITE:100.0us\n',
+    'system_node_virtual_machine_instance_show.txt': 'Instance Type: m5.4xlarge\n',
+}
+
+
+@pytest.fixture
+def upstream(isolated_api_cache, fake_run):
+    fake = fake_run(1, lambda n: FILES, RAW_DETAILS)
+    fake.cache = isolated_api_cache
+    return fake
+
+
+class TestResolveProjection:
+    """Test cases for resolving requested fields and metrics"""
+
+    def test_no_projection(self):
+        """Test requests without fields or metrics are not projected"""
+        assert RunDataService.resolve_projection() is None
+
+    def test_fields_and_metrics(self):
+        """Test header fields, stats fields and metric names resolve in response order"""
+        projection = RunDataService.resolve_projection(
+            fields=['Model', 'Maximum Throughput', 'Workload Type'], metrics=['cpu_busy']
+        )
+
+        assert projection == {
+            'fields': ['Workload Type', 'Model', 'Maximum Throughput', 'Maximum System CPU Busy'],
+            'metrics': ['throughput', 'cpu_busy']
+        }
+
+    def test_unknown_names(self):
+        """Test unknown fields and graph-only metrics are rejected"""
+        with pytest.raises(ValueError):
+            RunDataService.resolve_projection(fields=['Nope'])
+        with pytest.raises(ValueError):
+            RunDataService.resolve_projection(metrics=['ops'])
+
+
+class TestProjectedFetch:
+    """Test cases for projected single-run fetches"""
+
+    def test_header_fields_skip_the_stats_crawl(self, upstream):
+        """Test a header-only projection fetches no stats file"""
+        projection = RunDataService.resolve_projection(fields=['Workload Type'])
+
+        data = RunDataService.fetch_single_run_data(RUN_ID, projection=projection)
+
+        assert data == {'Workload Type': 'seq_write'}
+        assert upstream.fetched_types == []
+
+    def test_only_the_needed_files_are_fetched(self, upstream):
+        """Test a system metric fetches only the system stats file"""
+        projection = RunDataService.resolve_projection(metrics=['cpu_busy'])
+
+        data = RunDataService.fetch_single_run_data(RUN_ID, projection=projection)
+
+        assert data == {'Maximum System CPU Busy': 42.0}
+        assert upstream.fetched_types == ['stats_system.txt']
+
+    def test_wider_request_reuses_the_narrower_result(self, upstream):
+        """Test a wider request fetches only the metrics the cached partial result lacks"""
+        RunDataService.fetch_single_run_data(RUN_ID, projection=RunDataService.resolve_projection(metrics=['cpu_busy']))
+        upstream.fetched.clear()
+
+        data = RunDataService.fetch_single_run_data(
+            RUN_ID, projection=RunDataService.resolve_projection(fields=['Model'], metrics=['cpu_busy', 'throughput'])
+        )
+
+        assert data == {'Model': 'a400', 'Maximum Throughput': 2.0, 'Maximum System CPU Busy': 42.0}
+        assert upstream.fetched_types == ['stats_workload.txt']
+        assert upstream.details == [RUN_ID]
+
+    def test_full_request_completes_the_cached_result(self, upstream):
+        """Test an unprojected request fills in the rest and is then served from the full entry"""
+        RunDataService.fetch_single_run_data(RUN_ID, projection=RunDataService.resolve_projection(metrics=['cpu_busy']))
+        upstream.fetched.clear()
+
+        full = RunDataService.fetch_single_run_data(RUN_ID)
+        fetched = upstream.fetched_types
+        again = RunDataService.fetch_single_run_data(RUN_ID)
+
+        assert 'stats_system.txt' not in fetched
+        assert full['Maximum System CPU Busy'] == 42.0
+        assert full['Instance Type'] == 'm5.4xlarge'
+        assert again == full
+        assert upstream.details == [RUN_ID]
+
+    @pytest.mark.parametrize('streaming', [False, True])
+    def test_instance_type_known_to_the_ledger(self, upstream, settings, streaming):
+        """Test an instance-type-only crawl with nothing left to fetch still succeeds"""
+        settings.STREAMING_FETCH = {'ENABLED': streaming}
+        projection = RunDataService.resolve_projection(fields=['Instance Type'])
+
+        first = RunDataService.fetch_single_run_data(RUN_ID, projection=projection)
+        upstream.cache.clear()
+        upstream.fetched.clear()
+        again = RunDataService.fetch_single_run_data(RUN_ID, projection=projection)
+
+        assert first == again == {'Instance Type': 'm5.4xlarge'}
+        assert upstream.fetched_types == []
+
+
+class TestProjectionViews:
+    """Test cases for the fields/metrics query parameters"""
+
+    @patch('myapp.views.RunDataService.fetch_single_run_data')
+    def test_details_view_passes_the_projection(self, mock_fetch):
+        """Test fields= and metrics= reach the service as one projection"""
+        mock_fetch.return_value = {'Model': 'a400'}
+        request = RequestFactory().get('/fetch-details/', {'id': RUN_ID, 'fields': 'Model', 'metrics': 'cpu_busy'})
+
+        response = FetchDetailsView().get(request)
+
+        assert response.status_code == 200
+        mock_fetch.assert_called_once_with(RUN_ID, projection={
+            'fields': ['Model', 'Maximum System CPU Busy'], 'metrics': ['cpu_busy']
+        })
+
+    def test_unknown_field_is_a_bad_request(self):
+        """Test unknown names are rejected before any upstream call"""
+        for view, params in (
+            (FetchDetailsView(), {'id': RUN_ID, 'fields': 'Nope'}),
+            (FetchMultipleRunsView(), {'run_ids': RUN_ID, 'metrics': 'nope'}),
+        ):
+            response = view.get(RequestFactory().get('/api/', params))
+
+            assert response.status_code == 400
+            assert 'Unknown' in json.loads(response.content)['error']
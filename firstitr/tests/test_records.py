@@ -0,0 +1,94 @@
+"""
+Unit tests for compact cached records
+Tests RunRecord/IterationStats/GraphSeries round trips, cache persistence and footprint
+"""
+import os
+import tempfile
+from myapp.cache_introspection import deep_sizeof
+from myapp.cache_manager import LRUCache
+from myapp.records import GraphSeries, IterationStats, RunRecord
+from myapp.services.run_service import GraphDataManagerService, RunDataService
+from myapp.services.stats_service import GraphDataService, StatsProcessingService
+
+DETAILS = {
+    'Workload Type': 'seq_write',
+    'Peak Iteration': 12,
+    'ONTAP version': '9.15.1',
+    'Achieved Ops': 50000,
+    'Peak Latency': 1.25,
+    'Model': 'a400',
+    'Maximum Throughput': 1843.27734375,
+    'Maximum Cache Percentage': 75,
+    'Maximum System CPU Busy': 61.5,
+    'Maximum WAFL RDMA Write Latency': 112.75,
+    'Instance Type': 'm5.4xlarge',
+    'Sample Statistics': {'System CPU Busy': {'run': {'count': 3, 'max': 61.5}}},
+}
+
+POINTS = [{'latency': 1.5 + index / 7, 'ops': 1000 * index + 1, 'throughput': 1048576 * index} for index in range(200)]
+
+
+class TestRecords:
+    """Test cases for the record types"""
+
+    def test_run_record_round_trip(self):
+        """Test a record restores the public shape with the same types and order"""
+        record = RunDataService.to_cache(DETAILS)
+
+        restored = record.to_dict()
+
+        assert restored == DETAILS
+        assert list(restored) == list(DETAILS)
+        assert isinstance(restored['Maximum Cache Percentage'], int)
+        assert record.stats.fields[0] == 'Maximum Throughput'
+
+    def test_iteration_stats_keep_non_numbers(self):
+        """Test strings, None, booleans and huge ints are kept as objects"""
+        data = {'a': 'x', 'b': None, 'c': True, 'd': 2 ** 60, 'e': 3}
+
+        assert IterationStats(data).to_dict() == data
+
+    def test_graph_series_round_trip(self):
+        """Test points restore with int ops/throughput and float latency"""
+        series = GraphSeries.from_points(POINTS, GraphDataService.graph_types())
+
+        assert series.to_points() == POINTS
+        assert len(series) == 200
+        assert series.column('ops').typecode == 'q'
+        assert series.column('latency').typecode == 'd'
+
+    def test_footprint(self):
+        """Test cached runs and graph series take a fraction of the public shapes' memory"""
+        details = {field: value for field, value in DETAILS.items() if field != 'Sample Statistics'}
+
+        assert deep_sizeof(RunDataService.to_cache(details)) < deep_sizeof(details) * 0.6
+        assert deep_sizeof(GraphDataManagerService.to_cache(POINTS)) * 5 < deep_sizeof(POINTS)
+
+    def test_plain_entries_pass_through(self):
+        """Test entries cached before records existed are served as they are"""
+        assert RunDataService.from_cache(DETAILS) is DETAILS
+        assert GraphDataManagerService.from_cache(POINTS) is POINTS
+
+
+class TestRecordPersistence:
+    """Test cases for persisting records in the LRU cache file"""
+
+    def test_records_survive_a_reload(self):
+        """Test records are written to the cache file and restored on load"""
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.json')
+        temp_file.close()
+        try:
+            cache = LRUCache(max_size=3)
+            cache.cache_file = temp_file.name
+            cache.clear()
+            cache.put('details_250729hhm', RunRecord.from_dict(DETAILS, StatsProcessingService.STATS_FIELDS))
+            cache.put('graph_250729hhm', GraphDataManagerService.to_cache(POINTS))
+
+            reloaded = LRUCache(max_size=3)
+            reloaded.cache_file = temp_file.name
+            reloaded._load_from_file()
+
+            assert reloaded.get('details_250729hhm').to_dict() == DETAILS
+            assert reloaded.get('graph_250729hhm').to_points() == POINTS
+        finally:
+            os.unlink(temp_file.name)
@@ -0,0 +1,159 @@
+"""
+Unit tests for conditional revalidation of upstream artifacts
+Tests ETag/Last-Modified validators, 304 handling and changed artifacts
+"""
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+import pytest
+from myapp.services.api_service import ExternalAPIService, AsyncExternalAPIService
+from myapp.services.artifact_cache import artifact_cache
+from myapp.services.metric_registry import metric_registry
+
+LINK = 'testdirview.cgi?p=/x/eng/perfcloud/RESULTS/2507/250729hhm/ontap_command_output/01_iter'
+LAST_MODIFIED = 'Tue, 29 Jul 2025 10:00:00 GMT'
+
+
+class _ValidatingHandler(BaseHTTPRequestHandler):
+    """Serves artifacts with validators and answers matching conditional GETs with 304"""
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        if 'testdirview.cgi' in self.path:
+            body = f'<a href="{LINK}">1</a>\n'.encode()
+        else:
+            body = server.body.encode()
+        validators = {'ETag': server.etag} if server.etag else {'Last-Modified': LAST_MODIFIED}
+
+        with server.lock:
+            server.conditional_headers.append(
+                (self.headers.get('If-None-Match'), self.headers.get('If-Modified-Since'))
+            )
+        not_modified = (
+            (server.etag and self.headers.get('If-None-Match') == server.etag)
+            or (not server.etag and self.headers.get('If-Modified-Since') == LAST_MODIFIED)
+        )
+        with server.lock:
+            server.statuses.append(304 if not_modified else 200)
+
+        self.send_response(304 if not_modified else 200)
+        for name, value in validators.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', '0' if not_modified else str(len(body)))
+        self.end_headers()
+        if not not_modified:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def perfweb():
+    """Local perfweb stand-in that honours conditional requests"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _ValidatingHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.etag = '"v1"'
+    server.body = 'latency:2.5us\nops:50000/s\nwrite_data:1048576b/s\n'
+    server.statuses = []
+    server.conditional_headers = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f'http://127.0.0.1:{server.server_address[1]}'
+    with patch.object(ExternalAPIService, 'PERFWEB_BASE_URL', f'{base}/cgi-bin/perfcloud'):
+        yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _expire(key):
+    artifact_cache.peek(key).expires_at = 0
+
+
+class TestConditionalRevalidation:
+    """Test cases for revalidating expired artifacts"""
+
+    def test_unchanged_stats_file_revalidates_with_etag(self, perfweb):
+        """Test an expired file is refreshed by a 304 and served from the cache"""
+        key = artifact_cache.file_key('250729hhm', LINK, 'stats_workload.txt')
+        first = ExternalAPIService.fetch_stats_file('2507', '250729hhm', LINK, 'stats_workload.txt')
+        _expire(key)
+
+        second = ExternalAPIService.fetch_stats_file('2507', '250729hhm', LINK, 'stats_workload.txt')
+
+        assert first == second == perfweb.body
+        assert perfweb.statuses == [200, 304]
+        assert perfweb.conditional_headers[1] == ('"v1"', None)
+        assert artifact_cache.peek(key).expires_at > 0
+        assert artifact_cache.get_status()['revalidations'] == 1
+
+    def test_changed_stats_file_is_downloaded(self, perfweb):
+        """Test a new ETag replaces the cached body and its validators"""
+        key = artifact_cache.file_key('250729hhm', LINK, 'stats_workload.txt')
+        ExternalAPIService.fetch_stats_file('2507', '250729hhm', LINK, 'stats_workload.txt')
+        _expire(key)
+        perfweb.etag = '"v2"'
+        perfweb.body = 'latency:3.0us\nops:40000/s\nwrite_data:1048576b/s\n'
+
+        text = ExternalAPIService.fetch_stats_file('2507', '250729hhm', LINK, 'stats_workload.txt')
+
+        assert text.startswith('latency:3.0us')
+        assert perfweb.statuses == [200, 200]
+        assert artifact_cache.peek(key).etag == '"v2"'
+
+    def test_last_modified_validator(self, perfweb):
+        """Test If-Modified-Since is used when no ETag was served"""
+        perfweb.etag = None
+        key = artifact_cache.file_key('250729hhm', LINK, 'stats_workload.txt')
+        ExternalAPIService.fetch_stats_file('2507', '250729hhm', LINK, 'stats_workload.txt')
+        _expire(key)
+
+        ExternalAPIService.fetch_stats_file('2507', '250729hhm', LINK, 'stats_workload.txt')
+
+        assert perfweb.conditional_headers[1] == (None, LAST_MODIFIED)
+        assert perfweb.statuses == [200, 304]
+
+    def test_listing_revalidates(self, perfweb):
+        """Test an expired listing is refreshed without re-parsing"""
+        ExternalAPIService.fetch_perfweb_links('250729hhm')
+        _expire(artifact_cache.listing_key('250729hhm'))
+
+        with patch.object(ExternalAPIService, 'parse_perfweb_links') as mock_parse:
+            links = ExternalAPIService.fetch_perfweb_links('250729hhm')
+
+        assert links == [LINK]
+        assert perfweb.statuses == [200, 304]
+        mock_parse.assert_not_called()
+
+    def test_streamed_scan_revalidates(self, perfweb, settings):
+        """Test expired scan matches are refreshed by a 304 in streaming mode"""
+        settings.STREAMING_FETCH = {'ENABLED': True}
+        patterns = metric_registry.patterns('stats_workload.txt')
+        key = artifact_cache.file_key('250729hhm', LINK, 'stats_workload.txt')
+        ExternalAPIService.scan_stats_file('2507', '250729hhm', LINK, 'stats_workload.txt', patterns)
+        _expire(key)
+
+        matches = ExternalAPIService.scan_stats_file('2507', '250729hhm', LINK, 'stats_workload.txt', patterns)
+
+        assert matches == {
+            'throughput': '1048576', 'cache': None, 'ext_cache': None, 'disk': None,
+            'bamboo_ssd': None, 'latency': '2.5', 'ops': '50000'
+        }
+        assert perfweb.statuses == [200, 304]
+
+    def test_async_revalidation(self, perfweb):
+        """Test the httpx path sends validators and honours 304"""
+        key = artifact_cache.file_key('250729hhm', LINK, 'stats_workload.txt')
+
+        async def fetch_twice():
+            first = await AsyncExternalAPIService.fetch_stats_file('2507', '250729hhm', LINK, 'stats_workload.txt')
+            _expire(key)
+            second = await AsyncExternalAPIService.fetch_stats_file('2507', '250729hhm', LINK, 'stats_workload.txt')
+            return first, second
+
+        first, second = asyncio.run(fetch_twice())
+
+        assert first == second == perfweb.body
+        assert perfweb.statuses == [200, 304]
@@ -0,0 +1,116 @@
+"""
+Unit tests for batched run details fetching
+Tests fetch_run_details_many caching, deduplication, batched queries and its callers
+"""
+import asyncio
+from unittest.mock import Mock, patch
+from requests.exceptions import RequestException
+from myapp.services.api_service import ExternalAPIService, AsyncExternalAPIService
+from myapp.services.run_service import RunDataService, GraphDataManagerService
+
+
+def details_response(url, timeout=None):
+    """Runs API stand-in: run IDs starting with 'bad' are invalid, 'err' fail"""
+    run_id = url.split('?')[0].rsplit('/', 1)[-1]
+    if run_id.startswith('err'):
+        raise RequestException('connection reset')
+    response = Mock()
+    response.raise_for_status.return_value = None
+    response.json.return_value = {'workload': 0} if run_id.startswith('bad') else {'workload': f'wl-{run_id}', 'model': 'A400'}
+    return response
+
+
+class TestFetchRunDetailsMany:
+    """Test cases for ExternalAPIService.fetch_run_details_many"""
+
+    @patch('myapp.services.api_service.upstream_http.get', side_effect=details_response)
+    def test_per_id_results_and_errors(self, mock_get):
+        """Test each ID maps to its details, None when invalid, or its error"""
+        result = ExternalAPIService.fetch_run_details_many(['run000001', 'bad000002', 'err000003', 'run000001'])
+
+        assert list(result) == ['run000001', 'bad000002', 'err000003']
+        assert result['run000001']['workload'] == 'wl-run000001'
+        assert result['bad000002'] is None
+        assert isinstance(result['err000003'], Exception)
+        assert 'Network error fetching data for err000003' in str(result['err000003'])
+        assert mock_get.call_count == 3
+
+    @patch('myapp.services.api_service.upstream_http.get', side_effect=details_response)
+    def test_cached_details_skip_upstream(self, mock_get):
+        """Test details and invalid IDs fetched once are served from the artifact cache"""
+        ExternalAPIService.fetch_run_details_many(['run000001', 'bad000002'])
+        mock_get.reset_mock()
+
+        result = ExternalAPIService.fetch_run_details_many(['run000001', 'bad000002'])
+        result['run000001']['workload'] = 'changed'
+
+        assert ExternalAPIService.fetch_run_details('run000001')['workload'] == 'wl-run000001'
+        assert result['bad000002'] is None
+        mock_get.assert_not_called()
+
+    @patch('myapp.services.api_service.upstream_http.get')
+    def test_batched_query(self, mock_get, settings):
+        """Test RUN_DETAILS_BATCH fetches several runs per query and treats absent ones as invalid"""
+        settings.RUN_DETAILS_BATCH = {'ENABLED': True, 'MAX_IDS': 2}
+        response = Mock()
+        response.raise_for_status.return_value = None
+        response.json.side_effect = [
+            [{'id': 'run000001', 'workload': 'wl1'}],
+            {'results': [{'id': 'run000003', 'workload': 'wl3'}]},
+        ]
+        mock_get.return_value = response
+
+        result = ExternalAPIService.fetch_run_details_many(['run000001', 'run000002', 'run000003'], 'workload')
+
+        assert result == {'run000001': {'id': 'run000001', 'workload': 'wl1'}, 'run000002': None,
+                          'run000003': {'id': 'run000003', 'workload': 'wl3'}}
+        assert mock_get.call_count == 2
+        assert mock_get.call_args_list[0][0][0].endswith('/Runs?id=run000001,run000002&req_fields=workload,id')
+
+    @patch('myapp.services.api_service.upstream_http.get', side_effect=RequestException('timed out'))
+    def test_batched_query_error(self, mock_get, settings):
+        """Test a failed batched query is reported for every run it covered"""
+        settings.RUN_DETAILS_BATCH = {'ENABLED': True}
+
+        result = ExternalAPIService.fetch_run_details_many(['run000001', 'run000002'])
+
+        assert all(isinstance(outcome, Exception) for outcome in result.values())
+        assert mock_get.call_count == 1
+
+    @patch('myapp.services.api_service.async_upstream_http.get')
+    def test_async_variant(self, mock_get):
+        """Test the async service returns the same per-ID map"""
+        async def get(url, timeout=None):
+            return details_response(url)
+        mock_get.side_effect = get
+
+        result = asyncio.run(AsyncExternalAPIService.fetch_run_details_many(['run000001', 'bad000002']))
+
+        assert result['run000001']['model'] == 'A400'
+        assert result['bad000002'] is None
+
+
+class TestDetailsCallers:
+    """Test cases for services fetching details for several runs"""
+
+    @patch('myapp.services.run_service.RunIngestionService.ingest', return_value={'stats': {}, 'graph_data': None})
+    @patch('myapp.services.run_service.api_cache')
+    @patch('myapp.services.api_service.upstream_http.get', side_effect=details_response)
+    def test_multiple_runs_prefetch_details(self, mock_get, mock_cache, mock_stats):
+        """Test multi-run fetches request each distinct run's details once"""
+        mock_cache.get.return_value = None
+
+        result = RunDataService.fetch_multiple_runs_data(['run000001', 'run000002', 'run000001', 'bad000003'])
+
+        assert set(result['results']) == {'run000001', 'run000002'}
+        assert result['errors'] == {'bad000003': 'No data available for this ID'}
+        assert mock_get.call_count == 3
+
+    @patch('myapp.services.api_service.upstream_http.get', side_effect=details_response)
+    def test_graph_compatibility_uses_batch(self, mock_get):
+        """Test the graph compatibility check compares both runs' details"""
+        compatibility = GraphDataManagerService._check_graph_compatibility('run000001', 'run000002')
+
+        assert compatibility['compatible'] is False
+        assert compatibility['error_type'] == 'workload'
+        assert mock_get.call_count == 2
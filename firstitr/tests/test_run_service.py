@@ -10,7 +10,7 @@ from myapp.services.run_service import RunDataService, GraphDataManagerService
 class TestRunDataService:
     """Test cases for RunDataService"""
     
-    @patch('myapp.services.run_service.StatsProcessingService.fetch_comprehensive_stats')
+    @patch('myapp.services.run_service.RunIngestionService.ingest')
     @patch('myapp.services.run_service.DataTransformService.transform_run_data')
     @patch('myapp.services.run_service.ExternalAPIService.fetch_run_details')
     @patch('myapp.services.run_service.api_cache')
@@ -24,7 +24,7 @@ class TestRunDataService:
         mock_cache.get.return_value = None  # Not in cache
         mock_fetch_details.return_value = raw_data
         mock_transform.return_value = transformed_data
-        mock_stats.return_value = stats_data
+        mock_stats.return_value = {'stats': stats_data, 'graph_data': None}
         
         # Test the method
         result = RunDataService.fetch_single_run_data('123456789')
@@ -61,7 +61,7 @@ class TestRunDataService:
         assert result is None
         mock_fetch_details.assert_called_once_with('invalid123')
     
-    @patch('myapp.services.run_service.StatsProcessingService.fetch_comprehensive_stats')
+    @patch('myapp.services.run_service.RunIngestionService.ingest')
     @patch('myapp.services.run_service.DataTransformService.transform_run_data')
     @patch('myapp.services.run_service.ExternalAPIService.fetch_run_details')
     @patch('myapp.services.run_service.api_cache')
@@ -79,7 +79,7 @@ class TestRunDataService:
         assert result == transformed_data
         mock_stats.assert_not_called()
     
-    @patch('myapp.services.run_service.StatsProcessingService.fetch_comprehensive_stats')
+    @patch('myapp.services.run_service.RunIngestionService.ingest')
     @patch('myapp.services.run_service.DataTransformService.transform_run_data')
     @patch('myapp.services.run_service.ExternalAPIService.fetch_run_details')
     @patch('myapp.services.run_service.api_cache')
@@ -0,0 +1,133 @@
+"""
+Unit tests for per-sample series extraction
+Tests series parsing and summaries, and series mode in the stats crawls
+"""
+import asyncio
+import statistics
+from array import array
+import pytest
+from myapp.services import sample_series
+from myapp.services.iteration_ledger import iteration_ledger
+from myapp.services.sample_series import concat, parse_samples, summarize
+from myapp.services.stats_service import StatsProcessingService, AsyncStatsProcessingService
+
+RUN_ID = '250729hhm'
+
+
+def iteration_files(n):
+    """Stats files of iteration n, each counter sampled three times"""
+    return {
+        'stats_workload.txt': ''.join(
+            f'write_data:{n * 1048576 * k}b/s\nread_io_type.cache:{60 + k}%\n' for k in (1, 3, 2)
+        ),
+        'stats_system.txt': f'cpu_busy:{n}0.0%\ncpu_busy:{n}5.0%\ncpu_busy:{n}2.0%\n',
+        'stats_wafl_flexlog.txt': 'rdma_actual_latency.WAFL_SPINNP_WRITE:100.0us\n',
+        'system_node_virtual_machine_instance_show.txt': 'Instance Type: m5.4xlarge\n',
+    }
+
+
+@pytest.fixture
+def series(settings):
+    settings.STATS_SERIES = {'ENABLED': True}
+
+
+@pytest.fixture
+def run(fake_run):
+    return fake_run(2, iteration_files)
+
+
+class TestSummaries:
+    """Test cases for series parsing and summaries"""
+
+    def test_parse_skips_unparsable_values_and_scales(self):
+        """Test samples are scaled doubles and bad captures are dropped"""
+        assert parse_samples(['2', 'x', '4.5'], scale=2) == array('d', [4.0, 9.0])
+
+    def test_stdlib_summary(self, monkeypatch):
+        """Test the stdlib fallback matches interpolated percentiles and population stddev"""
+        monkeypatch.setattr(sample_series, 'NUMPY_AVAILABLE', False)
+        samples = array('d', [float(value) for value in range(1, 101)])
+
+        summary = summarize(samples)
+
+        assert summary['count'] == 100
+        assert summary['mean'] == pytest.approx(50.5)
+        assert summary['p50'] == pytest.approx(50.5)
+        assert summary['p95'] == pytest.approx(95.05)
+        assert summary['p99'] == pytest.approx(99.01)
+        assert summary['stddev'] == pytest.approx(statistics.pstdev(samples))
+        assert summary['max'] == 100.0
+        assert summarize(array('d')) is None
+
+    def test_numpy_summary_agrees_with_stdlib(self, monkeypatch):
+        """Test NumPy and the fallback give the same summary"""
+        pytest.importorskip('numpy')
+        samples = concat([array('d', [3.0, 1.0, 7.5]), array('d', [2.25, 9.0])])
+        vectorized = summarize(samples)
+        monkeypatch.setattr(sample_series, 'NUMPY_AVAILABLE', False)
+
+        assert summarize(samples) == pytest.approx(vectorized)
+
+
+class TestSeriesMode:
+    """Test cases for series mode in the stats crawls"""
+
+    def test_disabled_by_default(self, run):
+        """Test no summaries are added unless STATS_SERIES is enabled"""
+        stats = StatsProcessingService.fetch_comprehensive_stats(RUN_ID)
+
+        assert 'Sample Statistics' not in stats
+
+    def test_summaries_alongside_maxima(self, run, series):
+        """Test every sample is summarized per iteration and per run while maxima keep first-match semantics"""
+        stats = StatsProcessingService.fetch_comprehensive_stats(RUN_ID)
+
+        assert stats['Maximum System CPU Busy'] == 20.0
+        assert stats['Maximum Throughput'] == 2.0
+        cpu = stats['Sample Statistics']['System CPU Busy']
+        assert [iteration['max'] for iteration in cpu['iterations']] == [15.0, 25.0]
+        assert cpu['run']['count'] == 6
+        assert cpu['run']['max'] == 25.0
+        assert cpu['run']['mean'] == pytest.approx(sum([10, 15, 12, 20, 25, 22]) / 6)
+        throughput = stats['Sample Statistics']['Throughput']
+        assert throughput['run']['max'] == 6.0
+        assert 'Disk Percentage' not in stats['Sample Statistics']
+
+    def test_refresh_reuses_settled_samples(self, run, series):
+        """Test a refresh fetches only new iterations and still summarizes every sample"""
+        StatsProcessingService.fetch_comprehensive_stats(RUN_ID)
+        run.fetched.clear()
+        run.iterations = 3
+
+        stats = StatsProcessingService.fetch_comprehensive_stats(RUN_ID)
+
+        assert {link for link, _ in run.fetched} == {'link/02_iter', 'link/03_iter'}
+        cpu = stats['Sample Statistics']['System CPU Busy']
+        assert len(cpu['iterations']) == 3
+        assert cpu['run']['count'] == 9
+
+    def test_enabling_series_refetches_settled_iterations(self, run, settings):
+        """Test iterations settled without samples are fetched again once series mode is on"""
+        StatsProcessingService.fetch_comprehensive_stats(RUN_ID)
+        run.fetched.clear()
+        settings.STATS_SERIES = {'ENABLED': True}
+
+        stats = StatsProcessingService.fetch_comprehensive_stats(RUN_ID)
+
+        assert {link for link, _ in run.fetched} == {'link/01_iter', 'link/02_iter'}
+        assert stats['Sample Statistics']['System CPU Busy']['run']['count'] == 6
+        assert iteration_ledger.runs[RUN_ID].maxima['cpu_busy'] == 10.0
+
+    def test_skipped_in_streaming_mode(self, settings, series):
+        """Test streaming scans never report summaries"""
+        settings.STREAMING_FETCH = {'ENABLED': True}
+
+        assert not StatsProcessingService.series_enabled()
+
+    def test_async_crawl(self, fake_run, series):
+        """Test the async crawl reports the same summaries"""
+        fake_run(2, iteration_files)
+
+        stats = asyncio.run(AsyncStatsProcessingService.fetch_comprehensive_stats(RUN_ID))
+
+        assert stats['Sample Statistics']['Cache Percentage']['run']['max'] == 63.0
@@ -0,0 +1,187 @@
+"""
+Unit tests for priority scheduling of upstream work
+Tests priority scopes, weighted fair queuing, starvation protection and the limiter integration
+"""
+import asyncio
+import threading
+import time
+import pytest
+from myapp.services.adaptive_limiter import AdaptiveLimiter, UpstreamBusyError
+from myapp.services.concurrency import BoundedFetchExecutor
+from myapp.services.scheduler import (
+    BACKGROUND, BULK, INTERACTIVE, WorkScheduler, current_priority, priority_scope
+)
+
+URL = 'http://perfweb.example/cgi-bin/perfcloud/view.cgi?p=x'
+
+
+@pytest.fixture
+def scheduler():
+    return WorkScheduler({'WEIGHTS': {INTERACTIVE: 4, BULK: 2, BACKGROUND: 1}, 'STARVATION_SECONDS': 60})
+
+
+def single_slot_limiter(scheduler):
+    return AdaptiveLimiter('http://perfweb.example', {'INITIAL_LIMIT': 1, 'MIN_LIMIT': 1, 'MAX_LIMIT': 1}, scheduler=scheduler)
+
+
+class TestPriorityScope:
+    """Test cases for priority scopes"""
+
+    def test_scopes_only_lower_priority(self):
+        """Test nested scopes never raise the priority of their caller"""
+        assert current_priority() == INTERACTIVE
+        with priority_scope(BACKGROUND):
+            with priority_scope(BULK) as effective:
+                assert effective == BACKGROUND
+        with priority_scope(BULK):
+            assert current_priority() == BULK
+        assert current_priority() == INTERACTIVE
+
+    def test_unknown_class(self):
+        """Test unknown classes are rejected"""
+        with pytest.raises(ValueError):
+            with priority_scope('urgent'):
+                pass
+
+
+class TestFairQueue:
+    """Test cases for weighted fair queuing"""
+
+    def test_backlogged_classes_share_by_weight(self, scheduler):
+        """Test grants follow the 4:2:1 weights while every class is backlogged"""
+        queue = scheduler.queue()
+        for _ in range(40):
+            for priority in (BACKGROUND, BULK, INTERACTIVE):
+                queue.push(priority)
+
+        served = [queue.pop().priority for _ in range(35)]
+
+        assert served.count(INTERACTIVE) == 20
+        assert served.count(BULK) == 10
+        assert served.count(BACKGROUND) == 5
+
+    def test_idle_class_does_not_bank_credit(self, scheduler):
+        """Test a class arriving late competes from the current virtual time"""
+        queue = scheduler.queue()
+        for _ in range(20):
+            queue.push(BULK)
+        for _ in range(10):
+            queue.pop()
+        for _ in range(4):
+            queue.push(INTERACTIVE)
+
+        served = [queue.pop().priority for _ in range(6)]
+
+        assert served.count(BULK) >= 1
+
+    def test_starving_waiter_served_first(self):
+        """Test a waiter queued past STARVATION_SECONDS jumps ahead of fairer classes"""
+        scheduler = WorkScheduler({'STARVATION_SECONDS': 0.5})
+        queue = scheduler.queue()
+        old = queue.push(BACKGROUND)
+        old.enqueued_at -= 1
+        queue.push(INTERACTIVE)
+
+        assert queue.pop() is old
+        assert scheduler.get_status()['classes'][BACKGROUND]['starvation_promotions'] == 1
+
+
+class TestLimiterScheduling:
+    """Test cases for slot grants through the scheduler"""
+
+    def test_interactive_waiter_overtakes_queued_bulk(self, scheduler):
+        """Test a freed slot goes to the interactive waiter even though bulk queued first"""
+        limiter = single_slot_limiter(scheduler)
+        limiter.acquire(1)
+        order = []
+
+        def wait_for_slot(priority):
+            with priority_scope(priority):
+                limiter.acquire(5)
+            order.append(priority)
+            limiter.release(URL, 0.01)
+
+        bulk = threading.Thread(target=wait_for_slot, args=(BULK,))
+        bulk.start()
+        time.sleep(0.05)
+        interactive = threading.Thread(target=wait_for_slot, args=(INTERACTIVE,))
+        interactive.start()
+        time.sleep(0.05)
+        assert scheduler.get_status()['classes'][BULK]['queue_depth'] == 1
+
+        limiter.release(URL, 0.01)
+        bulk.join(5)
+        interactive.join(5)
+
+        assert order == [INTERACTIVE, BULK]
+        status = scheduler.get_status()['classes']
+        assert status[INTERACTIVE]['immediate'] == 1
+        assert status[BULK]['queued_grants'] == 1
+        assert status[BULK]['wait_p50_ms'] > status[INTERACTIVE]['wait_p50_ms']
+
+    def test_timeout_leaves_queue(self, scheduler):
+        """Test a waiter that times out is removed and counted as rejected"""
+        limiter = single_slot_limiter(scheduler)
+        limiter.acquire(1)
+
+        with priority_scope(BACKGROUND):
+            with pytest.raises(UpstreamBusyError):
+                limiter.acquire(0.05)
+
+        background = scheduler.get_status()['classes'][BACKGROUND]
+        assert background['queue_depth'] == 0
+        assert background['rejected'] == 1
+        assert len(limiter.queue) == 0
+
+    def test_async_waiters_are_granted_in_order(self, scheduler):
+        """Test async acquires queue behind the scheduler and get slots as they free up"""
+        limiter = single_slot_limiter(scheduler)
+
+        async def run():
+            limiter.acquire(1)
+            with priority_scope(BULK):
+                waiting = asyncio.ensure_future(limiter.acquire_async(5))
+            await asyncio.sleep(0.02)
+            assert not waiting.done()
+            limiter.release(URL, 0.01)
+            await asyncio.wait_for(waiting, 1)
+
+        asyncio.run(run())
+
+        assert limiter.in_flight == 1
+        assert scheduler.get_status()['classes'][BULK]['queued_grants'] == 1
+
+    def test_cancelled_async_waiter_frees_its_place(self, scheduler):
+        """Test cancelling a queued async acquire removes it from the queue"""
+        limiter = single_slot_limiter(scheduler)
+
+        async def run():
+            limiter.acquire(1)
+            waiting = asyncio.ensure_future(limiter.acquire_async(5))
+            await asyncio.sleep(0.02)
+            waiting.cancel()
+            await asyncio.gather(waiting, return_exceptions=True)
+
+        asyncio.run(run())
+
+        assert len(limiter.queue) == 0
+        assert scheduler.get_status()['classes'][INTERACTIVE]['queue_depth'] == 0
+
+
+class TestExecutorPriority:
+    """Test cases for priority classes in the shared fetch pool"""
+
+    def test_fan_out_keeps_priority_class(self):
+        """Test fetches run on the one shared pool and keep their caller's class"""
+        executor = BoundedFetchExecutor('test-fetch', 'UNUSED_SETTING', {'PER_PROCESS': 2, 'PER_RUN': 2})
+        task = lambda item: (threading.current_thread().name, current_priority())
+        try:
+            interactive = executor.map_ordered(task, range(4))
+            with priority_scope(BULK):
+                bulk = executor.map_ordered(task, range(4))
+        finally:
+            executor.shutdown()
+
+        assert {name.rsplit('_', 1)[0] for name, _ in interactive + bulk} == {'test-fetch'}
+        assert {priority for _, priority in interactive} == {INTERACTIVE}
+        assert {priority for _, priority in bulk} == {BULK}
@@ -0,0 +1,138 @@
+"""
+Unit tests for the upstream stand-in server
+Tests latency specs, synthetic and recorded data, fault injection and the app against it
+"""
+import time
+from unittest.mock import patch
+import pytest
+import requests
+from myapp.services.api_service import ExternalAPIService
+from myapp.services.artifact_cache import artifact_cache
+from myapp.services.run_service import RunDataService
+from myapp.services.stats_service import GraphDataService
+from myapp.standin import FaultProfile, FixtureStore, LatencyDistribution, Recorder, SyntheticData, start_standin
+
+RUN_ID = '250729hhm'
+FILE_PATH = f'/cgi-bin/perfcloud/view.cgi?p=/x/eng/perfcloud/RESULTS/2507/{RUN_ID}/ontap_command_output/01_iter/stats_workload.txt'
+
+
+@pytest.fixture(autouse=True)
+def no_details_cache():
+    """Keep run details out of the persisted API cache"""
+    with patch('myapp.services.run_service.api_cache') as cache:
+        cache.get.return_value = None
+        yield cache
+
+
+@pytest.fixture
+def standin():
+    servers = []
+
+    def start(**options):
+        server = start_standin(**options)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+class TestLatencyDistribution:
+    """Test cases for latency specs"""
+
+    def test_specs(self, tmp_path):
+        """Test each distribution kind samples in its range"""
+        trace = tmp_path / 'trace.txt'
+        trace.write_text('5\n15\n')
+
+        assert LatencyDistribution('fixed:20').sample() == 0.02
+        assert 0.005 <= LatencyDistribution('uniform:5,50', seed=1).sample() <= 0.05
+        assert LatencyDistribution('lognormal:20,0.8', seed=1).sample() > 0
+        assert LatencyDistribution('pareto:10,1.5', seed=1).sample() >= 0.01
+        assert LatencyDistribution(f'trace:{trace}', seed=1).sample() in (0.005, 0.015)
+
+    def test_invalid_specs(self):
+        """Test malformed specs are rejected"""
+        for spec in ('fixed', 'uniform:5', 'gamma:1,2', 'fixed:abc'):
+            with pytest.raises(ValueError):
+                LatencyDistribution(spec)
+
+
+class TestStandInServer:
+    """Test cases for serving and fault injection"""
+
+    def test_app_against_synthetic_runs(self, standin, settings):
+        """Test run details, stats and graph data load end to end from synthetic data"""
+        server = standin(synthetic=SyntheticData(iterations=4, file_kb=1))
+        settings.UPSTREAM_BASE_URLS = server.base_urls()
+
+        details = RunDataService.fetch_single_run_data(RUN_ID)
+        graph = GraphDataService.fetch_graph_data(RUN_ID)
+
+        assert details['Model'] in ('A400', 'A90', 'C250')
+        assert details['Instance Type'] == 'm5.4xlarge'
+        assert 'Maximum System CPU Busy' in details
+        assert len(graph) == 4
+        assert server.get_status()['endpoints']['file'] > 0
+
+    def test_unknown_run_is_invalid(self, standin, settings):
+        """Test runs missing everywhere are reported the way the Runs API does"""
+        server = standin(synthetic=SyntheticData())
+        settings.UPSTREAM_BASE_URLS = server.base_urls()
+
+        assert ExternalAPIService.fetch_run_details('bad') is None
+        assert ExternalAPIService.fetch_perfweb_links('bad') == []
+
+    def test_error_and_drop_injection(self, standin):
+        """Test injected errors return the configured status and drops close the connection"""
+        server = standin(synthetic=SyntheticData(file_kb=1), faults=FaultProfile(error_rate=1.0, error_status=502))
+        assert requests.get(server.base_url + FILE_PATH, timeout=5).status_code == 502
+
+        server = standin(synthetic=SyntheticData(file_kb=1), faults=FaultProfile(drop_rate=1.0))
+        with pytest.raises(requests.exceptions.ConnectionError):
+            requests.get(server.base_url + FILE_PATH, timeout=5)
+        assert server.get_status()['dropped'] >= 1
+
+    def test_latency_and_bandwidth(self, standin):
+        """Test per-endpoint latency and the bandwidth limit slow responses down"""
+        faults = FaultProfile(latency={'file': LatencyDistribution('fixed:50')}, bandwidth=256 * 1024)
+        server = standin(synthetic=SyntheticData(file_kb=64), faults=faults)
+
+        start = time.perf_counter()
+        body = requests.get(server.base_url + FILE_PATH, timeout=5).content
+        elapsed = time.perf_counter() - start
+
+        assert len(body) > 64 * 1000
+        # 50ms latency plus ~64KB at 256KB/s
+        assert elapsed >= 0.25
+
+    def test_etag_revalidation(self, standin):
+        """Test conditional requests get 304 Not Modified"""
+        server = standin(synthetic=SyntheticData(file_kb=1))
+        first = requests.get(server.base_url + FILE_PATH, timeout=5)
+
+        second = requests.get(server.base_url + FILE_PATH, headers={'If-None-Match': first.headers['ETag']}, timeout=5)
+
+        assert second.status_code == 304
+        assert server.get_status()['not_modified'] == 1
+
+    def test_record_then_replay(self, standin, settings, tmp_path):
+        """Test record mode captures upstream responses that replay without the upstream"""
+        upstream = standin(synthetic=SyntheticData(iterations=2, file_kb=1))
+        urls = upstream.base_urls()
+        store = FixtureStore(str(tmp_path))
+        recorder_server = standin(store=store, recorder=Recorder(store, urls['RUNS_API'], urls['PERFWEB']))
+        settings.UPSTREAM_BASE_URLS = recorder_server.base_urls()
+
+        recorded = RunDataService.fetch_single_run_data(RUN_ID)
+
+        assert (tmp_path / 'runs' / f'{RUN_ID}.json').exists()
+        assert (tmp_path / 'results' / '2507' / RUN_ID / 'ontap_command_output' / '02_iter' / 'stats_system.txt').exists()
+
+        replay = standin(store=FixtureStore(str(tmp_path)))
+        settings.UPSTREAM_BASE_URLS = replay.base_urls()
+        artifact_cache.clear()
+
+        assert RunDataService.fetch_single_run_data(RUN_ID) == recorded
@@ -16,17 +16,17 @@ class TestStatsProcessingService:
         """Test successful comprehensive stats fetch"""
         # Setup mocks
         mock_fetch_links.return_value = ['link1', 'link2']
-        # Each link calls: workload, system, wafl_flexlog (3 calls) + instance type tries for each link
-        mock_fetch_file.side_effect = [
-            'write_data:1048576b/s\nread_io_type.cache:75%\ncpu_busy:80.5%',  # link1 stats_workload.txt
-            'cpu_busy:85.2%',  # link1 stats_system.txt  
-            'rdma_actual_latency.WAFL_SPINNP_WRITE:125.5us',  # link1 stats_wafl_flexlog.txt
-            'write_data:2097152b/s\nread_io_type.cache:80%\ncpu_busy:75.0%',  # link2 stats_workload.txt
-            'cpu_busy:90.1%',  # link2 stats_system.txt
-            'rdma_actual_latency.WAFL_SPINNP_WRITE:115.0us',  # link2 stats_wafl_flexlog.txt
-            'Instance Type: c5.xlarge',  # link1 instance type file
-            None,  # link2 instance type file (already got it from link1)
-        ]
+        # Files are fetched concurrently, so answer by (link, file) rather than call order
+        files = {
+            ('link1', 'stats_workload.txt'): 'write_data:1048576b/s\nread_io_type.cache:75%\ncpu_busy:80.5%',
+            ('link1', 'stats_system.txt'): 'cpu_busy:85.2%',
+            ('link1', 'stats_wafl_flexlog.txt'): 'rdma_actual_latency.WAFL_SPINNP_WRITE:125.5us',
+            ('link2', 'stats_workload.txt'): 'write_data:2097152b/s\nread_io_type.cache:80%\ncpu_busy:75.0%',
+            ('link2', 'stats_system.txt'): 'cpu_busy:90.1%',
+            ('link2', 'stats_wafl_flexlog.txt'): 'rdma_actual_latency.WAFL_SPINNP_WRITE:115.0us',
+            ('link1', 'system_node_virtual_machine_instance_show.txt'): 'Instance Type: c5.xlarge',
+        }
+        mock_fetch_file.side_effect = lambda ym, run_id, link, stats_type: files.get((link, stats_type))
         
         result = StatsProcessingService.fetch_comprehensive_stats('202412345')
         
@@ -35,6 +35,11 @@ class TestStatsProcessingService:
         assert 'Maximum Throughput' in result
         assert 'Maximum Cache Percentage' in result
         assert 'Maximum System CPU Busy' in result
+        assert result['Maximum Throughput'] == 2.0
+        assert result['Maximum System CPU Busy'] == 90.1
+        assert result['Instance Type'] == 'c5.xlarge'
+        # 3 files per iteration plus one VM instance file
+        assert mock_fetch_file.call_count == 7
     
     @patch('myapp.services.stats_service.ExternalAPIService.fetch_perfweb_links')
     def test_fetch_comprehensive_stats_no_links(self, mock_fetch_links):
@@ -0,0 +1,310 @@
+"""
+Unit tests for streaming, early-terminating upstream scans
+Tests the line scanner, streamed stats/listing fetches and streaming-mode services
+"""
+import asyncio
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+import pytest
+from myapp.services.api_service import ExternalAPIService, AsyncExternalAPIService
+from myapp.services.artifact_cache import artifact_cache, MISSING
+from myapp.services.metric_registry import metric_registry
+from myapp.services.stats_service import StatsProcessingService, GraphDataService
+from myapp.services.stream_scan import LineScanner, MultiPatternScanner, scan_lines, scan_text
+
+STREAMING = {'ENABLED': True, 'CHUNK_SIZE': 4096}
+LINK = 'testdirview.cgi?p=/x/eng/perfcloud/RESULTS/2507/250729hhm/ontap_command_output/01_iter'
+LISTING_HTML = (
+    '<html>\n'
+    f'<a href="{LINK}">1</a>\n'
+    '<a href="testdirview.cgi?p=/x/eng/perfcloud/RESULTS/2507/250729hhm/ontap_command_output/02_iter">2</a>\n'
+    '</html>\n'
+)
+WORKLOAD_HEAD = (
+    'write_data:1048576b/s\nops:50000/s\nlatency:2.5us\n'
+    'read_io_type.cache:75%\nread_io_type.ext_cache:5%\nread_io_type.disk:20%\nread_io_type.bamboo_ssd:0%\n'
+)
+PADDING_BYTES = 32 * 1024 * 1024
+CHUNK = b'counter.padding:0\n' * 4096
+
+
+class _StatsHandler(BaseHTTPRequestHandler):
+    """Serves a workload file whose metrics are at the top of a very large body"""
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if 'testdirview.cgi' in self.path:
+            body = LISTING_HTML.encode()
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if 'stats_workload.txt' not in self.path:
+            body = b'cpu_busy:50.0%\n' if 'stats_system.txt' in self.path else b''
+            self.send_response(200 if body else 404)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        head = WORKLOAD_HEAD.encode()
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(head) + PADDING_BYTES))
+        self.end_headers()
+        sent = 0
+        try:
+            self.wfile.write(head)
+            while sent < PADDING_BYTES:
+                self.wfile.write(CHUNK)
+                sent += len(CHUNK)
+        except OSError:
+            pass
+        finally:
+            with self.server.lock:
+                self.server.padding_sent.append(sent)
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stats_server():
+    """Local perfweb stand-in with a large stats file"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _StatsHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.padding_sent = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f'http://127.0.0.1:{server.server_address[1]}'
+    with patch.object(ExternalAPIService, 'PERFWEB_BASE_URL', f'{base}/cgi-bin/perfcloud'):
+        yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def streaming(settings):
+    """Enable streaming fetch mode"""
+    settings.STREAMING_FETCH = STREAMING
+
+
+def _wait_for_handlers(server, count):
+    for _ in range(200):
+        with server.lock:
+            if len(server.padding_sent) >= count:
+                return
+        threading.Event().wait(0.01)
+
+
+class TestLineScanner:
+    """Test cases for the incremental scanner"""
+
+    def test_stops_reading_once_all_patterns_match(self):
+        """Test lines after the last match are never consumed"""
+        consumed = []
+
+        def lines():
+            for line in ['ops:50000/s', 'latency:2.5us', 'tail-1', 'tail-2']:
+                consumed.append(line)
+                yield line
+
+        patterns = {'ops': re.compile(r'ops:(\d+)/s'), 'latency': re.compile(r'latency:(\d+\.\d+)us')}
+
+        assert scan_lines(lines(), patterns) == {'ops': '50000', 'latency': '2.5'}
+        assert consumed == ['ops:50000/s', 'latency:2.5us']
+
+    def test_first_match_wins_and_absent_patterns_are_none(self):
+        """Test the first occurrence is kept and unmatched patterns report None"""
+        scanner = LineScanner({'ops': re.compile(r'ops:(\d+)/s'), 'cpu': re.compile(r'cpu_busy:(\d+)%')})
+
+        scanner.feed('ops:1/s')
+        scanner.feed('ops:2/s')
+
+        assert scanner.results() == {'ops': '1', 'cpu': None}
+        assert not scanner.done
+
+    def test_bytes_lines_are_decoded(self):
+        """Test undecoded response lines are handled"""
+        assert scan_lines([b'ops:7/s'], {'ops': re.compile(r'ops:(\d+)/s')}) == {'ops': '7'}
+
+    def test_scan_text_matches_full_body_search(self):
+        """Test in-memory scans agree with re.search on the whole body"""
+        patterns = StatsProcessingService.scan_patterns('stats_workload.txt')
+
+        matches = scan_text(WORKLOAD_HEAD, patterns)
+
+        assert matches['throughput'] == '1048576'
+        assert matches['latency'] == '2.5'
+        assert matches['bamboo_ssd'] == '0'
+
+
+class TestMultiPatternScanner:
+    """Test cases for single-pass extraction from downloaded bodies"""
+
+    @staticmethod
+    def searched(text, patterns):
+        return {name: (match.group(1) if (match := pattern.search(text)) else None) for name, pattern in patterns.items()}
+
+    def test_agrees_with_separate_searches(self):
+        """Test every stats file's patterns give the same first matches as one re.search each"""
+        text = (
+            'Instance Type: m5.4xlarge ops:1/s\nvolume.vol0.ops:2/s\nwafl.latency:9.0ms\n'
+            + 'counter.padding:0\n' * 50 + WORKLOAD_HEAD + 'cpu_busy:55.5%\nops:3/s\n'
+            + 'rdma_actual_latency.WAFL_SPINNP_WRITE:12.0us\n'
+        )
+        for stats_type in metric_registry.plan(metric_registry.details_metrics()):
+            patterns = StatsProcessingService.scan_patterns(stats_type)
+            assert MultiPatternScanner(patterns).scan(text) == self.searched(text, patterns)
+
+    def test_patterns_that_cannot_share_an_anchor_fall_back(self):
+        """Test keys that are suffixes of other keys and non-literal keys are searched on their own"""
+        patterns = {
+            'latency': re.compile(r'latency:(\d+\.\d+)us'),
+            'avg_latency': re.compile(r'avg_latency:(\d+\.\d+)us'),
+            'counter': re.compile(r'(\w+)_total:\d+'),
+            'ops': re.compile(r'ops:(\d+)/s'),
+        }
+        text = 'avg_latency:1.5us\nreads_total:4\nlatency:2.5us\nops:7/s\n'
+
+        scanner = MultiPatternScanner(patterns)
+
+        assert {pattern.pattern for pattern in scanner.residual} == {
+            patterns['latency'].pattern, patterns['counter'].pattern
+        }
+        assert scanner.scan(text) == {'latency': '1.5', 'avg_latency': '1.5', 'counter': 'reads', 'ops': '7'}
+
+    def test_stops_after_last_pattern_found(self):
+        """Test the walk ends at the last first match rather than the end of the body"""
+        patterns = StatsProcessingService.scan_patterns('stats_system.txt')
+        scanner = MultiPatternScanner(patterns)
+        visited = []
+        finditer = scanner.combined.finditer
+
+        class Recording:
+            def finditer(self, text):
+                for match in finditer(text):
+                    visited.append(match.start())
+                    yield match
+
+        scanner.combined = Recording()
+
+        assert scanner.scan('cpu_busy:50%\n' * 100) == {'cpu_busy': '50'}
+        assert visited == [8]
+
+
+class TestStreamedFetches:
+    """Test cases for ExternalAPIService streaming fetches against a local server"""
+
+    def test_scan_closes_connection_early(self, stats_server):
+        """Test a large file is abandoned once its metrics are found"""
+        patterns = StatsProcessingService.scan_patterns('stats_workload.txt')
+
+        matches = ExternalAPIService.scan_stats_file('2507', '250729hhm', LINK, 'stats_workload.txt', patterns)
+
+        assert matches['throughput'] == '1048576'
+        assert matches['ops'] == '50000'
+        _wait_for_handlers(stats_server, 1)
+        assert stats_server.padding_sent[0] < PADDING_BYTES
+
+    def test_cached_matches_are_reused(self, stats_server):
+        """Test a second scan for covered patterns does not hit the upstream"""
+        patterns = StatsProcessingService.scan_patterns('stats_workload.txt')
+        ExternalAPIService.scan_stats_file('2507', '250729hhm', LINK, 'stats_workload.txt', patterns)
+
+        graph_patterns = {name: patterns[name] for name in GraphDataService.GRAPH_PATTERNS}
+
+        matches = ExternalAPIService.scan_stats_file('2507', '250729hhm', LINK, 'stats_workload.txt', graph_patterns)
+
+        assert matches == {'latency': '2.5', 'ops': '50000', 'throughput': '1048576'}
+        _wait_for_handlers(stats_server, 1)
+        assert len(stats_server.padding_sent) == 1
+
+    def test_missing_file_is_remembered(self, stats_server):
+        """Test a 404 is cached as MISSING"""
+        patterns = metric_registry.patterns('stats_workload.txt')
+
+        assert ExternalAPIService.scan_stats_file('2507', '250729hhm', LINK, 'missing.txt', patterns) is None
+        assert artifact_cache.get(artifact_cache.file_key('250729hhm', LINK, 'missing.txt')) is MISSING
+
+    def test_full_fetch_ignores_cached_matches(self):
+        """Test fetch_stats_file does not mistake scan matches for a body"""
+        key = artifact_cache.file_key('250729hhm', LINK, 'stats_workload.txt')
+        artifact_cache.put(key, {r'ops:(\d+)/s': '50000'})
+
+        with patch('myapp.services.api_service.upstream_http.get') as mock_get:
+            mock_get.return_value.ok = True
+            mock_get.return_value.text = WORKLOAD_HEAD
+            assert ExternalAPIService.fetch_stats_file('2507', '250729hhm', LINK, 'stats_workload.txt') == WORKLOAD_HEAD
+
+    @pytest.mark.usefixtures('streaming')
+    def test_streamed_listing(self, stats_server):
+        """Test listing links are collected line by line in streaming mode"""
+        links = ExternalAPIService.fetch_perfweb_links('250729hhm')
+
+        assert links == [LINK, LINK.replace('01_iter', '02_iter')]
+
+    @pytest.mark.usefixtures('streaming')
+    def test_async_scan_closes_connection_early(self, stats_server):
+        """Test the httpx path also stops after the metrics are found"""
+        patterns = StatsProcessingService.scan_patterns('stats_workload.txt')
+
+        async def scan():
+            return await AsyncExternalAPIService.scan_stats_file('2507', '250729hhm', LINK, 'stats_workload.txt', patterns)
+
+        matches = asyncio.run(scan())
+
+        assert matches['cache'] == '75'
+        _wait_for_handlers(stats_server, 1)
+        assert stats_server.padding_sent[0] < PADDING_BYTES
+
+
+@pytest.mark.usefixtures('streaming')
+class TestStreamingModeServices:
+    """Test cases for the stats and graph services in streaming mode"""
+
+    @patch('myapp.services.stats_service.ExternalAPIService.fetch_perfweb_links')
+    @patch('myapp.services.stats_service.ExternalAPIService.scan_stats_file')
+    def test_comprehensive_stats_from_scans(self, mock_scan, mock_links):
+        """Test scan matches feed the same statistics as full bodies"""
+        mock_links.return_value = ['link1', 'link2']
+        bodies = {
+            ('link1', 'stats_workload.txt'): 'write_data:1048576b/s\nread_io_type.cache:75%',
+            ('link1', 'stats_system.txt'): 'cpu_busy:85.2%',
+            ('link2', 'stats_workload.txt'): 'write_data:2097152b/s\nread_io_type.cache:80%',
+            ('link2', 'stats_wafl_flexlog.txt'): 'rdma_actual_latency.WAFL_SPINNP_WRITE:115.0us',
+            ('link1', 'system_node_virtual_machine_instance_show.txt'): 'Instance Type: c5.xlarge ',
+        }
+
+        def fake_scan(year_month, run_id, link, stats_type, patterns):
+            body = bodies.get((link, stats_type))
+            return scan_text(body, patterns) if body is not None else None
+
+        mock_scan.side_effect = fake_scan
+
+        result = StatsProcessingService.fetch_comprehensive_stats('202412345')
+
+        assert result == {
+            'Maximum Throughput': 2.0,
+            'Maximum Cache Percentage': 80,
+            'Maximum System CPU Busy': 85.2,
+            'Maximum WAFL RDMA Write Latency': 115.0,
+            'Instance Type': 'c5.xlarge'
+        }
+        assert mock_scan.call_count == 7
+
+    def test_details_then_graph_share_one_stream(self, stats_server):
+        """Test the workload scan for details also serves the graph"""
+        links = ExternalAPIService.fetch_perfweb_links('250729hhm')
+        stats = StatsProcessingService.fetch_comprehensive_stats('250729hhm')
+        _wait_for_handlers(stats_server, len(links))
+        streams_after_details = len(stats_server.padding_sent)
+
+        graph = GraphDataService.fetch_graph_data('250729hhm')
+
+        assert stats['Maximum Throughput'] == 1.0
+        assert graph == [{'latency': 2.5, 'ops': 50000, 'throughput': 1048576}] * 2
+        assert len(stats_server.padding_sent) == streams_after_details
@@ -97,3 +97,11 @@ class TestCacheManagementView(TestCase):
         self.assertIn('status', response_data)
         self.assertIn('cleared successfully', response_data['status'])
         mock_clear.assert_called_once()
+    
+    @patch('myapp.views.iteration_ledger.reset')
+    def test_delete_resets_iteration_ledger(self, mock_reset):
+        """Test clearing the caches also forgets settled iterations"""
+        response = self.view.delete(self.factory.delete('/cache-management/'))
+        
+        self.assertEqual(response.status_code, 200)
+        mock_reset.assert_called_once()